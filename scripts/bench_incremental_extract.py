@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Benchmark prompt size of full vs. block-incremental job extraction.
+
+For each sample page in data/crawl_results/, simulates a re-crawl in which
+a few job blocks were added (copies of existing blocks with a new title)
+and one was removed, then compares the characters a full extraction sends
+to the LLM (the page, truncated to max_content_length) with what
+JobExtractor.extract_incremental sends (only the new blocks). No LLM is
+called; the planning step is exactly what extract_incremental runs.
+
+Usage:
+    python scripts/bench_incremental_extract.py
+    python scripts/bench_incremental_extract.py --added 5
+"""
+
+import argparse
+import random
+import time
+from pathlib import Path
+
+from offer_sherlock.extractors.blocks import plan_extraction, segment_markdown
+
+PAGES_DIR = Path(__file__).parent.parent / "data" / "crawl_results"
+MAX_CONTENT_LENGTH = 15000
+
+
+def mutate(blocks, added: int, rng: random.Random) -> str:
+    """Page markdown with ``added`` new blocks and one block removed."""
+    texts = [block.text for block in blocks]
+    for i in range(added):
+        source = rng.choice(texts)
+        texts.insert(rng.randrange(len(texts) + 1), f"{source} (新岗位 {i})")
+    if len(texts) > 1:
+        texts.pop(rng.randrange(len(texts)))
+    return "\n\n".join(texts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental extraction benchmark")
+    parser.add_argument("--added", type=int, default=2, help="blocks added per re-crawl")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"\n✂️  Prompt size per re-crawl ({args.added} blocks added, 1 removed)")
+    print("=" * 72)
+    print(
+        f"{'page':<24}{'blocks':>8}{'full chars':>12}{'delta chars':>13}"
+        f"{'saved':>8}{'plan ms':>9}"
+    )
+
+    total_full = total_delta = 0
+    for path in sorted(PAGES_DIR.glob("*.md")):
+        markdown = path.read_text(encoding="utf-8")
+        blocks = segment_markdown(markdown)
+        # State after a complete previous extraction: every block known
+        previous = {block.hash: [] for block in blocks}
+        changed = mutate(blocks, args.added, rng)
+
+        start = time.perf_counter()
+        plan = plan_extraction(segment_markdown(changed), previous, MAX_CONTENT_LENGTH)
+        plan_ms = (time.perf_counter() - start) * 1000
+
+        full = min(len(changed), MAX_CONTENT_LENGTH)
+        delta = len(plan.prompt)
+        total_full += full
+        total_delta += delta
+        print(
+            f"{path.stem[:23]:<24}{len(plan.blocks):>8}{full:>12}{delta:>13}"
+            f"{1 - delta / full:>8.0%}{plan_ms:>9.2f}"
+        )
+
+    print("-" * 72)
+    print(
+        f"{'total':<24}{'':>8}{total_full:>12}{total_delta:>13}"
+        f"{1 - total_delta / total_full:>8.0%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Benchmark deep pagination (OFFSET vs. keyset) and full-table walks.
+
+Reported:
+    - time to fetch a 100-row page at increasing depth with list_all()
+      (LIMIT/OFFSET) and with list_page() (keyset cursor)
+    - time and peak Python memory to walk every job with list_all(limit=n)
+      vs. iter_all()
+
+Usage:
+    python scripts/bench_job_pagination.py
+    python scripts/bench_job_pagination.py -n 500000
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import insert
+
+from offer_sherlock.database import DatabaseManager, JobRepository
+from offer_sherlock.database.models import Job
+
+
+def populate(db: DatabaseManager, n: int, batch: int = 10_000):
+    """Insert n jobs, several per second of created_at."""
+    start = datetime(2024, 1, 1)
+    for offset in range(0, n, batch):
+        rows = [
+            {
+                "title": f"工程师 {i}",
+                "company": f"公司{i % 100}",
+                "requirements": "熟悉 Python、分布式系统 " * 5,
+                "created_at": start + timedelta(seconds=i // 4),
+            }
+            for i in range(offset, min(offset + batch, n))
+        ]
+        with db.session() as session:
+            session.execute(insert(Job), rows)
+
+
+def time_offset_page(db: DatabaseManager, depth: int) -> float:
+    with db.session() as session:
+        start = time.perf_counter()
+        JobRepository(session).list_all(limit=100, offset=depth)
+        return (time.perf_counter() - start) * 1000
+
+
+def time_keyset_page(db: DatabaseManager, depth: int) -> float:
+    # Find the cursor at this depth once, then time only the page fetch
+    with db.session() as session:
+        repo = JobRepository(session)
+        row = repo.list_all(limit=1, offset=depth - 1)[0] if depth else None
+        after = (row.created_at, row.id) if row else None
+        start = time.perf_counter()
+        repo.list_page(limit=100, after=after)
+        return (time.perf_counter() - start) * 1000
+
+
+def walk(db: DatabaseManager, n: int, streaming: bool) -> tuple[float, float, int]:
+    """Touch every job; return (seconds, peak MiB, rows)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = 0
+    with db.session() as session:
+        repo = JobRepository(session)
+        jobs = repo.iter_all(batch_size=1000) if streaming else repo.list_all(limit=n)
+        for job in jobs:
+            rows += len(job.title) > 0
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 2**20, rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Job pagination benchmark")
+    parser.add_argument("-n", type=int, default=200_000, help="number of jobs")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(db_path=str(Path(tmp) / "bench_pages.db"))
+        db.create_tables()
+        print(f"Populating {args.n} jobs...")
+        populate(db, args.n)
+
+        print(f"\n📊 Page fetch at depth ({args.n} rows, 100 per page)")
+        print("=" * 44)
+        print(f"{'depth':>10}{'OFFSET ms':>14}{'keyset ms':>14}")
+        for depth in (0, 1_000, 10_000, args.n // 2, args.n - 100):
+            print(
+                f"{depth:>10}{time_offset_page(db, depth):>14.2f}"
+                f"{time_keyset_page(db, depth):>14.2f}"
+            )
+
+        print(f"\n📊 Full walk ({args.n} rows)")
+        print("=" * 44)
+        print(f"{'method':<12}{'seconds':>10}{'peak MiB':>12}{'rows':>10}")
+        for name, streaming in (("list_all", False), ("iter_all", True)):
+            seconds, peak, rows = walk(db, args.n, streaming)
+            print(f"{name:<12}{seconds:>10.2f}{peak:>12.1f}{rows:>10}")
+        db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Benchmark JobRepository.search: FTS5 index vs. LIKE scan.
+
+Builds a synthetic jobs table (500k rows by default), then times the same
+keywords through the FTS5 path and through the old ILIKE '%kw%' scan.
+
+Usage:
+    python scripts/bench_job_search.py
+    python scripts/bench_job_search.py -n 100000 --db data/bench_search.db
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import or_, select
+
+from offer_sherlock.database import DatabaseManager, JobRepository
+from offer_sherlock.database.models import Job
+from offer_sherlock.schemas.job import JobPosting
+
+TITLES = ["后端开发工程师", "前端开发工程师", "算法工程师", "数据分析师", "测试开发工程师",
+          "产品经理", "Android 开发", "iOS 开发", "机器学习研究员", "SRE 工程师"]
+COMPANIES = [
+    "字节跳动", "腾讯", "阿里巴巴", "美团", "京东", "百度", "华为", "拼多多", "Google", "Apple",
+]
+CITIES = ["北京", "上海", "深圳", "杭州", "成都", "广州", "Singapore", "Seattle"]
+SKILLS = ["Python", "Go", "Java", "C++", "Kubernetes", "分布式系统", "推荐算法", "大模型",
+          "数据仓库", "高并发", "前端框架", "自动化测试", "Rust", "Spark", "Flink"]
+KEYWORDS = ["后端", "推荐算法", "Kubernetes", "深圳", "机器学习", "Rust", "不存在的词"]
+
+
+def populate(db: DatabaseManager, n: int, batch: int = 5000):
+    """Insert n synthetic jobs."""
+    rng = random.Random(42)
+    for start in range(0, n, batch):
+        jobs = [
+            JobPosting(
+                title=f"{rng.choice(TITLES)}-{i}",
+                company=rng.choice(COMPANIES),
+                job_id_external=f"J{i:08d}",
+                location=rng.choice(CITIES),
+                requirements="熟悉 " + "、".join(rng.sample(SKILLS, 4)) + "，本科及以上学历",
+            )
+            for i in range(start, min(start + batch, n))
+        ]
+        with db.session() as session:
+            JobRepository(session).upsert_many(jobs)
+
+
+def like_search(session, keyword: str, limit: int = 50):
+    """The pre-FTS implementation."""
+    pattern = f"%{keyword}%"
+    stmt = (
+        select(Job)
+        .where(or_(Job.title.ilike(pattern), Job.company.ilike(pattern),
+                   Job.requirements.ilike(pattern), Job.location.ilike(pattern)))
+        .order_by(Job.created_at.desc())
+        .limit(limit)
+    )
+    return list(session.scalars(stmt))
+
+
+def timed(fn, repeat: int = 5) -> float:
+    """Median wall time in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Job search benchmark")
+    parser.add_argument("-n", type=int, default=500_000, help="number of jobs")
+    parser.add_argument("--db", help="reuse/create this database file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db or str(Path(tmp) / "bench_search.db")
+        db = DatabaseManager(db_path=db_path)
+        db.create_tables()
+
+        with db.session() as session:
+            existing = JobRepository(session).count()
+        if existing < args.n:
+            print(f"Populating {args.n - existing} jobs...")
+            start = time.perf_counter()
+            populate(db, args.n)
+            print(f"  done in {time.perf_counter() - start:.1f}s")
+
+        print(f"\n📊 Job search benchmark ({args.n} rows, median of 5, limit 50)")
+        print("=" * 60)
+        print(f"{'keyword':<14}{'LIKE ms':>10}{'FTS5 ms':>10}{'speedup':>10}{'hits':>8}")
+        with db.session() as session:
+            repo = JobRepository(session)
+            for keyword in KEYWORDS:
+                like_ms = timed(lambda: like_search(session, keyword))
+                fts_ms = timed(lambda: repo.search(keyword))
+                hits = len(repo.search(keyword))
+                print(f"{keyword:<14}{like_ms:>10.1f}{fts_ms:>10.1f}"
+                      f"{like_ms / max(fts_ms, 1e-6):>9.1f}x{hits:>8}")
+        db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
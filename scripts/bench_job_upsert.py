@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Benchmark job persistence: per-row add() loop vs. bulk upsert_many().
+
+The loop mirrors what IntelAgent.crawl_official used to do per job:
+get_by_external_id() + add() (which looks the job up again and flushes).
+The "rerun" phase writes identical content again, which the content hash
+turns into a no-op.
+
+Usage:
+    python scripts/bench_job_upsert.py            # 10k jobs
+    python scripts/bench_job_upsert.py -n 50000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from offer_sherlock.database import DatabaseManager, JobRepository
+from offer_sherlock.schemas.job import JobPosting
+
+
+def make_jobs(n: int, revision: int = 0) -> list[JobPosting]:
+    """Build n synthetic job postings."""
+    return [
+        JobPosting(
+            title=f"后端开发工程师 {i} v{revision}",
+            company=f"公司{i % 50}",
+            job_id_external=f"EXT{i:07d}",
+            location="北京",
+            job_type="社招",
+            requirements="熟悉 Python / Go，有分布式系统经验",
+            apply_link=f"https://jobs.example.com/{i}",
+        )
+        for i in range(n)
+    ]
+
+
+def run_loop(db: DatabaseManager, jobs: list[JobPosting]) -> tuple[float, int, int, int]:
+    """Old path: lookup + add() per job."""
+    start = time.perf_counter()
+    added = updated = unchanged = 0
+    with db.session() as session:
+        repo = JobRepository(session)
+        for job in jobs:
+            existing = repo.get_by_external_id(job.job_id_external)
+            if not existing:
+                added += 1
+            elif existing.content_hash == repo.content_hash(job):
+                unchanged += 1
+            else:
+                updated += 1
+            repo.add(job, source_url="https://jobs.example.com")
+    return time.perf_counter() - start, added, updated, unchanged
+
+
+def run_upsert(db: DatabaseManager, jobs: list[JobPosting]) -> tuple[float, int, int, int]:
+    """New path: batched INSERT ... ON CONFLICT DO UPDATE."""
+    start = time.perf_counter()
+    with db.session() as session:
+        result = JobRepository(session).upsert_many(
+            jobs, source_url="https://jobs.example.com"
+        )
+    return time.perf_counter() - start, result.inserted, result.updated, result.unchanged
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Job upsert benchmark")
+    parser.add_argument("-n", type=int, default=10_000, help="number of jobs")
+    args = parser.parse_args()
+
+    print(f"\n📊 Job persistence benchmark ({args.n} jobs)")
+    print("=" * 60)
+    print(
+        f"{'method':<14}{'phase':<10}{'seconds':>10}{'jobs/s':>12}"
+        f"{'new':>8}{'upd':>8}{'same':>8}"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, fn in (("add() loop", run_loop), ("upsert_many", run_upsert)):
+            db = DatabaseManager(db_path=str(Path(tmp) / f"{fn.__name__}.db"))
+            db.create_tables()
+            # "rerun" repeats the update with identical content
+            for phase, revision in (("insert", 0), ("update", 1), ("rerun", 1)):
+                jobs = make_jobs(args.n, revision)
+                seconds, added, updated, unchanged = fn(db, jobs)
+                print(
+                    f"{name:<14}{phase:<10}{seconds:>10.2f}"
+                    f"{args.n / seconds:>12.0f}{added:>8}{updated:>8}{unchanged:>8}"
+                )
+            db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Benchmark the lean crawl profile against full page loads.
+
+Crawls each default target from scripts/init_targets.py twice, once with
+every resource allowed and once with OfficialCrawler's default
+ResourcePolicy (images, media, fonts and trackers blocked), and reports
+requests, bytes transferred and time to markdown. Also checks that the
+lean markdown still carries the page's text.
+
+Needs Chromium (crawl4ai-setup) and network access.
+
+Usage:
+    python scripts/bench_lean_profile.py
+    python scripts/bench_lean_profile.py --limit 3
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from init_targets import DEFAULT_TARGETS  # noqa: E402
+
+from offer_sherlock.crawlers import LEAN_POLICY, OfficialCrawler  # noqa: E402
+
+
+async def measure(crawler: OfficialCrawler, target: dict) -> dict:
+    """Crawl a target once; returns its traffic and timing."""
+    start = time.perf_counter()
+    result = await crawler.crawl(
+        target["url"], resource_allowlist=target.get("resource_allowlist")
+    )
+    seconds = time.perf_counter() - start
+    if not result.success:
+        return {"error": result.error, "seconds": seconds}
+    return {
+        "seconds": seconds,
+        "chars": len(result.markdown),
+        "requests": result.metadata.get("requests", 0),
+        "blocked": result.metadata.get("blocked_requests", 0),
+        "bytes": result.metadata.get("bytes_transferred", 0),
+    }
+
+
+async def run(targets: list[dict]) -> None:
+    profiles = {
+        "full": OfficialCrawler(use_cache=False, resource_policy=None, measure_traffic=True),
+        "lean": OfficialCrawler(use_cache=False, resource_policy=LEAN_POLICY, measure_traffic=True),
+    }
+    totals = {name: {"seconds": 0.0, "bytes": 0, "requests": 0} for name in profiles}
+
+    print("\n🪶 Full vs. lean page loads")
+    print("=" * 84)
+    print(
+        f"{'company':<10}{'profile':>8}{'requests':>10}{'blocked':>9}"
+        f"{'KB':>10}{'seconds':>9}{'chars':>9}"
+    )
+    for target in targets:
+        for name, crawler in profiles.items():
+            async with crawler:
+                row = await measure(crawler, target)
+            if "error" in row:
+                print(f"{target['company']:<10}{name:>8}  failed: {row['error']}")
+                continue
+            for key in totals[name]:
+                totals[name][key] += row[key]
+            print(
+                f"{target['company']:<10}{name:>8}{row['requests']:>10}{row['blocked']:>9}"
+                f"{row['bytes'] / 1024:>10.0f}{row['seconds']:>9.2f}{row['chars']:>9}"
+            )
+
+    full, lean = totals["full"], totals["lean"]
+    print("-" * 84)
+    for key in ("requests", "bytes", "seconds"):
+        saved = 1 - lean[key] / full[key] if full[key] else 0.0
+        print(f"{key:<10} full {full[key]:>14.0f}   lean {lean[key]:>14.0f}   saved {saved:>6.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lean crawl profile benchmark")
+    parser.add_argument("--limit", type=int, help="only the first N targets")
+    args = parser.parse_args()
+
+    targets = DEFAULT_TARGETS[: args.limit] if args.limit else DEFAULT_TARGETS
+    asyncio.run(run(targets))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Benchmark markdown size and generation time with a learned selector.
+
+Builds synthetic career pages shaped like the real ones (navigation,
+banner, a filter panel with many options, recommended jobs, the job list,
+a long footer and inline scripts), learns the job-list selector from the
+job titles as IntelAgent does after an extraction, and compares Crawl4AI's
+markdown generation on the full page with generation on the selected
+element. The prompt sent to the LLM is the markdown, so its size is the
+LLM input size. No browser is needed.
+
+Usage:
+    python scripts/bench_learned_selector.py
+    python scripts/bench_learned_selector.py --jobs 50 --repeat 5
+"""
+
+import argparse
+import random
+import time
+
+from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+
+from offer_sherlock.crawlers import learn_selector
+
+ROLES = ["后端开发", "前端开发", "算法", "测试开发", "数据分析", "产品经理", "运维开发", "安全"]
+CITIES = ["北京", "上海", "深圳", "杭州", "广州", "成都", "武汉", "南京"]
+
+
+def job_title(rng: random.Random, i: int) -> str:
+    return f"{rng.choice(ROLES)}工程师-{rng.choice(['基础架构', '电商', '广告', '云'])}{i}"
+
+
+def career_page(rng: random.Random, jobs: int) -> tuple[str, list[str]]:
+    """Synthetic career page; returns its HTML and job titles."""
+    titles = [job_title(rng, i) for i in range(jobs)]
+    nav = "".join(f"<li><a href='/n/{i}'>栏目{i}</a></li>" for i in range(25))
+    filters = "".join(
+        f"<label><input type='checkbox'>{city}{role}</label>"
+        for city in CITIES
+        for role in ROLES
+    )
+    hot = "".join(f"<li><a href='/hot/{i}'>{titles[i]}</a></li>" for i in range(min(5, jobs)))
+    cards = "".join(
+        f"<li class='job-card'><a href='/position/{i}'><h3>{title}</h3></a>"
+        f"<p>{rng.choice(CITIES)} | 社招 | 更新于 2026-10-{rng.randint(1, 28):02d}</p>"
+        f"<p>负责{title}相关系统的设计与开发, 参与核心模块优化。</p></li>"
+        for i, title in enumerate(titles)
+    )
+    footer = "".join(
+        f"<p><a href='/f/{i}'>友情链接 {i}</a> 公司简介与隐私政策说明 {i}</p>" for i in range(60)
+    )
+    script = "<script>window.__STATE__=" + "{}".join("x" * 50 for _ in range(200)) + "</script>"
+    html = (
+        f"<html><head><style>body{{margin:0}}</style>{script}</head><body>"
+        f"<header><ul class='nav'>{nav}</ul>"
+        "<div class='banner'>加入我们 一起创造未来</div></header>"
+        f"<div id='app-{rng.randint(10**9, 10**10)}'><aside class='filter-panel'>{filters}</aside>"
+        f"<section class='hot-jobs'><h2>热招职位</h2><ul>{hot}</ul></section>"
+        f"<section class='results'><ul class='position-list'>{cards}</ul>"
+        f"<div class='pager'>上一页 1 2 3 下一页</div></section></div>"
+        f"<footer>{footer}</footer></body></html>"
+    )
+    return html, titles
+
+
+def to_markdown(html: str) -> str:
+    """Markdown as Crawl4AI generates it."""
+    return DefaultMarkdownGenerator().generate_markdown(html, base_url="https://jobs.example.com").raw_markdown
+
+
+def timed(fn, repeat: int):
+    """Best wall-clock milliseconds of ``repeat`` runs, and the last result."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Learned selector benchmark")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[10, 20, 50, 100])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print("\n🎯 Full page vs. learned job-list selector")
+    print("=" * 92)
+    print(
+        f"{'jobs':>5}{'selector':>26}{'learn ms':>10}{'full chars':>12}{'sel chars':>11}"
+        f"{'saved':>8}{'full ms':>9}{'sel ms':>8}"
+    )
+    for jobs in args.jobs:
+        html, titles = career_page(rng, jobs)
+        learn_ms, selector = timed(lambda: learn_selector(html, titles), args.repeat)
+        full_ms, full = timed(lambda: to_markdown(html), args.repeat)
+
+        def selected():
+            # Crawl4AI applies css_selector to the page, then converts the match
+            root = lxml_html.fromstring(html)
+            fragment = "".join(
+                lxml_html.tostring(e, encoding="unicode") for e in CSSSelector(selector)(root)
+            )
+            return to_markdown(fragment)
+
+        sel_ms, narrow = timed(selected, args.repeat)
+        missing = sum(title not in narrow for title in titles)
+        saved = 1 - len(narrow) / len(full)
+        print(
+            f"{jobs:>5}{selector:>26}{learn_ms:>10.1f}{len(full):>12}{len(narrow):>11}"
+            f"{saved:>8.0%}{full_ms:>9.1f}{sel_ms:>8.1f}"
+            + (f"  ({missing} titles missing!)" if missing else "")
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Benchmark raw page storage: raw_content per job vs. the page archive.
+
+Simulates repeated crawls of the pages in data/crawl_results/: each run
+re-fetches every page, a fraction of which changed since the last run, and
+stores 20 jobs per page. The "inline" layout copies the page text into
+jobs.raw_content (what JobRepository.add(raw_content=...) does); the
+"archive" layout writes the page once to a PageArchive, records the fetch
+in raw_pages and stores only the hash on the jobs.
+
+Usage:
+    python scripts/bench_raw_archive.py               # 30 runs
+    python scripts/bench_raw_archive.py --runs 100 --changed 0.2
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+
+from offer_sherlock.database import (
+    DatabaseManager,
+    JobRepository,
+    PageArchive,
+    RawPageRepository,
+)
+from offer_sherlock.schemas.job import JobPosting
+
+PAGES_DIR = Path(__file__).parent.parent / "data" / "crawl_results"
+JOBS_PER_PAGE = 20
+
+
+def load_pages() -> dict[str, str]:
+    """Crawled sample pages by URL."""
+    return {
+        f"https://jobs.example.com/{path.stem}": path.read_text(encoding="utf-8")
+        for path in sorted(PAGES_DIR.glob("*.md"))
+    }
+
+
+def make_jobs(url: str, revision: int) -> list[JobPosting]:
+    """Jobs extracted from a page revision."""
+    return [
+        JobPosting(
+            title=f"工程师 {i} r{revision}",
+            company=url.rsplit("/", 1)[-1],
+            job_id_external=f"{url}#{i}",
+        )
+        for i in range(JOBS_PER_PAGE)
+    ]
+
+
+def db_size(db: DatabaseManager) -> int:
+    """Database file size after reclaiming free pages."""
+    with db.engine.connect() as conn:
+        conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+        conn.execute(text("VACUUM"))
+    return Path(db.db_path).stat().st_size
+
+
+def dir_size(path: Path) -> int:
+    """Total size of the files below a directory."""
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def simulate(db, pages, runs, changed, archive=None) -> float:
+    """Crawl every page ``runs`` times; returns the seconds spent storing."""
+    rng = random.Random(0)
+    revisions = {url: 0 for url in pages}
+    seconds = 0.0
+    for _ in range(runs):
+        for url, base in pages.items():
+            if rng.random() < changed:
+                revisions[url] += 1
+            revision = revisions[url]
+            markdown = f"{base}\n\n<!-- revision {revision} -->\n"
+            jobs = make_jobs(url, revision)
+
+            start = time.perf_counter()
+            with db.session() as session:
+                repo = JobRepository(session)
+                if archive is None:
+                    # Inline layout: every written job carries the page text
+                    for job in jobs:
+                        repo.add(job, source_url=url, raw_content=markdown)
+                else:
+                    digest = archive.put(markdown)
+                    RawPageRepository(session).add(
+                        url, digest, markdown_size=len(markdown.encode("utf-8"))
+                    )
+                    repo.upsert_many(jobs, source_url=url, raw_page_hash=digest)
+            seconds += time.perf_counter() - start
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Raw page archive benchmark")
+    parser.add_argument("--runs", type=int, default=30, help="crawl runs")
+    parser.add_argument(
+        "--changed", type=float, default=0.3, help="fraction of pages changed per run"
+    )
+    args = parser.parse_args()
+
+    pages = load_pages()
+    raw_bytes = sum(len(p.encode("utf-8")) for p in pages.values())
+    print(
+        f"\n📦 Raw page storage ({len(pages)} pages, {raw_bytes / 1024:.0f} KiB, "
+        f"{args.runs} runs, {args.changed:.0%} changed per run, "
+        f"{JOBS_PER_PAGE} jobs/page)"
+    )
+    print("=" * 72)
+    print(f"{'layout':<10}{'db KiB':>10}{'archive KiB':>14}{'total KiB':>12}{'store s':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for layout in ("inline", "archive"):
+            db = DatabaseManager(db_path=str(Path(tmp) / f"{layout}.db"))
+            db.create_tables()
+            archive = PageArchive(Path(tmp) / "raw_pages") if layout == "archive" else None
+            seconds = simulate(db, pages, args.runs, args.changed, archive)
+            db_bytes = db_size(db)
+            archive_bytes = dir_size(archive.root) if archive else 0
+            print(
+                f"{layout:<10}{db_bytes / 1024:>10.0f}{archive_bytes / 1024:>14.0f}"
+                f"{(db_bytes + archive_bytes) / 1024:>12.0f}{seconds:>10.2f}"
+            )
+            db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
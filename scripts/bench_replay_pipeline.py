@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Benchmark end-to-end throughput on replayed crawls.
+
+Records the saved career pages in data/crawl_results/ and data/mock/ into
+a temporary recording, registers one crawl target per page in a temporary
+database and runs IntelAgent's PipelineRunner over them at several
+concurrency levels. Pages come from a ReplayCrawler and jobs from a fake
+LLM that answers after a fixed delay with the links listed on the page,
+so runs need neither a browser nor an API key and are repeatable: what
+changes between rows is only the pipeline's scheduling.
+
+Each level runs twice on a fresh database: a cold run extracts every
+page, a warm run replays the recording again. Pages unchanged since the
+cold run skip extraction; pages without jobs, and URLs saved twice with
+different content, are extracted again.
+
+Usage:
+    python scripts/bench_replay_pipeline.py
+    python scripts/bench_replay_pipeline.py --crawl-latency 2 --llm-latency 5 --levels 1 4 16
+"""
+
+import argparse
+import asyncio
+import re
+import tempfile
+import time
+from pathlib import Path
+
+from offer_sherlock.agents import IntelAgent, PipelineConfig, PipelineRunner
+from offer_sherlock.crawlers import CrawlRecording, ReplayCrawler
+from offer_sherlock.database import CrawlTargetRepository, DatabaseManager
+from offer_sherlock.schemas.job import JobListExtraction, JobPosting
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+PAGES = sorted((DATA_DIR / "crawl_results").glob("*.md")) + sorted((DATA_DIR / "mock").glob("*.md"))
+
+# Markdown links in list items stand in for job postings
+_LINK_ITEM = re.compile(r"^\s*[*-]\s+\[([^\]\n]{2,80})\]", re.MULTILINE)
+
+
+class FakeLLM:
+    """LLMClient stand-in: fixed latency, jobs are the page's list links."""
+
+    def __init__(self, latency: float, max_jobs: int = 30):
+        self.latency = latency
+        self.max_jobs = max_jobs
+        self.calls = 0
+
+    async def achat_structured(self, message: str, output_schema, system_prompt=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        titles = list(dict.fromkeys(m.strip() for m in _LINK_ITEM.findall(message)))
+        jobs = [JobPosting(title=title, company="Unknown") for title in titles[: self.max_jobs]]
+        return JobListExtraction(jobs=jobs, source_url="")
+
+
+def setup(root: Path, recording: CrawlRecording) -> DatabaseManager:
+    """Fresh database with one crawl target per recorded URL."""
+    db = DatabaseManager(db_path=str(root / "bench.db"))
+    db.create_tables()
+    with db.session() as session:
+        repo = CrawlTargetRepository(session)
+        for i, url in enumerate(recording.urls()):
+            repo.add(f"company-{i}", url)
+    return db
+
+
+async def run(db, recording, concurrency: int, args) -> list[tuple[float, int, int]]:
+    """Cold and warm pipeline runs; (seconds, companies, jobs) per run."""
+    crawler = ReplayCrawler(recording, latency=args.crawl_latency, jitter=0.2)
+    agent = IntelAgent(db, crawler=crawler)
+    agent._llm_client = FakeLLM(args.llm_latency)
+    runner = PipelineRunner(
+        agent,
+        PipelineConfig(crawl_workers=concurrency, extract_workers=concurrency, delay_between=0),
+    )
+    runs = []
+    async with agent:
+        for _ in range(2):
+            start = time.perf_counter()
+            results = await runner.run()
+            elapsed = time.perf_counter() - start
+            runs.append((elapsed, len(results), sum(r.jobs_found for r in results)))
+    return runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replayed pipeline benchmark")
+    parser.add_argument("--crawl-latency", type=float, default=0.5, help="seconds per page crawl")
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="seconds per LLM call")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        recording = CrawlRecording(tmp / "recording")
+        recording.import_markdown(PAGES)
+        pages = len(recording.urls())
+
+        print(
+            f"\n🔁 Replayed pipeline: {pages} pages, crawl {args.crawl_latency}s, "
+            f"LLM {args.llm_latency}s (±20% crawl jitter)"
+        )
+        print("=" * 72)
+        print(
+            f"{'workers':>8}{'cold s':>9}{'co/s':>8}{'jobs/s':>9}"
+            f"{'warm s':>9}{'co/s':>8}{'speedup':>9}"
+        )
+
+        baseline = None
+        for level in args.levels:
+            root = tmp / f"level-{level}"
+            root.mkdir()
+            db = setup(root, recording)
+            (cold, companies, jobs), (warm, warm_companies, _) = asyncio.run(
+                run(db, recording, level, args)
+            )
+            baseline = baseline or cold
+            print(
+                f"{level:>8}{cold:>9.2f}{companies / cold:>8.2f}{jobs / cold:>9.1f}"
+                f"{warm:>9.2f}{warm_companies / warm:>8.2f}{baseline / cold:>8.1f}x"
+            )
+            db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
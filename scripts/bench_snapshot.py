@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Benchmark loading jobs into pandas: ORM rows vs. columnar snapshots.
+
+Compares building a DataFrame from JobRepository.iter_all() and from
+pandas.read_sql with load_snapshot() over Parquet and Arrow IPC exports
+of the same table, plus the export cost itself.
+
+Usage:
+    python scripts/bench_snapshot.py            # 200k jobs
+    python scripts/bench_snapshot.py -n 1000000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import select, text
+
+from offer_sherlock.database import (
+    DatabaseManager,
+    JobRepository,
+    SnapshotExporter,
+    load_snapshot,
+)
+from offer_sherlock.database.models import Job
+from offer_sherlock.schemas.job import JobPosting
+
+COLUMNS = [c.name for c in Job.__table__.columns]
+
+
+def load(db: DatabaseManager, n: int) -> None:
+    """Insert n jobs spread over 90 days."""
+    for offset in range(0, n, 10_000):
+        jobs = [
+            JobPosting(
+                title=f"后端开发工程师 {i}",
+                company=f"公司{i % 500}",
+                job_id_external=f"E{i:08d}",
+                location="北京",
+                job_type="社招",
+                requirements="熟悉 Python / Go，有分布式系统经验",
+            )
+            for i in range(offset, min(offset + 10_000, n))
+        ]
+        with db.session() as session:
+            JobRepository(session).upsert_many(jobs)
+    with db.engine.begin() as conn:
+        conn.execute(
+            text("UPDATE jobs SET updated_at = datetime('2026-01-01', '+' || (id % 90) || ' days')")
+        )
+
+
+def from_orm(db: DatabaseManager, root: Path) -> pd.DataFrame:
+    with db.session() as session:
+        rows = [{c: getattr(job, c) for c in COLUMNS} for job in JobRepository(session).iter_all()]
+    return pd.DataFrame(rows)
+
+
+def from_read_sql(db: DatabaseManager, root: Path) -> pd.DataFrame:
+    with db.engine.connect() as conn:
+        return pd.read_sql(select(Job.__table__), conn)
+
+
+def from_snapshot(db: DatabaseManager, root: Path) -> pd.DataFrame:
+    return load_snapshot(root, "jobs")
+
+
+def timed(fn, *args) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshot load benchmark")
+    parser.add_argument("-n", type=int, default=200_000, help="number of jobs")
+    args = parser.parse_args()
+
+    print(f"\n📊 Snapshot benchmark ({args.n} jobs)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(db_path=str(Path(tmp) / "jobs.db"))
+        db.create_tables()
+        load(db, args.n)
+
+        roots = {}
+        for fmt in ("parquet", "arrow"):
+            roots[fmt] = Path(tmp) / fmt
+            exporter = SnapshotExporter(db, roots[fmt], format=fmt, settle_seconds=0)
+            seconds, _ = timed(exporter.export, ["jobs"])
+            size = sum(p.stat().st_size for p in roots[fmt].rglob("part-*")) / 2**20
+            print(f"{'export ' + fmt:<24}{seconds:>8.2f}s {size:>8.1f} MiB")
+        print()
+
+        cases = [
+            ("ORM iter_all", from_orm, None),
+            ("pandas.read_sql", from_read_sql, None),
+            ("load_snapshot parquet", from_snapshot, roots["parquet"]),
+            ("load_snapshot arrow", from_snapshot, roots["arrow"]),
+        ]
+        for name, fn, root in cases:
+            seconds, frame = timed(fn, db, root)
+            assert len(frame) == args.n
+            print(f"{name:<24}{seconds:>8.2f}s {args.n / seconds:>12.0f} rows/s")
+        db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
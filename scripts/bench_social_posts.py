@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Benchmark saving an insight's social posts: ORM unit of work vs. Core.
+
+    orm   - the previous InsightRepository.add: one SocialPost object per
+            post added through the session, flushed by the unit of work
+    core  - InsightRepository.add: executemany upsert of the posts plus a
+            bulk insert of the insight_posts links
+
+Each method saves one insight with N fresh posts, then a second insight
+re-analyzing the same posts (the ORM path stores them again; the Core
+path refreshes them in place).
+
+Usage:
+    python scripts/bench_social_posts.py              # 1k and 100k posts
+    python scripts/bench_social_posts.py -n 5000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from offer_sherlock.database import (
+    DatabaseManager,
+    Insight,
+    InsightRepository,
+    SocialPost,
+    SocialPostRepository,
+)
+from offer_sherlock.schemas.insight import InsightSummary
+from offer_sherlock.schemas.insight import SocialPost as SocialPostSchema
+
+
+def make_summary(n: int, run: int) -> InsightSummary:
+    """Build an insight over n posts (same post URLs on every run)."""
+    return InsightSummary(
+        company="字节跳动",
+        position_keyword=f"后端 run{run}",
+        posts_analyzed=n,
+        source_posts=[
+            SocialPostSchema(
+                title=f"字节后端面经 {i}",
+                content_summary="三轮技术面，问了分布式和算法题" * 3,
+                author=f"user{i % 500}",
+                likes=i % 1000 + run,
+                url=f"https://www.xiaohongshu.com/explore/{i:024x}",
+                is_interview_experience=True,
+            )
+            for i in range(n)
+        ],
+    )
+
+
+def save_orm(db: DatabaseManager, summary: InsightSummary) -> None:
+    """Old path: ORM objects through the unit of work."""
+    with db.session() as session:
+        insight = Insight(
+            company=summary.company,
+            position_keyword=summary.position_keyword,
+            posts_analyzed=summary.posts_analyzed,
+        )
+        session.add(insight)
+        session.flush()
+        for post in summary.source_posts:
+            insight.social_posts.append(
+                SocialPost(
+                    title=post.title,
+                    content_summary=post.content_summary,
+                    author=post.author,
+                    likes=post.likes,
+                    source=post.source,
+                    url=post.url,
+                    sentiment=post.sentiment.value,
+                    is_interview_experience=post.is_interview_experience,
+                    is_offer_info=post.is_offer_info,
+                )
+            )
+
+
+def save_core(db: DatabaseManager, summary: InsightSummary) -> None:
+    """New path: InsightRepository.add."""
+    with db.session() as session:
+        InsightRepository(session).add(summary)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Social post persistence benchmark")
+    parser.add_argument("-n", type=int, action="append", help="posts per insight")
+    args = parser.parse_args()
+    sizes = args.n or [1_000, 100_000]
+
+    print("\n📊 Social post persistence benchmark")
+    print("=" * 62)
+    print(f"{'posts':>8}  {'method':<6}{'run 1 s':>10}{'run 2 s':>10}{'posts/s':>12}{'rows':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in sizes:
+            for name, save in (("orm", save_orm), ("core", save_core)):
+                db = DatabaseManager(db_path=str(Path(tmp) / f"{name}_{n}.db"))
+                db.create_tables()
+                timings = []
+                for run in (1, 2):
+                    summary = make_summary(n, run)
+                    start = time.perf_counter()
+                    save(db, summary)
+                    timings.append(time.perf_counter() - start)
+                with db.session() as session:
+                    rows = SocialPostRepository(session).count()
+                print(
+                    f"{n:>8}  {name:<6}{timings[0]:>10.2f}{timings[1]:>10.2f}"
+                    f"{2 * n / sum(timings):>12.0f}{rows:>10}"
+                )
+                db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""Benchmark concurrent readers against a writer for each SQLite profile.
+
+Simulates the scheduler writing job batches while `run_agent.py --stats`
+or a dashboard reads. The writer and each reader use their own
+DatabaseManager (separate connection pools, like separate processes).
+
+Reported per profile:
+    - writer batches/s
+    - reader query latency p50 / p99 / max
+    - number of `database is locked` errors
+
+Usage:
+    python scripts/bench_sqlite_concurrency.py
+    python scripts/bench_sqlite_concurrency.py --seconds 20 --readers 4
+"""
+
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+
+from offer_sherlock.database import DatabaseManager, JobRepository, PerformanceProfile
+from offer_sherlock.database.models import Job
+from offer_sherlock.schemas.job import JobPosting
+
+PROFILES = {
+    "legacy": PerformanceProfile.legacy(),
+    "legacy+busy": PerformanceProfile(
+        journal_mode=None,
+        synchronous=None,
+        cache_size_kib=None,
+        mmap_size=None,
+        temp_store=None,
+    ),
+    "default (WAL)": PerformanceProfile(),
+}
+
+
+def writer(db_path: str, profile: PerformanceProfile, stop: threading.Event, stats: dict):
+    """Write batches of 200 jobs, one transaction each."""
+    db = DatabaseManager(db_path=db_path, profile=profile)
+    batch = 0
+    while not stop.is_set():
+        jobs = [
+            JobPosting(
+                title=f"工程师 {batch}-{i}",
+                company=f"公司{i % 20}",
+                job_id_external=f"W{batch:06d}-{i:03d}",
+                requirements="分布式系统 " * 20,
+            )
+            for i in range(200)
+        ]
+        try:
+            with db.session() as session:
+                JobRepository(session).upsert_many(jobs)
+            stats["batches"] += 1
+        except OperationalError as e:
+            if "locked" in str(e):
+                stats["locked"] += 1
+            else:
+                raise
+        batch += 1
+    db.engine.dispose()
+
+
+def reader(db_path: str, profile: PerformanceProfile, stop: threading.Event, stats: dict):
+    """Run the --stats style aggregate repeatedly."""
+    db = DatabaseManager(db_path=db_path, profile=profile)
+    stmt = (
+        select(Job.company, func.count(Job.id))
+        .group_by(Job.company)
+        .order_by(func.count(Job.id).desc())
+        .limit(5)
+    )
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            with db.session() as session:
+                list(session.execute(stmt))
+                JobRepository(session).count()
+            stats["latencies"].append(time.perf_counter() - start)
+        except OperationalError as e:
+            if "locked" in str(e):
+                stats["locked"] += 1
+            else:
+                raise
+    db.engine.dispose()
+
+
+def run_profile(name: str, profile: PerformanceProfile, seconds: float, readers: int):
+    """Run one profile and print a result row."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = str(Path(tmp) / "bench.db")
+        setup = DatabaseManager(db_path=db_path, profile=profile)
+        setup.create_tables()
+        setup.engine.dispose()
+
+        stop = threading.Event()
+        write_stats = {"batches": 0, "locked": 0}
+        read_stats = [{"latencies": [], "locked": 0} for _ in range(readers)]
+
+        threads = [threading.Thread(target=writer, args=(db_path, profile, stop, write_stats))]
+        threads += [
+            threading.Thread(target=reader, args=(db_path, profile, stop, stats))
+            for stats in read_stats
+        ]
+        for t in threads:
+            t.start()
+        time.sleep(seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+
+    latencies = sorted(latency for s in read_stats for latency in s["latencies"])
+    locked = write_stats["locked"] + sum(s["locked"] for s in read_stats)
+    if latencies:
+        p50 = statistics.median(latencies) * 1000
+        p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+        worst = latencies[-1] * 1000
+    else:
+        p50 = p99 = worst = float("nan")
+
+    print(
+        f"{name:<15}{write_stats['batches'] / seconds:>10.1f}{len(latencies):>9}"
+        f"{p50:>9.1f}{p99:>9.1f}{worst:>9.1f}{locked:>8}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite reader/writer benchmark")
+    parser.add_argument("--seconds", type=float, default=10.0, help="duration per profile")
+    parser.add_argument("--readers", type=int, default=2, help="reader threads")
+    args = parser.parse_args()
+
+    print(f"\n📊 SQLite concurrency benchmark ({args.seconds:.0f}s, {args.readers} readers)")
+    print("=" * 68)
+    print(
+        f"{'profile':<15}{'writes/s':>10}{'reads':>9}{'p50 ms':>9}{'p99 ms':>9}"
+        f"{'max ms':>9}{'locked':>8}"
+    )
+    for name, profile in PROFILES.items():
+        run_profile(name, profile, args.seconds, args.readers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Benchmark company statistics: GROUP BY over jobs vs. summary tables.
+
+Loads n jobs spread over 500 companies and a year of creation dates, then
+times the queries behind `run_agent.py --stats` both ways. Also reports
+the write cost of the triggers maintaining the summaries.
+
+Usage:
+    python scripts/bench_stats.py            # 200k jobs
+    python scripts/bench_stats.py -n 1000000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import func, select, text
+
+from offer_sherlock.database import DatabaseManager, JobRepository, StatsRepository
+from offer_sherlock.database.models import Job
+from offer_sherlock.database.stats import drop_stats_triggers
+from offer_sherlock.schemas.job import JobPosting
+
+REPEAT = 20
+
+
+def load(db: DatabaseManager, n: int) -> float:
+    """Insert n jobs in batches, returning the elapsed seconds."""
+    start = time.perf_counter()
+    batch = 10_000
+    for offset in range(0, n, batch):
+        jobs = [
+            JobPosting(
+                title=f"工程师 {i}",
+                company=f"公司{i % 500}",
+                job_id_external=f"E{i:08d}",
+                job_type=("校招", "社招", "实习")[i % 3],
+            )
+            for i in range(offset, min(offset + batch, n))
+        ]
+        with db.session() as session:
+            JobRepository(session).upsert_many(jobs)
+    return time.perf_counter() - start
+
+
+def spread_dates(db: DatabaseManager) -> None:
+    """Spread created_at over a year (triggers move the daily counts)."""
+    with db.engine.begin() as conn:
+        conn.execute(
+            text(
+                "UPDATE jobs SET created_at = "
+                "datetime('2026-01-01', '+' || (id % 365) || ' days')"
+            )
+        )
+
+
+def group_by_stats(session) -> tuple:
+    """The queries show_stats used to run."""
+    total = session.scalar(select(func.count()).select_from(Job))
+    stmt = (
+        select(Job.company, func.count(Job.id))
+        .group_by(Job.company)
+        .order_by(func.count(Job.id).desc())
+        .limit(5)
+    )
+    return total, list(session.execute(stmt))
+
+
+def summary_stats(session) -> tuple:
+    """The same figures from the summary tables."""
+    repo = StatsRepository(session)
+    return repo.total_jobs(), repo.top_companies(5)
+
+
+def time_query(db: DatabaseManager, fn) -> tuple[float, tuple]:
+    """Median milliseconds of fn over REPEAT runs."""
+    timings = []
+    with db.session() as session:
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            result = fn(session)
+            timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statistics query benchmark")
+    parser.add_argument("-n", type=int, default=200_000, help="number of jobs")
+    args = parser.parse_args()
+
+    print(f"\n📊 Statistics benchmark ({args.n} jobs, 500 companies, 365 days)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        plain = DatabaseManager(db_path=str(Path(tmp) / "plain.db"))
+        plain.create_tables()
+        drop_stats_triggers(plain.engine)
+        plain_load = load(plain, args.n)
+
+        db = DatabaseManager(db_path=str(Path(tmp) / "stats.db"))
+        db.create_tables()
+        stats_load = load(db, args.n)
+        spread_dates(db)
+
+        loads = (("insert without triggers", plain_load), ("insert with triggers", stats_load))
+        for label, seconds in loads:
+            print(f"{label:<28}{seconds:>8.2f}s {args.n / seconds:>10.0f} jobs/s")
+        print()
+
+        old_ms, old = time_query(db, group_by_stats)
+        new_ms, new = time_query(db, summary_stats)
+        assert old[0] == new[0] and sorted(c for _, c in old[1]) == sorted(c for _, c in new[1])
+        print(f"{'GROUP BY over jobs':<28}{old_ms:>8.2f} ms")
+        print(f"{'summary tables':<28}{new_ms:>8.2f} ms")
+        plain.engine.dispose()
+        db.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
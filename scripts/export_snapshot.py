@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""Export jobs, insights and social posts as columnar snapshots.
+
+Each run appends the rows changed since the previous run (see
+offer_sherlock.database.export). Requires pyarrow:
+pip install "offer-sherlock[export]".
+
+Usage:
+    python scripts/export_snapshot.py                      # data/snapshots, Parquet
+    python scripts/export_snapshot.py --format arrow --out data/arrow
+    python scripts/export_snapshot.py --tables jobs
+
+    # In a notebook
+    from offer_sherlock.database import load_snapshot
+    jobs = load_snapshot("data/snapshots", "jobs")
+"""
+
+import argparse
+import logging
+
+from offer_sherlock.database import DatabaseManager, SnapshotExporter
+from offer_sherlock.database.export import FORMATS, TABLES
+
+
+def main():
+    parser = argparse.ArgumentParser(description="导出数据快照 (Parquet / Arrow)")
+    parser.add_argument("--db", help="数据库路径或 URL (默认: 环境变量 DATABASE_URL)")
+    parser.add_argument("--out", default="data/snapshots", help="快照目录 (默认: data/snapshots)")
+    parser.add_argument(
+        "--format", choices=list(FORMATS), default="parquet", help="文件格式 (默认: parquet)"
+    )
+    parser.add_argument(
+        "--tables", nargs="+", choices=list(TABLES), help="要导出的表 (默认: 全部)"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    if args.db is None:
+        db = DatabaseManager.from_settings()
+    elif "://" in args.db:
+        db = DatabaseManager(url=args.db)
+    else:
+        db = DatabaseManager(db_path=args.db)
+    db.create_tables()
+
+    exporter = SnapshotExporter(db, args.out, format=args.format)
+    print(f"\n📦 导出快照到 {args.out} ({args.format})")
+    for result in exporter.export(args.tables).values():
+        print(f"  - {result} (水位: {result.watermark})")
+
+
+if __name__ == "__main__":
+    main()
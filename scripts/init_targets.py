@@ -25,6 +25,13 @@ DEFAULT_TARGETS = [
         "url": "https://careers.tencent.com/search.html?pcid=40001",
         "crawler_type": "official",
         "description": "腾讯招聘 - 技术类岗位",
+        # 分页抓取, 遇到全部已入库的岗位页即停止
+        "pagination": {
+            "mode": "url_template",
+            "url_template": "https://careers.tencent.com/search.html?pcid=40001&index={page}",
+            "max_pages": 10,
+            "id_pattern": r"postId=(\d+)",
+        },
     },
     {
         "company": "字节跳动",
@@ -118,6 +125,8 @@ def init_targets(db: DatabaseManager, targets: list[dict]) -> int:
                 url=target["url"],
                 crawler_type=target.get("crawler_type", "official"),
                 is_active=True,
+                pagination=target.get("pagination"),
+                resource_allowlist=target.get("resource_allowlist"),
             )
             print(f"  ✅ {target['company']} - {target.get('description', '')}")
             added += 1
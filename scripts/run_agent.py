@@ -11,25 +11,87 @@ Usage:
     # Batch mode (all active targets)
     python scripts/run_agent.py --all
 
+    # Batch mode as a staged crawl/extract/persist pipeline (official sites only)
+    python scripts/run_agent.py --all --pipeline
+
+    # Also crawl up to 50 job detail pages per run for requirements/salary
+    python scripts/run_agent.py --all --details 50
+
     # Add a new crawl target
     python scripts/run_agent.py --add-target --company "华为" --url "https://career.huawei.com"
+
+    # Record every crawled page, then replay the run offline
+    python scripts/run_agent.py --all --skip-social --record data/recordings/today
+    python scripts/run_agent.py --all --skip-social --replay data/recordings/today
+
+    # Merge duplicate jobs that have no external ID and move legacy
+    # raw_content into the page archive (one-off cleanup)
+    python scripts/run_agent.py --compact
 """
 
 import argparse
 import asyncio
 import logging
 import sys
+from contextlib import nullcontext
 from pathlib import Path
-
-from offer_sherlock.agents import IntelAgent, AgentResult
+from typing import Optional
+
+from offer_sherlock.agents import (
+    AgentResult,
+    FrontierConfig,
+    IntelAgent,
+    PipelineConfig,
+    PipelineRunner,
+)
+from offer_sherlock.crawlers import (
+    BaseCrawler,
+    CrawlRecording,
+    OfficialCrawler,
+    RecordingCrawler,
+    ReplayCrawler,
+)
 from offer_sherlock.database import (
     DatabaseManager,
     CrawlTargetRepository,
     JobRepository,
-    InsightRepository,
+    PageArchive,
+    StatsRepository,
 )
 
 
+def open_database(db: Optional[str]) -> DatabaseManager:
+    """Open --db as a URL or SQLite path, or DATABASE_URL if not given."""
+    if db is None:
+        return DatabaseManager.from_settings()
+    if "://" in db:
+        return DatabaseManager(url=db)
+    return DatabaseManager(db_path=db)
+
+
+def open_archive(archive_dir: Optional[str]) -> PageArchive:
+    """Open --archive-dir, or RAW_ARCHIVE_DIR if not given."""
+    if archive_dir is None:
+        return PageArchive.from_settings()
+    return PageArchive(archive_dir)
+
+
+def open_crawler(record: Optional[str], replay: Optional[str]) -> Optional[BaseCrawler]:
+    """Crawler for --record/--replay, or None to crawl normally."""
+    if replay:
+        return ReplayCrawler(CrawlRecording(replay))
+    if record:
+        return RecordingCrawler(OfficialCrawler(use_cache=False), CrawlRecording(record))
+    return None
+
+
+def detail_frontier(details: int) -> Optional[FrontierConfig]:
+    """Detail-page limits for --details (0 disables enrichment)."""
+    if details <= 0:
+        return None
+    return FrontierConfig(max_pages_per_run=details)
+
+
 def setup_logging(verbose: bool = False):
     """Configure logging."""
     level = logging.DEBUG if verbose else logging.INFO
@@ -62,10 +124,17 @@ def print_summary(results: list[AgentResult]):
     print(f"失败: {len(failed)}")
 
     total_jobs = sum(r.jobs_added for r in results)
+    total_updated = sum(r.jobs_updated for r in results)
+    total_unchanged = sum(r.jobs_unchanged for r in results)
+    pages_unchanged = sum(1 for r in results if r.official_status == "unchanged")
+    total_enriched = sum(r.details_enriched for r in results)
     total_insights = sum(1 for r in results if r.insight_generated)
     total_time = sum(r.duration_seconds for r in results)
 
     print(f"\n新增岗位: {total_jobs}")
+    print(f"更新岗位: {total_updated} (未变化: {total_unchanged})")
+    print(f"页面未变化 (跳过提取): {pages_unchanged}")
+    print(f"详情页补全岗位: {total_enriched}")
     print(f"生成情报: {total_insights}")
     print(f"总耗时: {total_time:.1f}s")
 
@@ -82,17 +151,29 @@ async def run_single(
     skip_official: bool = False,
     skip_social: bool = False,
     headless: bool = True,
+    archive: Optional[PageArchive] = None,
+    force: bool = False,
+    details: int = 0,
+    crawler: Optional[BaseCrawler] = None,
 ):
     """Run agent for a single company."""
     print(f"\n🚀 开始收集 {company} 情报...")
 
-    agent = IntelAgent(db, xhs_headless=headless)
-    result = await agent.run(
-        company=company,
-        official_url=url,
-        skip_official=skip_official,
-        skip_social=skip_social,
+    agent = IntelAgent(
+        db,
+        xhs_headless=headless,
+        archive=archive,
+        skip_unchanged=not force,
+        detail_frontier=detail_frontier(details),
+        crawler=crawler,
     )
+    async with agent, crawler if crawler is not None else nullcontext():
+        result = await agent.run(
+            company=company,
+            official_url=url,
+            skip_official=skip_official,
+            skip_social=skip_social,
+        )
 
     print_result(result)
     return result
@@ -102,6 +183,14 @@ async def run_batch(
     db: DatabaseManager,
     max_companies: int = None,
     headless: bool = True,
+    concurrency: int = 1,
+    pipeline: bool = False,
+    archive: Optional[PageArchive] = None,
+    force: bool = False,
+    details: int = 0,
+    crawler: Optional[BaseCrawler] = None,
+    skip_official: bool = False,
+    skip_social: bool = False,
 ):
     """Run agent for all active targets."""
     with db.session() as session:
@@ -116,11 +205,39 @@ async def run_batch(
     count = len(targets) if not max_companies else min(len(targets), max_companies)
     print(f"\n🚀 开始批量收集 {count} 家公司情报...")
 
-    agent = IntelAgent(db, xhs_headless=headless)
-    results = await agent.run_all(max_companies=max_companies)
-
-    for result in results:
-        print_result(result)
+    agent = IntelAgent(
+        db,
+        xhs_headless=headless,
+        archive=archive,
+        skip_unchanged=not force,
+        detail_frontier=detail_frontier(details),
+        crawler=crawler,
+    )
+    if pipeline:
+        runner = PipelineRunner(
+            agent,
+            PipelineConfig(crawl_workers=concurrency, extract_workers=concurrency),
+        )
+        async with agent, crawler if crawler is not None else nullcontext():
+            results = await runner.run(max_companies=max_companies)
+        for result in results:
+            print_result(result)
+        print("\n⚙️  流水线各阶段:")
+        for stage in runner.stats.values():
+            print(f"  - {stage}")
+        print_summary(results)
+        return results
+
+    results = []
+    async with agent, crawler if crawler is not None else nullcontext():
+        async for result in agent.iter_all(
+            max_companies=max_companies,
+            concurrency=concurrency,
+            skip_official=skip_official,
+            skip_social=skip_social,
+        ):
+            print_result(result)
+            results.append(result)
 
     print_summary(results)
     return results
@@ -167,33 +284,42 @@ def list_targets(db: DatabaseManager):
 def show_stats(db: DatabaseManager):
     """Show database statistics."""
     with db.session() as session:
-        job_repo = JobRepository(session)
-        insight_repo = InsightRepository(session)
+        stats_repo = StatsRepository(session)
         target_repo = CrawlTargetRepository(session)
 
         print("\n📊 数据库统计")
         print("=" * 60)
-        print(f"总岗位数: {job_repo.count()}")
-        print(f"总情报数: {insight_repo.count()}")
-        print(f"抓取目标: {len(target_repo.list_all())} (活跃: {len(target_repo.list_active())})")
-
-        # Top companies by job count
-        from sqlalchemy import select, func
-        from offer_sherlock.database.models import Job
-
-        stmt = (
-            select(Job.company, func.count(Job.id).label("count"))
-            .group_by(Job.company)
-            .order_by(func.count(Job.id).desc())
-            .limit(5)
+        print(f"总岗位数: {stats_repo.total_jobs()}")
+        print(f"总情报数: {stats_repo.total_insights()}")
+        print(
+            f"抓取目标: {target_repo.count()} "
+            f"(活跃: {target_repo.count(active_only=True)})"
         )
-        top_companies = list(session.execute(stmt))
 
+        top_companies = stats_repo.top_companies(5)
         if top_companies:
             print("\n岗位数 Top 5:")
             for company, count in top_companies:
                 print(f"  - {company}: {count}")
 
+        job_types = stats_repo.jobs_by_type()
+        if job_types:
+            print("\n岗位类型:")
+            for job_type, count in job_types:
+                print(f"  - {job_type or '未知'}: {count}")
+
+
+def compact_jobs(db: DatabaseManager, archive: PageArchive):
+    """Merge duplicate jobs without external ID and archive raw_content."""
+    with db.session() as session:
+        repo = JobRepository(session)
+        before = repo.count()
+        removed = repo.compact_duplicates()
+        moved = repo.archive_raw_content(archive)
+
+    print(f"\n🧹 已合并重复岗位: 删除 {removed} 条 (原 {before} 条)")
+    print(f"📦 已将 {moved} 条岗位原文移入归档: {archive.root}")
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -216,6 +342,9 @@ def main():
   # 查看状态
   python scripts/run_agent.py --list-targets
   python scripts/run_agent.py --stats
+
+  # 合并重复岗位, 归档岗位原文
+  python scripts/run_agent.py --compact
         """,
     )
 
@@ -245,6 +374,11 @@ def main():
         action="store_true",
         help="显示数据库统计",
     )
+    mode_group.add_argument(
+        "--compact",
+        action="store_true",
+        help="合并没有外部 ID 的重复岗位, 并将岗位原文移入归档",
+    )
 
     # Options
     parser.add_argument(
@@ -266,10 +400,46 @@ def main():
         type=int,
         help="批量模式: 最大公司数",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="批量模式: 并行处理的公司数 (默认: 1)",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="批量模式: 以抓取/提取/入库流水线运行 (仅官网)",
+    )
     parser.add_argument(
         "--db",
-        default="data/offers.db",
-        help="数据库路径 (默认: data/offers.db)",
+        help="数据库路径或 URL (默认: 环境变量 DATABASE_URL)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="页面未变化时也重新提取岗位",
+    )
+    parser.add_argument(
+        "--details",
+        type=int,
+        default=0,
+        help="每次运行最多抓取的岗位详情页数, 用于补全要求/薪资 (默认: 0, 不抓取)",
+    )
+    parser.add_argument(
+        "--archive-dir",
+        help="抓取页面归档目录 (默认: 环境变量 RAW_ARCHIVE_DIR)",
+    )
+    crawl_group = parser.add_mutually_exclusive_group()
+    crawl_group.add_argument(
+        "--record",
+        metavar="DIR",
+        help="把抓取到的页面录制到目录, 供 --replay 离线回放",
+    )
+    crawl_group.add_argument(
+        "--replay",
+        metavar="DIR",
+        help="从录制目录回放官网页面, 不启动浏览器 (社交情报无法回放, 需配合 --skip-social)",
     )
     parser.add_argument(
         "--no-headless",
@@ -283,17 +453,23 @@ def main():
     )
 
     args = parser.parse_args()
+    if args.replay and not (args.skip_social or args.pipeline):
+        # Replays cover career pages only; social search would go online
+        parser.error("--replay 只能离线回放官网页面, 请同时使用 --skip-social")
 
     # Setup
     setup_logging(args.verbose)
-    db = DatabaseManager(db_path=args.db)
+    db = open_database(args.db)
     db.create_tables()
+    archive = open_archive(args.archive_dir)
 
     # Execute
     if args.list_targets:
         list_targets(db)
     elif args.stats:
         show_stats(db)
+    elif args.compact:
+        compact_jobs(db, archive)
     elif args.add_target:
         if not args.company or not args.url:
             print("❌ 添加目标需要 --company 和 --url")
@@ -304,6 +480,14 @@ def main():
             db,
             max_companies=args.max_companies,
             headless=not args.no_headless,
+            concurrency=args.concurrency,
+            pipeline=args.pipeline,
+            archive=archive,
+            force=args.force,
+            details=args.details,
+            crawler=open_crawler(args.record, args.replay),
+            skip_official=args.skip_official,
+            skip_social=args.skip_social,
         ))
     elif args.company:
         asyncio.run(run_single(
@@ -313,6 +497,10 @@ def main():
             skip_official=args.skip_official,
             skip_social=args.skip_social,
             headless=not args.no_headless,
+            archive=archive,
+            force=args.force,
+            details=args.details,
+            crawler=open_crawler(args.record, args.replay),
         ))
     else:
         parser.print_help()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Soak test: crawl targets in a loop and record memory over time.
+
+Keeps one OfficialCrawler warm, crawls the default targets from
+scripts/init_targets.py round after round, and every --sample seconds
+appends the resident memory of this process and of its Chromium
+processes to a CSV file, with pages crawled and browser recycles so far.
+Run it with and without recycling to see the leak it bounds.
+
+Needs Chromium (crawl4ai-setup) and network access, unless --replay
+serves the pages of a recording (see run_agent.py --record) instead; that
+measures the Python side alone.
+
+Usage:
+    python scripts/soak_crawler.py --hours 24 --out outputs/soak.csv
+    python scripts/soak_crawler.py --hours 2 --no-recycle
+    python scripts/soak_crawler.py --hours 1 --replay data/recordings/today --latency 0.05
+"""
+
+import argparse
+import asyncio
+import csv
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from init_targets import DEFAULT_TARGETS  # noqa: E402
+
+from offer_sherlock.crawlers import (  # noqa: E402
+    CrawlRecording,
+    OfficialCrawler,
+    RecyclePolicy,
+    ReplayCrawler,
+)
+from offer_sherlock.crawlers.recycling import MB, browser_rss, process_tree_rss  # noqa: E402
+
+
+async def sample(
+    writer, out, crawler, state: dict, start: float, every: float, stop: asyncio.Event
+):
+    """Append a memory sample every ``every`` seconds until stopped."""
+    while not stop.is_set():
+        total = await asyncio.to_thread(process_tree_rss)
+        browsers = await asyncio.to_thread(browser_rss)
+        writer.writerow(
+            [
+                round(time.monotonic() - start),
+                round(total / MB, 1),
+                round(browsers / MB, 1),
+                state["pages"],
+                state["failed"],
+                getattr(crawler, "recycles", 0),
+            ]
+        )
+        out.flush()
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=every)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def soak(crawler, urls: list[str], hours: float, out_path: Path, every: float) -> dict:
+    """Crawl ``urls`` round-robin for ``hours``, sampling memory."""
+    state = {"pages": 0, "failed": 0}
+    stop = asyncio.Event()
+    start = time.monotonic()
+    deadline = start + hours * 3600
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with out_path.open("w", newline="") as out:
+        writer = csv.writer(out)
+        writer.writerow(["seconds", "rss_mb", "browser_rss_mb", "pages", "failed", "recycles"])
+        sampler = asyncio.create_task(sample(writer, out, crawler, state, start, every, stop))
+        try:
+            async with crawler:
+                while time.monotonic() < deadline:
+                    for url in urls:
+                        result = await crawler.crawl(url)
+                        state["pages"] += 1
+                        state["failed"] += not result.success
+                        if time.monotonic() >= deadline:
+                            break
+        finally:
+            stop.set()
+            await sampler
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawler memory soak test")
+    parser.add_argument("--hours", type=float, default=24.0)
+    parser.add_argument("--sample", type=float, default=60.0, help="seconds between samples")
+    parser.add_argument("--out", default="outputs/soak.csv")
+    parser.add_argument("--max-pages", type=int, default=100, help="recycle after N pages")
+    parser.add_argument("--max-rss-mb", type=float, default=1536.0, help="recycle above N MB")
+    parser.add_argument("--no-recycle", action="store_true", help="never recycle the browser")
+    parser.add_argument("--replay", metavar="DIR", help="replay a recording instead of crawling")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per replayed crawl")
+    args = parser.parse_args()
+
+    if args.replay:
+        recording = CrawlRecording(args.replay)
+        crawler = ReplayCrawler(recording, latency=args.latency)
+        urls = recording.urls()
+    else:
+        recycle = None if args.no_recycle else RecyclePolicy(args.max_pages, args.max_rss_mb)
+        crawler = OfficialCrawler(use_cache=False, recycle=recycle)
+        urls = [target["url"] for target in DEFAULT_TARGETS]
+    if not urls:
+        parser.error("nothing to crawl")
+
+    state = asyncio.run(soak(crawler, urls, args.hours, Path(args.out), args.sample))
+    print(
+        f"{state['pages']} pages ({state['failed']} failed), "
+        f"{getattr(crawler, 'recycles', 0)} recycles; samples in {args.out}"
+    )
+
+
+if __name__ == "__main__":
+    main()
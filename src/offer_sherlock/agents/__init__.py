@@ -3,14 +3,30 @@
 Provides orchestration agents that coordinate the ETL pipeline.
 """
 
+from offer_sherlock.agents.frontier import (
+    DetailFrontier,
+    FrontierConfig,
+    FrontierStats,
+)
 from offer_sherlock.agents.intel_agent import (
     AgentResult,
     IntelAgent,
     run_intel_agent,
 )
+from offer_sherlock.agents.pipeline import (
+    PipelineConfig,
+    PipelineRunner,
+    StageStats,
+)
 
 __all__ = [
     "AgentResult",
+    "DetailFrontier",
+    "FrontierConfig",
+    "FrontierStats",
     "IntelAgent",
+    "PipelineConfig",
+    "PipelineRunner",
+    "StageStats",
     "run_intel_agent",
 ]
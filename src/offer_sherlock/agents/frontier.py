@@ -0,0 +1,179 @@
+"""Detail-page enrichment for jobs found on list pages.
+
+List pages only carry snippets; requirements and salary are usually on
+each job's detail page (its apply_link). DetailFrontier takes the detail
+links of a list page's stored jobs, skips those fetched recently, crawls
+the rest with bounded concurrency, runs each page through
+JobExtractor.extract_single and merges the result into the stored jobs.
+
+A frontier has per-run caps (pages and seconds), so detail enrichment can
+never stretch a scheduled run; links left over are picked up by the next
+runs, never-fetched links first.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Optional
+
+from offer_sherlock.crawlers import BaseCrawler, HostThrottle, OfficialCrawler
+from offer_sherlock.database import AsyncJobRepository
+
+if TYPE_CHECKING:
+    from offer_sherlock.agents.intel_agent import IntelAgent
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FrontierConfig:
+    """Limits of detail-page enrichment.
+
+    Attributes:
+        max_pages_per_run: Detail pages fetched per run, across companies.
+        max_seconds_per_run: Seconds after the run started at which no new
+            detail fetch is started (None for no time limit).
+        concurrency: Detail pages crawled at once.
+        refresh_after_days: Days after which a fetched detail page is due
+            again. Pages are also due again when their list entry changes.
+    """
+
+    max_pages_per_run: int = 30
+    max_seconds_per_run: Optional[float] = 600.0
+    concurrency: int = 2
+    refresh_after_days: float = 7.0
+
+
+@dataclass
+class FrontierStats:
+    """Outcome of enriching one list page's jobs.
+
+    Attributes:
+        due: Detail links due for fetching.
+        fetched: Links crawled successfully.
+        enriched: Jobs updated from detail pages.
+        failed: Links whose crawl or extraction failed.
+        deferred: Due links left for a later run by the per-run caps.
+    """
+
+    due: int = 0
+    fetched: int = 0
+    enriched: int = 0
+    failed: int = 0
+    deferred: int = 0
+
+
+class DetailFrontier:
+    """Crawl and extract the detail pages of listed jobs within a budget.
+
+    Example:
+        >>> frontier = DetailFrontier(agent, FrontierConfig(max_pages_per_run=50))
+        >>> frontier.start_run()
+        >>> stats = await frontier.enrich("字节跳动", list_url)
+    """
+
+    def __init__(self, agent: "IntelAgent", config: Optional[FrontierConfig] = None):
+        """Initialize the frontier.
+
+        Args:
+            agent: Agent providing the database, extractor and throttle.
+            config: Enrichment limits. Uses defaults if None.
+        """
+        self.agent = agent
+        self.config = config or FrontierConfig()
+        # Links claimed this run, so overlapping list pages fetch each once
+        self._claimed: set[str] = set()
+        self._remaining = 0
+        self._deadline: Optional[float] = None
+        self.start_run()
+
+    def start_run(self) -> None:
+        """Reset the per-run budget (call at the start of every run)."""
+        self._claimed.clear()
+        self._remaining = self.config.max_pages_per_run
+        seconds = self.config.max_seconds_per_run
+        self._deadline = time.monotonic() + seconds if seconds is not None else None
+
+    @property
+    def remaining(self) -> int:
+        """Detail pages left in this run's budget."""
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            return 0
+        return self._remaining
+
+    async def enrich(self, company: str, source_url: str) -> FrontierStats:
+        """Fetch due detail pages of a list page's jobs and merge them.
+
+        Args:
+            company: Company name (context for extraction).
+            source_url: List page the jobs were extracted from.
+
+        Returns:
+            FrontierStats for this list page.
+        """
+        stats = FrontierStats()
+        repo = AsyncJobRepository(self.agent.adb)
+        stale_before = datetime.now() - timedelta(days=self.config.refresh_after_days)
+        # Fetch one extra to tell whether the cap deferred anything
+        limit = self.config.max_pages_per_run + 1
+        links = [
+            link
+            for link in await repo.detail_links_due(source_url, stale_before, limit)
+            if link.startswith(("http://", "https://")) and link not in self._claimed
+        ]
+        stats.due = len(links)
+
+        batch = links[: self.remaining]
+        stats.deferred = stats.due - len(batch)
+        if not batch:
+            return stats
+        self._remaining -= len(batch)
+        self._claimed.update(batch)
+
+        semaphore = asyncio.Semaphore(max(1, self.config.concurrency))
+
+        async def fetch(crawler: BaseCrawler, link: str) -> None:
+            async with semaphore:
+                if self._deadline is not None and time.monotonic() >= self._deadline:
+                    # Out of time while queued: leave it for the next run
+                    stats.deferred += 1
+                    self._claimed.discard(link)
+                    return
+                detail = None
+                try:
+                    await self.agent.throttle.wait(HostThrottle.key_for(link))
+                    result = await crawler.crawl(link)
+                    if not result.success:
+                        raise RuntimeError(result.error)
+                    stats.fetched += 1
+                    detail = await self.agent.job_extractor.extract_single(
+                        result.markdown, company=company, source_url=link
+                    )
+                    if detail is None:
+                        raise RuntimeError("no job extracted")
+                except Exception as e:
+                    stats.failed += 1
+                    logger.warning(f"{company}: detail page {link} failed: {e}")
+                # A failed link is stamped too, so it waits until it is stale
+                updated = await repo.enrich_detail(source_url, link, detail)
+                if detail is not None:
+                    stats.enriched += updated
+
+        # One browser for all detail pages of the list, unless the agent
+        # has its own crawler
+        browser = (
+            nullcontext(self.agent.crawler)
+            if self.agent.crawler is not None
+            else OfficialCrawler(use_cache=False)
+        )
+        async with browser as crawler:
+            await asyncio.gather(*(fetch(crawler, link) for link in batch))
+
+        logger.info(
+            f"{company}: enriched {stats.enriched} jobs from {stats.fetched} detail pages "
+            f"({stats.failed} failed, {stats.deferred} deferred)"
+        )
+        return stats
@@ -8,23 +8,47 @@ import asyncio
 import logging
 import time
 from dataclasses import dataclass, field
-from typing import Optional
-
-from offer_sherlock.crawlers import OfficialCrawler, XhsCrawler
+from typing import AsyncIterator, Optional
+
+from offer_sherlock.agents.frontier import DetailFrontier, FrontierConfig, FrontierStats
+from offer_sherlock.crawlers import (
+    BaseCrawler,
+    CrawlResult,
+    CrawlTarget,
+    HostThrottle,
+    OfficialCrawler,
+    Pagination,
+    XhsCrawler,
+    XhsNote,
+    learn_selector,
+)
 from offer_sherlock.database import (
-    CrawlTargetRepository,
+    AsyncCrawlTargetRepository,
+    AsyncDatabaseManager,
+    AsyncInsightRepository,
+    AsyncJobRepository,
+    AsyncRawPageRepository,
     DatabaseManager,
-    InsightRepository,
-    JobRepository,
+    PageArchive,
+    UpsertResult,
 )
+from offer_sherlock.database.hashing import page_fingerprint
 from offer_sherlock.extractors import InsightExtractor, JobExtractor
 from offer_sherlock.llm.client import LLMClient
 from offer_sherlock.schemas.insight import InsightSummary
+from offer_sherlock.schemas.job import (
+    IncrementalJobExtraction,
+    JobListExtraction,
+    JobPosting,
+)
 from offer_sherlock.utils.config import LLMProvider
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Length of the CrawlTarget.css_selector column
+MAX_SELECTOR_LENGTH = 200
+
 
 @dataclass
 class AgentResult:
@@ -35,12 +59,20 @@ class AgentResult:
         success: Whether the overall run was successful.
         jobs_found: Total jobs found from crawling.
         jobs_added: New jobs added to database.
-        jobs_updated: Existing jobs that were updated.
+        jobs_updated: Existing jobs whose content changed.
+        jobs_unchanged: Existing jobs seen again with identical content.
+        official_status: Outcome of the official stage: "crawled" if jobs
+            were extracted, "unchanged" if the page had not changed since
+            the last extraction (nothing was extracted), None if the stage
+            did not run or failed.
+        details_enriched: Jobs enriched from their detail pages.
         insight_generated: Whether social insight was generated.
         insight_sentiment: Overall sentiment if insight was generated.
         posts_analyzed: Number of social posts analyzed.
         errors: List of error messages encountered.
         duration_seconds: Total time taken in seconds.
+        stage_durations: Wall-clock seconds per stage ("official", "social").
+            Stages run concurrently, so their sum may exceed duration_seconds.
     """
 
     company: str
@@ -48,17 +80,25 @@ class AgentResult:
     jobs_found: int = 0
     jobs_added: int = 0
     jobs_updated: int = 0
+    jobs_unchanged: int = 0
+    official_status: Optional[str] = None
+    details_enriched: int = 0
     insight_generated: bool = False
     insight_sentiment: Optional[str] = None
     posts_analyzed: int = 0
     errors: list[str] = field(default_factory=list)
     duration_seconds: float = 0.0
+    stage_durations: dict[str, float] = field(default_factory=dict)
 
     def __str__(self) -> str:
         status = "✅" if self.success else "❌"
         parts = [f"{status} {self.company}:"]
         if self.jobs_found > 0:
             parts.append(f"{self.jobs_added} new jobs (of {self.jobs_found})")
+        if self.official_status == "unchanged":
+            parts.append("page unchanged")
+        if self.details_enriched:
+            parts.append(f"{self.details_enriched} enriched")
         if self.insight_generated:
             parts.append(f"insight={self.insight_sentiment}")
         if self.errors:
@@ -74,14 +114,36 @@ class AgentResult:
             "jobs_found": self.jobs_found,
             "jobs_added": self.jobs_added,
             "jobs_updated": self.jobs_updated,
+            "jobs_unchanged": self.jobs_unchanged,
+            "official_status": self.official_status,
+            "details_enriched": self.details_enriched,
             "insight_generated": self.insight_generated,
             "insight_sentiment": self.insight_sentiment,
             "posts_analyzed": self.posts_analyzed,
             "errors": self.errors,
             "duration_seconds": self.duration_seconds,
+            "stage_durations": self.stage_durations,
         }
 
 
+@dataclass
+class PageState:
+    """Change-detection state of a crawled page.
+
+    Attributes:
+        fingerprint: Hash of the normalized page markdown.
+        blocks: Jobs per page block hash of the last extraction.
+    """
+
+    fingerprint: Optional[str]
+    blocks: Optional[dict[str, list[JobPosting]]] = None
+
+    @classmethod
+    def of(cls, crawl_result: CrawlResult) -> "PageState":
+        """Get the state of a crawled page."""
+        return cls(fingerprint=page_fingerprint(crawl_result.markdown))
+
+
 class IntelAgent:
     """Intelligence collection agent that orchestrates the ETL pipeline.
 
@@ -99,17 +161,30 @@ class IntelAgent:
         >>>
         >>> # Batch mode
         >>> results = await agent.run_all()
+        >>>
+        >>> # Batch mode with 4 companies in flight, streaming results
+        >>> async for result in agent.iter_all(concurrency=4):
+        ...     print(result)
     """
 
     # Default social media search keywords template
     DEFAULT_SOCIAL_KEYWORDS = ["{company} offer", "{company} 面经"]
 
+    # Throttle key for social media searches (one platform, one rate limit)
+    SOCIAL_THROTTLE_KEY = "xiaohongshu"
+
     def __init__(
         self,
         db: DatabaseManager,
         llm_provider: LLMProvider = LLMProvider.QWEN,
         llm_model: str = "qwen-max",
         xhs_headless: bool = True,
+        archive: Optional[PageArchive] = None,
+        skip_unchanged: bool = True,
+        detail_frontier: Optional[FrontierConfig] = None,
+        learn_selectors: bool = True,
+        crawler: Optional[BaseCrawler] = None,
+        social_crawler: Optional[XhsCrawler] = None,
     ):
         """Initialize the intelligence agent.
 
@@ -118,11 +193,45 @@ class IntelAgent:
             llm_provider: LLM provider to use for extraction.
             llm_model: Model name for the LLM.
             xhs_headless: Whether to run XHS crawler in headless mode.
+            archive: Archive for crawled pages. If None, pages are not kept
+                and jobs have no raw_page_hash.
+            skip_unchanged: Skip extraction when a crawl target's page has
+                the same fingerprint as at its last extraction.
+            detail_frontier: Limits for crawling the detail pages of listed
+                jobs. If None, jobs keep their list-page snippets.
+            learn_selectors: After extracting a crawl target's full page,
+                store a CSS selector of its job list so later crawls only
+                convert the list.
+            crawler: Crawler for career and detail pages, e.g. a
+                ReplayCrawler for offline runs; it must provide
+                crawl_pages() for paginated targets. The caller starts and
+                closes it. If None, every page is crawled by a fresh
+                OfficialCrawler.
+            social_crawler: Xiaohongshu crawler shared by all companies,
+                e.g. one with a recycle policy for long-running processes.
+                The caller closes it. If None, each company gets a fresh
+                XhsCrawler (headless per xhs_headless).
         """
         self.db = db
+        # All persistence runs on a database thread so commits never block
+        # the event loop driving browsers and LLM calls
+        self.adb = AsyncDatabaseManager(db)
         self.llm_provider = llm_provider
         self.llm_model = llm_model
         self.xhs_headless = xhs_headless
+        self.archive = archive
+        self.skip_unchanged = skip_unchanged
+        self.learn_selectors = learn_selectors
+        self.crawler = crawler
+        self.social_crawler = social_crawler
+        # A shared XhsCrawler drives one page: one company searches at a time
+        self._social_lock = asyncio.Lock()
+
+        # Per-host anti-scraping delay, configured by run_all()/iter_all()
+        self.throttle = HostThrottle()
+        self.frontier = (
+            DetailFrontier(self, detail_frontier) if detail_frontier is not None else None
+        )
 
         # Lazy initialization
         self._llm_client: Optional[LLMClient] = None
@@ -153,6 +262,20 @@ class IntelAgent:
             self._insight_extractor = InsightExtractor(llm_client=self.llm_client)
         return self._insight_extractor
 
+    def close(self) -> None:
+        """Wait for pending database work and stop the database thread.
+
+        The agent stays usable (the thread restarts on the next database
+        call). An injected crawler is left to whoever started it.
+        """
+        self.adb.close()
+
+    async def __aenter__(self) -> "IntelAgent":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await asyncio.to_thread(self.close)
+
     async def run(
         self,
         company: str,
@@ -182,46 +305,23 @@ class IntelAgent:
 
         logger.info(f"Starting intelligence collection for {company}")
 
-        # Step 1: Crawl official site
+        # Official and social collection share nothing but the LLM client,
+        # so both stages run as concurrent tasks with independent errors.
+        stages = []
         if not skip_official:
-            url = official_url or self._get_official_url(company)
+            url = official_url or await self._get_official_url(company)
             if url:
-                try:
-                    jobs_found, jobs_added, jobs_updated = await self.crawl_official(
-                        company, url
-                    )
-                    result.jobs_found = jobs_found
-                    result.jobs_added = jobs_added
-                    result.jobs_updated = jobs_updated
-                    logger.info(
-                        f"{company}: Found {jobs_found} jobs, "
-                        f"added {jobs_added}, updated {jobs_updated}"
-                    )
-                except Exception as e:
-                    error_msg = f"Official crawl failed: {str(e)}"
-                    result.errors.append(error_msg)
-                    logger.error(f"{company}: {error_msg}")
+                stages.append(self._run_official_stage(result, url))
             else:
                 logger.warning(f"{company}: No official URL found, skipping")
 
-        # Step 2: Crawl social media
         if not skip_social:
             keywords = social_keywords or self._get_social_keywords(company)
-            try:
-                insight = await self.crawl_social(
-                    company, keywords, max_results=max_social_results
-                )
-                if insight:
-                    result.insight_generated = True
-                    result.insight_sentiment = insight.overall_sentiment.value
-                    result.posts_analyzed = insight.posts_analyzed
-                    logger.info(
-                        f"{company}: Generated insight from {insight.posts_analyzed} posts"
-                    )
-            except Exception as e:
-                error_msg = f"Social crawl failed: {str(e)}"
-                result.errors.append(error_msg)
-                logger.error(f"{company}: {error_msg}")
+            stages.append(
+                self._run_social_stage(result, keywords, max_social_results)
+            )
+
+        await asyncio.gather(*stages)
 
         # Finalize
         result.duration_seconds = time.time() - start_time
@@ -230,43 +330,108 @@ class IntelAgent:
         logger.info(f"Completed {company} in {result.duration_seconds:.1f}s")
         return result
 
+    async def _run_official_stage(self, result: AgentResult, url: str) -> None:
+        """Crawl the official site and record outcome into ``result``."""
+        company = result.company
+        stage_start = time.time()
+        try:
+            counts = await self.crawl_official(company, url)
+            if counts is None:
+                result.official_status = "unchanged"
+                logger.info(f"{company}: Page unchanged, skipped extraction")
+                # Detail pages deferred by earlier runs are still due
+                await self._run_detail_stage(result, url)
+                return
+            jobs_found, jobs_added, jobs_updated, jobs_unchanged = counts
+            result.official_status = "crawled"
+            result.jobs_found = jobs_found
+            result.jobs_added = jobs_added
+            result.jobs_updated = jobs_updated
+            result.jobs_unchanged = jobs_unchanged
+            logger.info(
+                f"{company}: Found {jobs_found} jobs, added {jobs_added}, "
+                f"updated {jobs_updated}, unchanged {jobs_unchanged}"
+            )
+            await self._run_detail_stage(result, url)
+        except Exception as e:
+            error_msg = f"Official crawl failed: {str(e)}"
+            result.errors.append(error_msg)
+            logger.error(f"{company}: {error_msg}")
+        finally:
+            result.stage_durations["official"] = time.time() - stage_start
+
+    async def _run_detail_stage(self, result: AgentResult, url: str) -> None:
+        """Enrich the list page's jobs from their detail pages, if enabled.
+
+        Failures are logged but do not fail the company: the jobs are
+        already stored with their list snippets.
+        """
+        try:
+            stats = await self.enrich_details(result.company, url)
+        except Exception as e:
+            logger.warning(f"{result.company}: Detail enrichment failed: {e}")
+            return
+        if stats is not None:
+            result.details_enriched = stats.enriched
+
+    async def _run_social_stage(
+        self,
+        result: AgentResult,
+        keywords: list[str],
+        max_results: int,
+    ) -> None:
+        """Crawl social media and record outcome into ``result``."""
+        company = result.company
+        stage_start = time.time()
+        try:
+            insight = await self.crawl_social(
+                company, keywords, max_results=max_results
+            )
+            if insight:
+                result.insight_generated = True
+                result.insight_sentiment = insight.overall_sentiment.value
+                result.posts_analyzed = insight.posts_analyzed
+                logger.info(
+                    f"{company}: Generated insight from {insight.posts_analyzed} posts"
+                )
+        except Exception as e:
+            error_msg = f"Social crawl failed: {str(e)}"
+            result.errors.append(error_msg)
+            logger.error(f"{company}: {error_msg}")
+        finally:
+            result.stage_durations["social"] = time.time() - stage_start
+
     async def run_all(
         self,
         max_companies: Optional[int] = None,
         delay_between: float = 2.0,
+        concurrency: int = 1,
+        skip_official: bool = False,
+        skip_social: bool = False,
     ) -> list[AgentResult]:
         """Run intelligence collection for all active crawl targets.
 
         Args:
             max_companies: Maximum number of companies to process.
-            delay_between: Delay in seconds between companies (anti-scraping).
+            delay_between: Minimum delay in seconds between two requests to
+                the same host or platform (anti-scraping).
+            concurrency: Maximum number of companies processed at once.
+            skip_official: Skip official site crawling.
+            skip_social: Skip social media crawling.
 
         Returns:
-            List of AgentResult for each company.
+            List of AgentResult for each company, in completion order.
         """
-        results = []
-
-        with self.db.session() as session:
-            target_repo = CrawlTargetRepository(session)
-            targets = target_repo.list_active()
-
-            if max_companies:
-                targets = targets[:max_companies]
-
-            logger.info(f"Starting batch run for {len(targets)} companies")
-
-            for i, target in enumerate(targets):
-                if i > 0:
-                    await asyncio.sleep(delay_between)
-
-                result = await self.run(
-                    company=target.company,
-                    official_url=target.url,
-                )
-                results.append(result)
-
-                # Update last crawled time
-                target_repo.update_last_crawled(target.id)
+        results = [
+            result
+            async for result in self.iter_all(
+                max_companies=max_companies,
+                delay_between=delay_between,
+                concurrency=concurrency,
+                skip_official=skip_official,
+                skip_social=skip_social,
+            )
+        ]
 
         # Summary
         successful = sum(1 for r in results if r.success)
@@ -280,63 +445,430 @@ class IntelAgent:
 
         return results
 
+    async def iter_all(
+        self,
+        max_companies: Optional[int] = None,
+        delay_between: float = 2.0,
+        concurrency: int = 1,
+        skip_official: bool = False,
+        skip_social: bool = False,
+    ) -> AsyncIterator[AgentResult]:
+        """Process all active crawl targets with a bounded worker pool.
+
+        Results are yielded as soon as each company finishes, so callers can
+        report progress while slower companies are still running.
+
+        Args:
+            max_companies: Maximum number of companies to process.
+            delay_between: Minimum delay in seconds between two requests to
+                the same host or platform (anti-scraping).
+            concurrency: Maximum number of companies processed at once.
+            skip_official: Skip official site crawling.
+            skip_social: Skip social media crawling.
+
+        Yields:
+            AgentResult for each company, in completion order.
+        """
+        self.throttle.min_interval = delay_between
+        if self.frontier is not None:
+            self.frontier.start_run()
+        targets = await self.list_active_targets(max_companies)
+
+        logger.info(
+            f"Starting batch run for {len(targets)} companies "
+            f"(concurrency={concurrency})"
+        )
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def process(target_id: int, company: str, url: str) -> AgentResult:
+            async with semaphore:
+                result = await self.run(
+                    company=company,
+                    official_url=url,
+                    skip_official=skip_official,
+                    skip_social=skip_social,
+                )
+            # Update last crawled time
+            await self.mark_crawled(target_id)
+            return result
+
+        tasks = [asyncio.create_task(process(*target)) for target in targets]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # The consumer stopped early: cancel the companies still running
+            # and wait for them, so none outlives the caller's crawler
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
     async def crawl_official(
         self,
         company: str,
         url: str,
-    ) -> tuple[int, int, int]:
+    ) -> Optional[tuple[int, int, int, int]]:
         """Crawl official career site and extract jobs.
 
+        If the URL belongs to a crawl target whose page has not changed
+        since its last extraction, nothing is extracted or written.
+
         Args:
             company: Company name.
             url: Career page URL.
 
         Returns:
-            Tuple of (jobs_found, jobs_added, jobs_updated).
+            Tuple of (jobs_found, jobs_added, jobs_updated, jobs_unchanged),
+            or None if the page is unchanged.
+        """
+        target_id = await self.target_id_for(url)
+        previous = await self.load_page_state(target_id)
+        target = await self.load_crawl_target(target_id)
+        crawl_result = await self.fetch_official(url, target=target)
+        state = PageState.of(crawl_result)
+        if self.page_unchanged(previous, state):
+            return None
+
+        page_hash = await self.archive_page(url, crawl_result, target_id=target_id)
+        extraction = await self.extract_official(
+            company, url, crawl_result.markdown, previous=previous.blocks if previous else None
+        )
+
+        jobs_found = extraction.count
+        if jobs_found == 0:
+            # Whatever the selector matches now holds no jobs
+            await self.update_selector(target_id, target, crawl_result, [])
+            return 0, 0, 0, 0
+
+        upsert = await self.persist_jobs(url, extraction.jobs, raw_page_hash=page_hash)
+        await self.save_page_state(target_id, state, extraction)
+        await self.update_selector(target_id, target, crawl_result, extraction.jobs)
+        return jobs_found, upsert.inserted, upsert.updated, upsert.unchanged
+
+    async def fetch_official(
+        self, url: str, target: Optional[CrawlTarget] = None
+    ) -> CrawlResult:
+        """Crawl an official career page (first stage of crawl_official).
+
+        Paginated lists are walked until a page lists only jobs that are
+        already stored, so incremental runs load one or two pages. A page
+        whose CSS selector matches nothing is crawled again in full.
+
+        Args:
+            url: Career page URL.
+            target: Crawl settings of the page's target (pagination,
+                resource allowlist, CSS selector), if it has one.
+
+        Returns:
+            Successful CrawlResult. Its metadata's "css_selector" is the
+            selector the markdown was limited to, None for the full page.
+
+        Raises:
+            RuntimeError: If the crawl failed.
         """
         logger.debug(f"Crawling official site: {url}")
 
         # Crawl (OfficialCrawler manages its own browser context internally)
         # Disable cache to ensure fresh content with proper JS rendering
-        crawler = OfficialCrawler(use_cache=False)
-        crawl_result = await crawler.crawl(url)
+        crawler = self.crawler or OfficialCrawler(use_cache=False)
+        selector = target.css_selector if target else None
+        crawl_result = await self._fetch(crawler, url, target, selector)
+        if selector and not (crawl_result.success and crawl_result.markdown.strip()):
+            logger.info(f"{url}: selector {selector!r} no longer matches, crawling full page")
+            selector = None
+            crawl_result = await self._fetch(crawler, url, target, None)
 
         if not crawl_result.success:
             raise RuntimeError(f"Crawl failed: {crawl_result.error}")
+        crawl_result.metadata = {**(crawl_result.metadata or {}), "css_selector": selector}
+        return crawl_result
 
-        # Extract
-        extraction = await self.job_extractor.extract(
-            content=crawl_result.markdown,
-            company=company,
-            source_url=url,
+    async def _fetch(
+        self,
+        crawler: BaseCrawler,
+        url: str,
+        target: Optional[CrawlTarget],
+        css_selector: Optional[str],
+    ) -> CrawlResult:
+        """Crawl a page once, paginated if its target says so."""
+        await self.throttle.wait(HostThrottle.key_for(url))
+        allowlist = target.resource_allowlist if target else None
+        if target is not None and target.pagination is not None:
+            return await crawler.crawl_pages(
+                url,
+                target.pagination,
+                known_ids=AsyncJobRepository(self.adb).known_external_ids,
+                css_selector=css_selector,
+                resource_allowlist=allowlist,
+            )
+        return await crawler.crawl(
+            url, css_selector=css_selector, resource_allowlist=allowlist
         )
 
-        jobs_found = extraction.count
-        if jobs_found == 0:
-            logger.warning(f"No jobs extracted from {url}")
-            return 0, 0, 0
+    async def enrich_details(self, company: str, url: str) -> Optional[FrontierStats]:
+        """Crawl due detail pages of the jobs listed on a page.
 
-        # Save to database
-        jobs_added = 0
-        jobs_updated = 0
+        Args:
+            company: Company name.
+            url: List page URL the jobs were extracted from.
 
-        with self.db.session() as session:
-            repo = JobRepository(session)
+        Returns:
+            FrontierStats, or None if detail enrichment is disabled.
+        """
+        if self.frontier is None:
+            return None
+        return await self.frontier.enrich(company, url)
+
+    async def target_id_for(self, url: str) -> Optional[int]:
+        """Get the ID of the crawl target with this URL, if any."""
+        target = await AsyncCrawlTargetRepository(self.adb).get_by_url(url)
+        return target.id if target else None
+
+    async def load_page_state(self, target_id: Optional[int]) -> Optional[PageState]:
+        """Get the page state stored at a target's last extraction.
+
+        Args:
+            target_id: Crawl target, or None for ad-hoc URLs.
+
+        Returns:
+            The stored PageState, or None if there is none.
+        """
+        if target_id is None:
+            return None
+        target = await AsyncCrawlTargetRepository(self.adb).get_by_id(target_id)
+        if target is None:
+            return None
+        blocks = None
+        if target.page_blocks:
+            blocks = {
+                digest: [JobPosting.model_validate(job) for job in jobs]
+                for digest, jobs in target.page_blocks.items()
+            }
+        return PageState(
+            fingerprint=target.page_fingerprint,
+            blocks=blocks,
+        )
+
+    async def load_crawl_target(self, target_id: Optional[int]) -> Optional[CrawlTarget]:
+        """Get the crawl settings stored for a crawl target.
+
+        Args:
+            target_id: Crawl target, or None for ad-hoc URLs.
+
+        Returns:
+            CrawlTarget with the target's pagination, resource allowlist
+            and CSS selector, or None if there is no such target.
+        """
+        if target_id is None:
+            return None
+        row = await AsyncCrawlTargetRepository(self.adb).get_by_id(target_id)
+        if row is None:
+            return None
+        pagination = None
+        try:
+            pagination = Pagination.from_dict(row.pagination)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Ignoring invalid pagination of target {target_id}: {e}")
+        return CrawlTarget(
+            url=row.url,
+            company=row.company,
+            css_selector=row.css_selector,
+            pagination=pagination,
+            resource_allowlist=list(row.resource_allowlist or []),
+        )
+
+    async def update_selector(
+        self,
+        target_id: Optional[int],
+        target: Optional[CrawlTarget],
+        crawl_result: CrawlResult,
+        jobs: list[JobPosting],
+    ) -> Optional[str]:
+        """Learn, keep or drop a target's CSS selector after extraction.
+
+        A selector is learned from full-page crawls only, so a working
+        selector (learned or hand-written) is kept. A selector whose crawl
+        yielded no jobs is dropped; one that failed to match was replaced
+        by a full-page crawl and is relearned from it.
+
+        Args:
+            target_id: Crawl target, or None for ad-hoc URLs.
+            target: The target's settings from load_crawl_target().
+            crawl_result: Crawl the jobs were extracted from.
+            jobs: Extracted jobs.
 
-            for job in extraction.jobs:
-                # Check if exists
-                existing = None
-                if job.job_id_external:
-                    existing = repo.get_by_external_id(job.job_id_external)
+        Returns:
+            The target's selector from now on.
+        """
+        if target_id is None or target is None:
+            return None
+        current = target.css_selector
+        applied = (crawl_result.metadata or {}).get("css_selector")
+        if applied and jobs:
+            return current
+        learned = None
+        if not applied and self.learn_selectors and jobs and crawl_result.html:
+            learned = await asyncio.to_thread(
+                learn_selector, crawl_result.html, [job.title for job in jobs]
+            )
+            if learned is not None and len(learned) > MAX_SELECTOR_LENGTH:
+                learned = None
+        if learned != current:
+            await AsyncCrawlTargetRepository(self.adb).set_css_selector(target_id, learned)
+            logger.info(f"{target.company}: CSS selector {current!r} -> {learned!r}")
+            target.css_selector = learned
+        return learned
+
+    def page_unchanged(self, previous: Optional[PageState], state: PageState) -> bool:
+        """Check whether a page is unchanged since its last extraction.
+
+        Args:
+            previous: Stored state from load_page_state().
+            state: State of the freshly crawled page.
+
+        Returns:
+            True if extraction can be skipped.
+        """
+        return (
+            self.skip_unchanged
+            and previous is not None
+            and previous.fingerprint is not None
+            and previous.fingerprint == state.fingerprint
+        )
+
+    async def save_page_state(
+        self,
+        target_id: Optional[int],
+        state: PageState,
+        extraction: JobListExtraction,
+    ) -> None:
+        """Remember a target's page state after its jobs were persisted.
+
+        Nothing is saved if no jobs were found, so a failed or empty
+        extraction is retried on the next crawl. A partial incremental
+        extraction saves its blocks but no fingerprint, so the rest of the
+        page is extracted next time even if it has not changed.
+
+        Args:
+            target_id: Crawl target, or None for ad-hoc URLs.
+            state: State of the crawled page.
+            extraction: Extraction result the jobs came from.
+        """
+        if target_id is None or extraction.count == 0:
+            return
+        fingerprint = state.fingerprint
+        blocks = None
+        if isinstance(extraction, IncrementalJobExtraction):
+            blocks = {
+                digest: [job.model_dump() for job in jobs]
+                for digest, jobs in extraction.block_jobs.items()
+            }
+            if not extraction.complete:
+                fingerprint = None
+        await AsyncCrawlTargetRepository(self.adb).update_page_state(
+            target_id, fingerprint, blocks
+        )
 
-                repo.add(job, source_url=url)
+    async def archive_page(
+        self,
+        url: str,
+        crawl_result: CrawlResult,
+        target_id: Optional[int] = None,
+    ) -> Optional[str]:
+        """Store a crawled page in the archive and record the fetch.
 
-                if existing:
-                    jobs_updated += 1
-                else:
-                    jobs_added += 1
+        Compression and disk writes run in a worker thread. Archiving is
+        best effort: a failure is logged and does not fail the crawl.
 
-        return jobs_found, jobs_added, jobs_updated
+        Args:
+            url: Career page URL.
+            crawl_result: Successful crawl of the page.
+            target_id: Crawl target of the page, looked up by URL if None.
+
+        Returns:
+            Archive hash of the page markdown, or None if there is no
+            archive or archiving failed.
+        """
+        if self.archive is None:
+            return None
+        markdown = crawl_result.markdown or ""
+        html = crawl_result.html
+        try:
+            markdown_hash = await asyncio.to_thread(self.archive.put, markdown)
+            html_hash = await asyncio.to_thread(self.archive.put, html) if html else None
+            await AsyncRawPageRepository(self.adb).add(
+                url,
+                markdown_hash,
+                markdown_size=len(markdown.encode("utf-8")),
+                html_hash=html_hash,
+                html_size=len(html.encode("utf-8")) if html else None,
+                target_id=target_id,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to archive {url}: {e}")
+            return None
+        return markdown_hash
+
+    async def extract_official(
+        self,
+        company: str,
+        url: str,
+        markdown: str,
+        previous: Optional[dict[str, list[JobPosting]]] = None,
+    ) -> JobListExtraction:
+        """Extract jobs from crawled markdown (second stage of crawl_official).
+
+        Only page blocks that are not in ``previous`` are sent to the LLM;
+        jobs of the other blocks are carried over.
+
+        Args:
+            company: Company name.
+            url: Career page URL the markdown came from.
+            markdown: Page content.
+            previous: Jobs per block hash from the last extraction of the
+                page (PageState.blocks), or None to extract the whole page.
+
+        Returns:
+            IncrementalJobExtraction with all jobs on the page, possibly empty.
+        """
+        extraction = await self.job_extractor.extract_incremental(
+            content=markdown,
+            company=company,
+            source_url=url,
+            previous=previous,
+        )
+        if extraction.count == 0:
+            logger.warning(f"No jobs extracted from {url}")
+        elif isinstance(extraction, IncrementalJobExtraction):
+            logger.debug(
+                f"{url}: extracted {extraction.changed_blocks}/{extraction.blocks} blocks "
+                f"({extraction.prompt_chars} chars), carried {extraction.carried_jobs} jobs"
+            )
+        return extraction
+
+    async def persist_jobs(
+        self,
+        url: str,
+        jobs: list[JobPosting],
+        raw_page_hash: Optional[str] = None,
+    ) -> UpsertResult:
+        """Save extracted jobs (last stage of crawl_official).
+
+        Jobs whose content has not changed are not rewritten.
+
+        Args:
+            url: Source URL of the jobs.
+            jobs: Extracted job postings.
+            raw_page_hash: Archive hash of the page they were extracted from.
+
+        Returns:
+            UpsertResult with inserted, updated and unchanged counts.
+        """
+        return await AsyncJobRepository(self.adb).upsert_many(
+            jobs, source_url=url, raw_page_hash=raw_page_hash
+        )
 
     async def crawl_social(
         self,
@@ -354,17 +886,14 @@ class IntelAgent:
         Returns:
             InsightSummary if successful, None otherwise.
         """
-        all_notes = []
-
-        async with XhsCrawler(headless=self.xhs_headless) as crawler:
-            for keyword in keywords:
-                logger.debug(f"Searching XHS: {keyword}")
-                try:
-                    notes = await crawler.search(keyword, max_results=max_results)
-                    all_notes.extend(notes)
-                    logger.debug(f"Found {len(notes)} notes for '{keyword}'")
-                except Exception as e:
-                    logger.warning(f"XHS search failed for '{keyword}': {e}")
+        if self.social_crawler is not None:
+            async with self._social_lock:
+                all_notes = await self._search_social(
+                    self.social_crawler, keywords, max_results
+                )
+        else:
+            async with XhsCrawler(headless=self.xhs_headless) as crawler:
+                all_notes = await self._search_social(crawler, keywords, max_results)
 
         if not all_notes:
             logger.warning(f"No social posts found for {company}")
@@ -391,20 +920,56 @@ class IntelAgent:
         )
 
         # Save to database
-        with self.db.session() as session:
-            repo = InsightRepository(session)
-            repo.add(summary)
+        await AsyncInsightRepository(self.adb).add(summary)
 
         return summary
 
-    def _get_official_url(self, company: str) -> Optional[str]:
+    async def _search_social(
+        self, crawler: XhsCrawler, keywords: list[str], max_results: int
+    ) -> list[XhsNote]:
+        """Search Xiaohongshu for each keyword; failed searches are skipped."""
+        all_notes = []
+        for keyword in keywords:
+            logger.debug(f"Searching XHS: {keyword}")
+            await self.throttle.wait(self.SOCIAL_THROTTLE_KEY)
+            try:
+                notes = await crawler.search(keyword, max_results=max_results)
+                all_notes.extend(notes)
+                logger.debug(f"Found {len(notes)} notes for '{keyword}'")
+            except Exception as e:
+                logger.warning(f"XHS search failed for '{keyword}': {e}")
+        return all_notes
+
+    async def list_active_targets(
+        self, max_companies: Optional[int] = None
+    ) -> list[tuple[int, str, str]]:
+        """List active crawl targets as plain (id, company, url) tuples.
+
+        Args:
+            max_companies: Maximum number of targets to return.
+
+        Returns:
+            Target tuples that stay usable after the session is closed.
+        """
+        targets = [
+            (target.id, target.company, target.url)
+            for target in await AsyncCrawlTargetRepository(self.adb).list_active()
+        ]
+
+        if max_companies:
+            targets = targets[:max_companies]
+        return targets
+
+    async def mark_crawled(self, target_id: int) -> None:
+        """Record the crawl time of a target in its own transaction."""
+        await AsyncCrawlTargetRepository(self.adb).update_last_crawled(target_id)
+
+    async def _get_official_url(self, company: str) -> Optional[str]:
         """Get official URL from CrawlTarget table."""
-        with self.db.session() as session:
-            repo = CrawlTargetRepository(session)
-            targets = repo.list_by_company(company)
-            for target in targets:
-                if target.crawler_type == "official" and target.is_active:
-                    return target.url
+        targets = await AsyncCrawlTargetRepository(self.adb).list_by_company(company)
+        for target in targets:
+            if target.crawler_type == "official" and target.is_active:
+                return target.url
         return None
 
     def _get_social_keywords(self, company: str) -> list[str]:
@@ -434,10 +999,10 @@ async def run_intel_agent(
     db = DatabaseManager(db_path=db_path)
     db.create_tables()
 
-    agent = IntelAgent(db)
-    return await agent.run(
-        company=company,
-        official_url=official_url,
-        skip_official=skip_official,
-        skip_social=skip_social,
-    )
+    async with IntelAgent(db) as agent:
+        return await agent.run(
+            company=company,
+            official_url=official_url,
+            skip_official=skip_official,
+            skip_social=skip_social,
+        )
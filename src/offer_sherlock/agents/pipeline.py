@@ -0,0 +1,369 @@
+"""Staged crawl → extract → persist pipeline for official career sites.
+
+IntelAgent.crawl_official runs the three steps back to back for a single
+company, so the browser idles while the LLM works and both idle while the
+database writes. PipelineRunner splits the steps into stages with their own
+worker pools, connected by bounded asyncio queues, so different companies
+occupy different stages at the same time. A full downstream queue blocks
+the upstream workers (backpressure), which keeps crawled markdown from
+piling up in memory when the LLM is the bottleneck.
+
+Social media collection is not part of the pipeline; use IntelAgent.run
+for it.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
+
+from offer_sherlock.crawlers import CrawlResult, CrawlTarget
+from offer_sherlock.schemas.job import JobListExtraction, JobPosting
+
+if TYPE_CHECKING:
+    from offer_sherlock.agents.intel_agent import AgentResult, IntelAgent, PageState
+
+logger = logging.getLogger(__name__)
+
+# Sentinel telling a stage worker to exit
+_STOP = object()
+
+
+@dataclass
+class PipelineConfig:
+    """Worker counts and queue bounds for the pipeline.
+
+    Attributes:
+        crawl_workers: Concurrent page crawls (browsers).
+        extract_workers: Concurrent LLM extraction calls.
+        persist_workers: Concurrent database writers.
+        detail_workers: Companies whose detail pages are crawled at once
+            (only if the agent has a detail frontier; each company's
+            pages are crawled with the frontier's own concurrency).
+        queue_size: Capacity of each inter-stage queue. Upstream workers
+            block when the downstream queue is full.
+        delay_between: Minimum delay between requests to the same host.
+    """
+
+    crawl_workers: int = 2
+    extract_workers: int = 2
+    persist_workers: int = 1
+    detail_workers: int = 1
+    queue_size: int = 4
+    delay_between: float = 2.0
+
+
+@dataclass
+class StageStats:
+    """Runtime statistics of a single pipeline stage.
+
+    Attributes:
+        name: Stage name (crawl, extract, persist, detail).
+        workers: Number of workers in the stage.
+        processed: Items the stage handled successfully.
+        failed: Items whose handler raised.
+        busy_seconds: Total time workers spent inside the handler.
+        queue_depth: Items waiting in the stage's input queue at last check.
+        max_queue_depth: Highest observed input queue depth.
+        elapsed_seconds: Wall-clock time the stage was running.
+    """
+
+    name: str
+    workers: int
+    processed: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Items handled per second of stage wall-clock time."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return (self.processed + self.failed) / self.elapsed_seconds
+
+    @property
+    def utilization(self) -> float:
+        """Fraction of worker time spent busy (0.0 - 1.0)."""
+        capacity = self.elapsed_seconds * self.workers
+        if capacity <= 0:
+            return 0.0
+        return min(1.0, self.busy_seconds / capacity)
+
+    def observe_queue(self, depth: int) -> None:
+        """Record the current depth of the stage's input queue."""
+        self.queue_depth = depth
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: {self.processed} ok, {self.failed} failed, "
+            f"{self.throughput:.2f}/s, util={self.utilization:.0%}, "
+            f"max_queue={self.max_queue_depth}"
+        )
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "name": self.name,
+            "workers": self.workers,
+            "processed": self.processed,
+            "failed": self.failed,
+            "busy_seconds": self.busy_seconds,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "elapsed_seconds": self.elapsed_seconds,
+            "throughput": self.throughput,
+            "utilization": self.utilization,
+        }
+
+
+@dataclass
+class _WorkItem:
+    """A company travelling through the pipeline."""
+
+    target_id: Optional[int]
+    url: str
+    result: "AgentResult"
+    started_at: float = field(default_factory=time.time)
+    target: Optional[CrawlTarget] = None
+    crawl_result: Optional[CrawlResult] = None
+    page_state: Optional["PageState"] = None
+    previous_blocks: Optional[dict[str, list[JobPosting]]] = None
+    # Page has the fingerprint of its last extraction; skip extract/persist
+    unchanged: bool = False
+    raw_page_hash: Optional[str] = None
+    extraction: Optional[JobListExtraction] = None
+
+
+class PipelineRunner:
+    """Run official-site collection as an overlapping three-stage pipeline.
+
+    Example:
+        >>> agent = IntelAgent(db)
+        >>> runner = PipelineRunner(agent, PipelineConfig(extract_workers=4))
+        >>> results = await runner.run()
+        >>> for stage in runner.stats.values():
+        ...     print(stage)
+    """
+
+    def __init__(self, agent: "IntelAgent", config: Optional[PipelineConfig] = None):
+        """Initialize the runner.
+
+        Args:
+            agent: Agent providing the crawl, extract and persist steps.
+            config: Pipeline configuration. Uses defaults if None.
+        """
+        self.agent = agent
+        self.config = config or PipelineConfig()
+        self.stats: dict[str, StageStats] = {}
+        self._results: list["AgentResult"] = []
+
+    async def run(self, max_companies: Optional[int] = None) -> list["AgentResult"]:
+        """Process all active crawl targets through the pipeline.
+
+        Args:
+            max_companies: Maximum number of companies to process.
+
+        Returns:
+            List of AgentResult for each company, in completion order.
+        """
+        targets = await self.agent.list_active_targets(max_companies)
+        return await self.run_targets(targets)
+
+    async def run_targets(
+        self, targets: list[tuple[Optional[int], str, str]]
+    ) -> list["AgentResult"]:
+        """Process the given (target_id, company, url) tuples.
+
+        Args:
+            targets: Targets to process. target_id may be None for ad-hoc
+                URLs that have no CrawlTarget row.
+
+        Returns:
+            List of AgentResult for each company, in completion order.
+        """
+        from offer_sherlock.agents.intel_agent import AgentResult
+
+        cfg = self.config
+        self.agent.throttle.min_interval = cfg.delay_between
+        with_details = self.agent.frontier is not None
+        if with_details:
+            self.agent.frontier.start_run()
+        self._results = []
+        self.stats = {
+            "crawl": StageStats("crawl", cfg.crawl_workers),
+            "extract": StageStats("extract", cfg.extract_workers),
+            "persist": StageStats("persist", cfg.persist_workers),
+        }
+        if with_details:
+            self.stats["detail"] = StageStats("detail", cfg.detail_workers)
+
+        crawl_queue: asyncio.Queue = asyncio.Queue(maxsize=cfg.queue_size)
+        extract_queue: asyncio.Queue = asyncio.Queue(maxsize=cfg.queue_size)
+        persist_queue: asyncio.Queue = asyncio.Queue(maxsize=cfg.queue_size)
+        detail_queue: Optional[asyncio.Queue] = (
+            asyncio.Queue(maxsize=cfg.queue_size) if with_details else None
+        )
+
+        logger.info(
+            f"Starting pipeline for {len(targets)} companies "
+            f"(crawl={cfg.crawl_workers}, extract={cfg.extract_workers}, "
+            f"persist={cfg.persist_workers}, queue={cfg.queue_size})"
+        )
+
+        stages = [
+            (self.stats["crawl"], crawl_queue, extract_queue, self._crawl),
+            (self.stats["extract"], extract_queue, persist_queue, self._extract),
+            (self.stats["persist"], persist_queue, detail_queue, self._persist),
+        ]
+        if with_details:
+            stages.append((self.stats["detail"], detail_queue, None, self._detail))
+        workers = [
+            [
+                asyncio.create_task(self._worker(stats, inbox, outbox, handler))
+                for _ in range(max(1, stats.workers))
+            ]
+            for stats, inbox, outbox, handler in stages
+        ]
+        stage_start = time.perf_counter()
+
+        try:
+            for target_id, company, url in targets:
+                item = _WorkItem(
+                    target_id=target_id,
+                    url=url,
+                    result=AgentResult(company=company),
+                )
+                await crawl_queue.put(item)
+                self.stats["crawl"].observe_queue(crawl_queue.qsize())
+
+            # Drain stage by stage: a stage may only stop once its upstream
+            # has finished producing.
+            for (stats, inbox, _, _), tasks in zip(stages, workers):
+                for _ in tasks:
+                    await inbox.put(_STOP)
+                await asyncio.gather(*tasks)
+                stats.elapsed_seconds = time.perf_counter() - stage_start
+        finally:
+            for task in (t for tasks in workers for t in tasks):
+                task.cancel()
+
+        for stats in self.stats.values():
+            logger.info(f"Pipeline stage {stats}")
+
+        return self._results
+
+    def report(self) -> dict:
+        """Get per-stage statistics of the last run as a dictionary."""
+        return {name: stats.to_dict() for name, stats in self.stats.items()}
+
+    async def _worker(
+        self,
+        stats: StageStats,
+        inbox: asyncio.Queue,
+        outbox: Optional[asyncio.Queue],
+        handler: Callable[[_WorkItem], Awaitable[None]],
+    ) -> None:
+        """Pull items from ``inbox``, handle them and forward to ``outbox``."""
+        while True:
+            item = await inbox.get()
+            stats.observe_queue(inbox.qsize())
+            if item is _STOP:
+                return
+
+            # Items that already failed upstream skip straight to persist,
+            # which records every result.
+            if not item.result.errors or stats.name == "persist":
+                busy_start = time.perf_counter()
+                try:
+                    await handler(item)
+                    stats.processed += 1
+                except Exception as e:
+                    stats.failed += 1
+                    error_msg = f"Pipeline {stats.name} failed: {str(e)}"
+                    item.result.errors.append(error_msg)
+                    logger.error(f"{item.result.company}: {error_msg}")
+                finally:
+                    stats.busy_seconds += time.perf_counter() - busy_start
+
+            if outbox is not None:
+                await outbox.put(item)
+            else:
+                self._finish(item)
+
+    async def _crawl(self, item: _WorkItem) -> None:
+        """Crawl stage."""
+        from offer_sherlock.agents.intel_agent import PageState
+
+        previous = await self.agent.load_page_state(item.target_id)
+        item.previous_blocks = previous.blocks if previous else None
+        item.target = await self.agent.load_crawl_target(item.target_id)
+        item.crawl_result = await self.agent.fetch_official(item.url, target=item.target)
+        item.page_state = PageState.of(item.crawl_result)
+        if self.agent.page_unchanged(previous, item.page_state):
+            item.unchanged = True
+            item.crawl_result = None
+            item.result.official_status = "unchanged"
+            return
+        item.raw_page_hash = await self.agent.archive_page(
+            item.url, item.crawl_result, target_id=item.target_id
+        )
+
+    async def _extract(self, item: _WorkItem) -> None:
+        """Extract stage."""
+        if item.unchanged:
+            return
+        item.extraction = await self.agent.extract_official(
+            item.result.company,
+            item.url,
+            item.crawl_result.markdown,
+            previous=item.previous_blocks,
+        )
+        item.result.jobs_found = item.extraction.count
+
+    async def _persist(self, item: _WorkItem) -> None:
+        """Persist stage."""
+        result = item.result
+        if not result.errors and item.extraction and item.extraction.jobs:
+            upsert = await self.agent.persist_jobs(
+                item.url, item.extraction.jobs, raw_page_hash=item.raw_page_hash
+            )
+            result.jobs_added = upsert.inserted
+            result.jobs_updated = upsert.updated
+            result.jobs_unchanged = upsert.unchanged
+            await self.agent.save_page_state(item.target_id, item.page_state, item.extraction)
+        if not result.errors and item.extraction is not None:
+            result.official_status = "crawled"
+            # The page's HTML is kept until here to learn the selector from
+            await self.agent.update_selector(
+                item.target_id, item.target, item.crawl_result, item.extraction.jobs
+            )
+        # Release the page once every stage is done with it
+        item.crawl_result = None
+        if item.target_id is not None:
+            await self.agent.mark_crawled(item.target_id)
+
+    async def _detail(self, item: _WorkItem) -> None:
+        """Detail stage: enrich the listed jobs from their detail pages.
+
+        Failures are logged but do not fail the company: its jobs are
+        already stored with their list snippets.
+        """
+        try:
+            stats = await self.agent.enrich_details(item.result.company, item.url)
+        except Exception as e:
+            logger.warning(f"{item.result.company}: Detail enrichment failed: {e}")
+            return
+        if stats is not None:
+            item.result.details_enriched = stats.enriched
+
+    def _finish(self, item: _WorkItem) -> None:
+        """Finalize an item's AgentResult after the last stage."""
+        result = item.result
+        result.duration_seconds = time.time() - item.started_at
+        result.success = len(result.errors) == 0
+        self._results.append(result)
@@ -5,13 +5,36 @@ Provides web scraping capabilities for official job sites and social media.
 
 from offer_sherlock.crawlers.base import BaseCrawler, CrawlResult
 from offer_sherlock.crawlers.official_crawler import CrawlTarget, OfficialCrawler
+from offer_sherlock.crawlers.pagination import Pagination, PaginationMode
+from offer_sherlock.crawlers.recycling import RecyclePolicy
+from offer_sherlock.crawlers.replay import (
+    CrawlRecording,
+    RecordedCrawl,
+    RecordingCrawler,
+    ReplayCrawler,
+)
+from offer_sherlock.crawlers.resources import LEAN_POLICY, ResourcePolicy, TrafficMeter
+from offer_sherlock.crawlers.selector import learn_selector
 from offer_sherlock.crawlers.social_crawler import XhsCrawler, XhsNote
+from offer_sherlock.crawlers.throttle import HostThrottle
 
 __all__ = [
     "BaseCrawler",
     "CrawlResult",
+    "CrawlRecording",
     "CrawlTarget",
+    "HostThrottle",
+    "LEAN_POLICY",
     "OfficialCrawler",
+    "Pagination",
+    "PaginationMode",
+    "RecordedCrawl",
+    "RecordingCrawler",
+    "RecyclePolicy",
+    "ReplayCrawler",
+    "ResourcePolicy",
+    "TrafficMeter",
     "XhsCrawler",
     "XhsNote",
+    "learn_selector",
 ]
@@ -5,12 +5,24 @@ career pages and extracting job descriptions in LLM-friendly markdown format.
 """
 
 import asyncio
+import hashlib
+import logging
+import uuid
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import AsyncIterator, Awaitable, Callable, Optional
 
 from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
 
 from offer_sherlock.crawlers.base import BaseCrawler, CrawlResult
+from offer_sherlock.crawlers.pagination import Pagination, PaginationMode
+from offer_sherlock.crawlers.recycling import BrowserBudget, RecyclePolicy
+from offer_sherlock.crawlers.resources import LEAN_POLICY, ResourcePolicy, TrafficMeter
+
+logger = logging.getLogger(__name__)
+
+# Looks up which of a set of external job IDs are already stored
+KnownIdsLookup = Callable[[set[str]], Awaitable[set[str]]]
 
 
 @dataclass
@@ -24,6 +36,9 @@ class CrawlTarget:
         wait_for: Optional wait condition (CSS selector or JS function).
         js_code: Optional JavaScript to execute before extraction.
         delay: Delay in seconds before extracting content (for dynamic pages).
+        pagination: How to walk a multi-page list (None for single pages).
+        resource_allowlist: Resource types and hosts the lean profile must
+            not block for this target (see ResourcePolicy.allowing()).
     """
 
     url: str
@@ -33,13 +48,17 @@ class CrawlTarget:
     js_code: Optional[str] = None
     delay: float = 0.0
     metadata: dict = field(default_factory=dict)
+    pagination: Optional[Pagination] = None
+    resource_allowlist: list[str] = field(default_factory=list)
 
 
 class OfficialCrawler(BaseCrawler):
     """Crawler for official company career pages using Crawl4AI.
 
     This crawler uses Crawl4AI to render JavaScript-heavy career pages
-    and extract clean markdown content suitable for LLM processing.
+    and extract clean markdown content suitable for LLM processing. By
+    default it crawls with a lean profile that blocks images, media, fonts
+    and trackers (see crawlers.resources).
 
     Example:
         >>> crawler = OfficialCrawler()
@@ -51,6 +70,15 @@ class OfficialCrawler(BaseCrawler):
         ...     "https://jobs.bytedance.com/...",
         ...     css_selector=".job-detail"
         ... )
+
+        >>> # Keep one browser warm across many crawls
+        >>> async with OfficialCrawler() as crawler:
+        ...     for url in urls:
+        ...         result = await crawler.crawl(url)
+
+    A warm browser is replaced by a fresh one between crawls once it has
+    opened recycle.max_pages pages or the browser processes outgrow
+    recycle.max_rss_mb; crawls still running finish on the old browser.
     """
 
     # Default delay for dynamic pages (seconds)
@@ -62,6 +90,9 @@ class OfficialCrawler(BaseCrawler):
         verbose: bool = False,
         use_cache: bool = True,
         default_delay: float = 3.0,
+        resource_policy: Optional[ResourcePolicy] = LEAN_POLICY,
+        measure_traffic: bool = False,
+        recycle: Optional[RecyclePolicy] = RecyclePolicy(),
     ):
         """Initialize the crawler.
 
@@ -71,15 +102,204 @@ class OfficialCrawler(BaseCrawler):
             use_cache: Enable caching of crawled pages.
             default_delay: Default delay before content extraction (seconds).
                           Most career pages need 2-5 seconds for JS to load.
+            resource_policy: Requests to block. None loads every resource
+                (the full browser profile).
+            measure_traffic: Record response bytes in the result metadata
+                ("bytes_transferred"). Costs a little per request.
+            recycle: When to replace the warm browser started by start().
+                None keeps it until close().
         """
         self.headless = headless
         self.verbose = verbose
         self.use_cache = use_cache
         self.default_delay = default_delay
+        self.resource_policy = resource_policy
+        self.measure_traffic = measure_traffic
         self._browser_config = BrowserConfig(
             headless=headless,
             verbose=verbose,
         )
+        # Browser kept open between crawls by start()/close()
+        self._crawler: Optional[AsyncWebCrawler] = None
+        self._budget = BrowserBudget(recycle) if recycle is not None else None
+        # Crawls in flight per warm browser, so a replaced one closes when idle
+        self._users: dict[AsyncWebCrawler, int] = {}
+        self._recycle_lock = asyncio.Lock()
+        self.recycles = 0
+
+    async def start(self) -> None:
+        """Launch a browser that later crawls reuse until close()."""
+        if self._crawler is None:
+            self._crawler = await self._launch()
+
+    async def close(self) -> None:
+        """Close the browser launched by start().
+
+        Crawls still running keep their browser until they finish.
+        """
+        crawler, self._crawler = self._crawler, None
+        if crawler is not None and crawler not in self._users:
+            await crawler.__aexit__(None, None, None)
+
+    async def __aenter__(self) -> "OfficialCrawler":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    @asynccontextmanager
+    async def _browser(self) -> AsyncIterator[AsyncWebCrawler]:
+        """The warm browser if started, else a browser for this call only."""
+        if self._crawler is None:
+            async with self._new_browser() as crawler:
+                yield crawler
+            return
+
+        await self._maybe_recycle()
+        crawler = self._crawler
+        self._users[crawler] = self._users.get(crawler, 0) + 1
+        try:
+            yield crawler
+        finally:
+            self._users[crawler] -= 1
+            if not self._users[crawler]:
+                del self._users[crawler]
+                if crawler is not self._crawler:
+                    # Replaced or closed while this crawl was running
+                    await crawler.__aexit__(None, None, None)
+
+    async def _maybe_recycle(self) -> None:
+        """Replace the warm browser if it is over its recycle budget."""
+        if self._budget is None:
+            return
+        async with self._recycle_lock:
+            reason = await self._budget.exhausted()
+            old = self._crawler
+            if reason is None or old is None:
+                return
+            self._crawler = await self._launch()
+            self.recycles += 1
+            logger.info(f"Recycled browser ({reason}), {self.recycles} so far")
+            if old not in self._users:
+                await old.__aexit__(None, None, None)
+
+    async def _launch(self) -> AsyncWebCrawler:
+        """Start a warm browser, governed by the recycle budget if any."""
+        crawler = self._new_browser()
+        if self._budget is None:
+            await crawler.__aenter__()
+        else:
+            async with self._budget.launching():
+                await crawler.__aenter__()
+        return crawler
+
+    def _new_browser(self) -> AsyncWebCrawler:
+        """Create a browser whose pages follow the crawl's resource policy."""
+        crawler = AsyncWebCrawler(config=self._browser_config)
+        crawler.crawler_strategy.set_hook("on_page_context_created", self._on_page_created)
+        return crawler
+
+    def _traffic(
+        self, resource_allowlist: Optional[list[str]] = None
+    ) -> tuple[dict, TrafficMeter]:
+        """Per-crawl state read by the page hook, and the crawl's meter."""
+        meter = TrafficMeter()
+        policy = self.resource_policy
+        if policy is not None:
+            policy = policy.allowing(resource_allowlist)
+        return {"resource_policy": policy, "traffic": meter}, meter
+
+    async def _on_page_created(self, page, context=None, config=None, **kwargs):
+        """Crawl4AI hook: intercept the requests of a new page.
+
+        Routes are installed once per page; pages reused by a session pick
+        up the policy and meter of the crawl currently using them.
+        Crawl4AI calls the hook on every crawl, reused session pages
+        included, so the recycle budget counts page loads.
+        """
+        if self._budget is not None:
+            self._budget.record()
+        state = getattr(config, "shared_data", None) or {}
+        if "traffic" not in state:
+            return
+        first_use = not hasattr(page, "_sherlock_state")
+        page._sherlock_state = state
+        if not first_use:
+            return
+
+        async def route_request(route):
+            current = page._sherlock_state
+            request = route.request
+            current["traffic"].requests += 1
+            policy = current["resource_policy"]
+            if policy is not None and policy.blocks(request.resource_type, request.url):
+                current["traffic"].blocked += 1
+                await route.abort()
+            else:
+                await route.fallback()
+
+        await page.route("**/*", route_request)
+
+        if self.measure_traffic:
+
+            async def count_bytes(request):
+                try:
+                    sizes = await request.sizes()
+                except Exception:
+                    return
+                page._sherlock_state["traffic"].bytes_transferred += (
+                    sizes.get("responseBodySize", 0) + sizes.get("responseHeadersSize", 0)
+                )
+
+            page.on("requestfinished", count_bytes)
+
+    def _run_config(
+        self,
+        css_selector: Optional[str] = None,
+        wait_for: Optional[str] = None,
+        js_code: Optional[str] = None,
+        timeout: int = 30000,
+        delay: Optional[float] = None,
+        **kwargs,
+    ) -> CrawlerRunConfig:
+        # Use default delay if not specified
+        actual_delay = delay if delay is not None else self.default_delay
+        kwargs.setdefault(
+            "cache_mode", CacheMode.ENABLED if self.use_cache else CacheMode.BYPASS
+        )
+        return CrawlerRunConfig(
+            css_selector=css_selector,
+            wait_for=wait_for,
+            js_code=js_code,
+            page_timeout=timeout,
+            delay_before_return_html=actual_delay,
+            **kwargs,
+        )
+
+    @staticmethod
+    def _to_result(url: str, result) -> CrawlResult:
+        """Convert a Crawl4AI result."""
+        if result.success:
+            return CrawlResult(
+                url=url,
+                markdown=result.markdown or "",
+                html=result.html,
+                title=result.metadata.get("title") if result.metadata else None,
+                success=True,
+                metadata={
+                    "status_code": result.status_code if hasattr(result, 'status_code') else None,
+                    "links_count": (
+                        len(result.links) if hasattr(result, 'links') and result.links else 0
+                    ),
+                },
+            )
+        return CrawlResult(
+            url=url,
+            markdown="",
+            success=False,
+            error=result.error_message if hasattr(result, 'error_message') else "Unknown error",
+        )
 
     async def crawl(
         self,
@@ -89,6 +309,7 @@ class OfficialCrawler(BaseCrawler):
         js_code: Optional[str] = None,
         timeout: int = 30000,
         delay: Optional[float] = None,
+        resource_allowlist: Optional[list[str]] = None,
         **kwargs,
     ) -> CrawlResult:
         """Crawl a single URL and extract markdown content.
@@ -104,48 +325,32 @@ class OfficialCrawler(BaseCrawler):
             timeout: Page load timeout in milliseconds.
             delay: Delay in seconds before extracting content.
                   If None, uses default_delay. Set to 0 to disable.
+            resource_allowlist: Resource types and hosts the resource
+                policy must let through for this page.
             **kwargs: Additional options passed to CrawlerRunConfig.
 
         Returns:
-            CrawlResult with extracted markdown content.
+            CrawlResult with extracted markdown content. Its metadata
+            counts the page's requests ("requests", "blocked_requests",
+            "bytes_transferred").
         """
-        # Use default delay if not specified
-        actual_delay = delay if delay is not None else self.default_delay
-
-        # Build run configuration
-        run_config = CrawlerRunConfig(
-            cache_mode=CacheMode.ENABLED if self.use_cache else CacheMode.BYPASS,
+        shared, meter = self._traffic(resource_allowlist)
+        run_config = self._run_config(
             css_selector=css_selector,
             wait_for=wait_for,
             js_code=js_code,
-            page_timeout=timeout,
-            delay_before_return_html=actual_delay,
+            timeout=timeout,
+            delay=delay,
+            shared_data=shared,
             **kwargs,
         )
 
         try:
-            async with AsyncWebCrawler(config=self._browser_config) as crawler:
-                result = await crawler.arun(url=url, config=run_config)
-
+            async with self._browser() as crawler:
+                result = self._to_result(url, await crawler.arun(url=url, config=run_config))
                 if result.success:
-                    return CrawlResult(
-                        url=url,
-                        markdown=result.markdown or "",
-                        html=result.html,
-                        title=result.metadata.get("title") if result.metadata else None,
-                        success=True,
-                        metadata={
-                            "status_code": result.status_code if hasattr(result, 'status_code') else None,
-                            "links_count": len(result.links) if hasattr(result, 'links') and result.links else 0,
-                        },
-                    )
-                else:
-                    return CrawlResult(
-                        url=url,
-                        markdown="",
-                        success=False,
-                        error=result.error_message if hasattr(result, 'error_message') else "Unknown error",
-                    )
+                    result.metadata.update(meter.to_dict())
+                return result
 
         except Exception as e:
             return CrawlResult(
@@ -155,6 +360,145 @@ class OfficialCrawler(BaseCrawler):
                 error=str(e),
             )
 
+    async def crawl_pages(
+        self,
+        url: str,
+        pagination: Pagination,
+        known_ids: Optional[KnownIdsLookup] = None,
+        css_selector: Optional[str] = None,
+        timeout: int = 30000,
+        delay: Optional[float] = None,
+        resource_allowlist: Optional[list[str]] = None,
+    ) -> CrawlResult:
+        """Crawl a paginated list, stopping once it reaches known jobs.
+
+        All pages are loaded in one browser (the warm one if started);
+        NEXT_BUTTON and SCROLL advance the same tab with JavaScript. The
+        walk ends after the first page whose job IDs (see
+        Pagination.id_pattern) are all known, when advancing yields no new
+        content, at max_pages, or at the first failed page after page 1.
+
+        Args:
+            url: URL of the first page.
+            pagination: How to reach the following pages.
+            known_ids: Returns which of the given external IDs are already
+                stored. Without it the walk does not stop early.
+            css_selector: CSS selector to extract specific content.
+            timeout: Page load timeout in milliseconds, per page.
+            delay: Delay before extracting the first page (see crawl()).
+            resource_allowlist: See crawl().
+
+        Returns:
+            CrawlResult for the whole list: the pages' markdown joined by
+            horizontal rules (for SCROLL, the final page, which contains
+            all loaded rows), the HTML and headers of the first page (final
+            page for SCROLL), "pages" and "stop_reason" in metadata, and
+            request counts summed over all pages. Unsuccessful only if the
+            first page failed.
+        """
+        shared, meter = self._traffic(resource_allowlist)
+        in_tab = pagination.mode != PaginationMode.URL_TEMPLATE
+        session_id = f"pages-{uuid.uuid4().hex}" if in_tab else None
+        pages: list[CrawlResult] = []
+        seen_ids: set[str] = set()
+        seen_pages: set[str] = set()
+        stop_reason = "max_pages"
+
+        try:
+            async with self._browser() as crawler:
+                try:
+                    for number in range(1, pagination.max_pages + 1):
+                        page_url = url
+                        if number == 1:
+                            config = self._run_config(
+                                css_selector,
+                                timeout=timeout,
+                                delay=delay,
+                                session_id=session_id,
+                                shared_data=shared,
+                            )
+                        elif in_tab:
+                            config = self._run_config(
+                                css_selector,
+                                wait_for=pagination.wait_for,
+                                js_code=pagination.advance_js(),
+                                timeout=timeout,
+                                delay=pagination.delay,
+                                session_id=session_id,
+                                js_only=True,
+                                cache_mode=CacheMode.BYPASS,
+                                shared_data=shared,
+                            )
+                        else:
+                            page_url = pagination.page_url(number)
+                            config = self._run_config(
+                                css_selector,
+                                wait_for=pagination.wait_for,
+                                timeout=timeout,
+                                delay=pagination.delay,
+                                shared_data=shared,
+                            )
+
+                        page = self._to_result(
+                            page_url, await crawler.arun(url=page_url, config=config)
+                        )
+                        if not page.success:
+                            if not pages:
+                                return page
+                            logger.warning(f"{url}: page {number} failed: {page.error}")
+                            stop_reason = "error"
+                            break
+
+                        digest = hashlib.sha256(page.markdown.encode("utf-8")).hexdigest()
+                        if digest in seen_pages:
+                            # Advancing did not change the page: no next page
+                            stop_reason = "last_page"
+                            break
+                        seen_pages.add(digest)
+                        pages.append(page)
+
+                        ids = pagination.job_ids(page.markdown) - seen_ids
+                        seen_ids |= ids
+                        if number > 1 and pagination.id_pattern and not ids:
+                            stop_reason = "last_page"
+                            break
+                        if ids and known_ids is not None and ids <= await known_ids(ids):
+                            stop_reason = "known"
+                            break
+                finally:
+                    if session_id:
+                        # Close the tab even if the walk failed, so a warm
+                        # browser does not collect orphaned session pages
+                        try:
+                            await crawler.crawler_strategy.kill_session(session_id)
+                        except Exception as e:
+                            logger.debug(f"{url}: closing session failed: {e}")
+        except Exception as e:
+            if not pages:
+                return CrawlResult(url=url, markdown="", success=False, error=str(e))
+            logger.warning(f"{url}: pagination aborted after {len(pages)} pages: {e}")
+            stop_reason = "error"
+
+        if pagination.mode == PaginationMode.SCROLL:
+            base, markdown = pages[-1], pages[-1].markdown
+        else:
+            base = pages[0]
+            markdown = "\n\n---\n\n".join(page.markdown for page in pages)
+        logger.debug(f"{url}: crawled {len(pages)} pages ({stop_reason})")
+        return CrawlResult(
+            url=url,
+            markdown=markdown,
+            html=base.html,
+            title=pages[0].title,
+            success=True,
+            metadata={
+                **(base.metadata or {}),
+                **meter.to_dict(),
+                "pages": len(pages),
+                "stop_reason": stop_reason,
+            },
+        )
+
     async def crawl_many(
         self,
         urls: list[str],
@@ -186,13 +530,23 @@ class OfficialCrawler(BaseCrawler):
         Returns:
             CrawlResult with extracted content.
         """
-        result = await self.crawl(
-            url=target.url,
-            css_selector=target.css_selector,
-            wait_for=target.wait_for,
-            js_code=target.js_code,
-            delay=target.delay if target.delay > 0 else None,
-        )
+        if target.pagination is not None:
+            result = await self.crawl_pages(
+                target.url,
+                target.pagination,
+                css_selector=target.css_selector,
+                delay=target.delay if target.delay > 0 else None,
+                resource_allowlist=target.resource_allowlist,
+            )
+        else:
+            result = await self.crawl(
+                url=target.url,
+                css_selector=target.css_selector,
+                wait_for=target.wait_for,
+                js_code=target.js_code,
+                delay=target.delay if target.delay > 0 else None,
+                resource_allowlist=target.resource_allowlist,
+            )
         # Add target metadata to result
         if result.metadata is None:
             result.metadata = {}
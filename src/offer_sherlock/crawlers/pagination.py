@@ -0,0 +1,113 @@
+"""Pagination settings for multi-page career lists.
+
+Many career sites show only the first screen of openings; the rest sit
+behind a "next" button, numbered page URLs or infinite scroll. A crawl
+target configured with a Pagination is walked page by page by
+OfficialCrawler.crawl_pages(), which stops early once a page only lists
+jobs that are already in the database, so an incremental run usually
+touches one or two pages.
+"""
+
+import json
+import re
+from dataclasses import asdict, dataclass
+from enum import Enum
+from typing import Optional
+
+
+class PaginationMode(str, Enum):
+    """How to get from one list page to the next."""
+
+    NEXT_BUTTON = "next_button"  # click a "next" button in the same tab
+    URL_TEMPLATE = "url_template"  # load numbered page URLs
+    SCROLL = "scroll"  # scroll to the bottom to load more rows
+
+
+# JS run in the page to advance it (js_only, same browser session)
+_CLICK_JS = "document.querySelector({selector})?.click();"
+_SCROLL_JS = "window.scrollTo(0, document.body.scrollHeight);"
+
+
+@dataclass
+class Pagination:
+    """Pagination settings of a crawl target.
+
+    Attributes:
+        mode: How to reach the next page.
+        next_selector: CSS selector of the "next" button (NEXT_BUTTON).
+        url_template: URL of page n with a ``{page}`` placeholder, e.g.
+            ``https://careers.example.com/jobs?page={page}`` (URL_TEMPLATE).
+            The first page is the target URL itself; the template is used
+            from page 2 on.
+        max_pages: Upper bound on pages per crawl, including the first.
+        id_pattern: Regex whose first group captures a job's external ID
+            from the page markdown (typically from its detail link, e.g.
+            ``/jobs/(\\d+)``). The captured values must match what the
+            extractor stores as job_id_external. Without it the walk only
+            stops at max_pages or when a page adds nothing new.
+        wait_for: Wait condition after advancing (Crawl4AI syntax, e.g.
+            ``css:.job-card``).
+        delay: Seconds to wait after advancing before reading the page.
+    """
+
+    mode: PaginationMode
+    next_selector: Optional[str] = None
+    url_template: Optional[str] = None
+    max_pages: int = 10
+    id_pattern: Optional[str] = None
+    wait_for: Optional[str] = None
+    delay: float = 2.0
+
+    def __post_init__(self):
+        self.mode = PaginationMode(self.mode)
+        if self.mode == PaginationMode.NEXT_BUTTON and not self.next_selector:
+            raise ValueError("next_button pagination needs next_selector")
+        if self.mode == PaginationMode.URL_TEMPLATE and "{page}" not in (
+            self.url_template or ""
+        ):
+            raise ValueError("url_template pagination needs a {page} placeholder")
+        if self.max_pages < 1:
+            raise ValueError("max_pages must be at least 1")
+        self._id_regex = re.compile(self.id_pattern) if self.id_pattern else None
+
+    @classmethod
+    def from_dict(cls, data: Optional[dict]) -> Optional["Pagination"]:
+        """Build settings from their stored form (CrawlTarget.pagination).
+
+        Args:
+            data: Stored settings, or None.
+
+        Returns:
+            Pagination, or None if the target is not paginated.
+        """
+        if not data:
+            return None
+        return cls(**data)
+
+    def to_dict(self) -> dict:
+        """Stored form of the settings (JSON-serializable)."""
+        data = asdict(self)
+        data["mode"] = self.mode.value
+        return {key: value for key, value in data.items() if value is not None}
+
+    def page_url(self, page: int) -> str:
+        """URL of a page (URL_TEMPLATE, pages counted from 1)."""
+        return self.url_template.format(page=page)
+
+    def advance_js(self) -> str:
+        """JavaScript that moves the open page on to the next one."""
+        if self.mode == PaginationMode.NEXT_BUTTON:
+            # JSON string literals are valid JavaScript string literals
+            return _CLICK_JS.format(selector=json.dumps(self.next_selector))
+        return _SCROLL_JS
+
+    def job_ids(self, markdown: str) -> set[str]:
+        """External job IDs listed on a page (empty without id_pattern)."""
+        if self._id_regex is None:
+            return set()
+        ids = set()
+        for match in self._id_regex.finditer(markdown or ""):
+            value = match.group(1) if self._id_regex.groups else match.group(0)
+            if value:
+                ids.add(value)
+        return ids
@@ -0,0 +1,215 @@
+"""Browser recycling for long-running crawls.
+
+A scheduler process runs for weeks, and a browser kept open across crawls
+grows with every page it renders (renderer caches, leaked listeners,
+detached DOM). A RecyclePolicy bounds that growth: once a browser has
+opened a number of pages, or its Chromium processes use more memory than
+allowed, the crawler closes it and launches a fresh one between crawls.
+"""
+
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterable, Optional
+
+import psutil
+
+logger = logging.getLogger(__name__)
+
+# Process names of Playwright's Chromium builds
+BROWSER_PROCESS_NAMES = ("chrome", "chromium", "headless_shell")
+
+MB = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class RecyclePolicy:
+    """When a long-lived browser is replaced.
+
+    Attributes:
+        max_pages: Pages a browser may open before it is replaced
+            (None for no limit).
+        max_rss_mb: Resident memory of the browser's Chromium processes,
+            in MB, above which it is replaced (None for no limit). Other
+            browsers of the process are not counted. Chromium shares
+            memory between its processes, so the sum overstates real
+            usage; set the limit with that in mind.
+        check_every: Pages between memory checks (reading the process
+            table costs a few milliseconds).
+    """
+
+    max_pages: Optional[int] = 100
+    max_rss_mb: Optional[float] = 1536.0
+    check_every: int = 10
+
+    def __post_init__(self):
+        if self.max_pages is not None and self.max_pages < 1:
+            raise ValueError("max_pages must be at least 1")
+        if self.check_every < 1:
+            raise ValueError("check_every must be at least 1")
+
+
+class BrowserBudget:
+    """Pages and memory used by one browser against a RecyclePolicy.
+
+    Example:
+        >>> budget = BrowserBudget(RecyclePolicy(max_pages=50))
+        >>> async with budget.launching():
+        ...     await browser.start()
+        >>> budget.record()
+        >>> if await budget.exhausted():
+        ...     ...  # replace the browser, then budget.reset()
+    """
+
+    def __init__(self, policy: RecyclePolicy):
+        """Initialize the budget.
+
+        Args:
+            policy: Limits to enforce.
+        """
+        self.policy = policy
+        self.pages = 0
+        self._last_check = 0
+        # Chromium main processes of the governed browser
+        self.processes: set[int] = set()
+
+    def record(self, pages: int = 1) -> None:
+        """Count pages opened by the browser."""
+        self.pages += pages
+
+    def reset(self) -> None:
+        """Start counting for a fresh browser."""
+        self.pages = 0
+        self._last_check = 0
+
+    @asynccontextmanager
+    async def launching(self) -> AsyncIterator[None]:
+        """Wrap a browser launch to govern the processes it starts.
+
+        The Chromium processes that appear during the launch are taken to
+        be the browser's, so memory checks leave out every other browser
+        of the process (a replaced one finishing its last crawl, another
+        crawler's). Counting restarts for the new browser.
+        """
+        before = await asyncio.to_thread(browser_pids)
+        yield
+        started = await asyncio.to_thread(browser_pids)
+        self.processes = _roots(started - before)
+        self.reset()
+
+    async def exhausted(self) -> Optional[str]:
+        """Check whether the browser is due for replacement.
+
+        Memory is only checked for a browser started under launching().
+
+        Returns:
+            "pages" or "memory" if a limit is reached, else None.
+        """
+        policy = self.policy
+        if policy.max_pages is not None and self.pages >= policy.max_pages:
+            return "pages"
+        if policy.max_rss_mb is None or not self.processes:
+            return None
+        if self.pages - self._last_check < policy.check_every:
+            return None
+        self._last_check = self.pages
+        rss = await asyncio.to_thread(tree_rss, self.processes)
+        if rss > policy.max_rss_mb * MB:
+            logger.info(f"Browser memory {rss / MB:.0f} MB over {policy.max_rss_mb:.0f} MB")
+            return "memory"
+        return None
+
+
+def _descendants(pid: Optional[int] = None) -> list[psutil.Process]:
+    try:
+        return psutil.Process(pid or os.getpid()).children(recursive=True)
+    except psutil.NoSuchProcess:
+        return []
+
+
+def _rss(process: psutil.Process) -> int:
+    try:
+        return process.memory_info().rss
+    except (psutil.NoSuchProcess, psutil.AccessDenied):
+        return 0
+
+
+def _browsers(pid: Optional[int] = None) -> list[psutil.Process]:
+    found = []
+    for child in _descendants(pid):
+        try:
+            name = child.name().lower()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+        if any(browser in name for browser in BROWSER_PROCESS_NAMES):
+            found.append(child)
+    return found
+
+
+def _roots(pids: set[int]) -> set[int]:
+    """The processes of ``pids`` whose parent is not among them."""
+    roots = set()
+    for pid in pids:
+        try:
+            if psutil.Process(pid).ppid() not in pids:
+                roots.add(pid)
+        except psutil.NoSuchProcess:
+            continue
+    return roots
+
+
+def browser_pids(pid: Optional[int] = None) -> set[int]:
+    """IDs of the Chromium processes started by a process.
+
+    Args:
+        pid: Parent process, this process if None.
+
+    Returns:
+        Process IDs.
+    """
+    return {process.pid for process in _browsers(pid)}
+
+
+def browser_rss(pid: Optional[int] = None) -> int:
+    """Resident memory of the Chromium processes started by a process.
+
+    Args:
+        pid: Parent process, this process if None.
+
+    Returns:
+        Summed RSS in bytes.
+    """
+    return sum(_rss(process) for process in _browsers(pid))
+
+
+def tree_rss(pids: Iterable[int]) -> int:
+    """Resident memory of some processes and everything they started.
+
+    Args:
+        pids: Root processes; those that have exited count as 0.
+
+    Returns:
+        Summed RSS in bytes.
+    """
+    total = 0
+    for pid in pids:
+        try:
+            total += process_tree_rss(pid)
+        except psutil.NoSuchProcess:
+            continue
+    return total
+
+
+def process_tree_rss(pid: Optional[int] = None) -> int:
+    """Resident memory of a process and everything it started.
+
+    Args:
+        pid: Root process, this process if None.
+
+    Returns:
+        Summed RSS in bytes (Python, Playwright drivers and browsers).
+    """
+    root = psutil.Process(pid or os.getpid())
+    return _rss(root) + sum(_rss(child) for child in _descendants(pid))
@@ -0,0 +1,337 @@
+"""Record crawl results and replay them offline.
+
+Benchmarks and end-to-end tests of IntelAgent should not need Chromium or
+the live career sites. A RecordingCrawler wraps a real crawler and writes
+every CrawlResult to a CrawlRecording; a ReplayCrawler serves the
+recorded results by URL, with the recorded or a synthetic latency, so a
+full pipeline run is repeatable and runs anywhere.
+
+A recording is a directory:
+
+    <root>/index.jsonl   one line per crawl (URL, hashes, metadata, timing)
+    <root>/blobs/        markdown and HTML as zstd blobs (see PageArchive)
+
+Bodies are content-addressed, so recording the same page many times only
+adds index lines.
+"""
+
+import asyncio
+import json
+import logging
+import random
+import re
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+from offer_sherlock.crawlers.base import BaseCrawler, CrawlResult
+from offer_sherlock.database.archive import PageArchive
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.jsonl"
+BLOB_DIR = "blobs"
+
+# Header written by the crawl scripts in front of saved markdown
+_URL_LINE = re.compile(r"^URL:\s*(\S+)\s*$", re.MULTILINE)
+_HEADER_END = re.compile(r"^---\s*$", re.MULTILINE)
+
+
+@dataclass
+class RecordedCrawl:
+    """Index entry of one recorded crawl.
+
+    Attributes:
+        url: URL that was crawled.
+        markdown_hash: Archive hash of the markdown.
+        html_hash: Archive hash of the HTML, if there was any.
+        title: Page title.
+        success: Whether the crawl succeeded.
+        error: Error message of a failed crawl.
+        metadata: CrawlResult metadata (status, request counts, pages).
+        elapsed: Seconds the crawl took.
+        crawled_at: When the crawl happened (ISO 8601).
+    """
+
+    url: str
+    markdown_hash: str
+    html_hash: Optional[str] = None
+    title: Optional[str] = None
+    success: bool = True
+    error: Optional[str] = None
+    metadata: dict = field(default_factory=dict)
+    elapsed: float = 0.0
+    crawled_at: Optional[str] = None
+
+
+class CrawlRecording:
+    """Recorded crawl results in a directory.
+
+    Example:
+        >>> recording = CrawlRecording("data/recordings/2026-10-19")
+        >>> recording.add(crawl_result, elapsed=4.2)
+        >>> recording.urls()
+        ['https://careers.tencent.com/...']
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        """Open a recording (created on first write).
+
+        Args:
+            root: Recording directory.
+        """
+        self.root = Path(root)
+        self.archive = PageArchive(self.root / BLOB_DIR)
+        self._lock = threading.Lock()
+        self._entries: dict[str, list[RecordedCrawl]] = {}
+        index = self.root / INDEX_FILE
+        if index.exists():
+            with index.open(encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = RecordedCrawl(**json.loads(line))
+                        self._entries.setdefault(entry.url, []).append(entry)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def urls(self) -> list[str]:
+        """Recorded URLs, in the order first recorded."""
+        return list(self._entries)
+
+    def entries(self, url: str) -> list[RecordedCrawl]:
+        """Recorded crawls of a URL, oldest first."""
+        return self._entries.get(url, [])
+
+    def add(self, result: CrawlResult, elapsed: float = 0.0) -> RecordedCrawl:
+        """Record a crawl result.
+
+        Args:
+            result: Result to record.
+            elapsed: Seconds the crawl took.
+
+        Returns:
+            The index entry written.
+        """
+        entry = RecordedCrawl(
+            url=result.url,
+            markdown_hash=self.archive.put(result.markdown or ""),
+            html_hash=self.archive.put(result.html) if result.html else None,
+            title=result.title,
+            success=result.success,
+            error=result.error,
+            # Round-trip through JSON so replays see what the file holds
+            metadata=json.loads(json.dumps(result.metadata or {}, default=str)),
+            elapsed=round(elapsed, 3),
+            crawled_at=result.crawled_at.isoformat() if result.crawled_at else None,
+        )
+        line = json.dumps(asdict(entry), ensure_ascii=False)
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            with (self.root / INDEX_FILE).open("a", encoding="utf-8") as f:
+                f.write(line + "\n")
+            self._entries.setdefault(entry.url, []).append(entry)
+        return entry
+
+    def load(self, entry: RecordedCrawl) -> CrawlResult:
+        """Rebuild the CrawlResult of an index entry."""
+        return CrawlResult(
+            url=entry.url,
+            markdown=self.archive.get_text(entry.markdown_hash),
+            html=self.archive.get_text(entry.html_hash) if entry.html_hash else None,
+            title=entry.title,
+            success=entry.success,
+            error=entry.error,
+            crawled_at=datetime.fromisoformat(entry.crawled_at) if entry.crawled_at else None,
+            metadata=dict(entry.metadata),
+        )
+
+    def import_markdown(self, paths: Iterable[Union[str, Path]]) -> int:
+        """Record saved markdown pages (e.g. data/crawl_results/*.md).
+
+        The files must start with the header the crawl scripts write
+        ("URL: ..." followed by a "---" line); files without a URL are
+        skipped.
+
+        Args:
+            paths: Markdown files.
+
+        Returns:
+            Number of pages recorded.
+        """
+        added = 0
+        for path in paths:
+            path = Path(path)
+            text = path.read_text(encoding="utf-8")
+            match = _URL_LINE.search(text)
+            if match is None:
+                logger.warning(f"Skipping {path}: no URL header")
+                continue
+            end = _HEADER_END.search(text, match.end())
+            body = text[end.end():].lstrip("\n") if end else text[match.end():]
+            title = text.splitlines()[0].lstrip("# ").strip() or None
+            self.add(CrawlResult(url=match.group(1), markdown=body, title=title))
+            added += 1
+        return added
+
+
+class RecordingCrawler(BaseCrawler):
+    """Crawler that records every result of another crawler.
+
+    Example:
+        >>> recording = CrawlRecording("data/recordings/today")
+        >>> async with RecordingCrawler(OfficialCrawler(), recording) as crawler:
+        ...     result = await crawler.crawl(url)
+    """
+
+    def __init__(self, crawler: BaseCrawler, recording: CrawlRecording):
+        """Initialize the recorder.
+
+        Args:
+            crawler: Crawler doing the actual crawling.
+            recording: Where results are recorded.
+        """
+        self.crawler = crawler
+        self.recording = recording
+
+    async def _record(self, crawl, url: str, *args, **kwargs) -> CrawlResult:
+        start = time.perf_counter()
+        result = await crawl(url, *args, **kwargs)
+        elapsed = time.perf_counter() - start
+        try:
+            await asyncio.to_thread(self.recording.add, result, elapsed)
+        except Exception as e:
+            logger.warning(f"Failed to record {url}: {e}")
+        return result
+
+    async def crawl(self, url: str, **kwargs) -> CrawlResult:
+        """Crawl a URL with the wrapped crawler and record the result."""
+        return await self._record(self.crawler.crawl, url, **kwargs)
+
+    async def crawl_pages(self, url: str, pagination, **kwargs) -> CrawlResult:
+        """Crawl a paginated list and record the combined result."""
+        return await self._record(self.crawler.crawl_pages, url, pagination, **kwargs)
+
+    async def crawl_many(self, urls: list[str], **kwargs) -> list[CrawlResult]:
+        """Crawl and record several URLs concurrently."""
+        return await asyncio.gather(*(self.crawl(url, **kwargs) for url in urls))
+
+    async def __aenter__(self) -> "RecordingCrawler":
+        if hasattr(self.crawler, "start"):
+            await self.crawler.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        if hasattr(self.crawler, "close"):
+            await self.crawler.close()
+
+
+class ReplayCrawler(BaseCrawler):
+    """Crawler serving recorded results by URL, without a browser.
+
+    Crawl options (selectors, pagination, resource allowlists) are
+    accepted and ignored: a URL returns what was recorded for it. A URL
+    recorded several times returns its recordings in order, then keeps
+    returning the last one, so replaying a series of runs reproduces the
+    page changes between them.
+
+    Example:
+        >>> crawler = ReplayCrawler(CrawlRecording("data/recordings/today"), latency=0.5)
+        >>> agent = IntelAgent(db, crawler=crawler)
+    """
+
+    def __init__(
+        self,
+        recording: CrawlRecording,
+        latency: Optional[float] = None,
+        time_scale: float = 1.0,
+        jitter: float = 0.0,
+        seed: int = 0,
+    ):
+        """Initialize the replay.
+
+        Args:
+            recording: Recorded results to serve.
+            latency: Seconds every crawl takes. If None, each crawl takes
+                its recorded time multiplied by time_scale.
+            time_scale: Factor on recorded times (0 replays instantly).
+            jitter: Random spread of the latency as a fraction (0.2 means
+                +/-20%), drawn from a generator seeded with ``seed`` so runs
+                are repeatable.
+            seed: Seed of the jitter.
+        """
+        self.recording = recording
+        self.latency = latency
+        self.time_scale = time_scale
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._served: dict[str, int] = {}
+        # Bodies are decompressed once per recorded crawl
+        self._bodies: dict[str, CrawlResult] = {}
+        self.crawls = 0
+        self.misses = 0
+
+    def _delay(self, entry: RecordedCrawl) -> float:
+        delay = self.latency if self.latency is not None else entry.elapsed * self.time_scale
+        if self.jitter:
+            delay *= 1 + self._random.uniform(-self.jitter, self.jitter)
+        return max(0.0, delay)
+
+    async def crawl(self, url: str, **kwargs) -> CrawlResult:
+        """Return the next recorded result for a URL.
+
+        Args:
+            url: URL to crawl.
+            **kwargs: Ignored crawl options.
+
+        Returns:
+            The recorded CrawlResult (a fresh copy), or an unsuccessful
+            one if the URL was never recorded.
+        """
+        self.crawls += 1
+        entries = self.recording.entries(url)
+        if not entries:
+            self.misses += 1
+            return CrawlResult(url=url, markdown="", success=False, error="Not recorded")
+        index = self._served.get(url, 0)
+        self._served[url] = index + 1
+        entry = entries[min(index, len(entries) - 1)]
+
+        await asyncio.sleep(self._delay(entry))
+        key = f"{url}\n{entry.markdown_hash}\n{entry.html_hash}"
+        recorded = self._bodies.get(key)
+        if recorded is None:
+            recorded = self.recording.load(entry)
+            self._bodies[key] = recorded
+        return CrawlResult(
+            url=recorded.url,
+            markdown=recorded.markdown,
+            html=recorded.html,
+            title=recorded.title,
+            success=recorded.success,
+            error=recorded.error,
+            metadata=dict(recorded.metadata or {}),
+        )
+
+    async def crawl_pages(self, url: str, pagination=None, **kwargs) -> CrawlResult:
+        """Return the recorded result of a paginated list (see crawl())."""
+        return await self.crawl(url)
+
+    async def crawl_many(self, urls: list[str], **kwargs) -> list[CrawlResult]:
+        """Replay several URLs concurrently."""
+        return await asyncio.gather(*(self.crawl(url) for url in urls))
+
+    async def start(self) -> None:
+        """Nothing to launch (for OfficialCrawler compatibility)."""
+
+    async def close(self) -> None:
+        """Nothing to close (for OfficialCrawler compatibility)."""
+
+    async def __aenter__(self) -> "ReplayCrawler":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        pass
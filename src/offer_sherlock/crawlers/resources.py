@@ -0,0 +1,161 @@
+"""Request interception for lean career-page crawling.
+
+Only the text of a career page is used, yet a full page load pulls images,
+fonts, video and third-party trackers, which dominate the bytes transferred
+and delay the load event. A ResourcePolicy decides per request whether the
+browser may fetch it; OfficialCrawler installs it as a Playwright route on
+every page it opens.
+
+Blocking is by Playwright resource type (so images served without a file
+extension are caught too) and by tracker host. A target that needs some of
+these to render its job list (e.g. job cards loaded from an image CDN host
+that also serves the data, or an icon font used as text) gets a per-target
+allowlist of resource types and hosts.
+"""
+
+from dataclasses import dataclass, field, replace
+from typing import Iterable, Optional
+from urllib.parse import urlparse
+
+# Playwright resource types (Request.resource_type)
+RESOURCE_TYPES = frozenset({
+    "document", "stylesheet", "image", "media", "font", "script", "texttrack",
+    "xhr", "fetch", "eventsource", "websocket", "manifest", "ping", "other",
+})
+
+# Never needed for text: pictures, video/audio, web fonts, beacons
+DEFAULT_BLOCKED_TYPES = frozenset({"image", "media", "font", "texttrack", "ping", "manifest"})
+
+# Analytics, ad and session-recording hosts seen on career sites
+TRACKER_DOMAINS = (
+    # International
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "facebook.net",
+    "connect.facebook.net",
+    "analytics.tiktok.com",
+    "bat.bing.com",
+    "clarity.ms",
+    "hotjar.com",
+    "fullstory.com",
+    "mixpanel.com",
+    "segment.com",
+    "segment.io",
+    "amplitude.com",
+    "nr-data.net",
+    "newrelic.com",
+    "demdex.net",
+    "omtrdc.net",
+    "adobedtm.com",
+    "scorecardresearch.com",
+    "snap.licdn.com",
+    "ads.linkedin.com",
+    "optimizely.com",
+    "onetrust.com",
+    "cookielaw.org",
+    # Chinese
+    "hm.baidu.com",
+    "cnzz.com",
+    "umeng.com",
+    "sensorsdata.cn",
+    "growingio.com",
+    "zhugeio.com",
+    "tongji.baidu.com",
+    "mmstat.com",
+)
+
+
+@dataclass
+class TrafficMeter:
+    """Request counters of one crawl.
+
+    Attributes:
+        requests: Requests the page issued (including blocked ones).
+        blocked: Requests aborted by the policy.
+        bytes_transferred: Response headers and bodies received, if
+            measured (see OfficialCrawler's measure_traffic).
+    """
+
+    requests: int = 0
+    blocked: int = 0
+    bytes_transferred: int = 0
+
+    def to_dict(self) -> dict:
+        """Metadata entries for CrawlResult.metadata."""
+        return {
+            "requests": self.requests,
+            "blocked_requests": self.blocked,
+            "bytes_transferred": self.bytes_transferred,
+        }
+
+
+@dataclass(frozen=True)
+class ResourcePolicy:
+    """Which requests a crawl may make.
+
+    Attributes:
+        blocked_types: Playwright resource types to abort.
+        blocked_domains: Hosts (and their subdomains) to abort.
+        allowed_types: Resource types never aborted.
+        allowed_domains: Hosts (and their subdomains) never aborted.
+
+    Example:
+        >>> policy = ResourcePolicy().allowing(["font", "img.example.com"])
+        >>> policy.blocks("image", "https://img.example.com/logo.png")
+        False
+    """
+
+    blocked_types: frozenset[str] = DEFAULT_BLOCKED_TYPES
+    blocked_domains: tuple[str, ...] = TRACKER_DOMAINS
+    allowed_types: frozenset[str] = field(default_factory=frozenset)
+    allowed_domains: tuple[str, ...] = ()
+
+    def allowing(self, allowlist: Optional[Iterable[str]]) -> "ResourcePolicy":
+        """Copy of the policy with a target's allowlist applied.
+
+        Args:
+            allowlist: Resource types (e.g. "font", "image") and hosts (e.g.
+                "static.example.com") the target needs.
+
+        Returns:
+            The policy itself if the allowlist is empty.
+        """
+        entries = [entry.strip().lower() for entry in allowlist or () if entry.strip()]
+        if not entries:
+            return self
+        types = {entry for entry in entries if entry in RESOURCE_TYPES}
+        domains = tuple(entry for entry in entries if entry not in RESOURCE_TYPES)
+        return replace(
+            self,
+            allowed_types=self.allowed_types | types,
+            allowed_domains=self.allowed_domains + domains,
+        )
+
+    def blocks(self, resource_type: str, url: str) -> bool:
+        """Check whether a request is aborted.
+
+        Args:
+            resource_type: Playwright resource type of the request.
+            url: Request URL.
+
+        Returns:
+            True if the request must not be made.
+        """
+        host = urlparse(url).hostname or ""
+        if _matches(host, self.allowed_domains):
+            return False
+        if _matches(host, self.blocked_domains):
+            return True
+        return resource_type in self.blocked_types and resource_type not in self.allowed_types
+
+
+def _matches(host: str, domains: tuple[str, ...]) -> bool:
+    """Check whether a host is one of the domains or a subdomain of one."""
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+
+# Default profile of OfficialCrawler
+LEAN_POLICY = ResourcePolicy()
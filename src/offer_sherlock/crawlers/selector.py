@@ -0,0 +1,169 @@
+"""Learn a CSS selector for the job list of a career page.
+
+Career pages wrap their job list in navigation, banners, filters and
+footers. Crawling with a CSS selector that covers only the list shrinks
+the markdown Crawl4AI generates and the prompt sent to the LLM. Most
+targets have no hand-written selector, so one is learned from a
+successful extraction: the smallest element of the page HTML containing
+the extracted job titles.
+
+A learned selector only stays useful while the site keeps its markup;
+IntelAgent falls back to the full page and relearns when it stops
+matching.
+"""
+
+import logging
+import re
+from typing import Iterable, Optional
+
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+from lxml.etree import ParserError
+
+logger = logging.getLogger(__name__)
+
+# Containers that are the whole page: nothing would be cut
+_PAGE_TAGS = frozenset({"html", "body"})
+
+# Ids and classes that look generated (hashes, counters, CSS modules)
+_VOLATILE_NAME = re.compile(r"\d{3,}|[0-9a-f]{6,}|__|^(?:css|sc|jsx)-")
+_NAME = re.compile(r"^-?[A-Za-z_][\w-]*$")
+
+# Ancestors climbed to make a selector unique
+_MAX_DEPTH = 6
+
+
+def learn_selector(
+    html: str,
+    titles: Iterable[str],
+    min_titles: int = 2,
+    min_coverage: float = 0.6,
+) -> Optional[str]:
+    """Find a selector for the smallest element holding the job titles.
+
+    Args:
+        html: Full page HTML.
+        titles: Job titles extracted from the page.
+        min_titles: Fewest titles that must be found in the HTML.
+        min_coverage: Fraction of the titles that must be found in the
+            HTML. Titles rewritten by the LLM or from other pages of a
+            paginated list are not found; if too few are, the container
+            of the rest may miss part of the list.
+
+    Returns:
+        A CSS selector matching exactly that element, or None if no
+        element smaller than the page holds the titles.
+    """
+    wanted = {_normalize(title) for title in titles}
+    wanted.discard("")
+    if len(wanted) < min_titles or not html:
+        return None
+    try:
+        root = lxml_html.fromstring(html)
+    except (ParserError, ValueError) as e:
+        logger.debug(f"Cannot parse page HTML: {e}")
+        return None
+
+    found = _title_elements(root, wanted)
+    if len(found) < min_titles or len(found) < min_coverage * len(wanted):
+        return None
+
+    container = _common_ancestor(found)
+    if container is None or container.tag in _PAGE_TAGS:
+        return None
+    selector = _selector_for(container)
+    if selector is None:
+        return None
+    matches = CSSSelector(selector)(root)
+    return selector if len(matches) == 1 and matches[0] is container else None
+
+
+def _normalize(text: str) -> str:
+    """Collapse whitespace and case for comparing titles."""
+    return " ".join(text.split()).lower()
+
+
+def _title_elements(root, wanted: set[str]) -> list:
+    """One innermost element containing each title found in the page.
+
+    A title may also appear outside the list (a "hot jobs" sidebar, the
+    navigation). Titles found in one place locate the list; of the other
+    titles, the occurrence inside that region is taken.
+    """
+    texts = {}
+    for element in root.iter():
+        if isinstance(element.tag, str) and element.tag not in ("script", "style"):
+            texts[element] = _normalize(element.text_content())
+
+    occurrences: dict[str, list] = {}
+    for element, text in texts.items():
+        for title in wanted:
+            if title in text and not any(title in texts.get(child, "") for child in element):
+                occurrences.setdefault(title, []).append(element)
+
+    for title, elements in occurrences.items():
+        if len(elements) > 1:
+            # Repeated within one job card (heading and description) it is
+            # still one occurrence: the card
+            card = _common_ancestor(elements)
+            if not any(other != title and other in texts[card] for other in occurrences):
+                occurrences[title] = [card]
+
+    unique = [elements[0] for elements in occurrences.values() if len(elements) == 1]
+    region = _common_ancestor(unique) if unique else None
+    found = []
+    for elements in occurrences.values():
+        inside = [
+            e
+            for e in elements
+            if region is not None and (e is region or region in e.iterancestors())
+        ]
+        found.append((inside or elements)[0])
+    return found
+
+
+def _common_ancestor(elements: list):
+    """Lowest element that is or contains all the elements."""
+    paths = [list(reversed([e, *e.iterancestors()])) for e in elements]
+    common = None
+    for nodes in zip(*paths):
+        if any(node is not nodes[0] for node in nodes):
+            break
+        common = nodes[0]
+    return common
+
+
+def _stable(name: str) -> bool:
+    return bool(_NAME.match(name)) and not _VOLATILE_NAME.search(name)
+
+
+def _step(element) -> str:
+    """Selector of an element among its siblings: tag plus stable classes."""
+    classes = [c for c in (element.get("class") or "").split() if _stable(c)]
+    return element.tag + "".join(f".{c}" for c in sorted(classes))
+
+
+def _selector_for(element) -> Optional[str]:
+    """Shortest selector path from a unique anchor to ``element``."""
+    root = element.getroottree().getroot()
+    parts = []
+    node = element
+    for _ in range(_MAX_DEPTH):
+        element_id = node.get("id")
+        if element_id and _stable(element_id):
+            parts.insert(0, f"#{element_id}")
+            return " > ".join(parts)
+        step = _step(node)
+        parent = node.getparent()
+        if parent is not None and len(CSSSelector(step)(root)) > 1:
+            same = [sibling for sibling in parent if sibling.tag == node.tag]
+            if len([s for s in same if _step(s) == step]) > 1:
+                step += f":nth-of-type({same.index(node) + 1})"
+        parts.insert(0, step)
+        selector = " > ".join(parts)
+        if len(CSSSelector(selector)(root)) == 1:
+            return selector
+        if parent is None or parent.tag in _PAGE_TAGS:
+            return None
+        node = parent
+    return None
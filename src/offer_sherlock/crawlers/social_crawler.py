@@ -7,6 +7,7 @@
 
 import asyncio
 import json
+import logging
 import re
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -17,6 +18,9 @@ from urllib.parse import quote
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
 
 from .base import BaseCrawler, CrawlResult
+from .recycling import BrowserBudget, RecyclePolicy
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -73,6 +77,7 @@ class XhsCrawler(BaseCrawler):
         headless: bool = False,
         storage_state_path: Optional[str] = None,
         timeout: int = 30000,
+        recycle: Optional[RecyclePolicy] = RecyclePolicy(),
     ):
         """
         初始化小红书爬虫。
@@ -81,6 +86,8 @@ class XhsCrawler(BaseCrawler):
             headless: 是否使用无头模式（首次登录建议 False）
             storage_state_path: 浏览器状态保存路径（用于保持登录）
             timeout: 页面加载超时时间（毫秒）
+            recycle: 浏览器重启策略（打开页面数或内存超限时保存登录状态并重启），
+                None 表示不重启
         """
         self.headless = headless
         self.storage_state_path = storage_state_path or str(
@@ -92,12 +99,36 @@ class XhsCrawler(BaseCrawler):
         self._context: Optional[BrowserContext] = None
         self._page: Optional[Page] = None
         self._playwright = None
+        self._budget = BrowserBudget(recycle) if recycle is not None else None
+        self.recycles = 0
 
     async def _ensure_browser(self) -> Page:
-        """确保浏览器已启动并返回页面。"""
-        if self._page is not None:
-            return self._page
+        """确保浏览器已启动并返回页面（每次调用计为一次页面访问）。"""
+        if self._page is not None and self._budget is not None:
+            reason = await self._budget.exhausted()
+            if reason is not None:
+                # 保存登录状态后重启浏览器，释放长时间运行积累的内存
+                await self._save_state()
+                await self.close()
+                self.recycles += 1
+                logger.info(f"小红书浏览器已重启 ({reason})")
+        if self._page is None:
+            try:
+                if self._budget is None:
+                    await self._launch()
+                else:
+                    async with self._budget.launching():
+                        await self._launch()
+            except Exception:
+                # 启动失败时不遗留 Playwright 进程
+                await self.close()
+                raise
+        if self._budget is not None:
+            self._budget.record()
+        return self._page
 
+    async def _launch(self) -> None:
+        """启动浏览器并打开页面。"""
         self._playwright = await async_playwright().start()
 
         self._browser = await self._playwright.chromium.launch(
@@ -124,7 +155,6 @@ class XhsCrawler(BaseCrawler):
             )
 
         self._page = await self._context.new_page()
-        return self._page
 
     async def _ensure_logged_in(self, page: Page, max_wait: int = 180) -> bool:
         """
@@ -533,19 +563,25 @@ class XhsCrawler(BaseCrawler):
         return "\n".join(lines)
 
     async def close(self):
-        """关闭浏览器。"""
-        if self._page:
-            await self._page.close()
-            self._page = None
-        if self._context:
-            await self._context.close()
-            self._context = None
-        if self._browser:
-            await self._browser.close()
-            self._browser = None
-        if self._playwright:
-            await self._playwright.stop()
-            self._playwright = None
+        """关闭浏览器（任一步失败也会继续关闭其余资源）。"""
+        page, self._page = self._page, None
+        context, self._context = self._context, None
+        browser, self._browser = self._browser, None
+        playwright, self._playwright = self._playwright, None
+        try:
+            if page:
+                await page.close()
+        finally:
+            try:
+                if context:
+                    await context.close()
+            finally:
+                try:
+                    if browser:
+                        await browser.close()
+                finally:
+                    if playwright:
+                        await playwright.stop()
 
     async def __aenter__(self):
         return self
@@ -0,0 +1,67 @@
+"""Per-host request throttling for polite concurrent crawling.
+
+Concurrent company processing must not hammer a single site, so the
+anti-scraping delay is enforced per host (or per platform for social
+media) instead of globally between companies.
+"""
+
+import asyncio
+import time
+from typing import Optional
+from urllib.parse import urlparse
+
+
+class HostThrottle:
+    """Enforce a minimum interval between requests to the same host.
+
+    Requests for different keys never wait on each other, so a worker pool
+    can crawl several sites in parallel while each individual site still
+    sees at most one request every ``min_interval`` seconds.
+
+    Example:
+        >>> throttle = HostThrottle(min_interval=2.0)
+        >>> await throttle.wait(HostThrottle.key_for("https://jobs.bytedance.com/x"))
+        >>> await throttle.wait("xiaohongshu")  # platform-level key
+    """
+
+    def __init__(self, min_interval: float = 0.0):
+        """Initialize the throttle.
+
+        Args:
+            min_interval: Minimum seconds between two requests to the same key.
+        """
+        self.min_interval = min_interval
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._last_request: dict[str, float] = {}
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        """Get the throttle key for a URL.
+
+        Args:
+            url: URL to be requested.
+
+        Returns:
+            Lower-cased host name, or the raw string if it is not a URL.
+        """
+        host = urlparse(url).netloc.lower()
+        return host or url
+
+    def last_request_at(self, key: str) -> Optional[float]:
+        """Get the monotonic timestamp of the last request for a key."""
+        return self._last_request.get(key)
+
+    async def wait(self, key: str) -> None:
+        """Wait until a request to ``key`` is allowed, then record it.
+
+        Args:
+            key: Host or platform key (see key_for()).
+        """
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            last = self._last_request.get(key)
+            if last is not None and self.min_interval > 0:
+                remaining = self.min_interval - (time.monotonic() - last)
+                if remaining > 0:
+                    await asyncio.sleep(remaining)
+            self._last_request[key] = time.monotonic()
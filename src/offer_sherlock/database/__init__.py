@@ -4,20 +4,46 @@ Provides SQLAlchemy ORM models and CRUD operations for persisting
 job postings, social insights, and crawl configurations.
 """
 
+from offer_sherlock.database.archive import PageArchive
+from offer_sherlock.database.async_operations import (
+    AsyncCrawlTargetRepository,
+    AsyncInsightRepository,
+    AsyncJobRepository,
+    AsyncRawPageRepository,
+)
+from offer_sherlock.database.async_session import AsyncDatabaseManager
+from offer_sherlock.database.export import (
+    ExportResult,
+    SnapshotExporter,
+    load_snapshot,
+)
 from offer_sherlock.database.models import (
     Base,
     CrawlTarget,
     Insight,
+    InsightCount,
     Job,
+    JobCompanyCount,
+    JobDailyCount,
+    JobTypeCount,
+    RawPage,
     SocialPost,
+    insight_posts,
 )
 from offer_sherlock.database.operations import (
     CrawlTargetRepository,
     InsightRepository,
     JobRepository,
+    Page,
+    RawPageRepository,
+    SocialPostRepository,
+    StatsRepository,
+    UpsertResult,
 )
 from offer_sherlock.database.session import (
     DatabaseManager,
+    PerformanceProfile,
+    PoolSettings,
     get_db,
     init_db,
 )
@@ -29,12 +55,36 @@ __all__ = [
     "Insight",
     "SocialPost",
     "CrawlTarget",
+    "RawPage",
+    "insight_posts",
+    "JobCompanyCount",
+    "JobDailyCount",
+    "JobTypeCount",
+    "InsightCount",
     # Repositories
     "JobRepository",
     "InsightRepository",
+    "SocialPostRepository",
     "CrawlTargetRepository",
+    "StatsRepository",
+    "RawPageRepository",
+    "UpsertResult",
+    "Page",
+    "AsyncJobRepository",
+    "AsyncInsightRepository",
+    "AsyncCrawlTargetRepository",
+    "AsyncRawPageRepository",
     # Session management
     "DatabaseManager",
+    "PerformanceProfile",
+    "PoolSettings",
+    "AsyncDatabaseManager",
     "get_db",
     "init_db",
+    # Raw page archive
+    "PageArchive",
+    # Snapshots
+    "SnapshotExporter",
+    "ExportResult",
+    "load_snapshot",
 ]
@@ -0,0 +1,152 @@
+"""Content-addressed archive of crawled pages.
+
+Crawled markdown and HTML are large, mostly repetitive between runs and
+only needed again for re-extraction, so they are kept out of the database:
+each page body is zstd-compressed and written once under its SHA-256,
+
+    <root>/ab/cd/abcd1234....zst
+
+and the raw_pages table records which target and URL was fetched when, and
+under which hashes. Jobs reference the page they were extracted from by
+hash (Job.raw_page_hash). A page fetched again with identical content
+costs a new index row but no new blob.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Union
+
+import zstandard
+
+logger = logging.getLogger(__name__)
+
+BLOB_SUFFIX = ".zst"
+
+
+def page_hash(content: Union[str, bytes]) -> str:
+    """SHA-256 hex digest of a page body (text is hashed as UTF-8)."""
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    return hashlib.sha256(content).hexdigest()
+
+
+class PageArchive:
+    """Store page bodies as deduplicated, zstd-compressed blobs on disk.
+
+    Thread-safe: blobs are written to a temporary file and renamed into
+    place, so concurrent writers of the same content never expose a
+    partial blob.
+
+    Example:
+        >>> archive = PageArchive("data/raw_pages")
+        >>> digest = archive.put(crawl_result.markdown)
+        >>> markdown = archive.get_text(digest)
+    """
+
+    def __init__(self, root: Union[str, Path], level: int = 10):
+        """Initialize the archive.
+
+        Args:
+            root: Directory holding the blobs (created on first write).
+            level: zstd compression level. Blobs are written once and read
+                rarely, so a high level is cheap overall.
+        """
+        self.root = Path(root)
+        self.level = level
+        # zstd (de)compressors are not thread-safe; keep one per thread
+        self._local = threading.local()
+
+    @classmethod
+    def from_settings(cls, settings=None) -> "PageArchive":
+        """Create the archive configured by RAW_ARCHIVE_DIR.
+
+        Args:
+            settings: Settings to use. Loads them from the environment if None.
+        """
+        if settings is None:
+            from offer_sherlock.utils.config import get_settings
+
+            settings = get_settings()
+        return cls(settings.raw_archive_dir)
+
+    def path(self, digest: str) -> Path:
+        """Path of the blob for a content hash."""
+        return self.root / digest[:2] / digest[2:4] / f"{digest}{BLOB_SUFFIX}"
+
+    def exists(self, digest: str) -> bool:
+        """Check whether a blob is stored."""
+        return self.path(digest).exists()
+
+    def put(self, content: Union[str, bytes]) -> str:
+        """Store a page body unless it is already archived.
+
+        Args:
+            content: Page text (stored as UTF-8) or bytes.
+
+        Returns:
+            SHA-256 hex digest of the content, its key in the archive.
+        """
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        digest = page_hash(content)
+        path = self.path(digest)
+        if path.exists():
+            return digest
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = self._compressor().compress(content)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        logger.debug(f"Archived {len(content)} bytes as {digest} ({len(data)} compressed)")
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        """Read an archived page body.
+
+        Args:
+            digest: Content hash returned by put().
+
+        Returns:
+            The original bytes.
+
+        Raises:
+            KeyError: If no blob is stored under the hash.
+        """
+        try:
+            data = self.path(digest).read_bytes()
+        except FileNotFoundError:
+            raise KeyError(digest) from None
+        return self._decompressor().decompress(data)
+
+    def get_text(self, digest: str) -> str:
+        """Read an archived page body as text."""
+        return self.get(digest).decode("utf-8")
+
+    def _compressor(self) -> zstandard.ZstdCompressor:
+        compressor = getattr(self._local, "compressor", None)
+        if compressor is None:
+            # Content size in the frame header lets decompress() size its buffer
+            compressor = zstandard.ZstdCompressor(level=self.level, write_content_size=True)
+            self._local.compressor = compressor
+        return compressor
+
+    def _decompressor(self) -> zstandard.ZstdDecompressor:
+        decompressor = getattr(self._local, "decompressor", None)
+        if decompressor is None:
+            decompressor = zstandard.ZstdDecompressor()
+            self._local.decompressor = decompressor
+        return decompressor
+
+    def __repr__(self) -> str:
+        return f"PageArchive(root='{self.root}')"
+
@@ -0,0 +1,272 @@
+"""Async repositories for use from coroutines.
+
+Each method runs the matching synchronous repository method in its own
+session on the AsyncDatabaseManager thread (one transaction per call).
+Returned ORM objects are detached but fully loaded; relationships that
+were not loaded during the call cannot be lazy-loaded afterwards.
+"""
+
+from datetime import datetime
+from typing import Iterable, Optional
+
+from offer_sherlock.database.async_session import AsyncDatabaseManager
+from offer_sherlock.database.models import CrawlTarget, Insight, Job, RawPage
+from offer_sherlock.database.operations import (
+    CrawlTargetRepository,
+    Cursor,
+    InsightRepository,
+    JobRepository,
+    Page,
+    RawPageRepository,
+    UpsertResult,
+)
+from offer_sherlock.schemas.insight import InsightSummary
+from offer_sherlock.schemas.job import JobPosting
+
+
+class AsyncJobRepository:
+    """Async counterpart of JobRepository.
+
+    Example:
+        >>> repo = AsyncJobRepository(adb)
+        >>> result = await repo.upsert_many(jobs, source_url=url)
+    """
+
+    def __init__(self, db: AsyncDatabaseManager):
+        """Initialize the repository.
+
+        Args:
+            db: Async database manager to run operations on.
+        """
+        self.db = db
+
+    async def add(self, job: JobPosting, source_url: Optional[str] = None) -> Job:
+        """Add or update a job. See JobRepository.add."""
+        return await self.db.run(lambda s: JobRepository(s).add(job, source_url))
+
+    async def upsert_many(
+        self,
+        jobs: list[JobPosting],
+        source_url: Optional[str] = None,
+        batch_size: int = 500,
+        raw_page_hash: Optional[str] = None,
+    ) -> UpsertResult:
+        """Insert or update jobs in bulk. See JobRepository.upsert_many."""
+        return await self.db.run(
+            lambda s: JobRepository(s).upsert_many(
+                jobs, source_url, batch_size, raw_page_hash=raw_page_hash
+            )
+        )
+
+    async def get_by_external_id(self, external_id: str) -> Optional[Job]:
+        """Get a job by its external ID."""
+        return await self.db.run(lambda s: JobRepository(s).get_by_external_id(external_id))
+
+    async def detail_links_due(
+        self, source_url: str, stale_before: datetime, limit: int = 100
+    ) -> list[str]:
+        """List detail page links due for fetching. See JobRepository."""
+        return await self.db.run(
+            lambda s: JobRepository(s).detail_links_due(source_url, stale_before, limit)
+        )
+
+    async def enrich_detail(
+        self, source_url: str, apply_link: str, detail: Optional[JobPosting]
+    ) -> int:
+        """Merge a job's detail page into the jobs listing it."""
+        return await self.db.run(
+            lambda s: JobRepository(s).enrich_detail(source_url, apply_link, detail)
+        )
+
+    async def known_external_ids(self, external_ids: Iterable[str]) -> set[str]:
+        """Get which of the given external IDs are already stored."""
+        values = list(external_ids)
+        return await self.db.run(lambda s: JobRepository(s).known_external_ids(values))
+
+    async def list_by_company(self, company: str) -> list[Job]:
+        """List all jobs for a company, newest first."""
+        return await self.db.run(lambda s: JobRepository(s).list_by_company(company))
+
+    async def list_page(self, limit: int = 100, after: Optional[Cursor] = None) -> Page[Job]:
+        """List jobs newest first with keyset pagination."""
+        return await self.db.run(lambda s: JobRepository(s).list_page(limit, after))
+
+    async def search(self, keyword: str, limit: int = 50, offset: int = 0) -> list[Job]:
+        """Search jobs by keyword. See JobRepository.search."""
+        return await self.db.run(lambda s: JobRepository(s).search(keyword, limit, offset))
+
+    async def count(self) -> int:
+        """Get total number of jobs."""
+        return await self.db.run(lambda s: JobRepository(s).count())
+
+    async def count_by_company(self, company: str) -> int:
+        """Get number of jobs for a company."""
+        return await self.db.run(lambda s: JobRepository(s).count_by_company(company))
+
+
+class AsyncInsightRepository:
+    """Async counterpart of InsightRepository."""
+
+    def __init__(self, db: AsyncDatabaseManager):
+        """Initialize the repository.
+
+        Args:
+            db: Async database manager to run operations on.
+        """
+        self.db = db
+
+    async def add(self, summary: InsightSummary) -> Insight:
+        """Add an insight with its social posts."""
+        return await self.db.run(lambda s: InsightRepository(s).add(summary))
+
+    async def get_latest_by_company(
+        self, company: str, position_keyword: Optional[str] = None
+    ) -> Optional[Insight]:
+        """Get the most recent insight for a company."""
+        return await self.db.run(
+            lambda s: InsightRepository(s).get_latest_by_company(company, position_keyword)
+        )
+
+    async def list_by_company(self, company: str) -> list[Insight]:
+        """List all insights for a company, newest first."""
+        return await self.db.run(lambda s: InsightRepository(s).list_by_company(company))
+
+    async def list_page(
+        self, limit: int = 100, after: Optional[Cursor] = None
+    ) -> Page[Insight]:
+        """List insights newest first with keyset pagination."""
+        return await self.db.run(lambda s: InsightRepository(s).list_page(limit, after))
+
+    async def count(self) -> int:
+        """Get total number of insights."""
+        return await self.db.run(lambda s: InsightRepository(s).count())
+
+
+class AsyncCrawlTargetRepository:
+    """Async counterpart of CrawlTargetRepository."""
+
+    def __init__(self, db: AsyncDatabaseManager):
+        """Initialize the repository.
+
+        Args:
+            db: Async database manager to run operations on.
+        """
+        self.db = db
+
+    async def add(
+        self,
+        company: str,
+        url: str,
+        crawler_type: str = "official",
+        css_selector: Optional[str] = None,
+        is_active: bool = True,
+        pagination: Optional[dict] = None,
+        resource_allowlist: Optional[list[str]] = None,
+    ) -> CrawlTarget:
+        """Add a new crawl target."""
+        return await self.db.run(
+            lambda s: CrawlTargetRepository(s).add(
+                company,
+                url,
+                crawler_type,
+                css_selector,
+                is_active,
+                pagination,
+                resource_allowlist,
+            )
+        )
+
+    async def get_by_id(self, target_id: int) -> Optional[CrawlTarget]:
+        """Get a crawl target by ID."""
+        return await self.db.run(lambda s: CrawlTargetRepository(s).get_by_id(target_id))
+
+    async def get_by_url(self, url: str) -> Optional[CrawlTarget]:
+        """Get the crawl target of a URL."""
+        return await self.db.run(lambda s: CrawlTargetRepository(s).get_by_url(url))
+
+    async def list_active(self) -> list[CrawlTarget]:
+        """List all active crawl targets."""
+        return await self.db.run(lambda s: CrawlTargetRepository(s).list_active())
+
+    async def list_by_company(self, company: str) -> list[CrawlTarget]:
+        """List crawl targets for a company."""
+        return await self.db.run(lambda s: CrawlTargetRepository(s).list_by_company(company))
+
+    async def update_last_crawled(self, target_id: int) -> bool:
+        """Update the last crawled timestamp."""
+        return await self.db.run(
+            lambda s: CrawlTargetRepository(s).update_last_crawled(target_id)
+        )
+
+    async def update_page_state(
+        self,
+        target_id: int,
+        page_fingerprint: Optional[str],
+        page_blocks: Optional[dict] = None,
+    ) -> bool:
+        """Record the state of a target's page. See CrawlTargetRepository."""
+        return await self.db.run(
+            lambda s: CrawlTargetRepository(s).update_page_state(
+                target_id, page_fingerprint, page_blocks
+            )
+        )
+
+    async def set_pagination(self, target_id: int, pagination: Optional[dict]) -> bool:
+        """Set or clear the pagination settings of a target."""
+        return await self.db.run(
+            lambda s: CrawlTargetRepository(s).set_pagination(target_id, pagination)
+        )
+
+    async def set_css_selector(self, target_id: int, css_selector: Optional[str]) -> bool:
+        """Set the CSS selector a target's crawls are limited to."""
+        return await self.db.run(
+            lambda s: CrawlTargetRepository(s).set_css_selector(target_id, css_selector)
+        )
+
+    async def set_resource_allowlist(
+        self, target_id: int, resource_allowlist: Optional[list[str]]
+    ) -> bool:
+        """Set the resource types and hosts a target's crawls must load."""
+        return await self.db.run(
+            lambda s: CrawlTargetRepository(s).set_resource_allowlist(
+                target_id, resource_allowlist
+            )
+        )
+
+    async def set_active(self, target_id: int, is_active: bool) -> bool:
+        """Set the active status of a target."""
+        return await self.db.run(
+            lambda s: CrawlTargetRepository(s).set_active(target_id, is_active)
+        )
+
+
+class AsyncRawPageRepository:
+    """Async counterpart of RawPageRepository."""
+
+    def __init__(self, db: AsyncDatabaseManager):
+        """Initialize the repository.
+
+        Args:
+            db: Async database manager to run operations on.
+        """
+        self.db = db
+
+    async def add(
+        self,
+        url: str,
+        markdown_hash: str,
+        markdown_size: int = 0,
+        html_hash: Optional[str] = None,
+        html_size: Optional[int] = None,
+        target_id: Optional[int] = None,
+    ) -> RawPage:
+        """Record a fetch of an archived page. See RawPageRepository.add."""
+        return await self.db.run(
+            lambda s: RawPageRepository(s).add(
+                url, markdown_hash, markdown_size, html_hash, html_size, target_id
+            )
+        )
+
+    async def get_latest(self, url: str) -> Optional[RawPage]:
+        """Get the most recent fetch of a URL."""
+        return await self.db.run(lambda s: RawPageRepository(s).get_latest(url))
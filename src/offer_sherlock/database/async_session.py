@@ -0,0 +1,114 @@
+"""Async access to the database for coroutine-based callers.
+
+SQLite calls block, and a commit can take tens of milliseconds while the
+event loop is also driving browsers and LLM requests. AsyncDatabaseManager
+moves every unit of work onto one dedicated database thread and awaits the
+result, so the loop keeps running while the database is busy. A single
+thread also serializes writes, which is what SQLite allows anyway, so
+concurrent coroutines queue up instead of contending for the write lock.
+
+Units of work are plain functions taking a Session, which lets the async
+repositories reuse the synchronous repositories unchanged.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from offer_sherlock.database.session import DatabaseManager
+
+T = TypeVar("T")
+
+
+class AsyncDatabaseManager:
+    """Run database work on a dedicated thread and await the result.
+
+    Example:
+        >>> adb = AsyncDatabaseManager(DatabaseManager("data/offers.db"))
+        >>> count = await adb.run(lambda session: JobRepository(session).count())
+        >>> adb.close()
+    """
+
+    def __init__(self, db: DatabaseManager):
+        """Initialize the async database manager.
+
+        Args:
+            db: Synchronous database manager providing the engine.
+        """
+        self.db = db
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._session_factory: Optional[sessionmaker] = None
+
+    @property
+    def session_factory(self) -> sessionmaker:
+        """Get the session factory for the database thread.
+
+        Objects are not expired on commit, so returned rows stay readable
+        from the event loop after their session has closed.
+        """
+        if self._session_factory is None:
+            self._session_factory = sessionmaker(
+                bind=self.db.engine,
+                autocommit=False,
+                autoflush=False,
+                expire_on_commit=False,
+            )
+        return self._session_factory
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Get the single-thread executor (lazy initialization)."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="offer-sherlock-db"
+            )
+        return self._executor
+
+    async def run(self, work: Callable[[Session], T]) -> T:
+        """Run ``work`` in its own session on the database thread.
+
+        The session commits if ``work`` returns and rolls back if it raises.
+
+        Args:
+            work: Function receiving a Session.
+
+        Returns:
+            Whatever ``work`` returns.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._run_in_session, work)
+
+    async def create_tables(self) -> None:
+        """Create all database tables on the database thread."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, self.db.create_tables)
+
+    def _run_in_session(self, work: Callable[[Session], T]) -> T:
+        session = self.session_factory()
+        try:
+            result = work(session)
+            session.commit()
+            return result
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def close(self) -> None:
+        """Wait for pending work and stop the database thread."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def __aenter__(self) -> "AsyncDatabaseManager":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.close)
+
+    def __repr__(self) -> str:
+        return f"AsyncDatabaseManager({self.db!r})"
@@ -0,0 +1,78 @@
+"""Normalized content hashes for change detection.
+
+LLM extraction of the same page is not byte-stable: whitespace, full-width
+punctuation and line breaks drift between runs. Hashing a normalized form
+of the job fields lets upserts tell real changes from noise, and a hash of
+the identifying fields gives jobs without an external ID a stable key.
+"""
+
+import hashlib
+import re
+import unicodedata
+from typing import Mapping, Optional
+
+_WHITESPACE = re.compile(r"\s+")
+
+# Separator between fields; cannot appear in normalized text
+_FIELD_SEP = "\x1f"
+
+
+def normalize_text(value: Optional[str]) -> str:
+    """Normalize a field for hashing.
+
+    Applies NFKC (full-width → half-width, compatibility characters) and
+    collapses runs of whitespace. None becomes the empty string.
+
+    Args:
+        value: Field value.
+
+    Returns:
+        Normalized text.
+    """
+    if value is None:
+        return ""
+    value = unicodedata.normalize("NFKC", value)
+    return _WHITESPACE.sub(" ", value).strip()
+
+
+def content_hash(fields: Mapping[str, Optional[str]], names: tuple[str, ...]) -> str:
+    """Hash the normalized values of the given fields.
+
+    Args:
+        fields: Column values.
+        names: Which fields to include, in a fixed order.
+
+    Returns:
+        Hex SHA-256 digest.
+    """
+    payload = _FIELD_SEP.join(normalize_text(fields.get(name)) for name in names)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def fingerprint(fields: Mapping[str, Optional[str]], names: tuple[str, ...]) -> str:
+    """Case-insensitive hash of identifying fields, used as a dedup key.
+
+    Args:
+        fields: Column values.
+        names: Which fields identify the record, in a fixed order.
+
+    Returns:
+        Hex SHA-256 digest.
+    """
+    payload = _FIELD_SEP.join(normalize_text(fields.get(name)).casefold() for name in names)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def page_fingerprint(content: Optional[str]) -> str:
+    """Hash of a crawled page's normalized text, for change detection.
+
+    Re-rendering the same page drifts in whitespace and full-width
+    characters; those differences do not change the fingerprint.
+
+    Args:
+        content: Page markdown.
+
+    Returns:
+        Hex SHA-256 digest.
+    """
+    return hashlib.sha256(normalize_text(content).encode("utf-8")).hexdigest()
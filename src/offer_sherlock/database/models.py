@@ -1,20 +1,40 @@
 """SQLAlchemy ORM models for Offer-Sherlock database."""
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 
 from sqlalchemy import (
     Boolean,
+    Column,
+    Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     JSON,
     String,
+    Table,
     Text,
     func,
+    text,
 )
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
+# Timestamps are stored in the same text format as SQLite's CURRENT_TIMESTAMP
+# (the server defaults below), so values written by Python and by SQLite
+# compare correctly. SQLAlchemy's default format appends microseconds, which
+# breaks equality and ordering between same-second values.
+Timestamp = DateTime().with_variant(
+    sqlite.DATETIME(
+        storage_format=(
+            "%(year)04d-%(month)02d-%(day)02d "
+            "%(hour)02d:%(minute)02d:%(second)02d"
+        )
+    ),
+    "sqlite",
+)
+
 
 class Base(DeclarativeBase):
     """Base class for all ORM models."""
@@ -27,12 +47,34 @@ class Job(Base):
 
     Stores structured job information extracted from official recruitment pages.
     Uses job_id_external as unique identifier to prevent duplicate entries.
+    Jobs without one are deduplicated by fingerprint (normalized company,
+    title, location and job type) instead.
     """
 
     __tablename__ = "jobs"
+    __table_args__ = (
+        # list_by_company / count_by_company: company = ? ORDER BY created_at
+        Index("ix_jobs_company_created_at", "company", "created_at"),
+        # list_all: ORDER BY created_at
+        Index("ix_jobs_created_at", "created_at"),
+        # list_updated_since: what changed recently
+        Index("ix_jobs_updated_at", "updated_at"),
+        # Jobs extracted from an archived page
+        Index("ix_jobs_raw_page_hash", "raw_page_hash"),
+        # Detail pages of a list page that are due for (re)fetching
+        Index("ix_jobs_source_url_detail_fetched_at", "source_url", "detail_fetched_at"),
+        # Upsert conflict target for jobs without an external ID
+        Index(
+            "ux_jobs_fingerprint",
+            "fingerprint",
+            unique=True,
+            sqlite_where=text("job_id_external IS NULL"),
+            postgresql_where=text("job_id_external IS NULL"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    company: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    company: Mapped[str] = mapped_column(String(100), nullable=False)
     title: Mapped[str] = mapped_column(String(200), nullable=False)
     job_id_external: Mapped[Optional[str]] = mapped_column(
         String(100), unique=True, nullable=True, index=True
@@ -43,13 +85,22 @@ class Job(Base):
     salary_range: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     apply_link: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
     source_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    # Legacy inline page text; new jobs reference the archived page instead
     raw_content: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # PageArchive hash of the page markdown the job was extracted from
+    raw_page_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # SHA-256 of the normalized job fields; writes are skipped when unchanged
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # SHA-256 of normalized company/title/location/job_type (dedup key)
+    fingerprint: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # Last fetch of the apply_link detail page; reset when the list entry changes
+    detail_fetched_at: Mapped[Optional[datetime]] = mapped_column(Timestamp, nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, server_default=func.now(), nullable=False
+        Timestamp, server_default=func.now(), nullable=False
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, server_default=func.now(), onupdate=func.now(), nullable=False
+        Timestamp, server_default=func.now(), onupdate=func.now(), nullable=False
     )
 
     def __repr__(self) -> str:
@@ -64,9 +115,22 @@ class Insight(Base):
     """
 
     __tablename__ = "insights"
+    __table_args__ = (
+        # get_latest_by_company with a keyword
+        Index(
+            "ix_insights_company_keyword_created_at",
+            "company",
+            "position_keyword",
+            "created_at",
+        ),
+        # list_by_company / get_latest_by_company without a keyword
+        Index("ix_insights_company_created_at", "company", "created_at"),
+        # list_all: ORDER BY created_at
+        Index("ix_insights_created_at", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    company: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    company: Mapped[str] = mapped_column(String(100), nullable=False)
     position_keyword: Mapped[str] = mapped_column(String(100), nullable=False)
     salary_estimate: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     interview_difficulty: Mapped[Optional[str]] = mapped_column(
@@ -78,12 +142,16 @@ class Insight(Base):
     posts_analyzed: Mapped[int] = mapped_column(Integer, default=0)
 
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, server_default=func.now(), nullable=False
+        Timestamp, server_default=func.now(), nullable=False
     )
 
-    # Relationship to social posts
+    # Posts the insight was built from, in summary order. Posts are shared
+    # between insights; deleting an insight only removes its links.
     social_posts: Mapped[list["SocialPost"]] = relationship(
-        "SocialPost", back_populates="insight", cascade="all, delete-orphan"
+        "SocialPost",
+        secondary=lambda: insight_posts,
+        back_populates="insights",
+        order_by=lambda: insight_posts.c.position,
     )
 
     def __repr__(self) -> str:
@@ -96,22 +164,26 @@ class Insight(Base):
 class SocialPost(Base):
     """Individual social media post with interview/offer information.
 
-    Stores detailed information from posts on platforms like Xiaohongshu,
-    linked to an Insight summary.
+    Stores detailed information from posts on platforms like Xiaohongshu.
+    Each post is stored once per platform, identified by post_key, and
+    linked to every Insight that analyzed it through insight_posts.
     """
 
     __tablename__ = "social_posts"
+    __table_args__ = (
+        # Upsert conflict target: one row per post per platform
+        Index("ux_social_posts_source_key", "source", "post_key", unique=True),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-    insight_id: Mapped[Optional[int]] = mapped_column(
-        Integer, ForeignKey("insights.id"), nullable=True, index=True
-    )
+    # Platform-specific identity (note ID, canonical URL or content hash)
+    post_key: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
     title: Mapped[str] = mapped_column(String(500), nullable=False)
     content_summary: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     author: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     likes: Mapped[int] = mapped_column(Integer, default=0)
     source: Mapped[str] = mapped_column(String(50), default="xiaohongshu")
-    url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True, index=True)
     mentioned_company: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     mentioned_position: Mapped[Optional[str]] = mapped_column(
         String(100), nullable=True
@@ -122,18 +194,41 @@ class SocialPost(Base):
     is_offer_info: Mapped[bool] = mapped_column(Boolean, default=False)
 
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, server_default=func.now(), nullable=False
+        Timestamp, server_default=func.now(), nullable=False
     )
+    # When the post was last returned by a crawl (engagement refreshed)
+    last_seen_at: Mapped[Optional[datetime]] = mapped_column(Timestamp, nullable=True)
 
-    # Relationship to insight
-    insight: Mapped[Optional["Insight"]] = relationship(
-        "Insight", back_populates="social_posts"
+    insights: Mapped[list["Insight"]] = relationship(
+        "Insight", secondary=lambda: insight_posts, back_populates="social_posts"
     )
 
     def __repr__(self) -> str:
         return f"<SocialPost(id={self.id}, title='{self.title[:30]}...')>"
 
 
+# Many-to-many link between insights and the posts they analyzed
+insight_posts = Table(
+    "insight_posts",
+    Base.metadata,
+    Column(
+        "insight_id",
+        Integer,
+        ForeignKey("insights.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "post_id",
+        Integer,
+        ForeignKey("social_posts.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    # Order of the post within the insight's summary
+    Column("position", Integer, nullable=False, default=0),
+    Index("ix_insight_posts_post_id", "post_id"),
+)
+
+
 class CrawlTarget(Base):
     """Configuration for crawl targets.
 
@@ -150,15 +245,112 @@ class CrawlTarget(Base):
         String(50), default="official"
     )  # official, xhs
     css_selector: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
-    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    # Pagination settings of multi-page lists (see crawlers.pagination)
+    pagination: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
+    # Resource types and hosts the lean crawl profile must not block
+    resource_allowlist: Mapped[Optional[list]] = mapped_column(JSON, nullable=True)
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True, index=True)
     last_crawled_at: Mapped[Optional[datetime]] = mapped_column(
-        DateTime, nullable=True
+        Timestamp, nullable=True
     )
+    # State of the page at the last successful extraction; a crawl whose
+    # fingerprint matches skips extraction
+    page_fingerprint: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # Jobs per page block hash, for incremental extraction of the next crawl
+    page_blocks: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(
-        DateTime, server_default=func.now(), nullable=False
+        Timestamp, server_default=func.now(), nullable=False
     )
 
     def __repr__(self) -> str:
         status = "active" if self.is_active else "inactive"
         return f"<CrawlTarget(id={self.id}, company='{self.company}', {status})>"
+
+
+class RawPage(Base):
+    """A fetch of a crawled page whose content is in the PageArchive.
+
+    The page bodies live on disk under their content hash (see
+    database.archive); this table only records what was fetched when.
+    Identical fetches share blobs but each gets its own row.
+    """
+
+    __tablename__ = "raw_pages"
+    __table_args__ = (
+        # Latest fetch of a URL
+        Index("ix_raw_pages_url_fetched_at", "url", "fetched_at"),
+        # Fetches that stored a given blob
+        Index("ix_raw_pages_markdown_hash", "markdown_hash"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    target_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("crawl_targets.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+    url: Mapped[str] = mapped_column(String(500), nullable=False)
+    markdown_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    html_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # Uncompressed sizes in bytes
+    markdown_size: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    html_size: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    fetched_at: Mapped[datetime] = mapped_column(
+        Timestamp, server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<RawPage(id={self.id}, url='{self.url}', hash='{self.markdown_hash[:12]}')>"
+
+
+# Summary tables below are maintained by triggers on jobs and insights (see
+# database.stats); do not write to them directly.
+
+
+class JobCompanyCount(Base):
+    """Number of jobs per company."""
+
+    __tablename__ = "job_counts_by_company"
+
+    company: Mapped[str] = mapped_column(String(100), primary_key=True)
+    jobs: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<JobCompanyCount(company='{self.company}', jobs={self.jobs})>"
+
+
+class JobDailyCount(Base):
+    """Number of jobs per company per creation day (UTC)."""
+
+    __tablename__ = "job_counts_daily"
+
+    company: Mapped[str] = mapped_column(String(100), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    jobs: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<JobDailyCount(company='{self.company}', day={self.day}, jobs={self.jobs})>"
+
+
+class JobTypeCount(Base):
+    """Number of jobs per job type ("" for jobs without one)."""
+
+    __tablename__ = "job_counts_by_type"
+
+    job_type: Mapped[str] = mapped_column(String(50), primary_key=True)
+    jobs: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<JobTypeCount(job_type='{self.job_type}', jobs={self.jobs})>"
+
+
+class InsightCount(Base):
+    """Number of insights and the latest insight time per company."""
+
+    __tablename__ = "insight_counts"
+
+    company: Mapped[str] = mapped_column(String(100), primary_key=True)
+    insights: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_created_at: Mapped[Optional[datetime]] = mapped_column(Timestamp, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<InsightCount(company='{self.company}', insights={self.insights})>"
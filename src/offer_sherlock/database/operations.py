@@ -1,12 +1,48 @@
 """Database CRUD operations for Offer-Sherlock."""
 
-from datetime import datetime
-from typing import Optional
-
-from sqlalchemy import or_, select
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Generic, Iterable, Iterator, Optional, TypeVar
+from urllib.parse import urlsplit
+
+from sqlalchemy import (
+    bindparam,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
-from offer_sherlock.database.models import CrawlTarget, Insight, Job, SocialPost
+from offer_sherlock.database.archive import PageArchive
+from offer_sherlock.database.hashing import content_hash, fingerprint
+from offer_sherlock.database.models import (
+    CrawlTarget,
+    Insight,
+    InsightCount,
+    Job,
+    JobCompanyCount,
+    JobDailyCount,
+    JobTypeCount,
+    RawPage,
+    SocialPost,
+    insight_posts,
+)
+from offer_sherlock.database.search import (
+    FTS_TABLE,
+    has_search_index,
+    split_keyword,
+)
+from offer_sherlock.database.stats import refresh_stats
 from offer_sherlock.schemas.insight import (
     InsightSummary,
     SocialPost as SocialPostSchema,
@@ -14,6 +50,97 @@ from offer_sherlock.schemas.insight import (
 from offer_sherlock.schemas.job import JobPosting
 
 
+@dataclass
+class UpsertResult:
+    """Outcome of a bulk upsert.
+
+    Attributes:
+        inserted: Rows that did not exist before.
+        updated: Existing rows whose content changed and were rewritten.
+        unchanged: Existing rows whose content was identical (not written).
+    """
+
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    @property
+    def total(self) -> int:
+        """Number of rows written."""
+        return self.inserted + self.updated
+
+
+# Keyset cursor: (created_at, id) of the last row of the previous page
+Cursor = tuple[datetime, int]
+
+T = TypeVar("T", Job, Insight)
+
+
+@dataclass
+class Page(Generic[T]):
+    """One page of a keyset-paginated listing.
+
+    Attributes:
+        items: Rows on this page, newest first.
+        next_cursor: Pass as ``after`` to get the next page; None on the
+            last page.
+    """
+
+    items: list[T] = field(default_factory=list)
+    next_cursor: Optional[Cursor] = None
+
+
+def _upsert_insert(session: Session, model: type):
+    """Build an INSERT supporting ON CONFLICT for the session's database.
+
+    SQLite and PostgreSQL share the on_conflict_do_update() API, so callers
+    only differ in which dialect constructs the statement.
+    """
+    if session.get_bind().dialect.name == "postgresql":
+        return postgresql_insert(model)
+    return sqlite_insert(model)
+
+
+def _keyset_page(
+    session: Session,
+    model: type[T],
+    limit: int,
+    after: Optional[Cursor],
+) -> Page[T]:
+    """Fetch rows of ``model`` ordered by (created_at, id) descending.
+
+    Seeks directly to the cursor via the created_at index (which includes
+    the rowid), so the cost does not grow with page depth like OFFSET does.
+    """
+    stmt = select(model).order_by(model.created_at.desc(), model.id.desc())
+    if after is not None:
+        created_at, row_id = after
+        # Row-value binds are untyped; bind with the column type so the
+        # timestamp is rendered in the stored format
+        cursor = tuple_(literal(created_at, model.created_at.type), literal(row_id))
+        stmt = stmt.where(tuple_(model.created_at, model.id) < cursor)
+    # One extra row tells whether another page exists
+    items = list(session.scalars(stmt.limit(limit + 1)))
+    if len(items) <= limit:
+        return Page(items=items)
+    items = items[:limit]
+    return Page(items=items, next_cursor=(items[-1].created_at, items[-1].id))
+
+
+def _iter_rows(session: Session, model: type[T], batch_size: int) -> Iterator[T]:
+    """Stream all rows of ``model`` oldest first, ``batch_size`` at a time."""
+    stmt = (
+        select(model)
+        .order_by(model.created_at, model.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for partition in session.scalars(stmt).partitions():
+        yield from partition
+        # Rows already yielded are not needed by the session any more
+        for row in partition:
+            session.expunge(row)
+
+
 class JobRepository:
     """Repository for Job CRUD operations.
 
@@ -39,23 +166,34 @@ class JobRepository:
         job: JobPosting,
         source_url: Optional[str] = None,
         raw_content: Optional[str] = None,
+        raw_page_hash: Optional[str] = None,
     ) -> Job:
         """Add a job posting to the database.
 
-        If a job with the same job_id_external exists, updates it instead.
+        If a job with the same job_id_external exists, updates it instead,
+        unless its content hash shows nothing changed.
 
         Args:
             job: JobPosting schema to add.
             source_url: URL where the job was found.
-            raw_content: Original raw content (optional).
+            raw_content: Original raw content (optional). Prefer archiving
+                the page and passing raw_page_hash.
+            raw_page_hash: PageArchive hash of the page the job came from.
 
         Returns:
             The created or updated Job model.
         """
-        # Check for existing job by external ID
-        existing = None
+        # Check for existing job by external ID, else by fingerprint
+        job_fingerprint = self.fingerprint(job)
         if job.job_id_external:
             existing = self.get_by_external_id(job.job_id_external)
+        else:
+            existing = self.get_by_fingerprint(job_fingerprint)
+
+        job_hash = self.content_hash(job)
+        if existing and existing.content_hash == job_hash:
+            # Unchanged: leave the row (and updated_at) alone
+            return existing
 
         if existing:
             # Update existing job
@@ -66,10 +204,16 @@ class JobRepository:
             existing.requirements = job.requirements
             existing.salary_range = job.salary_range
             existing.apply_link = job.apply_link
+            existing.content_hash = job_hash
+            existing.fingerprint = job_fingerprint
+            # The list entry changed; its detail page is due again
+            existing.detail_fetched_at = None
             if source_url:
                 existing.source_url = source_url
             if raw_content:
                 existing.raw_content = raw_content
+            if raw_page_hash:
+                existing.raw_page_hash = raw_page_hash
             return existing
 
         # Create new job
@@ -84,6 +228,9 @@ class JobRepository:
             apply_link=job.apply_link,
             source_url=source_url or job.apply_link,
             raw_content=raw_content,
+            raw_page_hash=raw_page_hash,
+            content_hash=job_hash,
+            fingerprint=job_fingerprint,
         )
         self.session.add(db_job)
         self.session.flush()  # Get the ID without committing
@@ -109,6 +256,336 @@ class JobRepository:
             results.append(db_job)
         return results
 
+    # Fields overwritten when an upsert hits an existing job_id_external;
+    # also the fields covered by the content hash
+    _UPSERT_FIELDS = (
+        "title",
+        "company",
+        "location",
+        "job_type",
+        "requirements",
+        "salary_range",
+        "apply_link",
+    )
+
+    @classmethod
+    def content_hash(cls, job: JobPosting) -> str:
+        """Hash of a job's normalized content fields.
+
+        Args:
+            job: Job posting.
+
+        Returns:
+            Hex digest; equal for postings that differ only in whitespace or
+            full-width/half-width characters.
+        """
+        fields = {name: getattr(job, name) for name in cls._UPSERT_FIELDS}
+        return content_hash(fields, cls._UPSERT_FIELDS)
+
+    # Fields that identify a job when it has no external ID
+    _FINGERPRINT_FIELDS = ("company", "title", "location", "job_type")
+
+    @classmethod
+    def fingerprint(cls, job: JobPosting) -> str:
+        """Dedup key of a job: hash of normalized company/title/location/type.
+
+        Args:
+            job: Job posting.
+
+        Returns:
+            Hex digest, case- and whitespace-insensitive.
+        """
+        fields = {name: getattr(job, name) for name in cls._FINGERPRINT_FIELDS}
+        return fingerprint(fields, cls._FINGERPRINT_FIELDS)
+
+    def upsert_many(
+        self,
+        jobs: list[JobPosting],
+        source_url: Optional[str] = None,
+        batch_size: int = 500,
+        raw_page_hash: Optional[str] = None,
+    ) -> UpsertResult:
+        """Insert or update many job postings with batched statements.
+
+        Unlike add_many(), this does not load ORM objects: jobs are written
+        with ``INSERT ... ON CONFLICT ... DO UPDATE`` in executemany batches,
+        keyed on job_id_external or, for jobs without one, on their
+        fingerprint. One extra SELECT per batch fetches the stored content
+        hashes, so unchanged jobs are not written at all and keep their
+        updated_at.
+
+        Args:
+            jobs: JobPosting schemas to write. If the same external ID (or
+                fingerprint) appears more than once, the last occurrence wins.
+            source_url: Common source URL for all jobs.
+            batch_size: Rows per statement batch.
+            raw_page_hash: PageArchive hash of the page the jobs were
+                extracted from. Set on inserted and updated jobs; unchanged
+                jobs keep the page they were last extracted from.
+
+        Returns:
+            UpsertResult with inserted, updated and unchanged counts.
+        """
+        result = UpsertResult()
+
+        keyed: dict[str, dict] = {}
+        unkeyed: dict[str, dict] = {}
+        for job in jobs:
+            row = self._job_row(job, source_url, raw_page_hash)
+            if job.job_id_external:
+                keyed[job.job_id_external] = row
+            else:
+                unkeyed[row["fingerprint"]] = row
+
+        for key, rows in (("job_id_external", keyed), ("fingerprint", unkeyed)):
+            rows = list(rows.values())
+            statement = self._upsert_statement(key, source_url, raw_page_hash)
+            for i in range(0, len(rows), batch_size):
+                batch = rows[i : i + batch_size]
+                stored = self._stored_hashes(key, [row[key] for row in batch])
+                writes = []
+                for row in batch:
+                    if row[key] not in stored:
+                        result.inserted += 1
+                    elif stored[row[key]] == row["content_hash"]:
+                        result.unchanged += 1
+                        continue
+                    else:
+                        result.updated += 1
+                    writes.append(row)
+                if writes:
+                    self.session.execute(statement, writes)
+
+        return result
+
+    def _job_row(
+        self, job: JobPosting, source_url: Optional[str], raw_page_hash: Optional[str] = None
+    ) -> dict:
+        """Build a column dict for Core inserts."""
+        return {
+            "company": job.company,
+            "title": job.title,
+            "job_id_external": job.job_id_external,
+            "location": job.location,
+            "job_type": job.job_type,
+            "requirements": job.requirements,
+            "salary_range": job.salary_range,
+            "apply_link": job.apply_link,
+            "source_url": source_url or job.apply_link,
+            "raw_page_hash": raw_page_hash,
+            "content_hash": self.content_hash(job),
+            "fingerprint": self.fingerprint(job),
+        }
+
+    def _upsert_statement(
+        self, key: str, source_url: Optional[str], raw_page_hash: Optional[str] = None
+    ):
+        """Build the upsert statement with ``key`` as the conflict target.
+
+        Args:
+            key: "job_id_external", or "fingerprint" for jobs without one.
+            source_url: Whether source_url is overwritten on update.
+            raw_page_hash: Whether raw_page_hash is overwritten on update.
+        """
+        stmt = _upsert_insert(self.session, Job)
+        set_ = {name: stmt.excluded[name] for name in self._UPSERT_FIELDS}
+        if source_url:
+            set_["source_url"] = stmt.excluded.source_url
+        if raw_page_hash:
+            set_["raw_page_hash"] = stmt.excluded.raw_page_hash
+        set_["content_hash"] = stmt.excluded.content_hash
+        set_["fingerprint"] = stmt.excluded.fingerprint
+        # The list entry changed; its detail page is due again
+        set_["detail_fetched_at"] = None
+        set_["updated_at"] = func.now()
+        return stmt.on_conflict_do_update(
+            index_elements=[getattr(Job, key)],
+            # Must match the partial unique index on fingerprint
+            index_where=Job.job_id_external.is_(None) if key == "fingerprint" else None,
+            set_=set_,
+            # Guards rows that became identical since the hash lookup
+            where=Job.content_hash.is_distinct_from(stmt.excluded.content_hash),
+        )
+
+    def _stored_hashes(self, key: str, values: list[str]) -> dict[str, Optional[str]]:
+        """Map the given keys that are already stored to their content hash."""
+        if not values:
+            return {}
+        column = getattr(Job, key)
+        stmt = select(column, Job.content_hash).where(column.in_(values))
+        if key == "fingerprint":
+            stmt = stmt.where(Job.job_id_external.is_(None))
+        return {value: digest for value, digest in self.session.execute(stmt)}
+
+    def detail_links_due(
+        self, source_url: str, stale_before: datetime, limit: int = 100
+    ) -> list[str]:
+        """List detail page links of a list page that need fetching.
+
+        Args:
+            source_url: List page the jobs were extracted from.
+            stale_before: Links fetched before this time are due again.
+            limit: Maximum number of links.
+
+        Returns:
+            Distinct apply links, never-fetched first, then oldest fetch.
+        """
+        last_fetch = func.max(Job.detail_fetched_at)
+        stmt = (
+            select(Job.apply_link)
+            .where(
+                Job.source_url == source_url,
+                Job.apply_link.is_not(None),
+                Job.apply_link != source_url,
+                or_(Job.detail_fetched_at.is_(None), Job.detail_fetched_at < stale_before),
+            )
+            .group_by(Job.apply_link)
+            # NULLs sort first
+            .order_by(last_fetch, Job.apply_link)
+            .limit(limit)
+        )
+        return list(self.session.scalars(stmt))
+
+    def enrich_detail(
+        self, source_url: str, apply_link: str, detail: Optional[JobPosting]
+    ) -> int:
+        """Merge a job's detail page into the jobs listing it.
+
+        Non-empty detail fields replace the list snippets; content_hash
+        keeps describing the list entry, so unchanged list entries do not
+        overwrite the enrichment. The fetch time is recorded even without
+        a detail (failed fetch), so the link waits until it is stale.
+
+        Args:
+            source_url: List page the jobs were extracted from.
+            apply_link: Detail page URL.
+            detail: Job extracted from the detail page, or None.
+
+        Returns:
+            Number of jobs updated.
+        """
+        values: dict = {"detail_fetched_at": datetime.now()}
+        if detail is not None:
+            for name in ("location", "job_type", "requirements", "salary_range"):
+                value = getattr(detail, name)
+                if value:
+                    values[name] = value
+        if len(values) == 1:
+            # Only the fetch time: not a content change
+            values["updated_at"] = Job.updated_at
+        stmt = (
+            update(Job)
+            .where(Job.source_url == source_url, Job.apply_link == apply_link)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        return self.session.execute(stmt).rowcount
+
+    def compact_duplicates(self, batch_size: int = 500) -> int:
+        """Merge duplicate jobs that have no external ID.
+
+        One-off cleanup for rows inserted before fingerprints existed:
+        backfills fingerprints of jobs without an external ID and, for each
+        group sharing a fingerprint, keeps the most recently updated row
+        (with the group's earliest created_at) and deletes the rest.
+
+        Args:
+            batch_size: Rows per UPDATE/DELETE batch.
+
+        Returns:
+            Number of duplicate rows deleted.
+        """
+        stmt = select(
+            Job.id,
+            Job.company,
+            Job.title,
+            Job.location,
+            Job.job_type,
+            Job.fingerprint,
+            Job.created_at,
+            Job.updated_at,
+        ).where(Job.job_id_external.is_(None))
+
+        groups: dict[str, list] = {}
+        for row in self.session.execute(stmt):
+            key = fingerprint(row._mapping, self._FINGERPRINT_FIELDS)
+            groups.setdefault(key, []).append(row)
+
+        doomed: list[int] = []
+        survivors: list[dict] = []
+        for key, rows in groups.items():
+            rows.sort(key=lambda r: (r.updated_at, r.id), reverse=True)
+            keep, duplicates = rows[0], rows[1:]
+            doomed.extend(r.id for r in duplicates)
+            created_at = min(r.created_at for r in rows)
+            if keep.fingerprint != key or keep.created_at != created_at:
+                survivors.append(
+                    {"job_id": keep.id, "fingerprint": key, "created_at": created_at}
+                )
+
+        # Delete first so backfilled fingerprints cannot collide
+        for i in range(0, len(doomed), batch_size):
+            self.session.execute(delete(Job).where(Job.id.in_(doomed[i : i + batch_size])))
+        if survivors:
+            # Plain UPDATE: keep updated_at, nothing about the job changed
+            stmt = (
+                update(Job)
+                .where(Job.id == bindparam("job_id"))
+                .values(
+                    fingerprint=bindparam("fingerprint"),
+                    created_at=bindparam("created_at"),
+                    updated_at=Job.updated_at,
+                )
+            )
+            for i in range(0, len(survivors), batch_size):
+                self.session.connection().execute(stmt, survivors[i : i + batch_size])
+        self.session.expire_all()
+        return len(doomed)
+
+    def archive_raw_content(self, archive: PageArchive, batch_size: int = 500) -> int:
+        """Move legacy raw_content text into the page archive.
+
+        Each job's raw_content is stored in the archive, referenced through
+        raw_page_hash (unless the job already references a page) and
+        cleared. Identical page texts are stored once. updated_at is kept.
+        SQLite only returns the freed space to the OS after a VACUUM.
+
+        Args:
+            archive: Archive to move the text into.
+            batch_size: Jobs read and updated per batch.
+
+        Returns:
+            Number of jobs whose raw_content was moved.
+        """
+        stmt = (
+            update(Job)
+            .where(Job.id == bindparam("job_id"))
+            .values(
+                raw_page_hash=func.coalesce(Job.raw_page_hash, bindparam("digest")),
+                raw_content=None,
+                updated_at=Job.updated_at,
+            )
+        )
+        moved = 0
+        last_id = 0
+        while True:
+            rows = self.session.execute(
+                select(Job.id, Job.raw_content)
+                .where(Job.id > last_id, Job.raw_content.is_not(None))
+                .order_by(Job.id)
+                .limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            params = [
+                {"job_id": job_id, "digest": archive.put(content)} for job_id, content in rows
+            ]
+            self.session.connection().execute(stmt, params)
+            moved += len(rows)
+            last_id = rows[-1].id
+        self.session.expire_all()
+        return moved
+
     def get_by_id(self, job_id: int) -> Optional[Job]:
         """Get a job by its internal ID.
 
@@ -120,6 +597,21 @@ class JobRepository:
         """
         return self.session.get(Job, job_id)
 
+    def get_by_fingerprint(self, job_fingerprint: str) -> Optional[Job]:
+        """Get a job without external ID by its fingerprint.
+
+        Args:
+            job_fingerprint: Fingerprint from JobRepository.fingerprint().
+
+        Returns:
+            Job if found, None otherwise.
+        """
+        stmt = select(Job).where(
+            Job.fingerprint == job_fingerprint,
+            Job.job_id_external.is_(None),
+        )
+        return self.session.scalars(stmt).first()
+
     def get_by_external_id(self, external_id: str) -> Optional[Job]:
         """Get a job by its external ID.
 
@@ -132,6 +624,25 @@ class JobRepository:
         stmt = select(Job).where(Job.job_id_external == external_id)
         return self.session.scalar(stmt)
 
+    def known_external_ids(self, external_ids: Iterable[str]) -> set[str]:
+        """Get which of the given external IDs are already stored.
+
+        Args:
+            external_ids: External job IDs from the source site.
+
+        Returns:
+            The subset of IDs that have a stored job.
+        """
+        values = list(set(external_ids))
+        known: set[str] = set()
+        # Stay below SQLite's bound-parameter limit
+        for start in range(0, len(values), 500):
+            stmt = select(Job.job_id_external).where(
+                Job.job_id_external.in_(values[start:start + 500])
+            )
+            known.update(self.session.scalars(stmt))
+        return known
+
     def list_by_company(self, company: str) -> list[Job]:
         """List all jobs from a specific company.
 
@@ -147,6 +658,8 @@ class JobRepository:
     def list_all(self, limit: int = 100, offset: int = 0) -> list[Job]:
         """List all jobs with pagination.
 
+        OFFSET scans every skipped row; prefer list_page() for deep pages.
+
         Args:
             limit: Maximum number of jobs to return.
             offset: Number of jobs to skip.
@@ -157,28 +670,114 @@ class JobRepository:
         stmt = select(Job).order_by(Job.created_at.desc()).limit(limit).offset(offset)
         return list(self.session.scalars(stmt))
 
-    def search(self, keyword: str, limit: int = 50) -> list[Job]:
-        """Search jobs by keyword in title, company, or requirements.
+    def list_page(self, limit: int = 100, after: Optional[Cursor] = None) -> Page[Job]:
+        """List jobs newest first with keyset pagination.
 
         Args:
-            keyword: Search keyword.
-            limit: Maximum number of results.
+            limit: Maximum number of jobs on the page.
+            after: ``next_cursor`` of the previous page; None for the first.
 
         Returns:
-            List of matching Jobs.
+            Page of Jobs.
+
+        Example:
+            >>> page = repo.list_page(50)
+            >>> while page.next_cursor:
+            ...     page = repo.list_page(50, after=page.next_cursor)
+        """
+        return _keyset_page(self.session, Job, limit, after)
+
+    def iter_all(self, batch_size: int = 1000) -> Iterator[Job]:
+        """Iterate over all jobs, oldest first, in constant memory.
+
+        Rows are fetched ``batch_size`` at a time from a single query and
+        detached from the session once yielded. Keep the session open
+        while iterating.
+
+        Args:
+            batch_size: Rows fetched per round trip.
+
+        Yields:
+            Jobs ordered by (created_at, id).
+        """
+        return _iter_rows(self.session, Job, batch_size)
+
+    def list_updated_since(self, since: datetime) -> list[Job]:
+        """List jobs that were added or changed since a point in time.
+
+        Args:
+            since: Lower bound (inclusive) on updated_at.
+
+        Returns:
+            Jobs ordered by updated_at, most recent first.
         """
-        pattern = f"%{keyword}%"
         stmt = (
             select(Job)
-            .where(
-                or_(
-                    Job.title.ilike(pattern),
-                    Job.company.ilike(pattern),
-                    Job.requirements.ilike(pattern),
+            .where(Job.updated_at >= since)
+            .order_by(Job.updated_at.desc())
+        )
+        return list(self.session.scalars(stmt))
+
+    def search(self, keyword: str, limit: int = 50, offset: int = 0) -> list[Job]:
+        """Search jobs by keyword in title, company, requirements or location.
+
+        Whitespace-separated terms must all match, as substrings. Uses the
+        FTS5 trigram index (see database.search) when available, ranking
+        results by BM25 relevance; terms too short for it, and keywords
+        made only of such terms, are matched by a LIKE scan ordered by
+        recency. On PostgreSQL the ILIKE filter is served by the pg_trgm
+        indexes.
+
+        Args:
+            keyword: Search keyword.
+            limit: Maximum number of results.
+            offset: Number of results to skip.
+
+        Returns:
+            List of matching Jobs, best match first.
+        """
+        terms = keyword.split()
+        if not terms:
+            return []
+        query = None
+        if has_search_index(self.session.connection()):
+            query, terms = split_keyword(keyword)
+        filters = [
+            or_(
+                Job.title.ilike(f"%{term}%"),
+                Job.company.ilike(f"%{term}%"),
+                Job.requirements.ilike(f"%{term}%"),
+                Job.location.ilike(f"%{term}%"),
+            )
+            for term in terms
+        ]
+
+        if query is not None:
+            ranked = (
+                select(
+                    literal_column("rowid").label("job_id"),
+                    literal_column("rank").label("rank"),
                 )
+                .select_from(text(FTS_TABLE))
+                .where(text(f"{FTS_TABLE} MATCH :query"))
+                .subquery()
+            )
+            stmt = (
+                select(Job)
+                .join(ranked, ranked.c.job_id == Job.id)
+                .where(*filters)
+                .order_by(ranked.c.rank)
+                .limit(limit)
+                .offset(offset)
             )
+            return list(self.session.scalars(stmt, {"query": query}))
+
+        stmt = (
+            select(Job)
+            .where(*filters)
             .order_by(Job.created_at.desc())
             .limit(limit)
+            .offset(offset)
         )
         return list(self.session.scalars(stmt))
 
@@ -188,8 +787,6 @@ class JobRepository:
         Returns:
             Total job count.
         """
-        from sqlalchemy import func
-
         stmt = select(func.count()).select_from(Job)
         return self.session.scalar(stmt) or 0
 
@@ -202,8 +799,6 @@ class JobRepository:
         Returns:
             Job count for the company.
         """
-        from sqlalchemy import func
-
         stmt = select(func.count()).select_from(Job).where(Job.company == company)
         return self.session.scalar(stmt) or 0
 
@@ -223,6 +818,154 @@ class JobRepository:
         return False
 
 
+# Xiaohongshu note URLs: /explore/<id>, /discovery/item/<id>
+_XHS_NOTE_ID = re.compile(r"/(?:explore|discovery/item)/([0-9a-fA-F]{24})")
+
+
+class SocialPostRepository:
+    """Repository for SocialPost storage.
+
+    Posts are stored once per (source, post_key) and shared between the
+    insights that analyzed them; re-crawled posts refresh their
+    engagement and analysis in place.
+
+    Example:
+        >>> repo = SocialPostRepository(session)
+        >>> post_ids = repo.upsert_many(summary.source_posts)
+    """
+
+    # Fields refreshed when a post is seen again
+    _UPSERT_FIELDS = (
+        "title",
+        "content_summary",
+        "author",
+        "likes",
+        "url",
+        "mentioned_company",
+        "mentioned_position",
+        "mentioned_salary",
+        "sentiment",
+        "is_interview_experience",
+        "is_offer_info",
+    )
+
+    def __init__(self, session: Session):
+        """Initialize the repository.
+
+        Args:
+            session: SQLAlchemy session to use for operations.
+        """
+        self.session = session
+
+    @staticmethod
+    def post_key(post: SocialPostSchema) -> str:
+        """Platform-specific identity of a post.
+
+        Uses the Xiaohongshu note ID when the URL contains one, otherwise
+        the URL without query string, otherwise a hash of title and author.
+
+        Args:
+            post: SocialPost schema.
+
+        Returns:
+            Key, unique per post within its source.
+        """
+        url = (post.url or "").strip()
+        if url:
+            match = _XHS_NOTE_ID.search(url)
+            if match:
+                return match.group(1).lower()
+            parts = urlsplit(url)
+            key = f"{parts.netloc.lower()}{parts.path.rstrip('/')}"
+            return key if len(key) <= 200 else "u:" + fingerprint({"url": key}, ("url",))
+        return "h:" + fingerprint(
+            {"title": post.title, "author": post.author}, ("title", "author")
+        )
+
+    def upsert_many(
+        self, posts: list[SocialPostSchema], batch_size: int = 500
+    ) -> list[int]:
+        """Insert new posts and refresh existing ones.
+
+        Args:
+            posts: SocialPost schemas. Duplicates (same source and key) are
+                stored once; the last occurrence wins.
+            batch_size: Rows per statement batch.
+
+        Returns:
+            Post IDs in the order of ``posts``.
+        """
+        rows: dict[tuple[str, str], dict] = {}
+        order: list[tuple[str, str]] = []
+        for post in posts:
+            row = self._post_row(post)
+            key = (row["source"], row["post_key"])
+            rows[key] = row
+            order.append(key)
+
+        stmt = _upsert_insert(self.session, SocialPost).values(last_seen_at=func.now())
+        set_ = {name: stmt.excluded[name] for name in self._UPSERT_FIELDS}
+        set_["last_seen_at"] = func.now()
+        # RETURNING yields the ID of inserted and updated rows alike, in
+        # parameter order, so no lookup query is needed
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SocialPost.source, SocialPost.post_key],
+            set_=set_,
+        ).returning(SocialPost.id, sort_by_parameter_order=True)
+
+        unique_rows = list(rows.values())
+        ids: dict[tuple[str, str], int] = {}
+        for i in range(0, len(unique_rows), batch_size):
+            batch = unique_rows[i : i + batch_size]
+            post_ids = self.session.scalars(stmt, batch).all()
+            for row, post_id in zip(batch, post_ids):
+                ids[(row["source"], row["post_key"])] = post_id
+
+        return [ids[key] for key in order]
+
+    def _post_row(self, post: SocialPostSchema) -> dict:
+        """Build a column dict for Core inserts."""
+        return {
+            "source": post.source,
+            "post_key": self.post_key(post),
+            "title": post.title,
+            "content_summary": post.content_summary,
+            "author": post.author,
+            "likes": post.likes,
+            "url": post.url,
+            "mentioned_company": post.mentioned_company,
+            "mentioned_position": post.mentioned_position,
+            "mentioned_salary": post.mentioned_salary,
+            "sentiment": post.sentiment.value if post.sentiment else None,
+            "is_interview_experience": post.is_interview_experience,
+            "is_offer_info": post.is_offer_info,
+        }
+
+    def get_by_key(self, source: str, post_key: str) -> Optional[SocialPost]:
+        """Get a post by its source and key.
+
+        Args:
+            source: Platform name.
+            post_key: Key from post_key().
+
+        Returns:
+            SocialPost if found, None otherwise.
+        """
+        stmt = select(SocialPost).where(
+            SocialPost.source == source, SocialPost.post_key == post_key
+        )
+        return self.session.scalars(stmt).first()
+
+    def count(self) -> int:
+        """Get total number of stored posts.
+
+        Returns:
+            Number of posts.
+        """
+        stmt = select(func.count()).select_from(SocialPost)
+        return self.session.scalar(stmt) or 0
+
+
 class InsightRepository:
     """Repository for Insight CRUD operations.
 
@@ -272,41 +1015,18 @@ class InsightRepository:
         self.session.add(db_insight)
         self.session.flush()  # Get the insight ID
 
-        # Add associated social posts
-        for post_schema in summary.source_posts:
-            db_post = self._create_social_post(post_schema, db_insight.id)
-            self.session.add(db_post)
+        # Upsert the posts (shared with earlier insights) and link them
+        post_ids = SocialPostRepository(self.session).upsert_many(summary.source_posts)
+        links = [
+            {"insight_id": db_insight.id, "post_id": post_id, "position": position}
+            for position, post_id in enumerate(dict.fromkeys(post_ids))
+        ]
+        if links:
+            self.session.execute(insert(insight_posts), links)
+            self.session.expire(db_insight, ["social_posts"])
 
         return db_insight
 
-    def _create_social_post(
-        self, post: SocialPostSchema, insight_id: int
-    ) -> SocialPost:
-        """Create a SocialPost model from schema.
-
-        Args:
-            post: SocialPost schema.
-            insight_id: ID of the parent Insight.
-
-        Returns:
-            SocialPost model instance.
-        """
-        return SocialPost(
-            insight_id=insight_id,
-            title=post.title,
-            content_summary=post.content_summary,
-            author=post.author,
-            likes=post.likes,
-            source=post.source,
-            url=post.url,
-            mentioned_company=post.mentioned_company,
-            mentioned_position=post.mentioned_position,
-            mentioned_salary=post.mentioned_salary,
-            sentiment=post.sentiment.value if post.sentiment else None,
-            is_interview_experience=post.is_interview_experience,
-            is_offer_info=post.is_offer_info,
-        )
-
     def get_by_id(self, insight_id: int) -> Optional[Insight]:
         """Get an insight by ID.
 
@@ -355,6 +1075,8 @@ class InsightRepository:
     def list_all(self, limit: int = 100, offset: int = 0) -> list[Insight]:
         """List all insights with pagination.
 
+        OFFSET scans every skipped row; prefer list_page() for deep pages.
+
         Args:
             limit: Maximum number of insights.
             offset: Number to skip.
@@ -367,14 +1089,37 @@ class InsightRepository:
         )
         return list(self.session.scalars(stmt))
 
+    def list_page(
+        self, limit: int = 100, after: Optional[Cursor] = None
+    ) -> Page[Insight]:
+        """List insights newest first with keyset pagination.
+
+        Args:
+            limit: Maximum number of insights on the page.
+            after: ``next_cursor`` of the previous page; None for the first.
+
+        Returns:
+            Page of Insights.
+        """
+        return _keyset_page(self.session, Insight, limit, after)
+
+    def iter_all(self, batch_size: int = 1000) -> Iterator[Insight]:
+        """Iterate over all insights, oldest first, in constant memory.
+
+        Args:
+            batch_size: Rows fetched per round trip.
+
+        Yields:
+            Insights ordered by (created_at, id).
+        """
+        return _iter_rows(self.session, Insight, batch_size)
+
     def count(self) -> int:
         """Get total number of insights.
 
         Returns:
             Total insight count.
         """
-        from sqlalchemy import func
-
         stmt = select(func.count()).select_from(Insight)
         return self.session.scalar(stmt) or 0
 
@@ -389,11 +1134,124 @@ class InsightRepository:
         """
         insight = self.get_by_id(insight_id)
         if insight:
-            self.session.delete(insight)  # Cascades to social_posts
+            self.session.delete(insight)  # Removes its post links, not the posts
             return True
         return False
 
 
+class StatsRepository:
+    """Read-only statistics backed by the summary tables.
+
+    The summaries are maintained by triggers (see database.stats), so these
+    queries cost the same however many jobs and insights are stored.
+
+    Example:
+        >>> with db.session() as session:
+        ...     repo = StatsRepository(session)
+        ...     for company, jobs in repo.top_companies(5):
+        ...         print(company, jobs)
+    """
+
+    def __init__(self, session: Session):
+        """Initialize repository with a session.
+
+        Args:
+            session: SQLAlchemy session instance.
+        """
+        self.session = session
+
+    def total_jobs(self) -> int:
+        """Get the total number of jobs."""
+        return self.session.scalar(select(func.sum(JobTypeCount.jobs))) or 0
+
+    def total_insights(self) -> int:
+        """Get the total number of insights."""
+        return self.session.scalar(select(func.sum(InsightCount.insights))) or 0
+
+    def jobs_by_company(self, company: str) -> int:
+        """Get the number of jobs of a company.
+
+        Args:
+            company: Company name.
+
+        Returns:
+            Job count.
+        """
+        stmt = select(JobCompanyCount.jobs).where(JobCompanyCount.company == company)
+        return self.session.scalar(stmt) or 0
+
+    def top_companies(self, limit: int = 5) -> list[tuple[str, int]]:
+        """Get the companies with the most jobs.
+
+        Args:
+            limit: Maximum number of companies.
+
+        Returns:
+            (company, job count) tuples, largest first.
+        """
+        stmt = (
+            select(JobCompanyCount.company, JobCompanyCount.jobs)
+            .order_by(JobCompanyCount.jobs.desc(), JobCompanyCount.company)
+            .limit(limit)
+        )
+        return [tuple(row) for row in self.session.execute(stmt)]
+
+    def jobs_per_day(
+        self, company: Optional[str] = None, since: Optional[date] = None
+    ) -> list[tuple[date, int]]:
+        """Get the number of jobs created per day.
+
+        Args:
+            company: Only count this company's jobs.
+            since: Only include days on or after this date.
+
+        Returns:
+            (day, job count) tuples in date order.
+        """
+        total = func.sum(JobDailyCount.jobs)
+        stmt = select(JobDailyCount.day, total).group_by(JobDailyCount.day)
+        if company is not None:
+            stmt = stmt.where(JobDailyCount.company == company)
+        if since is not None:
+            stmt = stmt.where(JobDailyCount.day >= since)
+        return [tuple(row) for row in self.session.execute(stmt.order_by(JobDailyCount.day))]
+
+    def jobs_by_type(self) -> list[tuple[str, int]]:
+        """Get the number of jobs per job type.
+
+        Returns:
+            (job type, job count) tuples, largest first. Jobs without a
+            type are counted under "".
+        """
+        stmt = select(JobTypeCount.job_type, JobTypeCount.jobs).order_by(
+            JobTypeCount.jobs.desc(), JobTypeCount.job_type
+        )
+        return [tuple(row) for row in self.session.execute(stmt)]
+
+    def insight_counts(self) -> list[InsightCount]:
+        """Get insight counts per company, most insights first.
+
+        Returns:
+            List of InsightCount rows.
+        """
+        stmt = (
+            select(InsightCount)
+            .order_by(InsightCount.insights.desc(), InsightCount.company)
+            # Triggers change these rows behind the ORM's back
+            .execution_options(populate_existing=True)
+        )
+        return list(self.session.scalars(stmt))
+
+    def refresh(self) -> None:
+        """Rebuild the summary tables from the jobs and insights tables.
+
+        Only needed to repair summaries after their triggers were disabled;
+        this scans both tables.
+        """
+        refresh_stats(self.session.connection())
+        self.session.expire_all()
+
+
 class CrawlTargetRepository:
     """Repository for CrawlTarget CRUD operations.
 
@@ -420,6 +1278,8 @@ class CrawlTargetRepository:
         crawler_type: str = "official",
         css_selector: Optional[str] = None,
         is_active: bool = True,
+        pagination: Optional[dict] = None,
+        resource_allowlist: Optional[list[str]] = None,
     ) -> CrawlTarget:
         """Add a new crawl target.
 
@@ -429,6 +1289,10 @@ class CrawlTargetRepository:
             crawler_type: Type of crawler (official/xhs).
             css_selector: Optional CSS selector for content.
             is_active: Whether the target is active.
+            pagination: Pagination settings (Pagination.to_dict()) for
+                multi-page lists.
+            resource_allowlist: Resource types and hosts the lean crawl
+                profile must not block (see crawlers.resources).
 
         Returns:
             The created CrawlTarget.
@@ -439,6 +1303,8 @@ class CrawlTargetRepository:
             crawler_type=crawler_type,
             css_selector=css_selector,
             is_active=is_active,
+            pagination=pagination,
+            resource_allowlist=resource_allowlist,
         )
         self.session.add(target)
         self.session.flush()
@@ -455,6 +1321,18 @@ class CrawlTargetRepository:
         """
         return self.session.get(CrawlTarget, target_id)
 
+    def get_by_url(self, url: str) -> Optional[CrawlTarget]:
+        """Get the crawl target of a URL.
+
+        Args:
+            url: Target URL.
+
+        Returns:
+            The oldest CrawlTarget with this URL, or None.
+        """
+        stmt = select(CrawlTarget).where(CrawlTarget.url == url).order_by(CrawlTarget.id)
+        return self.session.scalars(stmt).first()
+
     def list_active(self) -> list[CrawlTarget]:
         """List all active crawl targets.
 
@@ -485,6 +1363,20 @@ class CrawlTargetRepository:
         stmt = select(CrawlTarget).order_by(CrawlTarget.company)
         return list(self.session.scalars(stmt))
 
+    def count(self, active_only: bool = False) -> int:
+        """Get the number of crawl targets.
+
+        Args:
+            active_only: Only count active targets.
+
+        Returns:
+            Target count.
+        """
+        stmt = select(func.count()).select_from(CrawlTarget)
+        if active_only:
+            stmt = stmt.where(CrawlTarget.is_active.is_(True))
+        return self.session.scalar(stmt) or 0
+
     def update_last_crawled(self, target_id: int) -> bool:
         """Update the last crawled timestamp.
 
@@ -500,6 +1392,84 @@ class CrawlTargetRepository:
             return True
         return False
 
+    def update_page_state(
+        self,
+        target_id: int,
+        page_fingerprint: Optional[str],
+        page_blocks: Optional[dict] = None,
+    ) -> bool:
+        """Record the state of a target's page after a successful extraction.
+
+        Args:
+            target_id: The target ID.
+            page_fingerprint: Normalized fingerprint of the page content;
+                None if the page was only partly extracted.
+            page_blocks: Jobs per page block hash (JSON-serializable).
+
+        Returns:
+            True if updated, False if not found.
+        """
+        target = self.get_by_id(target_id)
+        if target:
+            target.page_fingerprint = page_fingerprint
+            target.page_blocks = page_blocks
+            return True
+        return False
+
+    def set_pagination(self, target_id: int, pagination: Optional[dict]) -> bool:
+        """Set or clear the pagination settings of a target.
+
+        Args:
+            target_id: The target ID.
+            pagination: Pagination settings (Pagination.to_dict()), or None
+                to crawl only the first page.
+
+        Returns:
+            True if updated, False if not found.
+        """
+        target = self.get_by_id(target_id)
+        if target:
+            target.pagination = pagination
+            return True
+        return False
+
+    def set_css_selector(self, target_id: int, css_selector: Optional[str]) -> bool:
+        """Set the CSS selector a target's crawls are limited to.
+
+        Args:
+            target_id: The target ID.
+            css_selector: Selector of the page's job list, or None to crawl
+                the whole page.
+
+        Returns:
+            True if updated, False if not found.
+        """
+        target = self.get_by_id(target_id)
+        if target:
+            target.css_selector = css_selector
+            return True
+        return False
+
+    def set_resource_allowlist(
+        self, target_id: int, resource_allowlist: Optional[list[str]]
+    ) -> bool:
+        """Set the resource types and hosts a target's crawls must load.
+
+        Args:
+            target_id: The target ID.
+            resource_allowlist: Resource types (e.g. "font") and hosts
+                (e.g. "static.example.com"), or None for the plain lean
+                profile.
+
+        Returns:
+            True if updated, False if not found.
+        """
+        target = self.get_by_id(target_id)
+        if target:
+            target.resource_allowlist = resource_allowlist
+            return True
+        return False
+
     def set_active(self, target_id: int, is_active: bool) -> bool:
         """Set the active status of a target.
 
@@ -530,3 +1500,103 @@ class CrawlTargetRepository:
             self.session.delete(target)
             return True
         return False
+
+
+class RawPageRepository:
+    """Repository for the raw page archive index.
+
+    The page bodies are stored in a PageArchive; this repository records
+    and looks up the fetches that produced them.
+
+    Example:
+        >>> digest = archive.put(result.markdown)
+        >>> repo = RawPageRepository(session)
+        >>> repo.add(result.url, digest, markdown_size=len(result.markdown))
+        >>> latest = repo.get_latest(result.url)
+    """
+
+    def __init__(self, session: Session):
+        """Initialize the repository.
+
+        Args:
+            session: SQLAlchemy session to use.
+        """
+        self.session = session
+
+    def add(
+        self,
+        url: str,
+        markdown_hash: str,
+        markdown_size: int = 0,
+        html_hash: Optional[str] = None,
+        html_size: Optional[int] = None,
+        target_id: Optional[int] = None,
+    ) -> RawPage:
+        """Record a fetch of an archived page.
+
+        Args:
+            url: URL that was fetched.
+            markdown_hash: Archive hash of the page markdown.
+            markdown_size: Uncompressed markdown size in bytes.
+            html_hash: Archive hash of the page HTML, if archived.
+            html_size: Uncompressed HTML size in bytes.
+            target_id: Crawl target that was fetched. Looked up by URL if
+                None; stays None for ad-hoc URLs.
+
+        Returns:
+            The created RawPage.
+        """
+        if target_id is None:
+            target_id = self.session.scalar(
+                select(CrawlTarget.id).where(CrawlTarget.url == url).limit(1)
+            )
+        page = RawPage(
+            target_id=target_id,
+            url=url,
+            markdown_hash=markdown_hash,
+            markdown_size=markdown_size,
+            html_hash=html_hash,
+            html_size=html_size,
+        )
+        self.session.add(page)
+        self.session.flush()
+        return page
+
+    def get_latest(self, url: str) -> Optional[RawPage]:
+        """Get the most recent fetch of a URL.
+
+        Args:
+            url: Page URL.
+
+        Returns:
+            The latest RawPage, or None if the URL was never archived.
+        """
+        stmt = (
+            select(RawPage)
+            .where(RawPage.url == url)
+            .order_by(RawPage.fetched_at.desc(), RawPage.id.desc())
+            .limit(1)
+        )
+        return self.session.scalar(stmt)
+
+    def list_by_target(self, target_id: int, limit: int = 100) -> list[RawPage]:
+        """List fetches of a crawl target, newest first.
+
+        Args:
+            target_id: Crawl target ID.
+            limit: Maximum number of fetches.
+
+        Returns:
+            List of RawPages.
+        """
+        stmt = (
+            select(RawPage)
+            .where(RawPage.target_id == target_id)
+            .order_by(RawPage.fetched_at.desc(), RawPage.id.desc())
+            .limit(limit)
+        )
+        return list(self.session.scalars(stmt))
+
+    def count(self) -> int:
+        """Get the number of recorded fetches."""
+        return self.session.scalar(select(func.count()).select_from(RawPage)) or 0
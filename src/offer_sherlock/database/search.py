@@ -0,0 +1,171 @@
+"""Full-text indexes for job search: SQLite FTS5 and PostgreSQL pg_trgm.
+
+Neither engine's word tokenizers segment Chinese, so both index character
+trigrams, which match substrings in any script.
+
+On SQLite the index is a contentless FTS5 table using the built-in
+``trigram`` tokenizer, kept in sync with ``jobs`` by plain-SQL triggers:
+any connection can write to ``jobs`` (the sqlite3 shell, DB browsers,
+pandas), and it stores only the inverted index, not a second copy of the
+text. Trigrams cannot match terms shorter than three characters, such as
+"后端", so queries match those terms with LIKE on ``jobs`` instead.
+
+On PostgreSQL the index is a set of pg_trgm GIN indexes on the same
+columns. They serve the ``ILIKE '%keyword%'`` search directly; keywords
+shorter than three characters still match but cannot use the index.
+"""
+
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+FTS_TABLE = "jobs_fts"
+
+# Job columns covered by the index, in FTS column order
+FTS_COLUMNS = ("title", "company", "requirements", "location")
+
+# Shortest term the trigram index can match
+MIN_MATCH_CHARS = 3
+
+
+def split_keyword(keyword: str) -> tuple[Optional[str], list[str]]:
+    """Split a user keyword into an FTS5 MATCH expression and short terms.
+
+    Whitespace separates terms, and all terms must match. Terms of at
+    least MIN_MATCH_CHARS characters become quoted substring phrases of
+    the MATCH expression; shorter ones are returned for a LIKE filter.
+
+    Args:
+        keyword: Raw search keyword.
+
+    Returns:
+        Tuple of (MATCH expression or None, short terms).
+
+    Example:
+        >>> split_keyword("Python 后端")
+        ('"Python"', ['后端'])
+    """
+    phrases, short = [], []
+    for term in keyword.split():
+        if len(term) >= MIN_MATCH_CHARS:
+            phrases.append('"' + term.replace('"', '""') + '"')
+        else:
+            short.append(term)
+    return " ".join(phrases) or None, short
+
+
+_COLUMNS = ", ".join(FTS_COLUMNS)
+
+
+def _values(prefix: str) -> str:
+    return ", ".join(f"{prefix}.{col}" for col in FTS_COLUMNS)
+
+
+_TRGM_STATEMENTS = ("CREATE EXTENSION IF NOT EXISTS pg_trgm",) + tuple(
+    f"CREATE INDEX IF NOT EXISTS ix_jobs_{col}_trgm ON jobs USING gin ({col} gin_trgm_ops)"
+    for col in FTS_COLUMNS
+)
+
+_TRIGGERS = ("ai", "ad", "au")
+
+_CREATE_STATEMENTS = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"{_COLUMNS}, content='', tokenize='trigram')",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON jobs BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {_COLUMNS}) VALUES (new.id, {_values("new")});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON jobs BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMNS})
+        VALUES ('delete', old.id, {_values("old")});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+    AFTER UPDATE OF {_COLUMNS} ON jobs BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMNS})
+        VALUES ('delete', old.id, {_values("old")});
+        INSERT INTO {FTS_TABLE}(rowid, {_COLUMNS}) VALUES (new.id, {_values("new")});
+    END""",
+)
+
+
+def has_search_index(conn: Connection) -> bool:
+    """Check whether the FTS index exists on this connection's database."""
+    if conn.dialect.name != "sqlite":
+        return False
+    stmt = text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name")
+    return conn.execute(stmt, {"name": FTS_TABLE}).first() is not None
+
+
+def _index_sql(conn: Connection) -> Optional[str]:
+    stmt = text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name")
+    return conn.execute(stmt, {"name": FTS_TABLE}).scalar()
+
+
+def _drop_statements() -> tuple[str, ...]:
+    return tuple(
+        f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}" for suffix in _TRIGGERS
+    ) + (f"DROP TABLE IF EXISTS {FTS_TABLE}",)
+
+
+def ensure_search_index(engine: Engine) -> bool:
+    """Create the search index, backfilling existing jobs.
+
+    On SQLite this is the FTS table and its triggers; an index built with
+    another tokenizer by an earlier version is replaced. On PostgreSQL it
+    is the pg_trgm GIN indexes. Safe to call repeatedly. Does nothing on
+    other engines, when the SQLite build lacks FTS5 (or its trigram
+    tokenizer, SQLite < 3.34), or when the pg_trgm extension cannot be
+    created.
+
+    Args:
+        engine: Database engine.
+
+    Returns:
+        True if the index is available.
+    """
+    if engine.dialect.name == "postgresql":
+        try:
+            with engine.begin() as conn:
+                for statement in _TRGM_STATEMENTS:
+                    conn.execute(text(statement))
+        except Exception:
+            # Extension not installed or not permitted: plain ILIKE scans
+            return False
+        return True
+    if engine.dialect.name != "sqlite":
+        return False
+
+    with engine.begin() as conn:
+        existing = _index_sql(conn)
+        if existing is not None and "trigram" not in existing:
+            # Bigram index of earlier versions, maintained by triggers
+            # calling a Python function: rebuild it in plain SQL
+            for statement in _drop_statements():
+                conn.execute(text(statement))
+            existing = None
+        created = existing is None
+        try:
+            for statement in _CREATE_STATEMENTS:
+                conn.execute(text(statement))
+        except Exception:
+            # SQLite without FTS5 or its trigram tokenizer: keep the
+            # LIKE-based search
+            return False
+        if created:
+            conn.execute(
+                text(
+                    f"INSERT INTO {FTS_TABLE}(rowid, {_COLUMNS}) "
+                    f"SELECT id, {_values('jobs')} FROM jobs"
+                )
+            )
+    return True
+
+
+def drop_search_index(engine: Engine) -> None:
+    """Drop the FTS index (its triggers, and the PostgreSQL trigram
+    indexes, are dropped along with ``jobs``)."""
+    if engine.dialect.name != "sqlite":
+        return
+    with engine.begin() as conn:
+        for statement in _drop_statements():
+            conn.execute(text(statement))
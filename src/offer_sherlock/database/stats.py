@@ -0,0 +1,249 @@
+"""Summary tables for job and insight statistics.
+
+Counting jobs per company with ``GROUP BY`` scans the whole jobs table, so
+the CLI stats and dashboards read small summary tables instead:
+
+- ``job_counts_by_company``: jobs per company
+- ``job_counts_daily``: jobs per company per creation day (UTC)
+- ``job_counts_by_type``: jobs per job type
+- ``insight_counts``: insights and latest insight time per company
+
+They are kept up to date on write by triggers on ``jobs`` and
+``insights``, so every write path (repositories, bulk upserts, raw SQL)
+is covered and the counts commit or roll back with the data. Updates only
+touch the summaries when company, job type or creation day change.
+refresh_stats() rebuilds them from scratch, e.g. when the triggers are
+first installed on an existing database.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+STATS_TABLES = ("job_counts_by_company", "job_counts_daily", "job_counts_by_type", "insight_counts")
+
+# The trigger name used to detect whether the summaries are installed
+_MARKER_TRIGGER = "job_counts_ai"
+
+
+def _day(dialect: str, expr: str) -> str:
+    """SQL for the calendar day of a timestamp expression."""
+    if dialect == "sqlite":
+        return f"date({expr})"
+    return f"CAST({expr} AS DATE)"
+
+
+def _bump_jobs(dialect: str, row: str, delta: int) -> str:
+    """Statements adding ``delta`` to the counts of the ``row`` job."""
+    day = _day(dialect, f"{row}.created_at")
+    job_type = f"coalesce({row}.job_type, '')"
+    if delta > 0:
+        return f"""
+        INSERT INTO job_counts_by_company (company, jobs) VALUES ({row}.company, 1)
+            ON CONFLICT (company) DO UPDATE SET jobs = job_counts_by_company.jobs + 1;
+        INSERT INTO job_counts_daily (company, day, jobs) VALUES ({row}.company, {day}, 1)
+            ON CONFLICT (company, day) DO UPDATE SET jobs = job_counts_daily.jobs + 1;
+        INSERT INTO job_counts_by_type (job_type, jobs) VALUES ({job_type}, 1)
+            ON CONFLICT (job_type) DO UPDATE SET jobs = job_counts_by_type.jobs + 1;"""
+    return f"""
+        UPDATE job_counts_by_company SET jobs = jobs - 1 WHERE company = {row}.company;
+        DELETE FROM job_counts_by_company WHERE company = {row}.company AND jobs <= 0;
+        UPDATE job_counts_daily SET jobs = jobs - 1
+            WHERE company = {row}.company AND day = {day};
+        DELETE FROM job_counts_daily
+            WHERE company = {row}.company AND day = {day} AND jobs <= 0;
+        UPDATE job_counts_by_type SET jobs = jobs - 1 WHERE job_type = {job_type};
+        DELETE FROM job_counts_by_type WHERE job_type = {job_type} AND jobs <= 0;"""
+
+
+def _bump_insights(row: str, delta: int) -> str:
+    """Statements adding ``delta`` to the counts of the ``row`` insight."""
+    if delta > 0:
+        return f"""
+        INSERT INTO insight_counts (company, insights, last_created_at)
+            VALUES ({row}.company, 1, {row}.created_at)
+            ON CONFLICT (company) DO UPDATE SET
+                insights = insight_counts.insights + 1,
+                last_created_at = CASE
+                    WHEN insight_counts.last_created_at IS NULL
+                        OR excluded.last_created_at > insight_counts.last_created_at
+                    THEN excluded.last_created_at
+                    ELSE insight_counts.last_created_at
+                END;"""
+    return f"""
+        UPDATE insight_counts SET
+            insights = insights - 1,
+            last_created_at = (
+                SELECT max(created_at) FROM insights WHERE company = {row}.company
+            )
+            WHERE company = {row}.company;
+        DELETE FROM insight_counts WHERE company = {row}.company AND insights <= 0;"""
+
+
+def _job_changed(dialect: str) -> str:
+    """Condition for job updates that move the job to other summary rows."""
+    # SQLite spells IS DISTINCT FROM as IS NOT (before 3.39)
+    ne = "IS NOT" if dialect == "sqlite" else "IS DISTINCT FROM"
+    old_day, new_day = _day(dialect, "old.created_at"), _day(dialect, "new.created_at")
+    return (
+        f"old.company {ne} new.company "
+        f"OR old.job_type {ne} new.job_type "
+        f"OR {old_day} {ne} {new_day}"
+    )
+
+
+def _sqlite_statements() -> list[str]:
+    return [
+        f"""CREATE TRIGGER IF NOT EXISTS {_MARKER_TRIGGER} AFTER INSERT ON jobs BEGIN
+        {_bump_jobs("sqlite", "new", 1)}
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS job_counts_ad AFTER DELETE ON jobs BEGIN
+        {_bump_jobs("sqlite", "old", -1)}
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS job_counts_au
+        AFTER UPDATE OF company, job_type, created_at ON jobs
+        WHEN {_job_changed("sqlite")} BEGIN
+        {_bump_jobs("sqlite", "old", -1)}
+        {_bump_jobs("sqlite", "new", 1)}
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS insight_counts_ai AFTER INSERT ON insights BEGIN
+        {_bump_insights("new", 1)}
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS insight_counts_ad AFTER DELETE ON insights BEGIN
+        {_bump_insights("old", -1)}
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS insight_counts_au AFTER UPDATE OF company ON insights
+        WHEN old.company IS NOT new.company BEGIN
+        {_bump_insights("old", -1)}
+        {_bump_insights("new", 1)}
+        END""",
+    ]
+
+
+def _postgresql_statements() -> list[str]:
+    # One function per table; TG_OP tells inserts, deletes and updates apart
+    return [
+        f"""CREATE OR REPLACE FUNCTION job_counts_sync() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN {_bump_jobs("postgresql", "OLD", -1)}
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN {_bump_jobs("postgresql", "NEW", 1)}
+            END IF;
+            RETURN NULL;
+        END $$ LANGUAGE plpgsql""",
+        f"""CREATE OR REPLACE FUNCTION insight_counts_sync() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('DELETE', 'UPDATE') THEN {_bump_insights("OLD", -1)}
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN {_bump_insights("NEW", 1)}
+            END IF;
+            RETURN NULL;
+        END $$ LANGUAGE plpgsql""",
+        f"""CREATE OR REPLACE TRIGGER {_MARKER_TRIGGER} AFTER INSERT OR DELETE ON jobs
+        FOR EACH ROW EXECUTE FUNCTION job_counts_sync()""",
+        f"""CREATE OR REPLACE TRIGGER job_counts_au
+        AFTER UPDATE OF company, job_type, created_at ON jobs
+        FOR EACH ROW WHEN ({_job_changed("postgresql")})
+        EXECUTE FUNCTION job_counts_sync()""",
+        """CREATE OR REPLACE TRIGGER insight_counts_ai AFTER INSERT OR DELETE ON insights
+        FOR EACH ROW EXECUTE FUNCTION insight_counts_sync()""",
+        """CREATE OR REPLACE TRIGGER insight_counts_au AFTER UPDATE OF company ON insights
+        FOR EACH ROW WHEN (OLD.company IS DISTINCT FROM NEW.company)
+        EXECUTE FUNCTION insight_counts_sync()""",
+    ]
+
+
+def has_stats_triggers(conn: Connection) -> bool:
+    """Check whether the summary triggers exist on this connection's database."""
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        stmt = text("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = :name")
+    elif dialect == "postgresql":
+        stmt = text("SELECT 1 FROM pg_trigger WHERE tgname = :name")
+    else:
+        return False
+    return conn.execute(stmt, {"name": _MARKER_TRIGGER}).first() is not None
+
+
+def refresh_stats(conn: Connection) -> None:
+    """Rebuild the summary tables from jobs and insights.
+
+    Args:
+        conn: Connection inside a transaction.
+    """
+    day = _day(conn.dialect.name, "created_at")
+    for table in STATS_TABLES:
+        conn.execute(text(f"DELETE FROM {table}"))
+    conn.execute(
+        text(
+            "INSERT INTO job_counts_by_company (company, jobs) "
+            "SELECT company, count(*) FROM jobs GROUP BY company"
+        )
+    )
+    conn.execute(
+        text(
+            f"INSERT INTO job_counts_daily (company, day, jobs) "
+            f"SELECT company, {day}, count(*) FROM jobs GROUP BY company, {day}"
+        )
+    )
+    conn.execute(
+        text(
+            "INSERT INTO job_counts_by_type (job_type, jobs) "
+            "SELECT coalesce(job_type, ''), count(*) FROM jobs "
+            "GROUP BY coalesce(job_type, '')"
+        )
+    )
+    conn.execute(
+        text(
+            "INSERT INTO insight_counts (company, insights, last_created_at) "
+            "SELECT company, count(*), max(created_at) FROM insights GROUP BY company"
+        )
+    )
+
+
+def ensure_stats_triggers(engine: Engine) -> bool:
+    """Install the summary triggers, backfilling the summary tables.
+
+    Safe to call repeatedly. The summary tables themselves are created by
+    Base.metadata.create_all().
+
+    Args:
+        engine: Database engine.
+
+    Returns:
+        True if the summaries are maintained on this database.
+    """
+    dialect = engine.dialect.name
+    if dialect == "sqlite":
+        statements = _sqlite_statements()
+    elif dialect == "postgresql":
+        statements = _postgresql_statements()
+    else:
+        return False
+
+    with engine.begin() as conn:
+        if has_stats_triggers(conn):
+            return True
+        for statement in statements:
+            conn.execute(text(statement))
+        refresh_stats(conn)
+    return True
+
+
+def drop_stats_triggers(engine: Engine) -> None:
+    """Drop the summary triggers and functions."""
+    dialect = engine.dialect.name
+    with engine.begin() as conn:
+        if dialect == "sqlite":
+            for name in (
+                _MARKER_TRIGGER,
+                "job_counts_ad",
+                "job_counts_au",
+                "insight_counts_ai",
+                "insight_counts_ad",
+                "insight_counts_au",
+            ):
+                conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+        elif dialect == "postgresql":
+            # Dropping the functions drops the triggers using them
+            conn.execute(text("DROP FUNCTION IF EXISTS job_counts_sync() CASCADE"))
+            conn.execute(text("DROP FUNCTION IF EXISTS insight_counts_sync() CASCADE"))
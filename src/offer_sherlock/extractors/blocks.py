@@ -0,0 +1,246 @@
+"""Segment career pages into stable blocks for incremental extraction.
+
+A list page usually changes by a few job cards at a time. Splitting its
+markdown into blocks that survive re-crawls unchanged (a heading with its
+body, a list row, a paragraph) lets JobExtractor.extract_incremental send
+only new or changed blocks to the LLM and carry over the jobs of blocks it
+has seen before.
+
+Block boundaries:
+
+- a heading or horizontal rule always starts a block; the heading's body
+  (paragraphs and attribute lists) stays in the heading's block
+- a top-level list item starts a block if it contains a link (a job row),
+  or if the current block is not a heading section
+- a blank line ends a block that is not a heading section
+- blocks longer than ``max_chars`` are split at line boundaries
+"""
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from typing import Optional
+
+from offer_sherlock.database.hashing import normalize_text
+from offer_sherlock.schemas.job import JobPosting
+
+_HEADING = re.compile(r"^#{1,6}\s")
+_RULE = re.compile(r"^(?:-{3,}|\*{3,}|_{3,})\s*$")
+_LIST_ITEM = re.compile(r"^(?:[-*+]|\d+[.)])\s")
+_LINK = re.compile(r"\]\(")
+
+# Default upper bound on a block's size (characters)
+MAX_BLOCK_CHARS = 2000
+
+
+@dataclass
+class Block:
+    """A segment of page markdown.
+
+    Attributes:
+        text: Block markdown.
+        heading: Nearest heading above the block, as context for blocks
+            extracted on their own (None for heading blocks themselves).
+    """
+
+    text: str
+    heading: Optional[str] = None
+
+    @property
+    def hash(self) -> str:
+        """Hash of the normalized block text."""
+        return block_hash(self.text)
+
+    def prompt_text(self) -> str:
+        """Block text with its heading prepended as context."""
+        if self.heading:
+            return f"{self.heading}\n{self.text}"
+        return self.text
+
+
+def block_hash(text: str) -> str:
+    """Hash of a block's normalized text (whitespace/width insensitive)."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def segment_markdown(markdown: str, max_chars: int = MAX_BLOCK_CHARS) -> list[Block]:
+    """Split page markdown into blocks.
+
+    Args:
+        markdown: Page markdown.
+        max_chars: Maximum block size; longer blocks are split by lines.
+
+    Returns:
+        Non-empty blocks in page order.
+    """
+    blocks: list[Block] = []
+    lines: list[str] = []
+    heading: Optional[str] = None
+    in_section = False
+
+    def flush():
+        text = "\n".join(lines).strip()
+        lines.clear()
+        if not text:
+            return
+        context = None if text.startswith(heading or "\0") else heading
+        for chunk in _split_long(text, max_chars):
+            blocks.append(Block(chunk, context))
+
+    for line in (markdown or "").splitlines():
+        stripped = line.strip()
+        if _HEADING.match(line):
+            flush()
+            heading = stripped
+            in_section = True
+        elif _RULE.match(stripped):
+            flush()
+            in_section = False
+            continue
+        elif not stripped:
+            if not in_section:
+                flush()
+            elif lines:
+                lines.append("")
+            continue
+        elif _LIST_ITEM.match(line) and (not in_section or _LINK.search(line)):
+            flush()
+            # Rows below a heading are their own blocks from here on
+            in_section = False
+        lines.append(line.rstrip())
+    flush()
+    return blocks
+
+
+def _split_long(text: str, max_chars: int) -> list[str]:
+    if len(text) <= max_chars:
+        return [text]
+    chunks, current, size = [], [], 0
+    for line in text.split("\n"):
+        if current and size + len(line) > max_chars:
+            chunks.append("\n".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    chunks.append("\n".join(current))
+    return chunks
+
+
+@dataclass
+class ExtractionPlan:
+    """Which blocks of a page need extracting, given the previous crawl.
+
+    Attributes:
+        blocks: All blocks of the page.
+        selected: New or changed blocks to send to the LLM.
+        deferred: New or changed blocks left for a later run because the
+            prompt budget was used up.
+        carried: Jobs of unchanged blocks, by block hash.
+    """
+
+    blocks: list[Block]
+    selected: list[Block] = field(default_factory=list)
+    deferred: list[Block] = field(default_factory=list)
+    carried: dict[str, list[JobPosting]] = field(default_factory=dict)
+
+    @property
+    def prompt(self) -> str:
+        """Markdown of the selected blocks."""
+        return "\n\n".join(block.prompt_text() for block in self.selected)
+
+    def assign(self, jobs: list[JobPosting]) -> dict[str, list[JobPosting]]:
+        """Attribute extracted jobs to the selected blocks they came from.
+
+        A job belongs to the selected block naming it most specifically:
+        its external ID or apply link, then its title as link text, then
+        its title anywhere. This keeps a short title such as "工程师" on
+        its own card rather than on a header or filter bar listing it.
+
+        A job found in no block cannot be attributed. If there is one, the
+        selected blocks left without jobs are omitted from the result
+        (the job may have come from any of them), so the next run extracts
+        them again instead of carrying the job over while its card is gone.
+
+        Args:
+            jobs: Jobs extracted from the prompt.
+
+        Returns:
+            Jobs per selected block hash.
+        """
+        texts = [normalize_text(block.text).casefold() for block in self.selected]
+        assigned: dict[str, list[JobPosting]] = {block.hash: [] for block in self.selected}
+        unattributed = False
+        for job in jobs:
+            index = _best_block(texts, job)
+            if index is None:
+                unattributed = True
+                continue
+            assigned[self.selected[index].hash].append(job)
+        if unattributed:
+            return {digest: found for digest, found in assigned.items() if found}
+        return assigned
+
+
+def _best_block(texts: list[str], job: JobPosting) -> Optional[int]:
+    """Index of the text naming the job most specifically, or None.
+
+    An external ID or apply link beats the title as link text, which beats
+    the title anywhere in the text; ties go to the shortest text.
+    """
+    title = normalize_text(job.title).casefold()
+    links = [
+        normalize_text(key).casefold()
+        for key in (job.job_id_external, job.apply_link)
+        if key
+    ]
+    best, best_rank = None, None
+    for i, text in enumerate(texts):
+        if any(link in text for link in links):
+            kind = 3
+        elif title and f"[{title}]" in text:
+            kind = 2
+        elif title and title in text:
+            kind = 1
+        else:
+            continue
+        rank = (kind, -len(text))
+        if best_rank is None or rank > best_rank:
+            best, best_rank = i, rank
+    return best
+
+
+def plan_extraction(
+    blocks: list[Block],
+    previous: Optional[dict[str, list[JobPosting]]],
+    max_chars: int,
+) -> ExtractionPlan:
+    """Decide which blocks to extract.
+
+    Args:
+        blocks: Blocks of the freshly crawled page.
+        previous: Jobs per block hash from the previous extraction.
+        max_chars: Prompt budget for the selected blocks. At least one
+            block is always selected.
+
+    Returns:
+        ExtractionPlan for the page.
+    """
+    previous = previous or {}
+    plan = ExtractionPlan(blocks=blocks)
+    seen: set[str] = set()
+    size = 0
+    for block in blocks:
+        digest = block.hash
+        if digest in seen:
+            continue
+        seen.add(digest)
+        if digest in previous:
+            plan.carried[digest] = previous[digest]
+            continue
+        length = len(block.prompt_text()) + 2
+        if plan.selected and size + length > max_chars:
+            plan.deferred.append(block)
+            continue
+        plan.selected.append(block)
+        size += length
+    return plan
@@ -3,8 +3,13 @@
 from typing import Optional
 
 from offer_sherlock.extractors.base import BaseExtractor
+from offer_sherlock.extractors.blocks import plan_extraction, segment_markdown
 from offer_sherlock.llm.client import LLMClient
-from offer_sherlock.schemas.job import JobListExtraction, JobPosting
+from offer_sherlock.schemas.job import (
+    IncrementalJobExtraction,
+    JobListExtraction,
+    JobPosting,
+)
 
 # System prompt for job extraction
 JOB_EXTRACTION_SYSTEM_PROMPT = """你是一个专业的招聘信息提取助手。你的任务是从招聘网站的页面内容中提取结构化的岗位信息。
@@ -94,6 +99,18 @@ class JobExtractor(BaseExtractor[JobListExtraction]):
         Returns:
             JobListExtraction with list of extracted jobs.
         """
+        try:
+            return await self._extract(content, company, source_url)
+        except Exception as e:
+            # Return empty result on failure
+            return JobListExtraction(
+                jobs=[],
+                source_url=source_url,
+                extraction_notes=f"提取失败: {str(e)}",
+            )
+
+    async def _extract(self, content: str, company: str, source_url: str) -> JobListExtraction:
+        """Run the LLM extraction, raising on failure."""
         truncated_content = self._truncate_content(content)
 
         user_prompt = JOB_EXTRACTION_USER_PROMPT.format(
@@ -102,31 +119,76 @@ class JobExtractor(BaseExtractor[JobListExtraction]):
             content=truncated_content,
         )
 
-        try:
-            # Use structured output to get jobs directly
-            result = await self.llm.achat_structured(
-                message=user_prompt,
-                output_schema=JobListExtraction,
-                system_prompt=JOB_EXTRACTION_SYSTEM_PROMPT,
-            )
+        # Use structured output to get jobs directly
+        result = await self.llm.achat_structured(
+            message=user_prompt,
+            output_schema=JobListExtraction,
+            system_prompt=JOB_EXTRACTION_SYSTEM_PROMPT,
+        )
 
-            # Ensure source_url is set
-            result.source_url = source_url
+        # Ensure source_url is set
+        result.source_url = source_url
 
-            # Ensure company name is consistent
-            for job in result.jobs:
-                if not job.company or job.company == "Unknown":
-                    job.company = company
+        # Ensure company name is consistent
+        for job in result.jobs:
+            if not job.company or job.company == "Unknown":
+                job.company = company
 
-            return result
+        return result
 
-        except Exception as e:
-            # Return empty result on failure
-            return JobListExtraction(
-                jobs=[],
-                source_url=source_url,
-                extraction_notes=f"提取失败: {str(e)}",
-            )
+    async def extract_incremental(
+        self,
+        content: str,
+        company: str = "Unknown",
+        source_url: str = "",
+        previous: Optional[dict[str, list[JobPosting]]] = None,
+    ) -> IncrementalJobExtraction:
+        """Extract only the parts of a page that changed since the last crawl.
+
+        The page is split into blocks (see extractors.blocks). Blocks whose
+        hash is in ``previous`` keep their jobs; the others are sent to the
+        LLM together, up to max_content_length characters, and the jobs
+        found are attributed back to their blocks. Blocks that do not fit,
+        whose extraction failed or that may hold a job found in no block
+        are left out of ``block_jobs``, so the next run picks them up.
+
+        Args:
+            content: Page markdown.
+            company: Company name for context.
+            source_url: URL of the source page.
+            previous: ``block_jobs`` of the previous extraction of this
+                page, or None to extract the whole page.
+
+        Returns:
+            IncrementalJobExtraction with all jobs on the page.
+        """
+        plan = plan_extraction(segment_markdown(content), previous, self.max_content_length)
+        carried = [job for jobs in plan.carried.values() for job in jobs]
+        result = IncrementalJobExtraction(
+            source_url=source_url,
+            block_jobs=dict(plan.carried),
+            blocks=len(plan.blocks),
+            changed_blocks=len(plan.selected),
+            deferred_blocks=len(plan.deferred),
+            carried_jobs=len(carried),
+        )
+
+        extracted: list[JobPosting] = []
+        if plan.selected:
+            prompt = plan.prompt
+            result.prompt_chars = len(prompt)
+            try:
+                extraction = await self._extract(prompt, company, source_url)
+            except Exception as e:
+                result.deferred_blocks += len(plan.selected)
+                result.extraction_notes = f"提取失败: {str(e)}"
+            else:
+                extracted = extraction.jobs
+                result.extraction_notes = extraction.extraction_notes
+                result.block_jobs.update(plan.assign(extracted))
+
+        result.jobs = carried + extracted
+        return result
 
     async def extract_single(
         self,
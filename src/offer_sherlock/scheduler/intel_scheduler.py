@@ -21,7 +21,9 @@ from apscheduler.events import (
 )
 
 from offer_sherlock.agents import IntelAgent, AgentResult
-from offer_sherlock.database import DatabaseManager
+from offer_sherlock.crawlers import OfficialCrawler, RecyclePolicy, XhsCrawler
+from offer_sherlock.crawlers.recycling import MB, process_tree_rss
+from offer_sherlock.database import DatabaseManager, PoolSettings
 from offer_sherlock.utils.config import LLMProvider
 
 logger = logging.getLogger(__name__)
@@ -33,24 +35,42 @@ class ScheduleConfig:
 
     Attributes:
         db_path: Path to SQLite database file.
+        database_url: Database URL (e.g. PostgreSQL); overrides db_path.
+            If neither is set, DATABASE_URL from the settings is used.
         llm_provider: LLM provider for extraction.
         llm_model: Model name for LLM.
         skip_social: Skip social media crawling.
         max_companies_per_run: Max companies to process per scheduled run.
-        delay_between_companies: Delay between companies (anti-scraping).
+        delay_between_companies: Minimum delay between requests to the same
+            host or platform (anti-scraping).
+        max_concurrent_companies: Number of companies processed in parallel.
         cron_hour: Hour(s) to run (cron format, e.g., "9,21" for 9AM and 9PM).
         cron_minute: Minute to run (default: 0).
         cron_day_of_week: Days to run (default: "mon-fri").
         interval_hours: Alternative: run every N hours (if set, ignores cron).
         timezone: Timezone for scheduling (default: Asia/Shanghai).
+        run_timeout_minutes: Cancel a run still going after this long, so
+            a hung browser or LLM call cannot block later runs (None for
+            no limit).
+        watchdog_interval_minutes: Minutes between watchdog checks of the
+            process's memory (None disables the watchdog).
+        max_rss_mb: Memory of the process and its browsers, in MB, above
+            which the watchdog stops the scheduler between runs so a
+            supervisor can restart it (None to only log memory).
+        browser_recycle: When to replace the browsers shared by all runs,
+            for career pages and for Xiaohongshu (None keeps them until
+            close()). Its memory limit applies to each browser, so set it
+            below max_rss_mb.
     """
 
-    db_path: str = "data/offers.db"
+    db_path: Optional[str] = None
+    database_url: Optional[str] = None
     llm_provider: LLMProvider = LLMProvider.QWEN
     llm_model: str = "qwen-max"
     skip_social: bool = False
     max_companies_per_run: Optional[int] = None
     delay_between_companies: float = 2.0
+    max_concurrent_companies: int = 1
 
     # Cron schedule (default: 9AM and 9PM on weekdays)
     cron_hour: str = "9,21"
@@ -62,10 +82,28 @@ class ScheduleConfig:
 
     timezone: str = "Asia/Shanghai"
 
+    # Watchdog
+    run_timeout_minutes: Optional[float] = 180.0
+    watchdog_interval_minutes: Optional[float] = 5.0
+    max_rss_mb: Optional[float] = None
+    browser_recycle: Optional[RecyclePolicy] = RecyclePolicy()
+
     # Callbacks
     on_complete: Optional[Callable[[list[AgentResult]], None]] = None
     on_error: Optional[Callable[[Exception], None]] = None
 
+    def open_database(self) -> DatabaseManager:
+        """Create the database manager for this configuration.
+
+        URLs get the DB_POOL_* pool settings; without a path or URL the
+        database and pool come from the application settings.
+        """
+        if self.database_url:
+            return DatabaseManager(url=self.database_url, pool=PoolSettings.from_settings())
+        if self.db_path:
+            return DatabaseManager(db_path=self.db_path)
+        return DatabaseManager.from_settings()
+
 
 class IntelScheduler:
     """Scheduler for periodic intelligence collection.
@@ -97,10 +135,17 @@ class IntelScheduler:
         self.config = config or ScheduleConfig()
         self._scheduler: Optional[AsyncIOScheduler] = None
         self._db: Optional[DatabaseManager] = None
+        self._crawler: Optional[OfficialCrawler] = None
+        self._social_crawler: Optional[XhsCrawler] = None
         self._agent: Optional[IntelAgent] = None
         self._run_count: int = 0
         self._last_run: Optional[datetime] = None
         self._last_results: list[AgentResult] = []
+        self._run_started: Optional[datetime] = None
+        self._last_rss: Optional[int] = None
+        # Loop driven by run_blocking(), stopped on shutdown
+        self._blocking_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.memory_exceeded = False
 
     @property
     def is_running(self) -> bool:
@@ -122,17 +167,34 @@ class IntelScheduler:
         """Results from the last run."""
         return self._last_results
 
-    def _init_components(self):
-        """Initialize database and agent."""
+    async def _init_components(self):
+        """Initialize database, browsers and agent.
+
+        The browsers are shared by every run, so they are recycled by
+        config.browser_recycle instead of relaunched per page or company.
+        The Xiaohongshu browser launches on its first search.
+        """
         if self._db is None:
-            self._db = DatabaseManager(db_path=self.config.db_path)
+            self._db = self.config.open_database()
             self._db.create_tables()
 
+        if self._crawler is None:
+            crawler = OfficialCrawler(use_cache=False, recycle=self.config.browser_recycle)
+            await crawler.start()
+            self._crawler = crawler
+
+        if self._social_crawler is None:
+            self._social_crawler = XhsCrawler(
+                headless=True, recycle=self.config.browser_recycle
+            )
+
         if self._agent is None:
             self._agent = IntelAgent(
                 db=self._db,
                 llm_provider=self.config.llm_provider,
                 llm_model=self.config.llm_model,
+                crawler=self._crawler,
+                social_crawler=self._social_crawler,
             )
 
     def _create_trigger(self):
@@ -154,14 +216,24 @@ class IntelScheduler:
         """Execute one round of intelligence collection."""
         logger.info("Starting scheduled intelligence collection")
         start_time = datetime.now()
+        self._run_started = start_time
 
         try:
-            self._init_components()
+            await self._init_components()
 
-            results = await self._agent.run_all(
+            run = self._agent.run_all(
                 max_companies=self.config.max_companies_per_run,
                 delay_between=self.config.delay_between_companies,
+                concurrency=self.config.max_concurrent_companies,
+                skip_social=self.config.skip_social,
             )
+            timeout = self.config.run_timeout_minutes
+            try:
+                results = await asyncio.wait_for(
+                    run, timeout * 60 if timeout is not None else None
+                )
+            except asyncio.TimeoutError:
+                raise TimeoutError(f"Run exceeded {timeout:g} minutes and was cancelled")
 
             self._run_count += 1
             self._last_run = datetime.now()
@@ -191,6 +263,32 @@ class IntelScheduler:
             if self.config.on_error:
                 self.config.on_error(e)
             raise
+        finally:
+            self._run_started = None
+
+    async def _watchdog(self):
+        """Log memory use; stop the scheduler if it is over max_rss_mb.
+
+        The limit is only enforced between runs, so a run is never cut
+        short by it.
+        """
+        rss = await asyncio.to_thread(process_tree_rss)
+        self._last_rss = rss
+        running = ""
+        if self._run_started is not None:
+            minutes = (datetime.now() - self._run_started).total_seconds() / 60
+            running = f", run in progress for {minutes:.0f} min"
+        logger.info(f"Watchdog: {rss / MB:.0f} MB resident{running}")
+
+        limit = self.config.max_rss_mb
+        if limit is None or rss <= limit * MB or self._run_started is not None:
+            return
+        error = MemoryError(f"Process uses {rss / MB:.0f} MB, over {limit:g} MB")
+        logger.error(f"Watchdog: {error}; stopping scheduler")
+        self.memory_exceeded = True
+        if self.config.on_error:
+            self.config.on_error(error)
+        self.shutdown(wait=False)
 
     def _on_job_event(self, event: JobExecutionEvent):
         """Handle job execution events."""
@@ -226,6 +324,17 @@ class IntelScheduler:
             name="Intelligence Collection",
             replace_existing=True,
         )
+        if self.config.watchdog_interval_minutes:
+            self._scheduler.add_job(
+                self._watchdog,
+                trigger=IntervalTrigger(
+                    minutes=self.config.watchdog_interval_minutes,
+                    timezone=self.config.timezone,
+                ),
+                id="watchdog",
+                name="Memory Watchdog",
+                replace_existing=True,
+            )
 
         self._scheduler.start()
 
@@ -248,6 +357,20 @@ class IntelScheduler:
             self._scheduler.shutdown(wait=wait)
             self._scheduler = None
             logger.info("Scheduler shutdown complete")
+        loop, self._blocking_loop = self._blocking_loop, None
+        if loop is not None:
+            loop.stop()
+
+    async def close(self):
+        """Release the agent's database thread and the browsers (after shutdown())."""
+        if self._agent is not None:
+            await asyncio.to_thread(self._agent.close)
+            self._agent = None
+        crawlers = (self._crawler, self._social_crawler)
+        self._crawler = self._social_crawler = None
+        for crawler in crawlers:
+            if crawler is not None:
+                await crawler.close()
 
     async def run_once(self) -> list[AgentResult]:
         """Run intelligence collection once immediately.
@@ -260,7 +383,8 @@ class IntelScheduler:
     def run_blocking(self):
         """Run the scheduler in blocking mode.
 
-        This will block the current thread until interrupted (Ctrl+C).
+        This will block the current thread until interrupted (Ctrl+C) or
+        stopped by the watchdog (see memory_exceeded).
         """
         import signal
 
@@ -273,15 +397,18 @@ class IntelScheduler:
         signal.signal(signal.SIGTERM, signal_handler)
 
         # Start scheduler
+        loop = asyncio.get_event_loop()
+        self._blocking_loop = loop
         self.start()
 
         # Keep running
         try:
-            asyncio.get_event_loop().run_forever()
+            loop.run_forever()
         except (KeyboardInterrupt, SystemExit):
             pass
         finally:
             self.shutdown()
+            loop.run_until_complete(self.close())
 
     def get_next_run_time(self) -> Optional[datetime]:
         """Get the next scheduled run time."""
@@ -300,6 +427,9 @@ class IntelScheduler:
             "run_count": self._run_count,
             "last_run": self._last_run.isoformat() if self._last_run else None,
             "next_run": self.get_next_run_time().isoformat() if self.get_next_run_time() else None,
+            "run_in_progress": self._run_started is not None,
+            "rss_mb": round(self._last_rss / MB) if self._last_rss is not None else None,
+            "memory_exceeded": self.memory_exceeded,
             "config": {
                 "db_path": self.config.db_path,
                 "cron_hour": self.config.cron_hour,
@@ -309,12 +439,15 @@ class IntelScheduler:
                 "timezone": self.config.timezone,
                 "skip_social": self.config.skip_social,
                 "max_companies_per_run": self.config.max_companies_per_run,
+                "max_concurrent_companies": self.config.max_concurrent_companies,
+                "run_timeout_minutes": self.config.run_timeout_minutes,
+                "max_rss_mb": self.config.max_rss_mb,
             },
         }
 
 
 async def run_scheduler(
-    db_path: str = "data/offers.db",
+    db_path: Optional[str] = None,
     cron_hour: str = "9,21",
     interval_hours: Optional[float] = None,
     skip_social: bool = False,
@@ -323,7 +456,7 @@ async def run_scheduler(
     """Convenience function to create and start a scheduler.
 
     Args:
-        db_path: Path to database file.
+        db_path: Path to database file (None for DATABASE_URL).
         cron_hour: Hour(s) to run (cron format).
         interval_hours: Run every N hours (overrides cron).
         skip_social: Skip social media crawling.
@@ -3,12 +3,17 @@
 Defines structured data models for job postings and social intelligence.
 """
 
-from offer_sherlock.schemas.job import JobListExtraction, JobPosting
+from offer_sherlock.schemas.job import (
+    IncrementalJobExtraction,
+    JobListExtraction,
+    JobPosting,
+)
 from offer_sherlock.schemas.insight import InsightSummary, SocialPost
 
 __all__ = [
     "JobPosting",
     "JobListExtraction",
+    "IncrementalJobExtraction",
     "SocialPost",
     "InsightSummary",
 ]
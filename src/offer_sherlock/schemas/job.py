@@ -72,3 +72,33 @@ class JobListExtraction(BaseModel):
 
     def __str__(self) -> str:
         return f"JobListExtraction({self.count} jobs from {self.source_url})"
+
+
+class IncrementalJobExtraction(JobListExtraction):
+    """Jobs of a page extracted block by block against a previous crawl.
+
+    ``jobs`` holds every job on the page: those carried over from
+    unchanged blocks followed by those extracted from changed blocks.
+
+    Attributes:
+        block_jobs: Jobs per block hash for all blocks extracted so far;
+            pass it as ``previous`` to the next incremental extraction.
+        blocks: Number of blocks on the page.
+        changed_blocks: New or changed blocks sent to the LLM.
+        deferred_blocks: Changed blocks left for a later run (prompt
+            budget exhausted or extraction failed).
+        carried_jobs: Jobs taken over from unchanged blocks.
+        prompt_chars: Characters of page content sent to the LLM.
+    """
+
+    block_jobs: dict[str, list[JobPosting]] = Field(default_factory=dict)
+    blocks: int = 0
+    changed_blocks: int = 0
+    deferred_blocks: int = 0
+    carried_jobs: int = 0
+    prompt_chars: int = 0
+
+    @property
+    def complete(self) -> bool:
+        """Whether every block of the page has been extracted."""
+        return self.deferred_blocks == 0
@@ -97,6 +97,33 @@ class Settings(BaseSettings):
         default="sqlite:///./data/offers.db",
         description="Database connection URL",
     )
+    db_pool_size: int = Field(
+        default=5,
+        ge=1,
+        description="Connections kept in the pool (non-SQLite databases)",
+    )
+    db_max_overflow: int = Field(
+        default=10,
+        ge=0,
+        description="Extra connections allowed beyond the pool size",
+    )
+    db_pool_timeout: float = Field(
+        default=30.0,
+        gt=0,
+        description="Seconds to wait for a free pooled connection",
+    )
+    db_pool_pre_ping: bool = Field(
+        default=True,
+        description="Check pooled connections are alive before use",
+    )
+    db_pool_recycle: int = Field(
+        default=1800,
+        description="Replace pooled connections older than this many seconds (-1 disables)",
+    )
+    raw_archive_dir: str = Field(
+        default="./data/raw_pages",
+        description="Directory of the compressed raw page archive",
+    )
 
     # Logging Configuration
     log_level: str = Field(
@@ -0,0 +1,173 @@
+"""Tests for detail-page enrichment."""
+
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from offer_sherlock.agents import FrontierConfig, IntelAgent
+from offer_sherlock.crawlers.base import CrawlResult
+from offer_sherlock.database import DatabaseManager, JobRepository
+from offer_sherlock.schemas.job import JobPosting
+
+LIST_URL = "https://jobs.example.com/list"
+
+
+def listed_job(i: int) -> JobPosting:
+    """Job as extracted from the list page."""
+    return JobPosting(
+        title=f"Engineer {i}",
+        company="TestCorp",
+        job_id_external=f"J{i}",
+        requirements="snippet",
+        apply_link=f"https://jobs.example.com/detail/{i}",
+    )
+
+
+@pytest.fixture
+def db():
+    """Create in-memory database with three listed jobs."""
+    manager = DatabaseManager(db_path=":memory:")
+    manager.create_tables()
+    with manager.session() as session:
+        JobRepository(session).upsert_many([listed_job(i) for i in range(3)], LIST_URL)
+    return manager
+
+
+@pytest.fixture
+def crawled():
+    """Patch the frontier's browser; returns the list of crawled URLs."""
+    urls = []
+
+    async def crawl(url):
+        urls.append(url)
+        if url.endswith("/broken"):
+            return CrawlResult(url=url, markdown="", success=False, error="timeout")
+        return CrawlResult(url=url, markdown=f"# Detail {url}")
+
+    crawler = MagicMock()
+    crawler.crawl = crawl
+    crawler.__aenter__ = AsyncMock(return_value=crawler)
+    crawler.__aexit__ = AsyncMock(return_value=None)
+    with patch("offer_sherlock.agents.frontier.OfficialCrawler", return_value=crawler):
+        yield urls
+
+
+def make_agent(db, **config) -> IntelAgent:
+    """Agent with a frontier whose extractor returns detailed jobs."""
+    agent = IntelAgent(db, detail_frontier=FrontierConfig(**config))
+
+    async def extract_single(content, company="Unknown", source_url=""):
+        return JobPosting(
+            title="Engineer",
+            company=company,
+            requirements="5 years of Python",
+            salary_range="30-50k",
+        )
+
+    agent._job_extractor = MagicMock()
+    agent._job_extractor.extract_single = extract_single
+    return agent
+
+
+class TestDetailFrontier:
+    """Tests for DetailFrontier."""
+
+    @pytest.mark.asyncio
+    async def test_enrich_merges_detail(self, db, crawled):
+        """Test detail pages enrich the stored jobs once."""
+        agent = make_agent(db)
+
+        stats = await agent.enrich_details("TestCorp", LIST_URL)
+
+        assert (stats.due, stats.fetched, stats.enriched, stats.failed) == (3, 3, 3, 0)
+        with db.session() as session:
+            job = JobRepository(session).get_by_external_id("J0")
+            assert job.requirements == "5 years of Python"
+            assert job.salary_range == "30-50k"
+            assert job.detail_fetched_at is not None
+
+        # Recently fetched links are not due in the next run
+        agent.frontier.start_run()
+        stats = await agent.enrich_details("TestCorp", LIST_URL)
+        assert stats.due == 0
+        assert len(crawled) == 3
+
+    @pytest.mark.asyncio
+    async def test_unchanged_list_keeps_enrichment(self, db, crawled):
+        """Test re-listing an unchanged job keeps its detail fields."""
+        agent = make_agent(db)
+        await agent.enrich_details("TestCorp", LIST_URL)
+
+        with db.session() as session:
+            repo = JobRepository(session)
+            result = repo.upsert_many([listed_job(0)], LIST_URL)
+            assert result.unchanged == 1
+            assert repo.get_by_external_id("J0").requirements == "5 years of Python"
+
+            # A changed list entry resets the job for a new detail fetch
+            changed = listed_job(1).model_copy(update={"title": "Senior Engineer 1"})
+            repo.upsert_many([changed], LIST_URL)
+            session.expire_all()
+            assert repo.get_by_external_id("J1").detail_fetched_at is None
+
+        agent.frontier.start_run()
+        stats = await agent.enrich_details("TestCorp", LIST_URL)
+        assert stats.fetched == 1
+        assert crawled[-1].endswith("/detail/1")
+
+    @pytest.mark.asyncio
+    async def test_per_run_cap(self, db, crawled):
+        """Test the page cap spans companies and leftovers come next run."""
+        agent = make_agent(db, max_pages_per_run=2)
+
+        first = await agent.enrich_details("TestCorp", LIST_URL)
+        assert (first.fetched, first.deferred) == (2, 1)
+        # The run's budget is used up
+        assert (await agent.enrich_details("TestCorp", LIST_URL)).fetched == 0
+
+        agent.frontier.start_run()
+        second = await agent.enrich_details("TestCorp", LIST_URL)
+        assert second.fetched == 1
+        assert len(set(crawled)) == 3
+
+    @pytest.mark.asyncio
+    async def test_time_cap(self, db, crawled):
+        """Test no detail page is fetched once the run is out of time."""
+        agent = make_agent(db, max_seconds_per_run=0)
+
+        stats = await agent.enrich_details("TestCorp", LIST_URL)
+
+        assert stats.fetched == 0
+        assert stats.deferred == 3
+        assert crawled == []
+
+    @pytest.mark.asyncio
+    async def test_failed_link_waits_until_stale(self, db, crawled):
+        """Test a failing detail page is stamped and not retried at once."""
+        with db.session() as session:
+            job = listed_job(9).model_copy(
+                update={"apply_link": "https://jobs.example.com/broken"}
+            )
+            JobRepository(session).upsert_many([job], LIST_URL)
+        agent = make_agent(db)
+
+        stats = await agent.enrich_details("TestCorp", LIST_URL)
+
+        assert (stats.fetched, stats.failed, stats.enriched) == (3, 1, 3)
+        with db.session() as session:
+            repo = JobRepository(session)
+            broken = repo.get_by_external_id("J9")
+            assert broken.requirements == "snippet"
+            assert broken.detail_fetched_at is not None
+            # Due again once stale
+            later = datetime.now() + timedelta(days=8)
+            assert "https://jobs.example.com/broken" in repo.detail_links_due(LIST_URL, later)
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self, db):
+        """Test agents without a frontier do not enrich."""
+        agent = IntelAgent(db)
+
+        assert agent.frontier is None
+        assert await agent.enrich_details("TestCorp", LIST_URL) is None
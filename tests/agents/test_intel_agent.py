@@ -101,6 +101,15 @@ class TestIntelAgent:
         assert agent.db == db
         assert agent._llm_client is None  # Lazy init
 
+    @pytest.mark.asyncio
+    async def test_close_stops_database_thread(self, db):
+        """Test leaving the agent's context stops its database thread."""
+        async with IntelAgent(db) as agent:
+            assert await agent.target_id_for("https://test.com") is None
+            assert agent.adb._executor is not None
+
+        assert agent.adb._executor is None
+
     def test_default_social_keywords(self, agent):
         """Test default social keyword generation."""
         keywords = agent._get_social_keywords("字节跳动")
@@ -148,7 +157,7 @@ class TestIntelAgent:
 
         # Create mock extractor
         mock_extractor = MagicMock()
-        mock_extractor.extract = AsyncMock(return_value=mock_extraction)
+        mock_extractor.extract_incremental = AsyncMock(return_value=mock_extraction)
         agent._job_extractor = mock_extractor
 
         with patch(
@@ -158,14 +167,288 @@ class TestIntelAgent:
             mock_crawler_instance.crawl = AsyncMock(return_value=mock_crawl_result)
             MockCrawler.return_value = mock_crawler_instance
 
-            jobs_found, jobs_added, jobs_updated = await agent.crawl_official(
-                company="TestCorp",
-                url="https://test.com",
-            )
+            first = await agent.crawl_official(company="TestCorp", url="https://test.com")
+            second = await agent.crawl_official(company="TestCorp", url="https://test.com")
 
+        jobs_found, jobs_added, jobs_updated, jobs_unchanged = first
         assert jobs_found == 2
         assert jobs_added == 2
         assert jobs_updated == 0
+        assert jobs_unchanged == 0
+        # Re-crawling the same content writes nothing
+        assert second == (2, 0, 0, 2)
+
+    @pytest.mark.asyncio
+    async def test_crawl_official_paginated(self, agent, db):
+        """Test a paginated target is walked with a known-ID lookup."""
+        from offer_sherlock.database import CrawlTargetRepository
+
+        settings = {"mode": "next_button", "next_selector": ".next", "id_pattern": r"#(\w+)"}
+        with db.session() as session:
+            CrawlTargetRepository(session).add(
+                "TestCorp",
+                "https://test.com",
+                pagination=settings,
+                resource_allowlist=["font"],
+            )
+        await agent.persist_jobs(
+            "https://test.com",
+            [JobPosting(title="Engineer", company="TestCorp", job_id_external="J1")],
+        )
+        known = {}
+
+        async def crawl_pages(
+            url, pagination, known_ids=None, css_selector=None, resource_allowlist=None
+        ):
+            known["ids"] = await known_ids({"J1", "J2"})
+            known["mode"] = pagination.mode
+            known["allowlist"] = resource_allowlist
+            return CrawlResult(url=url, markdown="# Jobs\n- Engineer #J1\n- Designer #J2")
+
+        agent.extract_official = AsyncMock(
+            return_value=JobListExtraction(jobs=[], source_url="https://test.com")
+        )
+        with patch("offer_sherlock.agents.intel_agent.OfficialCrawler") as mock_crawler:
+            mock_crawler.return_value.crawl_pages = crawl_pages
+            await agent.crawl_official(company="TestCorp", url="https://test.com")
+
+        assert known == {"ids": {"J1"}, "mode": "next_button", "allowlist": ["font"]}
+        # Ad-hoc URLs have no stored crawl settings
+        assert await agent.load_crawl_target(None) is None
+
+    @pytest.mark.asyncio
+    async def test_crawl_official_learns_selector(self, agent, db):
+        """Test a job-list selector is learned, used and relearned."""
+        from offer_sherlock.database import CrawlTargetRepository
+
+        with db.session() as session:
+            CrawlTargetRepository(session).add("TestCorp", "https://test.com")
+        page = {
+            "html": (
+                "<html><body><nav>Menu</nav><ul class='jobs'>"
+                "<li>Engineer</li><li>Designer</li></ul><footer>About</footer></body></html>"
+            )
+        }
+        selectors = []
+
+        async def crawl(url, css_selector=None, resource_allowlist=None):
+            selectors.append(css_selector)
+            if css_selector and css_selector.split(".")[-1] not in page["html"]:
+                return CrawlResult(url=url, markdown="", html=page["html"])
+            markdown = "- Engineer\n- Designer" + ("" if css_selector else "\nMenu About")
+            return CrawlResult(url=url, markdown=markdown, html=page["html"])
+
+        agent.skip_unchanged = False
+        agent.extract_official = AsyncMock(
+            return_value=JobListExtraction(
+                jobs=[
+                    JobPosting(title="Engineer", company="TestCorp"),
+                    JobPosting(title="Designer", company="TestCorp"),
+                ],
+                source_url="https://test.com",
+            )
+        )
+
+        def stored():
+            with db.session() as session:
+                return CrawlTargetRepository(session).get_by_url("https://test.com").css_selector
+
+        with patch("offer_sherlock.agents.intel_agent.OfficialCrawler") as mock_crawler:
+            mock_crawler.return_value.crawl = crawl
+            await agent.crawl_official(company="TestCorp", url="https://test.com")
+            assert stored() == "ul.jobs"
+
+            await agent.crawl_official(company="TestCorp", url="https://test.com")
+            assert agent.extract_official.call_args.args[2] == "- Engineer\n- Designer"
+
+            # Redesign: the selector matches nothing, the full page is used
+            page["html"] = page["html"].replace("class='jobs'", "class='positions'")
+            await agent.crawl_official(company="TestCorp", url="https://test.com")
+            assert stored() == "ul.positions"
+
+        assert selectors == [None, "ul.jobs", "ul.jobs", None]
+
+        # A selector whose content yields no jobs is dropped
+        target = await agent.load_crawl_target(1)
+        result = CrawlResult(
+            url="https://test.com", markdown="x", metadata={"css_selector": "ul.positions"}
+        )
+        assert await agent.update_selector(1, target, result, []) is None
+        assert stored() is None
+
+    @pytest.mark.asyncio
+    async def test_crawl_official_replayed(self, db, tmp_path):
+        """Test an injected replay crawler drives a run without a browser."""
+        from offer_sherlock.crawlers import CrawlRecording, ReplayCrawler
+        from offer_sherlock.database import CrawlTargetRepository, JobRepository
+
+        with db.session() as session:
+            CrawlTargetRepository(session).add("TestCorp", "https://test.com")
+        recording = CrawlRecording(tmp_path / "rec")
+        recording.add(CrawlResult(url="https://test.com", markdown="- Engineer"))
+        agent = IntelAgent(db, crawler=ReplayCrawler(recording, time_scale=0))
+        agent.extract_official = AsyncMock(
+            return_value=JobListExtraction(
+                jobs=[JobPosting(title="Engineer", company="TestCorp")],
+                source_url="https://test.com",
+            )
+        )
+
+        with patch("offer_sherlock.agents.intel_agent.OfficialCrawler") as mock_crawler:
+            assert await agent.crawl_official("TestCorp", "https://test.com") == (1, 1, 0, 0)
+            # The replayed page is unchanged on the next run
+            assert await agent.crawl_official("TestCorp", "https://test.com") is None
+
+        mock_crawler.assert_not_called()
+        with db.session() as session:
+            assert JobRepository(session).count() == 1
+
+    @pytest.mark.asyncio
+    async def test_iter_all_replayed_stays_offline(self, db, tmp_path):
+        """Test a replayed batch without social collection crawls nothing live."""
+        from offer_sherlock.crawlers import CrawlRecording, ReplayCrawler
+        from offer_sherlock.database import CrawlTargetRepository
+
+        with db.session() as session:
+            CrawlTargetRepository(session).add("TestCorp", "https://test.com")
+        recording = CrawlRecording(tmp_path / "rec")
+        recording.add(CrawlResult(url="https://test.com", markdown="- Engineer"))
+        agent = IntelAgent(db, crawler=ReplayCrawler(recording, time_scale=0))
+        agent.extract_official = AsyncMock(
+            return_value=JobListExtraction(
+                jobs=[JobPosting(title="Engineer", company="TestCorp")],
+                source_url="https://test.com",
+            )
+        )
+
+        with patch(
+            "offer_sherlock.agents.intel_agent.OfficialCrawler"
+        ) as mock_official, patch(
+            "offer_sherlock.agents.intel_agent.XhsCrawler"
+        ) as mock_social:
+            results = [
+                r async for r in agent.iter_all(delay_between=0, skip_social=True)
+            ]
+
+        mock_official.assert_not_called()
+        mock_social.assert_not_called()
+        assert [(r.company, r.jobs_added, r.success) for r in results] == [
+            ("TestCorp", 1, True)
+        ]
+        assert agent.crawler.crawls == 1 and agent.crawler.misses == 0
+
+    @pytest.fixture
+    def fake_official(self, agent, db):
+        """Register a target and fake its crawl; returns the extract mock."""
+        from offer_sherlock.database import CrawlTargetRepository
+
+        with db.session() as session:
+            CrawlTargetRepository(session).add("TestCorp", "https://test.com")
+
+        page = {"markdown": "# Jobs\n- Engineer"}
+
+        async def fake_fetch(url, target=None):
+            return CrawlResult(url=url, markdown=page["markdown"])
+
+        extract = AsyncMock(
+            return_value=JobListExtraction(
+                jobs=[JobPosting(title="Engineer", company="TestCorp", job_id_external="J1")],
+                source_url="https://test.com",
+            )
+        )
+        agent.fetch_official = fake_fetch
+        agent.extract_official = extract
+        extract.page = page
+        return extract
+
+    @pytest.mark.asyncio
+    async def test_crawl_official_skips_unchanged_page(self, agent, db, fake_official):
+        """Test that an unchanged page is not extracted again."""
+        from offer_sherlock.database import CrawlTargetRepository
+
+        first = await agent.crawl_official(company="TestCorp", url="https://test.com")
+        # Whitespace drift does not count as a change
+        fake_official.page["markdown"] = "# Jobs\n\n-   Engineer\n"
+        second = await agent.crawl_official(company="TestCorp", url="https://test.com")
+
+        assert first == (1, 1, 0, 0)
+        assert second is None
+        assert fake_official.await_count == 1
+        with db.session() as session:
+            target = CrawlTargetRepository(session).get_by_url("https://test.com")
+            assert target.page_fingerprint is not None
+
+        result = await agent.run(
+            company="TestCorp", official_url="https://test.com", skip_social=True
+        )
+        assert result.success is True
+        assert result.official_status == "unchanged"
+        assert "page unchanged" in str(result)
+
+    @pytest.mark.asyncio
+    async def test_crawl_official_changed_page(self, agent, fake_official):
+        """Test that a changed page, or skip_unchanged=False, extracts again."""
+        await agent.crawl_official(company="TestCorp", url="https://test.com")
+
+        fake_official.page["markdown"] = "# Jobs\n- Engineer\n- Designer"
+        result = await agent.run(
+            company="TestCorp", official_url="https://test.com", skip_social=True
+        )
+        assert result.official_status == "crawled"
+        assert fake_official.await_count == 2
+
+        agent.skip_unchanged = False
+        assert await agent.crawl_official(company="TestCorp", url="https://test.com") is not None
+        assert fake_official.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_empty_extraction_is_retried(self, agent, fake_official):
+        """Test that a page yielding no jobs is not remembered as extracted."""
+        fake_official.return_value = JobListExtraction(jobs=[], source_url="https://test.com")
+
+        await agent.crawl_official(company="TestCorp", url="https://test.com")
+        await agent.crawl_official(company="TestCorp", url="https://test.com")
+
+        assert fake_official.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_crawl_official_incremental(self, agent, db):
+        """Test a changed page only sends its changed blocks to the LLM."""
+        from offer_sherlock.database import CrawlTargetRepository, JobRepository
+        from offer_sherlock.extractors import JobExtractor
+
+        with db.session() as session:
+            CrawlTargetRepository(session).add("TestCorp", "https://test.com")
+        llm = MagicMock()
+        llm.achat_structured = AsyncMock()
+        agent._job_extractor = JobExtractor(llm_client=llm)
+        page = {"markdown": "## Jobs\n- [Engineer](https://test.com/1)\n"}
+
+        async def fake_fetch(url, target=None):
+            return CrawlResult(url=url, markdown=page["markdown"])
+
+        agent.fetch_official = fake_fetch
+        llm.achat_structured.return_value = JobListExtraction(
+            jobs=[JobPosting(title="Engineer", company="TestCorp", job_id_external="J1")],
+            source_url="",
+        )
+        await agent.crawl_official(company="TestCorp", url="https://test.com")
+
+        page["markdown"] += "- [Designer](https://test.com/2)\n"
+        llm.achat_structured.return_value = JobListExtraction(
+            jobs=[JobPosting(title="Designer", company="TestCorp", job_id_external="J2")],
+            source_url="",
+        )
+        counts = await agent.crawl_official(company="TestCorp", url="https://test.com")
+
+        prompt = llm.achat_structured.call_args.kwargs["message"]
+        assert "Designer" in prompt
+        assert "Engineer" not in prompt
+        assert counts == (2, 1, 0, 1)
+        with db.session() as session:
+            assert JobRepository(session).count() == 2
+            target = CrawlTargetRepository(session).get_by_url("https://test.com")
+            assert len(target.page_blocks) == 3
 
     @pytest.mark.asyncio
     async def test_crawl_social_success(self, agent, db):
@@ -220,6 +503,44 @@ class TestIntelAgent:
         assert summary is not None
         assert summary.overall_sentiment == Sentiment.POSITIVE
 
+    @pytest.mark.asyncio
+    async def test_crawl_social_shared_crawler(self, db):
+        """Test an injected XhsCrawler serves every company, one at a time."""
+        import asyncio
+
+        from offer_sherlock.crawlers.social_crawler import XhsNote
+
+        active = []
+        overlaps = []
+
+        async def search(keyword, max_results=10):
+            overlaps.append(bool(active))
+            active.append(keyword)
+            await asyncio.sleep(0.01)
+            active.remove(keyword)
+            return [XhsNote(note_id=keyword, title=keyword, user_nickname="u")]
+
+        social = MagicMock(search=search, close=AsyncMock())
+        agent = IntelAgent(db, social_crawler=social)
+        agent._insight_extractor = MagicMock(
+            analyze_notes=AsyncMock(
+                side_effect=lambda notes, company, position_keyword: InsightSummary(
+                    company=company, position_keyword=position_keyword
+                )
+            )
+        )
+
+        with patch("offer_sherlock.agents.intel_agent.XhsCrawler") as mock_crawler:
+            summaries = await asyncio.gather(
+                agent.crawl_social("A", ["A offer", "A 面经"]),
+                agent.crawl_social("B", ["B offer"]),
+            )
+
+        mock_crawler.assert_not_called()
+        social.close.assert_not_awaited()
+        assert [s.company for s in summaries] == ["A", "B"]
+        assert overlaps == [False, False, False]
+
     @pytest.mark.asyncio
     async def test_run_handles_crawl_error(self, agent):
         """Test that run handles crawl errors gracefully."""
@@ -277,3 +598,153 @@ class TestIntelAgent:
 
         assert mock_run.call_count == 2
         assert len(results) == 2
+
+    @pytest.mark.asyncio
+    async def test_run_all_concurrent_worker_pool(self, agent, db):
+        """Test that concurrency bounds the number of companies in flight."""
+        import asyncio
+
+        from offer_sherlock.database import CrawlTargetRepository
+
+        with db.session() as session:
+            repo = CrawlTargetRepository(session)
+            for i in range(6):
+                repo.add(f"Company {i}", f"https://{i}.com", is_active=True)
+
+        in_flight = 0
+        peak = 0
+
+        async def fake_run(company, official_url=None, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return AgentResult(company=company)
+
+        with patch.object(agent, "run", side_effect=fake_run):
+            results = await agent.run_all(delay_between=0, concurrency=3)
+
+        assert len(results) == 6
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_iter_all_streams_in_completion_order(self, agent, db):
+        """Test that results stream back as companies finish."""
+        import asyncio
+
+        from offer_sherlock.database import CrawlTargetRepository
+
+        with db.session() as session:
+            repo = CrawlTargetRepository(session)
+            repo.add("Slow", "https://slow.com", is_active=True)
+            repo.add("Fast", "https://fast.com", is_active=True)
+
+        async def fake_run(company, official_url=None, **kwargs):
+            await asyncio.sleep(0.05 if company == "Slow" else 0)
+            return AgentResult(company=company)
+
+        with patch.object(agent, "run", side_effect=fake_run):
+            companies = [
+                r.company async for r in agent.iter_all(delay_between=0, concurrency=2)
+            ]
+
+        assert companies == ["Fast", "Slow"]
+
+    @pytest.mark.asyncio
+    async def test_iter_all_early_exit_waits_for_cancelled(self, agent, db):
+        """Test breaking out of iter_all cancels and awaits running companies."""
+        import asyncio
+
+        from offer_sherlock.database import CrawlTargetRepository
+
+        with db.session() as session:
+            repo = CrawlTargetRepository(session)
+            repo.add("Fast", "https://fast.com", is_active=True)
+            repo.add("Slow", "https://slow.com", is_active=True)
+        cancelled = []
+
+        async def fake_run(company, official_url=None, **kwargs):
+            if company == "Slow":
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(company)
+                    raise
+            return AgentResult(company=company)
+
+        with patch.object(agent, "run", side_effect=fake_run):
+            results = agent.iter_all(delay_between=0, concurrency=2)
+            async for result in results:
+                break
+            await results.aclose()
+
+        assert result.company == "Fast"
+        assert cancelled == ["Slow"]
+
+    @pytest.mark.asyncio
+    async def test_run_all_updates_last_crawled_per_target(self, agent, db):
+        """Test that every processed target gets its crawl time recorded."""
+        from offer_sherlock.database import CrawlTargetRepository
+
+        with db.session() as session:
+            repo = CrawlTargetRepository(session)
+            repo.add("Company A", "https://a.com", is_active=True)
+            repo.add("Company B", "https://b.com", is_active=True)
+
+        with patch.object(agent, "run", new_callable=AsyncMock) as mock_run:
+            mock_run.return_value = AgentResult(company="Test", success=True)
+            await agent.run_all(delay_between=0, concurrency=2)
+
+        with db.session() as session:
+            targets = CrawlTargetRepository(session).list_all()
+            assert all(t.last_crawled_at is not None for t in targets)
+
+    @pytest.mark.asyncio
+    async def test_run_stages_concurrently(self, agent):
+        """Test that official and social stages overlap in time."""
+        import asyncio
+
+        async def slow_official(company, url):
+            await asyncio.sleep(0.1)
+            return 1, 1, 0, 0
+
+        async def slow_social(company, keywords, max_results=10):
+            await asyncio.sleep(0.1)
+            return None
+
+        with patch.object(agent, "crawl_official", side_effect=slow_official), \
+                patch.object(agent, "crawl_social", side_effect=slow_social):
+            result = await agent.run(company="TestCorp", official_url="https://test.com")
+
+        assert result.success is True
+        assert result.jobs_added == 1
+        assert set(result.stage_durations) == {"official", "social"}
+        assert result.duration_seconds < 0.18
+
+    @pytest.mark.asyncio
+    async def test_run_stage_errors_are_independent(self, agent):
+        """Test that a failing stage does not cancel the other one."""
+        insight = InsightSummary(
+            company="TestCorp",
+            position_keyword="offer",
+            overall_sentiment=Sentiment.POSITIVE,
+            posts_analyzed=3,
+        )
+
+        with patch.object(
+            agent, "crawl_official", new_callable=AsyncMock
+        ) as mock_official, patch.object(
+            agent, "crawl_social", new_callable=AsyncMock
+        ) as mock_social:
+            mock_official.side_effect = Exception("Network error")
+            mock_social.return_value = insight
+
+            result = await agent.run(company="TestCorp", official_url="https://test.com")
+
+        assert result.success is False
+        assert result.errors == ["Official crawl failed: Network error"]
+        assert result.insight_generated is True
+        assert result.posts_analyzed == 3
+        assert "official" in result.stage_durations
+        assert "social" in result.stage_durations
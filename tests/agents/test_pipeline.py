@@ -0,0 +1,240 @@
+"""Tests for the staged crawl → extract → persist pipeline."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from offer_sherlock.agents import IntelAgent, PipelineConfig, PipelineRunner
+from offer_sherlock.crawlers.base import CrawlResult
+from offer_sherlock.database import (
+    CrawlTargetRepository,
+    DatabaseManager,
+    JobRepository,
+    PageArchive,
+    RawPageRepository,
+)
+from offer_sherlock.schemas.job import JobListExtraction, JobPosting
+
+
+@pytest.fixture
+def db():
+    """Create in-memory database with three active targets."""
+    manager = DatabaseManager(db_path=":memory:")
+    manager.create_tables()
+    with manager.session() as session:
+        repo = CrawlTargetRepository(session)
+        for i in range(3):
+            repo.add(f"Company {i}", f"https://{i}.example.com", is_active=True)
+    return manager
+
+
+@pytest.fixture
+def agent(db):
+    """Create agent whose crawl and extract steps are fakes."""
+    agent = IntelAgent(db)
+
+    async def fake_fetch(url, target=None):
+        await asyncio.sleep(0.01)
+        return CrawlResult(url=url, markdown=f"# Jobs at {url}")
+
+    async def fake_extract(company, url, markdown, previous=None):
+        await asyncio.sleep(0.02)
+        return JobListExtraction(
+            jobs=[
+                JobPosting(title="Engineer", company=company, job_id_external=f"{url}#1"),
+                JobPosting(title="Designer", company=company, job_id_external=f"{url}#2"),
+            ],
+            source_url=url,
+        )
+
+    agent.fetch_official = fake_fetch
+    agent.extract_official = fake_extract
+    return agent
+
+
+class TestPipelineRunner:
+    """Tests for PipelineRunner."""
+
+    @pytest.mark.asyncio
+    async def test_run_processes_all_targets(self, agent, db):
+        """Test that every target flows through all stages."""
+        runner = PipelineRunner(agent, PipelineConfig(delay_between=0))
+
+        results = await runner.run()
+
+        assert len(results) == 3
+        assert all(r.success for r in results)
+        assert all(r.jobs_added == 2 for r in results)
+        with db.session() as session:
+            assert JobRepository(session).count() == 6
+            targets = CrawlTargetRepository(session).list_all()
+            assert all(t.last_crawled_at is not None for t in targets)
+
+    @pytest.mark.asyncio
+    async def test_archives_pages(self, agent, db, tmp_path):
+        """Test crawled pages are archived and referenced by their jobs."""
+        agent.archive = PageArchive(tmp_path / "raw_pages")
+        runner = PipelineRunner(agent, PipelineConfig(delay_between=0))
+
+        await runner.run()
+
+        with db.session() as session:
+            page = RawPageRepository(session).get_latest("https://0.example.com")
+            assert page.target_id is not None
+            assert agent.archive.get_text(page.markdown_hash) == "# Jobs at https://0.example.com"
+            job = JobRepository(session).get_by_external_id("https://0.example.com#1")
+            assert job.raw_page_hash == page.markdown_hash
+            assert job.raw_content is None
+
+    @pytest.mark.asyncio
+    async def test_stage_stats(self, agent):
+        """Test that each stage reports throughput and queue depth."""
+        runner = PipelineRunner(agent, PipelineConfig(delay_between=0, queue_size=1))
+
+        await runner.run()
+
+        report = runner.report()
+        assert set(report) == {"crawl", "extract", "persist"}
+        for stats in runner.stats.values():
+            assert stats.processed == 3
+            assert stats.failed == 0
+            assert stats.throughput > 0
+            assert stats.max_queue_depth <= 1
+
+    @pytest.mark.asyncio
+    async def test_unchanged_pages_skip_extraction(self, agent, db):
+        """Test a re-crawl of unchanged pages does not extract again."""
+        extracted = []
+        original_extract = agent.extract_official
+
+        async def counting_extract(company, url, markdown, previous=None):
+            extracted.append(url)
+            return await original_extract(company, url, markdown, previous)
+
+        agent.extract_official = counting_extract
+        runner = PipelineRunner(agent, PipelineConfig(delay_between=0))
+
+        first = await runner.run()
+        second = await runner.run()
+
+        assert len(extracted) == 3
+        assert all(r.official_status == "crawled" for r in first)
+        assert all(r.official_status == "unchanged" for r in second)
+        assert all(r.success and r.jobs_found == 0 for r in second)
+        with db.session() as session:
+            targets = CrawlTargetRepository(session).list_all()
+            assert all(t.page_fingerprint is not None for t in targets)
+
+    @pytest.mark.asyncio
+    async def test_learns_selectors(self, agent, db):
+        """Test selectors are learned from the crawled HTML, with or without jobs."""
+        html = (
+            "<html><body><nav>Menu</nav><ul class='jobs'>"
+            "<li>Engineer</li><li>Designer</li></ul><footer>About</footer></body></html>"
+        )
+        with db.session() as session:
+            CrawlTargetRepository(session).get_by_url("https://2.example.com").css_selector = (
+                "div.stale"
+            )
+        original_extract = agent.extract_official
+
+        async def fetch(url, target=None):
+            metadata = {"css_selector": target.css_selector} if target.css_selector else {}
+            return CrawlResult(url=url, markdown=f"# Jobs at {url}", html=html, metadata=metadata)
+
+        async def extract(company, url, markdown, previous=None):
+            if url == "https://2.example.com":
+                return JobListExtraction(jobs=[], source_url=url)
+            return await original_extract(company, url, markdown, previous)
+
+        agent.fetch_official = fetch
+        agent.extract_official = extract
+
+        await PipelineRunner(agent, PipelineConfig(delay_between=0)).run()
+
+        with db.session() as session:
+            repo = CrawlTargetRepository(session)
+            assert repo.get_by_url("https://0.example.com").css_selector == "ul.jobs"
+            assert repo.get_by_url("https://1.example.com").css_selector == "ul.jobs"
+            # A selector whose crawl yielded no jobs is dropped
+            assert repo.get_by_url("https://2.example.com").css_selector is None
+
+    @pytest.mark.asyncio
+    async def test_crawl_failure_skips_later_stages(self, agent):
+        """Test that a failed crawl is reported without being extracted."""
+        original = agent.fetch_official
+
+        async def flaky_fetch(url, target=None):
+            if url.startswith("https://1."):
+                raise RuntimeError("Crawl failed: timeout")
+            return await original(url)
+
+        agent.fetch_official = flaky_fetch
+        runner = PipelineRunner(agent, PipelineConfig(delay_between=0))
+
+        results = await runner.run()
+
+        failed = [r for r in results if not r.success]
+        assert len(failed) == 1
+        assert failed[0].company == "Company 1"
+        assert "timeout" in failed[0].errors[0]
+        assert runner.stats["crawl"].failed == 1
+        assert runner.stats["extract"].processed == 2
+
+    @pytest.mark.asyncio
+    async def test_backpressure_bounds_in_flight_pages(self, agent):
+        """Test that a slow extract stage throttles the crawl stage."""
+        crawled = 0
+        extracted = 0
+        peak_backlog = 0
+        original_fetch = agent.fetch_official
+
+        async def counting_fetch(url, target=None):
+            nonlocal crawled, peak_backlog
+            result = await original_fetch(url)
+            crawled += 1
+            peak_backlog = max(peak_backlog, crawled - extracted)
+            return result
+
+        async def slow_extract(company, url, markdown, previous=None):
+            nonlocal extracted
+            await asyncio.sleep(0.05)
+            extracted += 1
+            return JobListExtraction(jobs=[], source_url=url)
+
+        agent.fetch_official = counting_fetch
+        agent.extract_official = slow_extract
+        config = PipelineConfig(
+            crawl_workers=3, extract_workers=1, queue_size=1, delay_between=0
+        )
+
+        with patch.object(agent, "list_active_targets") as mock_targets:
+            mock_targets.return_value = [
+                (None, f"C{i}", f"https://{i}.test") for i in range(8)
+            ]
+            results = await PipelineRunner(agent, config).run()
+
+        assert len(results) == 8
+        # queue (1) + extract workers (1) + crawl workers holding a page (3)
+        assert peak_backlog <= 5
+
+    @pytest.mark.asyncio
+    async def test_detail_stage(self, agent):
+        """Test the detail stage runs only when the agent has a frontier."""
+        from offer_sherlock.agents import DetailFrontier, FrontierStats
+
+        runner = PipelineRunner(agent, PipelineConfig(delay_between=0))
+        await runner.run()
+        assert "detail" not in runner.stats
+
+        agent.frontier = DetailFrontier(agent)
+        enrich = AsyncMock(return_value=FrontierStats(due=2, fetched=2, enriched=2))
+        agent.enrich_details = enrich
+        results = await runner.run()
+
+        assert runner.stats["detail"].processed == 3
+        assert all(r.details_enriched == 2 for r in results)
+        assert {call.args[1] for call in enrich.call_args_list} == {
+            f"https://{i}.example.com" for i in range(3)
+        }
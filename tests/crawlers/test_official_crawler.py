@@ -4,7 +4,7 @@ import pytest
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from offer_sherlock.crawlers import OfficialCrawler, CrawlTarget, CrawlResult
+from offer_sherlock.crawlers import OfficialCrawler, CrawlTarget, CrawlResult, Pagination
 
 
 class TestCrawlResult:
@@ -113,6 +113,7 @@ class TestOfficialCrawler:
 
         with patch("offer_sherlock.crawlers.official_crawler.AsyncWebCrawler") as mock_crawler_class:
             mock_crawler = AsyncMock()
+            mock_crawler.crawler_strategy = MagicMock()
             mock_crawler.arun = AsyncMock(return_value=mock_result)
             mock_crawler.__aenter__ = AsyncMock(return_value=mock_crawler)
             mock_crawler.__aexit__ = AsyncMock(return_value=None)
@@ -137,6 +138,7 @@ class TestOfficialCrawler:
 
         with patch("offer_sherlock.crawlers.official_crawler.AsyncWebCrawler") as mock_crawler_class:
             mock_crawler = AsyncMock()
+            mock_crawler.crawler_strategy = MagicMock()
             mock_crawler.arun = AsyncMock(return_value=mock_result)
             mock_crawler.__aenter__ = AsyncMock(return_value=mock_crawler)
             mock_crawler.__aexit__ = AsyncMock(return_value=None)
@@ -154,6 +156,7 @@ class TestOfficialCrawler:
 
         with patch("offer_sherlock.crawlers.official_crawler.AsyncWebCrawler") as mock_crawler_class:
             mock_crawler = AsyncMock()
+            mock_crawler.crawler_strategy = MagicMock()
             mock_crawler.__aenter__ = AsyncMock(side_effect=Exception("Connection failed"))
             mock_crawler_class.return_value = mock_crawler
 
@@ -183,6 +186,7 @@ class TestOfficialCrawler:
 
         with patch("offer_sherlock.crawlers.official_crawler.AsyncWebCrawler") as mock_crawler_class:
             mock_crawler = AsyncMock()
+            mock_crawler.crawler_strategy = MagicMock()
             mock_crawler.arun = AsyncMock(return_value=mock_result)
             mock_crawler.__aenter__ = AsyncMock(return_value=mock_crawler)
             mock_crawler.__aexit__ = AsyncMock(return_value=None)
@@ -211,6 +215,7 @@ class TestOfficialCrawler:
 
         with patch("offer_sherlock.crawlers.official_crawler.AsyncWebCrawler") as mock_crawler_class:
             mock_crawler = AsyncMock()
+            mock_crawler.crawler_strategy = MagicMock()
             mock_crawler.arun = AsyncMock(return_value=mock_result)
             mock_crawler.__aenter__ = AsyncMock(return_value=mock_crawler)
             mock_crawler.__aexit__ = AsyncMock(return_value=None)
@@ -220,3 +225,134 @@ class TestOfficialCrawler:
 
             assert len(results) == 2
             assert all(r.success for r in results)
+
+
+def _page(markdown):
+    """Successful Crawl4AI result with the given markdown."""
+    result = MagicMock()
+    result.success = True
+    result.markdown = markdown
+    result.html = f"<html>{markdown}</html>"
+    result.metadata = {"title": "Jobs"}
+    result.status_code = 200
+    result.links = []
+    return result
+
+
+def _mock_browser(mock_crawler_class, results):
+    """Make the patched AsyncWebCrawler return ``results`` in turn."""
+    mock_crawler = AsyncMock()
+    mock_crawler.crawler_strategy = MagicMock()
+    mock_crawler.arun = AsyncMock(side_effect=results)
+    mock_crawler.__aenter__ = AsyncMock(return_value=mock_crawler)
+    mock_crawler.__aexit__ = AsyncMock(return_value=None)
+    mock_crawler_class.return_value = mock_crawler
+    return mock_crawler
+
+
+def _jobs(*ids):
+    """List page markdown linking to the given job IDs."""
+    return "\n".join(f"- [Job {i}](https://x.test/jobs/{i})" for i in ids)
+
+
+class TestCrawlPages:
+    """Tests for OfficialCrawler.crawl_pages."""
+
+    @pytest.mark.asyncio
+    async def test_stops_at_known_jobs(self):
+        """Test the walk ends after the first page of known jobs."""
+        crawler = OfficialCrawler(default_delay=0)
+        pagination = Pagination(
+            mode="next_button", next_selector=".next", id_pattern=r"/jobs/(\d+)"
+        )
+        known = {"3", "4"}
+
+        async def known_ids(ids):
+            return ids & known
+
+        with patch("offer_sherlock.crawlers.official_crawler.AsyncWebCrawler") as cls:
+            browser = _mock_browser(
+                cls, [_page(_jobs(1, 2)), _page(_jobs(3, 4)), _page(_jobs(5, 6))]
+            )
+            result = await crawler.crawl_pages(
+                "https://x.test/jobs", pagination, known_ids=known_ids
+            )
+
+        assert result.success is True
+        assert result.metadata["pages"] == 2
+        assert result.metadata["stop_reason"] == "known"
+        assert "jobs/1" in result.markdown and "jobs/4" in result.markdown
+        assert "jobs/5" not in result.markdown
+        # Later pages are advanced in the same tab
+        configs = [call.kwargs["config"] for call in browser.arun.call_args_list]
+        assert configs[1].js_only is True
+        assert configs[1].session_id == configs[0].session_id
+
+    @pytest.mark.asyncio
+    async def test_url_template_stops_at_repeated_page(self):
+        """Test a template walk ends when a page repeats the previous one."""
+        crawler = OfficialCrawler(default_delay=0)
+        pagination = Pagination(
+            mode="url_template", url_template="https://x.test/jobs?page={page}"
+        )
+
+        with patch("offer_sherlock.crawlers.official_crawler.AsyncWebCrawler") as cls:
+            browser = _mock_browser(
+                cls, [_page(_jobs(1)), _page(_jobs(2)), _page(_jobs(2))]
+            )
+            result = await crawler.crawl_pages("https://x.test/jobs", pagination)
+
+        urls = [call.kwargs["url"] for call in browser.arun.call_args_list]
+        assert urls == [
+            "https://x.test/jobs",
+            "https://x.test/jobs?page=2",
+            "https://x.test/jobs?page=3",
+        ]
+        assert result.metadata["pages"] == 2
+        assert result.metadata["stop_reason"] == "last_page"
+        # One browser for the whole walk
+        assert cls.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_scroll_keeps_final_page(self):
+        """Test an infinite-scroll walk returns the fully loaded page."""
+        crawler = OfficialCrawler(default_delay=0)
+        pagination = Pagination(mode="scroll", max_pages=2)
+
+        with patch("offer_sherlock.crawlers.official_crawler.AsyncWebCrawler") as cls:
+            _mock_browser(cls, [_page(_jobs(1)), _page(_jobs(1, 2))])
+            result = await crawler.crawl_pages("https://x.test/jobs", pagination)
+
+        assert result.markdown == _jobs(1, 2)
+        assert result.metadata["stop_reason"] == "max_pages"
+
+    @pytest.mark.asyncio
+    async def test_first_page_failure(self):
+        """Test a failed first page fails the crawl, a later one ends it."""
+        crawler = OfficialCrawler(default_delay=0)
+        pagination = Pagination(mode="next_button", next_selector=".next")
+        failed = MagicMock(success=False, error_message="timeout")
+
+        with patch("offer_sherlock.crawlers.official_crawler.AsyncWebCrawler") as cls:
+            _mock_browser(cls, [failed])
+            result = await crawler.crawl_pages("https://x.test/jobs", pagination)
+            assert result.success is False
+            assert result.error == "timeout"
+
+            _mock_browser(cls, [_page(_jobs(1)), failed])
+            result = await crawler.crawl_pages("https://x.test/jobs", pagination)
+            assert result.success is True
+            assert result.metadata["stop_reason"] == "error"
+
+    @pytest.mark.asyncio
+    async def test_warm_browser_reused(self):
+        """Test a started crawler keeps one browser across crawls."""
+        with patch("offer_sherlock.crawlers.official_crawler.AsyncWebCrawler") as cls:
+            browser = _mock_browser(cls, [_page("a"), _page("b")])
+            async with OfficialCrawler(default_delay=0) as crawler:
+                await crawler.crawl("https://x.test/a")
+                await crawler.crawl("https://x.test/b")
+
+        assert cls.call_count == 1
+        assert browser.arun.call_count == 2
+        browser.__aexit__.assert_awaited_once()
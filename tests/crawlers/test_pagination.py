@@ -0,0 +1,67 @@
+"""Tests for pagination settings."""
+
+import json
+
+import pytest
+
+from offer_sherlock.crawlers import Pagination, PaginationMode
+
+
+class TestPagination:
+    """Tests for Pagination."""
+
+    def test_round_trip(self):
+        """Test settings survive their stored form."""
+        pagination = Pagination(
+            mode=PaginationMode.NEXT_BUTTON,
+            next_selector="button.next",
+            max_pages=5,
+            id_pattern=r"/jobs/(\d+)",
+        )
+        data = pagination.to_dict()
+
+        assert data["mode"] == "next_button"
+        assert "url_template" not in data
+        assert Pagination.from_dict(data) == pagination
+        assert Pagination.from_dict(None) is None
+
+    def test_validation(self):
+        """Test incomplete settings are rejected."""
+        with pytest.raises(ValueError):
+            Pagination(mode="next_button")
+        with pytest.raises(ValueError):
+            Pagination(mode="url_template", url_template="https://x.test/jobs")
+        with pytest.raises(ValueError):
+            Pagination(mode="scroll", max_pages=0)
+        with pytest.raises(ValueError):
+            Pagination(mode="carousel")
+
+    def test_page_url_and_js(self):
+        """Test how each mode reaches the next page."""
+        template = Pagination(mode="url_template", url_template="https://x.test/jobs?p={page}")
+        button = Pagination(mode="next_button", next_selector="a[rel='next']")
+
+        assert template.page_url(3) == "https://x.test/jobs?p=3"
+        assert "a[rel='next']" in button.advance_js()
+        assert "scrollTo" in Pagination(mode="scroll").advance_js()
+
+    def test_js_quotes_selector(self):
+        """Test selectors with both quotes and backslashes stay one JS string."""
+        selector = """button[aria-label="Next"][data-x='a\\:b']"""
+        js = Pagination(mode="next_button", next_selector=selector).advance_js()
+
+        argument = js.removeprefix("document.querySelector(").removesuffix(")?.click();")
+        # A JSON string is a valid JavaScript string literal
+        assert json.loads(argument) == selector
+
+    def test_job_ids(self):
+        """Test external IDs are captured from job links."""
+        pagination = Pagination(mode="scroll", id_pattern=r"/position/(\d+)/detail")
+        markdown = (
+            "- [后端开发](https://x.test/position/101/detail)\n"
+            "- [前端开发](https://x.test/position/102/detail)\n"
+            "- [后端开发](https://x.test/position/101/detail)\n"
+        )
+
+        assert pagination.job_ids(markdown) == {"101", "102"}
+        assert Pagination(mode="scroll").job_ids(markdown) == set()
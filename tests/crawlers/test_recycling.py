@@ -0,0 +1,238 @@
+"""Tests for browser recycling."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from offer_sherlock.crawlers import OfficialCrawler, RecyclePolicy, XhsCrawler
+from offer_sherlock.crawlers.recycling import (
+    MB,
+    BrowserBudget,
+    browser_pids,
+    browser_rss,
+    process_tree_rss,
+    tree_rss,
+)
+
+
+def _browsers(crawler: OfficialCrawler, release: asyncio.Event = None) -> list:
+    """Make ``crawler`` launch mock browsers; returns those launched."""
+    launched = []
+
+    def new_browser():
+        browser = MagicMock()
+        browser.__aenter__ = AsyncMock(return_value=browser)
+        browser.__aexit__ = AsyncMock(return_value=None)
+
+        async def arun(url, config):
+            # Every crawl opens one page, as Crawl4AI's hook reports
+            await crawler._on_page_created(MagicMock(), config=config)
+            if release is not None and url.endswith("/slow"):
+                await release.wait()
+            return MagicMock(success=True, markdown=url, metadata={}, links=[])
+
+        browser.arun = arun
+        launched.append(browser)
+        return browser
+
+    crawler._new_browser = new_browser
+    return launched
+
+
+class TestBrowserBudget:
+    """Tests for RecyclePolicy and BrowserBudget."""
+
+    def test_validation(self):
+        """Test impossible limits are rejected."""
+        with pytest.raises(ValueError):
+            RecyclePolicy(max_pages=0)
+        with pytest.raises(ValueError):
+            RecyclePolicy(check_every=0)
+
+    @pytest.mark.asyncio
+    async def test_page_limit(self):
+        """Test the budget runs out after max_pages pages."""
+        budget = BrowserBudget(RecyclePolicy(max_pages=3, max_rss_mb=None))
+        budget.record(2)
+        assert await budget.exhausted() is None
+
+        budget.record()
+        assert await budget.exhausted() == "pages"
+        budget.reset()
+        assert await budget.exhausted() is None
+
+    @pytest.mark.asyncio
+    async def test_memory_limit_checked_periodically(self):
+        """Test memory is read every check_every pages."""
+        budget = BrowserBudget(RecyclePolicy(max_pages=None, max_rss_mb=100, check_every=2))
+        budget.processes = {42}
+        with patch(
+            "offer_sherlock.crawlers.recycling.tree_rss", return_value=200 * MB
+        ) as rss:
+            budget.record()
+            assert await budget.exhausted() is None
+            budget.record()
+            assert await budget.exhausted() == "memory"
+            assert await budget.exhausted() is None
+
+        assert rss.call_count == 1
+        rss.assert_called_once_with({42})
+
+    @pytest.mark.asyncio
+    async def test_memory_of_other_browsers_not_counted(self):
+        """Test only the processes started by the launch are measured."""
+        budget = BrowserBudget(RecyclePolicy(max_pages=None, max_rss_mb=100, check_every=1))
+        # 7 is another browser of the process, 8 the one launched
+        memory = {7: 900 * MB, 8: 50 * MB}
+        with patch(
+            "offer_sherlock.crawlers.recycling.browser_pids", side_effect=[{7}, {7, 8}]
+        ), patch("offer_sherlock.crawlers.recycling._roots", side_effect=set), patch(
+            "offer_sherlock.crawlers.recycling.process_tree_rss", side_effect=memory.get
+        ):
+            async with budget.launching():
+                pass
+            budget.record()
+            assert budget.processes == {8}
+            assert await budget.exhausted() is None
+
+    @pytest.mark.asyncio
+    async def test_unknown_browser_memory_not_checked(self):
+        """Test a budget without launched processes only counts pages."""
+        budget = BrowserBudget(RecyclePolicy(max_pages=None, max_rss_mb=1, check_every=1))
+        budget.record()
+
+        assert await budget.exhausted() is None
+
+    def test_process_memory(self):
+        """Test this process's memory is measured and has no browsers."""
+        assert process_tree_rss() > 10 * MB
+        assert browser_rss() == 0
+        assert browser_pids() == set()
+        assert tree_rss([999_999_999]) == 0
+
+
+class TestOfficialCrawlerRecycling:
+    """Tests for recycling OfficialCrawler's warm browser."""
+
+    @pytest.mark.asyncio
+    async def test_recycles_after_max_pages(self):
+        """Test the warm browser is replaced every max_pages pages."""
+        crawler = OfficialCrawler(recycle=RecyclePolicy(max_pages=2, max_rss_mb=None))
+        launched = _browsers(crawler)
+
+        async with crawler:
+            for i in range(5):
+                assert (await crawler.crawl(f"https://x.test/{i}")).success
+
+        assert crawler.recycles == 2
+        assert len(launched) == 3
+        assert all(browser.__aexit__.await_count == 1 for browser in launched)
+
+    @pytest.mark.asyncio
+    async def test_running_crawl_keeps_old_browser(self):
+        """Test a replaced browser closes only after its crawls finish."""
+        release = asyncio.Event()
+        crawler = OfficialCrawler(recycle=RecyclePolicy(max_pages=1, max_rss_mb=None))
+        launched = _browsers(crawler, release)
+
+        await crawler.start()
+        slow = asyncio.create_task(crawler.crawl("https://x.test/slow"))
+        await asyncio.sleep(0)
+        await crawler.crawl("https://x.test/fast")
+
+        old, new = launched
+        old.__aexit__.assert_not_awaited()
+        release.set()
+        assert (await slow).success
+        old.__aexit__.assert_awaited_once()
+
+        await crawler.close()
+        new.__aexit__.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_recycle_ignores_memory_left_by_others(self):
+        """Test a fresh browser is not recycled for other browsers' memory."""
+        policy = RecyclePolicy(max_pages=None, max_rss_mb=500, check_every=1)
+        crawler = OfficialCrawler(recycle=policy)
+        launched = _browsers(crawler)
+        # Process 1 (another crawler's browser) stays at 2 GB throughout;
+        # each launch adds a browser, the first of which grows over the limit
+        running = {1}
+        memory = {1: 2000 * MB, 10: 800 * MB, 11: 100 * MB}
+
+        def pids():
+            return set(running)
+
+        async def enter(*args):
+            running.add(10 + len(running) - 1)
+
+        def new_browser(make=crawler._new_browser):
+            browser = make()
+            browser.__aenter__.side_effect = enter
+            return browser
+
+        crawler._new_browser = new_browser
+        module = "offer_sherlock.crawlers.recycling"
+        with patch(f"{module}.browser_pids", side_effect=pids), patch(
+            f"{module}._roots", side_effect=set
+        ), patch(f"{module}.process_tree_rss", side_effect=memory.get):
+            async with crawler:
+                for i in range(5):
+                    assert (await crawler.crawl(f"https://x.test/{i}")).success
+
+        assert crawler.recycles == 1
+        assert len(launched) == 2
+
+    @pytest.mark.asyncio
+    async def test_recycling_disabled(self):
+        """Test recycle=None keeps one browser until close()."""
+        crawler = OfficialCrawler(recycle=None)
+        launched = _browsers(crawler)
+
+        async with crawler:
+            for i in range(3):
+                await crawler.crawl(f"https://x.test/{i}")
+
+        assert len(launched) == 1
+
+
+class TestXhsCrawlerRecycling:
+    """Tests for XhsCrawler's browser lifecycle."""
+
+    @pytest.mark.asyncio
+    async def test_recycle_keeps_login(self):
+        """Test the browser is relaunched after saving its login state."""
+        crawler = XhsCrawler(recycle=RecyclePolicy(max_pages=2, max_rss_mb=None))
+        pages = []
+
+        async def launch():
+            crawler._page = MagicMock(close=AsyncMock())
+            pages.append(crawler._page)
+
+        crawler._launch = launch
+        crawler._save_state = AsyncMock()
+
+        for _ in range(5):
+            await crawler._ensure_browser()
+
+        assert len(pages) == 3
+        assert crawler._save_state.await_count == 2
+        pages[0].close.assert_awaited_once()
+        assert crawler.recycles == 2
+
+    @pytest.mark.asyncio
+    async def test_close_releases_everything_on_error(self):
+        """Test a failing page close still closes browser and Playwright."""
+        crawler = XhsCrawler()
+        crawler._page = MagicMock(close=AsyncMock(side_effect=RuntimeError("crashed")))
+        crawler._context = MagicMock(close=AsyncMock())
+        crawler._browser = browser = MagicMock(close=AsyncMock())
+        crawler._playwright = playwright = MagicMock(stop=AsyncMock())
+
+        with pytest.raises(RuntimeError):
+            await crawler.close()
+
+        browser.close.assert_awaited_once()
+        playwright.stop.assert_awaited_once()
+        assert crawler._page is None and crawler._playwright is None
@@ -0,0 +1,180 @@
+"""Tests for crawl recording and replay."""
+
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from offer_sherlock.crawlers import (
+    CrawlRecording,
+    RecordingCrawler,
+    ReplayCrawler,
+)
+from offer_sherlock.crawlers.base import CrawlResult
+
+URL = "https://careers.example.com/jobs"
+
+
+def recorded(tmp_path, *markdowns: str) -> CrawlRecording:
+    """Recording holding one crawl of URL per markdown."""
+    recording = CrawlRecording(tmp_path / "rec")
+    for i, markdown in enumerate(markdowns):
+        recording.add(CrawlResult(url=URL, markdown=markdown, title=f"v{i}"), elapsed=0.5)
+    return recording
+
+
+class TestCrawlRecording:
+    """Tests for CrawlRecording."""
+
+    def test_round_trip(self, tmp_path):
+        """Test results survive reopening the recording."""
+        recording = CrawlRecording(tmp_path / "rec")
+        recording.add(
+            CrawlResult(
+                url=URL,
+                markdown="# Jobs\n- 后端开发工程师",
+                html="<ul><li>后端开发工程师</li></ul>",
+                title="招聘",
+                metadata={"pages": 2, "headers": {"etag": "abc"}},
+            ),
+            elapsed=1.23456,
+        )
+        recording.add(
+            CrawlResult(url="https://other.test", markdown="", success=False, error="timeout")
+        )
+
+        reopened = CrawlRecording(tmp_path / "rec")
+
+        assert len(reopened) == 2
+        assert reopened.urls() == [URL, "https://other.test"]
+        entry = reopened.entries(URL)[0]
+        assert entry.elapsed == 1.235
+        result = reopened.load(entry)
+        assert result.markdown == "# Jobs\n- 后端开发工程师"
+        assert result.html == "<ul><li>后端开发工程师</li></ul>"
+        assert result.metadata == {"pages": 2, "headers": {"etag": "abc"}}
+        assert result.crawled_at is not None
+        failed = reopened.load(reopened.entries("https://other.test")[0])
+        assert not failed.success and failed.error == "timeout" and failed.html is None
+
+    def test_same_page_stored_once(self, tmp_path):
+        """Test recording a page again only adds an index line."""
+        recording = recorded(tmp_path, "same", "same", "same")
+
+        assert len(recording.entries(URL)) == 3
+        assert len(list((tmp_path / "rec" / "blobs").rglob("*.zst"))) == 1
+
+    def test_import_markdown(self, tmp_path):
+        """Test saved crawl results are imported by their URL header."""
+        saved = tmp_path / "tencent.md"
+        saved.write_text(
+            f"# 腾讯 招聘\n\nURL: {URL}\n时间: 2026-01-01\n\n---\n\n- 后端开发工程师\n",
+            encoding="utf-8",
+        )
+        headerless = tmp_path / "notes.md"
+        headerless.write_text("# Notes\n", encoding="utf-8")
+        recording = CrawlRecording(tmp_path / "rec")
+
+        assert recording.import_markdown([saved, headerless]) == 1
+        result = recording.load(recording.entries(URL)[0])
+        assert result.markdown == "- 后端开发工程师\n"
+        assert result.title == "腾讯 招聘"
+
+
+class TestReplayCrawler:
+    """Tests for ReplayCrawler."""
+
+    @pytest.mark.asyncio
+    async def test_serves_recordings_in_order(self, tmp_path):
+        """Test a URL's crawls replay in order, then the last repeats."""
+        crawler = ReplayCrawler(recorded(tmp_path, "first", "second"), time_scale=0)
+
+        async with crawler:
+            served = [(await crawler.crawl(URL, css_selector="ul.jobs")).markdown for _ in range(3)]
+            paged = await crawler.crawl_pages(URL, MagicMock())
+
+        assert served == ["first", "second", "second"]
+        assert paged.markdown == "second"
+        assert crawler.crawls == 4 and crawler.misses == 0
+
+    @pytest.mark.asyncio
+    async def test_unknown_url(self, tmp_path):
+        """Test a URL never recorded fails like an unreachable page."""
+        crawler = ReplayCrawler(recorded(tmp_path, "page"), time_scale=0)
+
+        results = await crawler.crawl_many([URL, "https://unknown.test"])
+
+        assert results[0].success
+        assert not results[1].success and results[1].error == "Not recorded"
+        assert crawler.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_results_are_copies(self, tmp_path):
+        """Test callers changing a result do not change later replays."""
+        crawler = ReplayCrawler(recorded(tmp_path, "page"), time_scale=0)
+
+        first = await crawler.crawl(URL)
+        first.metadata["css_selector"] = "ul.jobs"
+
+        assert (await crawler.crawl(URL)).metadata == {}
+
+    def test_latency(self, tmp_path):
+        """Test recorded, fixed and jittered latencies."""
+        entry = recorded(tmp_path, "page").entries(URL)[0]
+
+        assert ReplayCrawler(MagicMock(), time_scale=2)._delay(entry) == 1.0
+        assert ReplayCrawler(MagicMock(), latency=0.2)._delay(entry) == 0.2
+
+        def delays(seed):
+            crawler = ReplayCrawler(MagicMock(), latency=1.0, jitter=0.5, seed=seed)
+            return [crawler._delay(entry) for _ in range(5)]
+
+        assert delays(1) == delays(1) != delays(2)
+        assert all(0.5 <= delay <= 1.5 for delay in delays(1))
+
+    @pytest.mark.asyncio
+    async def test_crawls_overlap(self, tmp_path):
+        """Test concurrent replays wait in parallel, like real crawls."""
+        crawler = ReplayCrawler(recorded(tmp_path, "page"), latency=0.1)
+
+        start = time.perf_counter()
+        await crawler.crawl_many([URL] * 5)
+
+        assert time.perf_counter() - start < 0.4
+
+
+class TestRecordingCrawler:
+    """Tests for RecordingCrawler."""
+
+    @pytest.mark.asyncio
+    async def test_records_and_delegates(self, tmp_path):
+        """Test crawls pass through and are recorded for replay."""
+        inner = MagicMock(start=AsyncMock(), close=AsyncMock())
+        inner.crawl = AsyncMock(side_effect=lambda url, **kw: CrawlResult(url=url, markdown=url))
+        inner.crawl_pages = AsyncMock(return_value=CrawlResult(url=URL, markdown="all pages"))
+        recording = CrawlRecording(tmp_path / "rec")
+
+        async with RecordingCrawler(inner, recording) as crawler:
+            result = await crawler.crawl("https://a.test", css_selector="ul")
+            await crawler.crawl_many(["https://b.test"])
+            await crawler.crawl_pages(URL, "pagination")
+
+        assert result.markdown == "https://a.test"
+        inner.crawl.assert_any_await("https://a.test", css_selector="ul")
+        inner.crawl_pages.assert_awaited_once_with(URL, "pagination")
+        inner.start.assert_awaited_once()
+        inner.close.assert_awaited_once()
+
+        replay = ReplayCrawler(CrawlRecording(tmp_path / "rec"), time_scale=0)
+        assert (await replay.crawl(URL)).markdown == "all pages"
+        assert (await replay.crawl("https://b.test")).success
+
+    @pytest.mark.asyncio
+    async def test_recording_failure_keeps_result(self, tmp_path):
+        """Test a failing write does not fail the crawl."""
+        inner = MagicMock(crawl=AsyncMock(return_value=CrawlResult(url=URL, markdown="x")))
+        recording = MagicMock(add=MagicMock(side_effect=OSError("disk full")))
+
+        result = await RecordingCrawler(inner, recording).crawl(URL)
+
+        assert result.markdown == "x"
@@ -0,0 +1,133 @@
+"""Tests for lean-profile request interception."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from offer_sherlock.crawlers import OfficialCrawler
+from offer_sherlock.crawlers.resources import LEAN_POLICY, ResourcePolicy
+
+
+class FakePage:
+    """Playwright page stand-in that records its route and listeners."""
+
+    def __init__(self):
+        self.handler = None
+        self.listeners = {}
+
+    async def route(self, pattern, handler):
+        self.handler = handler
+
+    def on(self, event, listener):
+        self.listeners[event] = listener
+
+
+def fake_route(resource_type, url):
+    """Playwright route stand-in for a request."""
+    route = MagicMock()
+    route.request.resource_type = resource_type
+    route.request.url = url
+    route.abort = AsyncMock()
+    route.fallback = AsyncMock()
+    return route
+
+
+class TestResourcePolicy:
+    """Tests for ResourcePolicy."""
+
+    def test_lean_policy(self):
+        """Test heavy resources and trackers are blocked, text is not."""
+        assert LEAN_POLICY.blocks("image", "https://cdn.example.com/banner")
+        assert LEAN_POLICY.blocks("font", "https://fonts.example.com/a.woff2")
+        assert LEAN_POLICY.blocks("script", "https://www.googletagmanager.com/gtm.js")
+        assert LEAN_POLICY.blocks("script", "https://hm.baidu.com/hm.js?abc")
+        assert not LEAN_POLICY.blocks("document", "https://jobs.example.com/")
+        assert not LEAN_POLICY.blocks("xhr", "https://jobs.example.com/api/list")
+        assert not LEAN_POLICY.blocks("script", "https://baidu.com/app.js")
+
+    def test_allowing(self):
+        """Test a target allowlist lets types and hosts through."""
+        policy = LEAN_POLICY.allowing(["Font", "img.example.com", " "])
+
+        assert not policy.blocks("font", "https://fonts.example.com/a.woff2")
+        assert not policy.blocks("image", "https://a.img.example.com/x.png")
+        assert policy.blocks("image", "https://other.example.com/x.png")
+        assert LEAN_POLICY.allowing(None) is LEAN_POLICY
+        # The shared default is not modified
+        assert LEAN_POLICY.blocks("font", "https://fonts.example.com/a.woff2")
+
+    def test_custom_policy(self):
+        """Test a policy that also blocks stylesheets."""
+        policy = ResourcePolicy(blocked_types=frozenset({"stylesheet"}), blocked_domains=())
+
+        assert policy.blocks("stylesheet", "https://jobs.example.com/app.css")
+        assert not policy.blocks("image", "https://jobs.example.com/logo.png")
+
+
+class TestRequestInterception:
+    """Tests for OfficialCrawler's page hook."""
+
+    @pytest.mark.asyncio
+    async def test_hook_blocks_and_counts(self):
+        """Test the route aborts blocked requests and counts them."""
+        crawler = OfficialCrawler(measure_traffic=True)
+        shared, meter = crawler._traffic(["font"])
+        page = FakePage()
+        await crawler._on_page_created(page, config=MagicMock(shared_data=shared))
+
+        image = fake_route("image", "https://cdn.example.com/a.png")
+        font = fake_route("font", "https://cdn.example.com/a.woff2")
+        await page.handler(image)
+        await page.handler(font)
+
+        image.abort.assert_awaited_once()
+        font.fallback.assert_awaited_once()
+        assert (meter.requests, meter.blocked) == (2, 1)
+
+        request = MagicMock()
+        request.sizes = AsyncMock(
+            return_value={"responseBodySize": 1000, "responseHeadersSize": 24}
+        )
+        await page.listeners["requestfinished"](request)
+        assert meter.bytes_transferred == 1024
+
+    @pytest.mark.asyncio
+    async def test_reused_page_follows_current_crawl(self):
+        """Test a session page counts into the crawl now using it."""
+        crawler = OfficialCrawler()
+        page = FakePage()
+        first_shared, first = crawler._traffic()
+        await crawler._on_page_created(page, config=MagicMock(shared_data=first_shared))
+        handler = page.handler
+
+        second_shared, second = crawler._traffic()
+        await crawler._on_page_created(page, config=MagicMock(shared_data=second_shared))
+        await page.handler(fake_route("image", "https://cdn.example.com/a.png"))
+
+        assert page.handler is handler
+        assert "requestfinished" not in page.listeners
+        assert (first.blocked, second.blocked) == (0, 1)
+
+    @pytest.mark.asyncio
+    async def test_full_profile(self):
+        """Test crawling without a policy lets everything through."""
+        crawler = OfficialCrawler(resource_policy=None)
+        shared, meter = crawler._traffic()
+        page = FakePage()
+        await crawler._on_page_created(page, config=MagicMock(shared_data=shared))
+
+        image = fake_route("image", "https://cdn.example.com/a.png")
+        await page.handler(image)
+
+        image.fallback.assert_awaited_once()
+        assert (meter.requests, meter.blocked) == (1, 0)
+
+    @pytest.mark.asyncio
+    async def test_other_crawls_untouched(self):
+        """Test pages of crawls without crawler state are not routed."""
+        crawler = OfficialCrawler()
+        page = FakePage()
+
+        await crawler._on_page_created(page, config=MagicMock(shared_data=None))
+
+        assert page.handler is None
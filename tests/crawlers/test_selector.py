@@ -0,0 +1,93 @@
+"""Tests for job-list selector learning."""
+
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+
+from offer_sherlock.crawlers import learn_selector
+
+TITLES = ["后端开发工程师", "前端开发工程师", "算法工程师"]
+
+
+def page(jobs: str, sidebar: str = "") -> str:
+    """Career page HTML around a job list."""
+    return (
+        "<html><body><nav><a>首页</a><a>社会招聘</a></nav>"
+        f"<aside>{sidebar}</aside>"
+        f"<main><div class='filters'>城市 职能</div>{jobs}</main>"
+        "<footer>关于我们</footer></body></html>"
+    )
+
+
+def selected_text(html: str, selector: str) -> str:
+    """Text of the elements a selector matches."""
+    root = lxml_html.fromstring(html)
+    return " ".join(e.text_content() for e in CSSSelector(selector)(root))
+
+
+class TestLearnSelector:
+    """Tests for learn_selector."""
+
+    def test_class_container(self):
+        """Test the list is found by its stable classes."""
+        html = page(
+            "<ul class='job-list css-9f8e7d6c'>"
+            "<li><a href='/1'><span>后端开发</span>工程师</a></li>"
+            "<li><a href='/2'>前端开发工程师</a></li>"
+            "<li><a href='/3'>算法工程师</a></li></ul>"
+        )
+
+        selector = learn_selector(html, TITLES)
+
+        assert selector == "ul.job-list"
+        text = selected_text(html, selector)
+        assert all(title in text for title in TITLES)
+        assert "关于我们" not in text
+
+    def test_id_container(self):
+        """Test an element id anchors the selector."""
+        html = page(
+            "<div id='positions'><div class='row'><p>后端开发工程师</p></div>"
+            "<div class='row'><p>前端开发工程师</p><p>算法工程师</p></div></div>"
+        )
+
+        assert learn_selector(html, TITLES) == "#positions"
+
+    def test_generated_id_and_sibling_lists(self):
+        """Test volatile ids are skipped and siblings told apart."""
+        html = page(
+            "<section><div>热门</div></section>"
+            "<section id='app-1699999999'><div>后端开发工程师</div><div>前端开发工程师</div>"
+            "<div>算法工程师</div></section>"
+        )
+
+        selector = learn_selector(html, TITLES)
+
+        assert "1699999999" not in selector
+        assert "nth-of-type(2)" in selector
+        assert "算法工程师" in selected_text(html, selector)
+
+    def test_titles_repeated_outside_list(self):
+        """Test a sidebar repeating a title does not widen the container."""
+        html = page(
+            "<ol class='jobs'><li>后端开发工程师</li><li>前端开发工程师</li>"
+            "<li>算法工程师</li></ol>",
+            sidebar="<p>热招: 算法工程师</p>",
+        )
+
+        assert learn_selector(html, TITLES) == "ol.jobs"
+
+    def test_title_repeated_in_card(self):
+        """Test a title also in its card's description is one occurrence."""
+        cards = "".join(f"<li><h3>{t}</h3><p>负责{t}相关工作</p></li>" for t in TITLES)
+        html = page(f"<ul class='cards'>{cards}</ul>", sidebar=f"<p>{TITLES[0]}</p>")
+
+        assert learn_selector(html, TITLES) == "ul.cards"
+
+    def test_no_useful_container(self):
+        """Test pages where no selector would help."""
+        scattered = page("<p>后端开发工程师</p>", sidebar="<p>前端开发工程师</p><p>算法工程师</p>")
+
+        assert learn_selector(scattered, TITLES) is None
+        assert learn_selector(page("<p>后端开发工程师</p>"), TITLES) is None
+        assert learn_selector(page("<ul><li>后端开发工程师</li></ul>"), ["后端开发工程师"]) is None
+        assert learn_selector("", TITLES) is None
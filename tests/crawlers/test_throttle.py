@@ -0,0 +1,41 @@
+"""Tests for HostThrottle."""
+
+import asyncio
+import time
+
+import pytest
+
+from offer_sherlock.crawlers import HostThrottle
+
+
+class TestHostThrottle:
+    """Tests for per-host request throttling."""
+
+    def test_key_for_url(self):
+        """Test that keys are derived from the host name."""
+        assert HostThrottle.key_for("https://Jobs.ByteDance.com/a?b=1") == "jobs.bytedance.com"
+        assert HostThrottle.key_for("xiaohongshu") == "xiaohongshu"
+
+    @pytest.mark.asyncio
+    async def test_same_host_is_delayed(self):
+        """Test that consecutive requests to one host are spaced out."""
+        throttle = HostThrottle(min_interval=0.05)
+
+        start = time.monotonic()
+        await throttle.wait("a.com")
+        await throttle.wait("a.com")
+        elapsed = time.monotonic() - start
+
+        assert elapsed >= 0.05
+
+    @pytest.mark.asyncio
+    async def test_different_hosts_do_not_wait(self):
+        """Test that requests to different hosts proceed in parallel."""
+        throttle = HostThrottle(min_interval=1.0)
+
+        start = time.monotonic()
+        await asyncio.gather(*(throttle.wait(f"host{i}.com") for i in range(5)))
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 0.5
+        assert throttle.last_request_at("host0.com") is not None
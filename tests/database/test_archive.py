@@ -0,0 +1,148 @@
+"""Tests for the raw page archive."""
+
+import threading
+
+import pytest
+
+from offer_sherlock.database import (
+    CrawlTargetRepository,
+    JobRepository,
+    PageArchive,
+    RawPageRepository,
+)
+from offer_sherlock.database.archive import page_hash
+from offer_sherlock.schemas.job import JobPosting
+
+
+@pytest.fixture
+def archive(tmp_path):
+    """Archive in a temporary directory."""
+    return PageArchive(tmp_path / "raw_pages")
+
+
+class TestPageArchive:
+    """Tests for PageArchive."""
+
+    def test_put_and_get(self, archive):
+        """Test a page round-trips through the archive."""
+        markdown = "# 招聘\n\n后端开发工程师 - 北京\n" * 100
+        digest = archive.put(markdown)
+
+        assert digest == page_hash(markdown)
+        assert archive.exists(digest)
+        assert archive.get_text(digest) == markdown
+        # Stored compressed, under a fanned-out path
+        path = archive.path(digest)
+        assert path.parent.parent.parent == archive.root
+        assert path.stat().st_size < len(markdown.encode("utf-8")) / 10
+
+    def test_put_deduplicates(self, archive):
+        """Test identical content is stored once."""
+        first = archive.put("same page")
+        mtime = archive.path(first).stat().st_mtime_ns
+        second = archive.put(b"same page")
+
+        assert first == second
+        assert archive.path(first).stat().st_mtime_ns == mtime
+        assert len(list(archive.root.rglob("*.zst"))) == 1
+
+    def test_get_missing(self, archive):
+        """Test reading an unknown hash raises KeyError."""
+        with pytest.raises(KeyError):
+            archive.get("0" * 64)
+
+    def test_concurrent_puts(self, archive):
+        """Test threads writing the same and different pages."""
+        pages = [f"page {i % 5}" * 50 for i in range(40)]
+        digests = [None] * len(pages)
+
+        def write(i):
+            digests[i] = archive.put(pages[i])
+
+        threads = [threading.Thread(target=write, args=(i,)) for i in range(len(pages))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(set(digests)) == 5
+        assert all(archive.get_text(d) == p for d, p in zip(digests, pages))
+        assert not list(archive.root.rglob("*.tmp"))
+
+
+class TestRawPageRepository:
+    """Tests for RawPageRepository."""
+
+    def test_add_resolves_target(self, db, archive):
+        """Test fetches are linked to the crawl target with the same URL."""
+        url = "https://jobs.example.com"
+        with db.session() as session:
+            target = CrawlTargetRepository(session).add("公司A", url)
+            repo = RawPageRepository(session)
+            page = repo.add(url, archive.put("v1"), markdown_size=2)
+            adhoc = repo.add("https://other.example.com", archive.put("v2"))
+
+            assert page.target_id == target.id
+            assert adhoc.target_id is None
+            assert page.fetched_at is not None
+
+    def test_get_latest(self, db, archive):
+        """Test the latest fetch of a URL is returned."""
+        url = "https://jobs.example.com"
+        with db.session() as session:
+            repo = RawPageRepository(session)
+            repo.add(url, archive.put("v1"))
+            latest = repo.add(url, archive.put("v2"), html_hash=archive.put("<p>v2</p>"))
+
+            found = repo.get_latest(url)
+            assert found.id == latest.id
+            assert archive.get_text(found.markdown_hash) == "v2"
+            assert archive.get_text(found.html_hash) == "<p>v2</p>"
+            assert repo.get_latest("https://unknown.example.com") is None
+            assert repo.count() == 2
+
+
+class TestJobPageReference:
+    """Tests for jobs referencing archived pages."""
+
+    def test_upsert_sets_page_hash(self, db, archive):
+        """Test inserted and updated jobs point at the page they came from."""
+        first = archive.put("page v1")
+        second = archive.put("page v2")
+        jobs = [JobPosting(title="工程师", company="公司A", job_id_external="E1")]
+        changed = [JobPosting(title="高级工程师", company="公司A", job_id_external="E1")]
+
+        with db.session() as session:
+            repo = JobRepository(session)
+            repo.upsert_many(jobs, raw_page_hash=first)
+            assert repo.get_by_external_id("E1").raw_page_hash == first
+
+            # Unchanged jobs keep the page they were extracted from
+            repo.upsert_many(jobs, raw_page_hash=second)
+            session.expire_all()
+            assert repo.get_by_external_id("E1").raw_page_hash == first
+
+            repo.upsert_many(changed, raw_page_hash=second)
+            session.expire_all()
+            assert repo.get_by_external_id("E1").raw_page_hash == second
+
+    def test_archive_raw_content(self, db, archive):
+        """Test legacy raw_content is moved into the archive."""
+        with db.session() as session:
+            repo = JobRepository(session)
+            for i in range(5):
+                repo.add(
+                    JobPosting(title=f"工程师 {i}", company="公司A", job_id_external=f"E{i}"),
+                    raw_content="shared page" if i < 4 else None,
+                )
+            updated_at = repo.get_by_external_id("E0").updated_at
+
+            assert repo.archive_raw_content(archive, batch_size=2) == 4
+            jobs = [repo.get_by_external_id(f"E{i}") for i in range(5)]
+
+            assert all(job.raw_content is None for job in jobs)
+            assert jobs[0].updated_at == updated_at
+            assert {job.raw_page_hash for job in jobs[:4]} == {page_hash("shared page")}
+            assert jobs[4].raw_page_hash is None
+            assert archive.get_text(jobs[0].raw_page_hash) == "shared page"
+        assert len(list(archive.root.rglob("*.zst"))) == 1
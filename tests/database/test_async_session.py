@@ -0,0 +1,159 @@
+"""Tests for the async database layer."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from offer_sherlock.database import (
+    AsyncCrawlTargetRepository,
+    AsyncDatabaseManager,
+    AsyncInsightRepository,
+    AsyncJobRepository,
+    InsightRepository,
+    JobRepository,
+)
+from offer_sherlock.schemas.insight import InsightSummary, Sentiment, SocialPost
+from offer_sherlock.schemas.job import JobPosting
+
+
+@pytest.fixture
+def adb(db):
+    """Create an async manager over the in-memory database."""
+    manager = AsyncDatabaseManager(db)
+    yield manager
+    manager.close()
+
+
+class TestAsyncDatabaseManager:
+    """Tests for AsyncDatabaseManager."""
+
+    @pytest.mark.asyncio
+    async def test_run_commits(self, adb, db):
+        """Test that work is committed and visible to other sessions."""
+        await adb.run(
+            lambda s: JobRepository(s).add(JobPosting(title="Engineer", company="A"))
+        )
+
+        with db.session() as session:
+            assert JobRepository(session).count() == 1
+
+    @pytest.mark.asyncio
+    async def test_run_rolls_back_on_error(self, adb, db):
+        """Test that a failing unit of work leaves no changes."""
+
+        def failing(session):
+            JobRepository(session).add(JobPosting(title="Engineer", company="A"))
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await adb.run(failing)
+
+        with db.session() as session:
+            assert JobRepository(session).count() == 0
+
+    @pytest.mark.asyncio
+    async def test_runs_on_dedicated_thread(self, adb):
+        """Test that all work runs on one thread other than the loop's."""
+        threads = {await adb.run(lambda s: threading.get_ident()) for _ in range(5)}
+
+        assert len(threads) == 1
+        assert threading.get_ident() not in threads
+
+    @pytest.mark.asyncio
+    async def test_does_not_block_event_loop(self, adb):
+        """Test that the loop keeps running while the database is busy."""
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            for _ in range(10):
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        def slow(session):
+            time.sleep(0.1)
+
+        await asyncio.gather(adb.run(slow), ticker())
+
+        assert ticks == 10
+
+    @pytest.mark.asyncio
+    async def test_async_context_manager_closes(self, db):
+        """Test that leaving the context stops the database thread."""
+        async with AsyncDatabaseManager(db) as adb:
+            await adb.run(lambda s: None)
+            assert adb._executor is not None
+        assert adb._executor is None
+
+
+class TestAsyncRepositories:
+    """Tests for the async repositories."""
+
+    @pytest.mark.asyncio
+    async def test_job_upsert_and_query(self, adb):
+        """Test job round trip through the async repository."""
+        repo = AsyncJobRepository(adb)
+        jobs = [
+            JobPosting(title="后端开发", company="腾讯", job_id_external="T1"),
+            JobPosting(title="前端开发", company="腾讯", job_id_external="T2"),
+        ]
+
+        result = await repo.upsert_many(jobs, source_url="https://careers.tencent.com")
+
+        assert result.inserted == 2
+        assert await repo.count() == 2
+        job = await repo.get_by_external_id("T1")
+        # Detached but loaded
+        assert job.title == "后端开发"
+        assert job.source_url == "https://careers.tencent.com"
+        assert [j.job_id_external for j in await repo.search("前端")] == ["T2"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_writes_are_serialized(self, adb):
+        """Test that concurrent coroutines can all write."""
+        repo = AsyncJobRepository(adb)
+
+        await asyncio.gather(
+            *(
+                repo.upsert_many(
+                    [JobPosting(title="Engineer", company=f"C{i}", job_id_external=f"J{i}")]
+                )
+                for i in range(20)
+            )
+        )
+
+        assert await repo.count() == 20
+
+    @pytest.mark.asyncio
+    async def test_insight_add_saves_posts(self, adb, db):
+        """Test that an insight is saved together with its posts."""
+        summary = InsightSummary(
+            company="字节跳动",
+            position_keyword="后端",
+            overall_sentiment=Sentiment.POSITIVE,
+            posts_analyzed=1,
+            source_posts=[SocialPost(title="字节后端面经", content_summary="三轮技术面")],
+        )
+
+        insight = await AsyncInsightRepository(adb).add(summary)
+
+        assert insight.id is not None
+        with db.session() as session:
+            posts = InsightRepository(session).get_by_id(insight.id).social_posts
+            assert [p.title for p in posts] == ["字节后端面经"]
+        latest = await AsyncInsightRepository(adb).get_latest_by_company("字节跳动")
+        assert latest.id == insight.id
+
+    @pytest.mark.asyncio
+    async def test_crawl_target_lifecycle(self, adb):
+        """Test crawl target add/list/update through the async repository."""
+        repo = AsyncCrawlTargetRepository(adb)
+        target = await repo.add("华为", "https://career.huawei.com")
+
+        assert [t.company for t in await repo.list_active()] == ["华为"]
+        assert await repo.update_last_crawled(target.id)
+        assert (await repo.get_by_id(target.id)).last_crawled_at is not None
+        assert await repo.set_active(target.id, False)
+        assert await repo.list_active() == []
@@ -0,0 +1,128 @@
+"""Tests for columnar snapshot export."""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+
+from offer_sherlock.database import (
+    InsightRepository,
+    JobRepository,
+    SnapshotExporter,
+    load_snapshot,
+)
+from offer_sherlock.schemas.insight import InsightSummary, SocialPost
+from offer_sherlock.schemas.job import JobPosting
+
+pytest.importorskip("pyarrow")
+
+
+def _jobs(n: int, suffix: str = "") -> list[JobPosting]:
+    return [
+        JobPosting(title=f"工程师 {i}{suffix}", company="公司A", job_id_external=f"E{i}")
+        for i in range(n)
+    ]
+
+
+def _backdate(db, **tables) -> None:
+    """Set the change timestamps of all rows of the given tables."""
+    columns = {"jobs": "updated_at", "insights": "created_at", "social_posts": "last_seen_at"}
+    with db.engine.begin() as conn:
+        for table, value in tables.items():
+            conn.execute(text(f"UPDATE {table} SET {columns[table]} = :value"), {"value": value})
+
+
+@pytest.fixture(params=["parquet", "arrow"])
+def exporter(request, db, tmp_path):
+    """Exporter writing to a temporary directory, without settle delay."""
+    return SnapshotExporter(db, tmp_path / "snapshots", format=request.param, settle_seconds=0)
+
+
+class TestSnapshotExporter:
+    """Tests for SnapshotExporter."""
+
+    def test_export_and_load(self, db, exporter):
+        """Test a full export of all tables."""
+        with db.session() as session:
+            JobRepository(session).upsert_many(_jobs(3))
+            InsightRepository(session).add(
+                InsightSummary(
+                    company="公司A",
+                    position_keyword="后端",
+                    key_insights=["加班少"],
+                    source_posts=[SocialPost(title="面经", content_summary="三轮技术面")],
+                )
+            )
+        _backdate(
+            db,
+            jobs="2026-01-01 10:00:00",
+            insights="2026-01-02 10:00:00",
+            social_posts="2026-01-02 10:00:00",
+        )
+
+        results = exporter.export()
+
+        assert results["jobs"].rows == 3
+        assert results["jobs"].files[0].parent.name == "date=2026-01-01"
+        jobs = load_snapshot(exporter.root, "jobs")
+        assert sorted(jobs.title) == ["工程师 0", "工程师 1", "工程师 2"]
+        insights = load_snapshot(exporter.root, "insights")
+        assert insights.key_insights[0] == '["加班少"]'
+        assert len(load_snapshot(exporter.root, "social_posts")) == 1
+
+    def test_incremental_export(self, db, exporter):
+        """Test that later runs only append changed rows."""
+        with db.session() as session:
+            JobRepository(session).upsert_many(_jobs(3))
+        _backdate(db, jobs="2026-01-01 10:00:00")
+        exporter.export(["jobs"])
+        assert exporter.export(["jobs"])["jobs"].rows == 0
+
+        # Pretend the first run happened on 2026-01-02 and E0 changed after it
+        exporter._save_watermark("jobs", datetime(2026, 1, 2))
+        with db.session() as session:
+            JobRepository(session).upsert_many(_jobs(1, suffix=" (更新)"))
+        with db.engine.begin() as conn:
+            conn.execute(
+                text(
+                    "UPDATE jobs SET updated_at = '2026-01-03 10:00:00' "
+                    "WHERE job_id_external = 'E0'"
+                )
+            )
+
+        result = exporter.export(["jobs"])["jobs"]
+        assert result.rows == 1
+        assert result.files[0].parent.name == "date=2026-01-03"
+        jobs = load_snapshot(exporter.root, "jobs")
+        assert len(jobs) == 3
+        assert jobs.set_index("job_id_external").title["E0"] == "工程师 0 (更新)"
+        assert len(load_snapshot(exporter.root, "jobs", latest=False)) == 4
+
+    def test_settle_delay(self, db, tmp_path):
+        """Test that rows changed within the settle delay wait for a later run."""
+        with db.session() as session:
+            JobRepository(session).upsert_many(_jobs(2))
+        exporter = SnapshotExporter(db, tmp_path / "snapshots", settle_seconds=3600)
+
+        assert exporter.export(["jobs"])["jobs"].rows == 0
+
+    def test_load_columns(self, db, exporter):
+        """Test loading a subset of columns."""
+        with db.session() as session:
+            JobRepository(session).upsert_many(_jobs(2))
+        _backdate(db, jobs="2026-01-01 10:00:00")
+        exporter.export(["jobs"])
+
+        jobs = load_snapshot(exporter.root, "jobs", columns=["title"])
+        assert list(jobs.columns) == ["id", "title"]
+
+    def test_load_empty(self, tmp_path):
+        """Test loading a snapshot that was never written."""
+        jobs = load_snapshot(tmp_path, "jobs")
+        assert jobs.empty
+        assert "title" in jobs.columns
+
+    def test_unknown_format(self, db, tmp_path):
+        """Test that unknown formats are rejected."""
+        with pytest.raises(ValueError):
+            SnapshotExporter(db, tmp_path, format="csv")
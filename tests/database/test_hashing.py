@@ -0,0 +1,80 @@
+"""Tests for content hashing."""
+
+from offer_sherlock.database.hashing import (
+    content_hash,
+    fingerprint,
+    normalize_text,
+    page_fingerprint,
+)
+
+FIELDS = ("title", "location")
+
+
+class TestNormalizeText:
+    """Tests for normalize_text."""
+
+    def test_collapses_whitespace(self):
+        """Test that whitespace runs and line breaks collapse."""
+        assert normalize_text("  后端\n\t开发  工程师 ") == "后端 开发 工程师"
+
+    def test_full_width(self):
+        """Test that full-width characters become half-width."""
+        assert normalize_text("Ｐｙｔｈｏｎ（３年）") == "Python(3年)"
+
+    def test_none(self):
+        """Test that None normalizes to the empty string."""
+        assert normalize_text(None) == ""
+
+
+class TestContentHash:
+    """Tests for content_hash."""
+
+    def test_ignores_noise(self):
+        """Test that formatting noise does not change the hash."""
+        a = content_hash({"title": "后端开发", "location": "北京"}, FIELDS)
+        b = content_hash({"title": " 后端开发\n", "location": "北京"}, FIELDS)
+        assert a == b
+
+    def test_detects_changes(self):
+        """Test that a real change changes the hash."""
+        a = content_hash({"title": "后端开发", "location": "北京"}, FIELDS)
+        b = content_hash({"title": "后端开发", "location": "上海"}, FIELDS)
+        assert a != b
+
+    def test_field_boundaries(self):
+        """Test that moving text between fields changes the hash."""
+        a = content_hash({"title": "ab", "location": "c"}, FIELDS)
+        b = content_hash({"title": "a", "location": "bc"}, FIELDS)
+        assert a != b
+
+
+class TestFingerprint:
+    """Tests for fingerprint."""
+
+    def test_case_insensitive(self):
+        """Test that identifying fields match regardless of case."""
+        a = fingerprint({"title": "Android Engineer", "location": "Beijing"}, FIELDS)
+        b = fingerprint({"title": "android  engineer", "location": "BEIJING"}, FIELDS)
+        assert a == b
+
+    def test_missing_fields(self):
+        """Test that None and missing fields are treated alike."""
+        assert fingerprint({"title": "SRE", "location": None}, FIELDS) == fingerprint(
+            {"title": "SRE"}, FIELDS
+        )
+
+
+class TestPageFingerprint:
+    """Tests for page_fingerprint."""
+
+    def test_ignores_rendering_noise(self):
+        """Test that whitespace and full-width drift keep the fingerprint."""
+        a = page_fingerprint("# 招聘\n\n- 后端工程师（北京）\n")
+        b = page_fingerprint("# 招聘\n- 后端工程师(北京)   ")
+        assert a == b
+
+    def test_detects_changes(self):
+        """Test that a new job on the page changes the fingerprint."""
+        a = page_fingerprint("- 后端工程师")
+        b = page_fingerprint("- 后端工程师\n- 前端工程师")
+        assert a != b
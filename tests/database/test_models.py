@@ -10,15 +10,6 @@ from offer_sherlock.database.models import (
     SocialPost,
     CrawlTarget,
 )
-from offer_sherlock.database.session import DatabaseManager
-
-
-@pytest.fixture
-def db():
-    """Create an in-memory database for testing."""
-    manager = DatabaseManager(db_path=":memory:")
-    manager.create_tables()
-    return manager
 
 
 @pytest.fixture
@@ -122,22 +113,31 @@ class TestInsightModel:
 
         # Add related posts
         post1 = SocialPost(
-            insight_id=insight.id,
             title="字节面经分享",
             content_summary="三轮技术面",
             likes=100,
         )
         post2 = SocialPost(
-            insight_id=insight.id,
             title="字节offer",
             content_summary="薪资不错",
             likes=200,
         )
-        session.add_all([post1, post2])
+        insight.social_posts.extend([post1, post2])
         session.flush()
 
         # Check relationship
         assert len(insight.social_posts) == 2
+        assert post1.insights == [insight]
+
+    def test_post_shared_between_insights(self, session):
+        """Test that one post can back several insights."""
+        post = SocialPost(title="腾讯面经", content_summary="两轮技术面")
+        first = Insight(company="腾讯", position_keyword="后端", social_posts=[post])
+        second = Insight(company="腾讯", position_keyword="offer", social_posts=[post])
+        session.add_all([first, second])
+        session.flush()
+
+        assert {i.position_keyword for i in post.insights} == {"后端", "offer"}
 
 
 class TestSocialPostModel:
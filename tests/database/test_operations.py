@@ -1,14 +1,17 @@
 """Tests for database CRUD operations."""
 
+from datetime import datetime
+
 import pytest
+from sqlalchemy import insert, update
 
-from offer_sherlock.database.models import Job, Insight
+from offer_sherlock.database.models import Job, Insight, SocialPost
 from offer_sherlock.database.operations import (
     JobRepository,
     InsightRepository,
     CrawlTargetRepository,
+    SocialPostRepository,
 )
-from offer_sherlock.database.session import DatabaseManager
 from offer_sherlock.schemas.job import JobPosting
 from offer_sherlock.schemas.insight import (
     InsightSummary,
@@ -18,14 +21,6 @@ from offer_sherlock.schemas.insight import (
 )
 
 
-@pytest.fixture
-def db():
-    """Create an in-memory database for testing."""
-    manager = DatabaseManager(db_path=":memory:")
-    manager.create_tables()
-    return manager
-
-
 @pytest.fixture
 def session(db):
     """Get a database session."""
@@ -93,6 +88,257 @@ class TestJobRepository:
         assert len(result) == 3
         assert repo.count() == 3
 
+    def test_upsert_many_counts(self, session):
+        """Test that upsert_many reports inserted and updated rows."""
+        repo = JobRepository(session)
+        repo.add(JobPosting(title="前端", company="腾讯", job_id_external="TX001"))
+        session.flush()
+
+        result = repo.upsert_many(
+            [
+                JobPosting(title="高级前端", company="腾讯", job_id_external="TX001"),
+                JobPosting(title="后端", company="腾讯", job_id_external="TX002"),
+                JobPosting(title="无 ID 岗位", company="腾讯"),
+            ],
+            source_url="https://careers.tencent.com",
+        )
+
+        assert result.inserted == 2
+        assert result.updated == 1
+        assert result.total == 3
+        assert repo.count() == 3
+
+        session.expire_all()
+        updated = repo.get_by_external_id("TX001")
+        assert updated.title == "高级前端"
+        assert updated.source_url == "https://careers.tencent.com"
+
+    def test_upsert_many_duplicate_ids_in_batch(self, session):
+        """Test that the last occurrence of a repeated external ID wins."""
+        repo = JobRepository(session)
+
+        result = repo.upsert_many(
+            [
+                JobPosting(title="v1", company="阿里", job_id_external="ALI001"),
+                JobPosting(title="v2", company="阿里", job_id_external="ALI001"),
+            ]
+        )
+
+        assert result.inserted == 1
+        assert result.updated == 0
+        assert repo.get_by_external_id("ALI001").title == "v2"
+
+    def test_upsert_many_batches(self, session):
+        """Test upserting across several statement batches."""
+        repo = JobRepository(session)
+        jobs = [
+            JobPosting(title=f"岗位{i}", company="华为", job_id_external=f"HW{i:03d}")
+            for i in range(25)
+        ]
+
+        first = repo.upsert_many(jobs, batch_size=10)
+        for job in jobs:
+            job.location = "深圳"
+        second = repo.upsert_many(jobs, batch_size=10)
+
+        assert (first.inserted, first.updated) == (25, 0)
+        assert (second.inserted, second.updated) == (0, 25)
+        assert repo.count() == 25
+
+    def test_upsert_many_skips_unchanged(self, session):
+        """Test that identical content is counted but not rewritten."""
+        repo = JobRepository(session)
+        jobs = [
+            JobPosting(title="后端开发", company="美团", job_id_external="MT1", location="北京"),
+            JobPosting(title="前端开发", company="美团", job_id_external="MT2", location="北京"),
+        ]
+        repo.upsert_many(jobs)
+        session.execute(update(Job).values(updated_at=datetime(2020, 1, 1)))
+
+        rerun = [
+            # Whitespace and full-width noise only
+            JobPosting(title=" 后端开发 ", company="美团", job_id_external="MT1", location="北京"),
+            JobPosting(
+                title="前端开发（React）", company="美团", job_id_external="MT2", location="北京"
+            ),
+            JobPosting(title="算法工程师", company="美团", job_id_external="MT3"),
+        ]
+        result = repo.upsert_many(rerun)
+
+        assert (result.inserted, result.updated, result.unchanged) == (1, 1, 1)
+        assert result.total == 2
+        session.expire_all()
+        assert repo.get_by_external_id("MT1").updated_at == datetime(2020, 1, 1)
+        assert repo.get_by_external_id("MT2").updated_at > datetime(2020, 1, 1)
+        assert repo.get_by_external_id("MT2").title == "前端开发（React）"
+
+    def test_add_skips_unchanged(self, session):
+        """Test that add() leaves an unchanged job untouched."""
+        repo = JobRepository(session)
+        job = JobPosting(title="测试开发", company="京东", job_id_external="JD1")
+        repo.add(job)
+        session.execute(update(Job).values(updated_at=datetime(2020, 1, 1)))
+        session.expire_all()
+
+        repo.add(JobPosting(title="测试开发 ", company="京东", job_id_external="JD1"))
+        session.flush()
+
+        assert repo.get_by_external_id("JD1").updated_at == datetime(2020, 1, 1)
+
+    def test_upsert_many_dedupes_jobs_without_external_id(self, session):
+        """Test that jobs without an external ID upsert on their fingerprint."""
+        repo = JobRepository(session)
+        jobs = [
+            JobPosting(title="后端开发", company="小米", location="北京"),
+            JobPosting(title="后端开发", company="小米", location="武汉"),
+            # Same posting as the first, different formatting
+            JobPosting(title="后端开发 ", company="小米", location="北京"),
+        ]
+
+        first = repo.upsert_many(jobs)
+        second = repo.upsert_many(
+            [
+                JobPosting(title="后端开发", company="小米", location="北京"),
+                JobPosting(
+                    title="后端开发", company="小米", location="武汉", salary_range="30k"
+                ),
+            ]
+        )
+
+        assert (first.inserted, first.updated, first.unchanged) == (2, 0, 0)
+        assert (second.inserted, second.updated, second.unchanged) == (0, 1, 1)
+        assert repo.count() == 2
+        wuhan = repo.get_by_fingerprint(
+            JobRepository.fingerprint(JobPosting(title="后端开发", company="小米", location="武汉"))
+        )
+        assert wuhan.salary_range == "30k"
+
+    def test_fingerprint_does_not_collide_with_keyed_jobs(self, session):
+        """Test that a keyed job and an unkeyed twin are stored separately."""
+        repo = JobRepository(session)
+
+        repo.upsert_many([JobPosting(title="SRE", company="快手", job_id_external="KS1")])
+        result = repo.upsert_many([JobPosting(title="SRE", company="快手")])
+
+        assert result.inserted == 1
+        assert repo.count() == 2
+
+    def test_add_dedupes_by_fingerprint(self, session):
+        """Test that add() updates an existing job without external ID."""
+        repo = JobRepository(session)
+
+        first = repo.add(JobPosting(title="数据分析", company="网易", location="杭州"))
+        second = repo.add(
+            JobPosting(title="数据分析", company="网易", location="杭州", salary_range="25k")
+        )
+
+        assert first.id == second.id
+        assert second.salary_range == "25k"
+        assert repo.count() == 1
+
+    def test_compact_duplicates(self, session):
+        """Test merging duplicates inserted before fingerprints existed."""
+        repo = JobRepository(session)
+        session.execute(
+            insert(Job),
+            [
+                {"title": "测试", "company": "滴滴", "location": "北京",
+                 "created_at": datetime(2024, 1, 1), "updated_at": datetime(2024, 1, 1)},
+                {"title": "测试 ", "company": "滴滴", "location": "北京", "salary_range": "20k",
+                 "created_at": datetime(2024, 2, 1), "updated_at": datetime(2024, 2, 1)},
+                {"title": "运维", "company": "滴滴", "location": "北京",
+                 "created_at": datetime(2024, 3, 1), "updated_at": datetime(2024, 3, 1)},
+                {"title": "测试", "company": "滴滴", "location": "北京", "job_id_external": "DD1",
+                 "created_at": datetime(2024, 4, 1), "updated_at": datetime(2024, 4, 1)},
+            ],
+        )
+
+        removed = repo.compact_duplicates()
+
+        assert removed == 1
+        assert repo.count() == 3
+        kept = repo.get_by_fingerprint(
+            JobRepository.fingerprint(JobPosting(title="测试", company="滴滴", location="北京"))
+        )
+        assert kept.salary_range == "20k"
+        assert kept.created_at == datetime(2024, 1, 1)
+        assert kept.updated_at == datetime(2024, 2, 1)
+        # Later upserts now hit the merged row
+        result = repo.upsert_many([JobPosting(title="运维", company="滴滴", location="北京")])
+        assert result.inserted == 0
+        assert repo.compact_duplicates() == 0
+
+    def test_list_page_walks_all_rows(self, session):
+        """Test keyset pages cover every row once, including created_at ties."""
+        repo = JobRepository(session)
+        session.execute(
+            insert(Job),
+            [
+                # Several rows share each timestamp
+                {
+                    "title": f"岗位{i}",
+                    "company": "OPPO",
+                    "created_at": datetime(2024, 1, 1 + i // 3),
+                }
+                for i in range(10)
+            ],
+        )
+
+        seen = []
+        page = repo.list_page(limit=4)
+        seen.extend(page.items)
+        while page.next_cursor:
+            page = repo.list_page(limit=4, after=page.next_cursor)
+            seen.extend(page.items)
+
+        keys = [(job.created_at, job.id) for job in seen]
+        assert len(keys) == 10
+        assert keys == sorted(keys, reverse=True)
+
+    def test_list_page_last_page(self, session):
+        """Test that an exactly full last page has no next cursor."""
+        repo = JobRepository(session)
+        repo.upsert_many([JobPosting(title=f"T{i}", company="vivo") for i in range(4)])
+
+        page = repo.list_page(limit=4)
+
+        assert len(page.items) == 4
+        assert page.next_cursor is None
+
+    def test_iter_all_streams_in_order(self, session):
+        """Test that iter_all yields every job oldest first and detaches them."""
+        repo = JobRepository(session)
+        session.execute(
+            insert(Job),
+            [
+                {"title": f"岗位{i}", "company": "荣耀", "created_at": datetime(2024, 1, 1 + i % 5)}
+                for i in range(25)
+            ],
+        )
+
+        jobs = list(repo.iter_all(batch_size=7))
+
+        keys = [(job.created_at, job.id) for job in jobs]
+        assert len(keys) == 25
+        assert keys == sorted(keys)
+        assert all(job not in session for job in jobs)
+
+    def test_list_updated_since(self, session):
+        """Test listing jobs changed after a point in time."""
+        repo = JobRepository(session)
+        repo.upsert_many(
+            [
+                JobPosting(title="A", company="百度", job_id_external="BD1"),
+                JobPosting(title="B", company="百度", job_id_external="BD2"),
+            ]
+        )
+        session.execute(update(Job).values(updated_at=datetime(2020, 1, 1)))
+        repo.upsert_many([JobPosting(title="B2", company="百度", job_id_external="BD2")])
+
+        changed = repo.list_updated_since(datetime(2021, 1, 1))
+
+        assert [job.job_id_external for job in changed] == ["BD2"]
+
     def test_get_by_external_id(self, session):
         """Test getting job by external ID."""
         repo = JobRepository(session)
@@ -108,6 +354,20 @@ class TestJobRepository:
         not_found = repo.get_by_external_id("NOTEXIST")
         assert not_found is None
 
+    def test_known_external_ids(self, session):
+        """Test looking up which external IDs are stored."""
+        repo = JobRepository(session)
+        repo.upsert_many(
+            [
+                JobPosting(title=f"岗位{i}", company="阿里", job_id_external=f"ALI{i}")
+                for i in range(3)
+            ]
+        )
+
+        candidates = [f"ALI{i}" for i in range(1000)] + ["ALI1"]
+        assert repo.known_external_ids(candidates) == {"ALI0", "ALI1", "ALI2"}
+        assert repo.known_external_ids([]) == set()
+
     def test_list_by_company(self, session):
         """Test listing jobs by company."""
         repo = JobRepository(session)
@@ -157,6 +417,60 @@ class TestJobRepository:
         assert len(results) == 1
         assert results[0].company == "字节"
 
+    @pytest.mark.sqlite_only
+    def test_search_ranked_with_offset(self, session):
+        """Test that FTS search ranks matches and supports limit/offset."""
+        repo = JobRepository(session)
+        repo.upsert_many([
+            JobPosting(
+                title="算法工程师",
+                company="字节",
+                job_id_external="S001",
+                requirements="推荐算法，熟悉 Python",
+            ),
+            JobPosting(
+                title="算法工程师（推荐算法方向）",
+                company="快手",
+                job_id_external="S002",
+                requirements="推荐算法 推荐系统 推荐算法",
+            ),
+            JobPosting(title="前端开发", company="腾讯", job_id_external="S003"),
+        ])
+
+        results = repo.search("推荐算法")
+        assert [job.job_id_external for job in results] == ["S002", "S001"]
+
+        page = repo.search("推荐算法", limit=1, offset=1)
+        assert [job.job_id_external for job in page] == ["S001"]
+
+    def test_search_location_and_single_char(self, session):
+        """Test searching by location and by a single Chinese character."""
+        repo = JobRepository(session)
+        repo.upsert_many([
+            JobPosting(title="后端", company="美团", job_id_external="L1", location="北京"),
+            JobPosting(title="后端", company="美团", job_id_external="L2", location="上海"),
+        ])
+
+        assert [j.job_id_external for j in repo.search("北京")] == ["L1"]
+        assert len(repo.search("京")) == 1
+        assert repo.search("   ") == []
+
+    def test_search_index_follows_updates_and_deletes(self, session):
+        """Test that the trigger-maintained index stays in sync."""
+        repo = JobRepository(session)
+        job = repo.add(JobPosting(title="数据分析师", company="京东", job_id_external="D1"))
+        session.flush()
+        assert len(repo.search("数据分析")) == 1
+
+        job.title = "数据工程师"
+        session.flush()
+        assert repo.search("数据分析") == []
+        assert len(repo.search("数据工程")) == 1
+
+        repo.delete(job.id)
+        session.flush()
+        assert repo.search("数据工程") == []
+
     def test_delete(self, session):
         """Test deleting a job."""
         repo = JobRepository(session)
@@ -268,8 +582,25 @@ class TestInsightRepository:
         bilibili = repo.list_by_company("B站")
         assert len(bilibili) == 2
 
-    def test_delete_cascades_to_posts(self, session):
-        """Test that deleting insight also deletes posts."""
+    def test_list_page_and_iter_all(self, session):
+        """Test keyset pages and streaming over insights."""
+        repo = InsightRepository(session)
+        for i in range(5):
+            repo.add(InsightSummary(company=f"公司{i}", position_keyword="后端", posts_analyzed=1))
+        session.flush()
+
+        first = repo.list_page(limit=3)
+        second = repo.list_page(limit=3, after=first.next_cursor)
+
+        assert len(first.items) == 3
+        assert len(second.items) == 2
+        assert second.next_cursor is None
+        paged = {i.id for i in first.items + second.items}
+        assert paged == {i.id for i in repo.iter_all(batch_size=2)}
+        assert len(paged) == 5
+
+    def test_delete_removes_links_but_keeps_posts(self, session):
+        """Test that deleting an insight unlinks its posts without deleting them."""
         repo = InsightRepository(session)
         posts = [
             SocialPostSchema(title="帖子1", content_summary="内容1", likes=10),
@@ -285,12 +616,13 @@ class TestInsightRepository:
         session.flush()
         insight_id = insight.id
 
-        # Verify posts exist
+        # Verify posts are linked
         from sqlalchemy import select
-        from offer_sherlock.database.models import SocialPost
-        stmt = select(SocialPost).where(SocialPost.insight_id == insight_id)
-        posts_before = list(session.scalars(stmt))
-        assert len(posts_before) == 2
+        from offer_sherlock.database.models import insight_posts
+        stmt = select(insight_posts.c.post_id).where(
+            insight_posts.c.insight_id == insight_id
+        )
+        assert len(list(session.scalars(stmt))) == 2
 
         # Delete insight
         assert repo.delete(insight_id) is True
@@ -300,10 +632,97 @@ class TestInsightRepository:
         # Verify insight is deleted
         assert repo.get_by_id(insight_id) is None
 
-        # Verify posts are also deleted (cascade)
-        stmt = select(SocialPost).where(SocialPost.insight_id == insight_id)
-        remaining = list(session.scalars(stmt))
-        assert len(remaining) == 0
+        # Links are gone, the (shareable) posts remain
+        assert list(session.scalars(stmt)) == []
+        assert SocialPostRepository(session).count() == 2
+
+    def test_posts_shared_across_insights(self, session):
+        """Test that re-analyzed posts are stored once and refreshed."""
+        repo = InsightRepository(session)
+        note = "https://www.xiaohongshu.com/explore/64a1b2c3d4e5f60718293a4b?xsec=1"
+        first = repo.add(
+            InsightSummary(
+                company="阿里",
+                position_keyword="offer",
+                source_posts=[
+                    SocialPostSchema(
+                        title="阿里offer", content_summary="总包50w", likes=10, url=note
+                    ),
+                    SocialPostSchema(title="阿里面经", content_summary="三轮", likes=5),
+                ],
+            )
+        )
+        second = repo.add(
+            InsightSummary(
+                company="阿里",
+                position_keyword="面经",
+                source_posts=[
+                    # Same note, different tracking params, more likes
+                    SocialPostSchema(
+                        title="阿里offer",
+                        content_summary="总包50w",
+                        likes=99,
+                        url=note.split("?")[0],
+                    ),
+                ],
+            )
+        )
+        session.flush()
+
+        posts = SocialPostRepository(session)
+        assert posts.count() == 2
+        shared = posts.get_by_key("xiaohongshu", "64a1b2c3d4e5f60718293a4b")
+        assert shared.likes == 99
+        assert shared.last_seen_at is not None
+        assert {i.id for i in shared.insights} == {first.id, second.id}
+        assert [p.title for p in first.social_posts] == ["阿里offer", "阿里面经"]
+
+    def test_post_key(self):
+        """Test post identity derivation."""
+        key = SocialPostRepository.post_key
+        assert key(
+            SocialPostSchema(
+                title="t",
+                content_summary="c",
+                url="https://www.xiaohongshu.com/discovery/item/64A1B2C3D4E5F60718293A4B",
+            )
+        ) == "64a1b2c3d4e5f60718293a4b"
+        assert key(
+            SocialPostSchema(title="t", content_summary="c", url="https://Zhihu.com/p/123/?a=1")
+        ) == "zhihu.com/p/123"
+        untitled = SocialPostSchema(title="t", content_summary="c", author="a")
+        assert key(untitled).startswith("h:")
+        assert key(untitled) == key(untitled.model_copy(update={"likes": 5}))
+
+    def test_upsert_many_ids_follow_input_order(self, session):
+        """Test returned IDs line up with shuffled new and existing posts."""
+        import random
+
+        repo = SocialPostRepository(session)
+
+        def post(i, likes=0):
+            return SocialPostSchema(
+                title=f"帖子{i}",
+                content_summary=f"内容{i}",
+                url=f"https://www.zhihu.com/p/{i}",
+                likes=likes,
+            )
+
+        existing = repo.upsert_many([post(i) for i in range(0, 20, 2)])
+        existing_ids = dict(zip(range(0, 20, 2), existing))
+
+        order = list(range(20))
+        random.Random(7).shuffle(order)
+        # Small batches: the order must hold across statement batches too
+        ids = repo.upsert_many([post(i, likes=i) for i in order] + [post(order[0])], batch_size=3)
+
+        assert len(ids) == 21 and ids[-1] == ids[0]
+        for i, post_id in zip(order, ids):
+            stored = session.get(SocialPost, post_id)
+            assert stored.url == f"https://www.zhihu.com/p/{i}"
+            if i in existing_ids:
+                assert post_id == existing_ids[i]
+        assert repo.count() == 20
 
 
 class TestCrawlTargetRepository:
@@ -333,6 +752,16 @@ class TestCrawlTargetRepository:
         active = repo.list_active()
         assert len(active) == 2
 
+    def test_count(self, session):
+        """Test counting all and active targets."""
+        repo = CrawlTargetRepository(session)
+        repo.add("公司A", "https://a.com", is_active=True)
+        repo.add("公司B", "https://b.com", is_active=False)
+        session.flush()
+
+        assert repo.count() == 2
+        assert repo.count(active_only=True) == 1
+
     def test_update_last_crawled(self, session):
         """Test updating last crawled timestamp."""
         repo = CrawlTargetRepository(session)
@@ -357,3 +786,15 @@ class TestCrawlTargetRepository:
 
         repo.set_active(target.id, True)
         assert target.is_active is True
+
+    def test_set_pagination(self, session):
+        """Test storing and clearing pagination settings."""
+        repo = CrawlTargetRepository(session)
+        settings = {"mode": "scroll", "max_pages": 3}
+        target = repo.add("测试", "https://test.com", pagination=settings)
+        session.flush()
+        assert target.pagination == settings
+
+        assert repo.set_pagination(target.id, None) is True
+        assert target.pagination is None
+        assert repo.set_pagination(9999, settings) is False
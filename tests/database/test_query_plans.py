@@ -0,0 +1,234 @@
+"""Query plan regression tests for hot repository queries.
+
+Each test captures the SQL a repository method actually emits and runs it
+through EXPLAIN QUERY PLAN, failing if SQLite would scan the table or sort
+with a temporary b-tree instead of using an index.
+"""
+
+import sqlite3
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+
+from offer_sherlock.database.operations import (
+    CrawlTargetRepository,
+    InsightRepository,
+    JobRepository,
+)
+from offer_sherlock.database.session import DatabaseManager
+
+
+@pytest.fixture
+def db():
+    """Create an in-memory database for testing."""
+    manager = DatabaseManager(db_path=":memory:")
+    manager.create_tables()
+    return manager
+
+
+def query_plans(db, call) -> list[list[str]]:
+    """Run ``call(session)`` and return the query plan of each SELECT it issues."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", capture)
+    try:
+        with db.session() as session:
+            call(session)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", capture)
+
+    assert statements, "call issued no SELECT"
+    plans = []
+    with db.engine.connect() as conn:
+        raw = conn.connection.dbapi_connection
+        for statement, parameters in statements:
+            rows = raw.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            plans.append([row[3] for row in rows])
+    return plans
+
+
+def assert_indexed(plans: list[list[str]], index: str) -> None:
+    """Assert every plan uses ``index`` and none scans or sorts."""
+    for plan in plans:
+        detail = "\n".join(plan)
+        assert index in detail, detail
+        assert not any(line.startswith("SCAN") and "INDEX" not in line for line in plan), detail
+        assert "TEMP B-TREE" not in detail, detail
+
+
+class TestJobQueryPlans:
+    """Query plans for JobRepository."""
+
+    def test_list_by_company(self, db):
+        """Test list_by_company searches and sorts via the composite index."""
+        plans = query_plans(db, lambda s: JobRepository(s).list_by_company("腾讯"))
+        assert_indexed(plans, "ix_jobs_company_created_at")
+
+    def test_count_by_company(self, db):
+        """Test count_by_company uses a covering index."""
+        plans = query_plans(db, lambda s: JobRepository(s).count_by_company("腾讯"))
+        assert_indexed(plans, "ix_jobs_company_created_at")
+
+    def test_list_all(self, db):
+        """Test list_all walks the created_at index instead of sorting."""
+        plans = query_plans(db, lambda s: JobRepository(s).list_all(limit=20))
+        assert_indexed(plans, "ix_jobs_created_at")
+
+    def test_list_page_after_cursor(self, db):
+        """Test keyset pagination seeks via the created_at index."""
+        plans = query_plans(
+            db, lambda s: JobRepository(s).list_page(20, after=(datetime(2024, 1, 1), 5))
+        )
+        assert_indexed(plans, "ix_jobs_created_at")
+
+    def test_iter_all(self, db):
+        """Test streaming walks the created_at index instead of sorting."""
+        plans = query_plans(db, lambda s: list(JobRepository(s).iter_all()))
+        assert_indexed(plans, "ix_jobs_created_at")
+
+    def test_get_by_external_id(self, db):
+        """Test lookup by external ID uses its unique index."""
+        plans = query_plans(db, lambda s: JobRepository(s).get_by_external_id("J1"))
+        assert_indexed(plans, "job_id_external")
+
+    def test_get_by_fingerprint(self, db):
+        """Test fingerprint lookup uses the partial unique index."""
+        plans = query_plans(db, lambda s: JobRepository(s).get_by_fingerprint("abc"))
+        assert_indexed(plans, "ux_jobs_fingerprint")
+
+
+class TestInsightQueryPlans:
+    """Query plans for InsightRepository."""
+
+    def test_get_latest_by_company_and_keyword(self, db):
+        """Test the latest insight lookup uses the three-column index."""
+        plans = query_plans(
+            db, lambda s: InsightRepository(s).get_latest_by_company("腾讯", "后端")
+        )
+        assert_indexed(plans, "ix_insights_company_keyword_created_at")
+
+    def test_get_latest_by_company(self, db):
+        """Test the latest insight lookup without keyword."""
+        plans = query_plans(db, lambda s: InsightRepository(s).get_latest_by_company("腾讯"))
+        assert_indexed(plans, "ix_insights_company_")
+
+    def test_list_by_company(self, db):
+        """Test list_by_company searches and sorts via an index."""
+        plans = query_plans(db, lambda s: InsightRepository(s).list_by_company("腾讯"))
+        assert_indexed(plans, "ix_insights_company_")
+
+    def test_list_page_after_cursor(self, db):
+        """Test keyset pagination seeks via the created_at index."""
+        plans = query_plans(
+            db, lambda s: InsightRepository(s).list_page(20, after=(datetime(2024, 1, 1), 5))
+        )
+        assert_indexed(plans, "ix_insights_created_at")
+
+
+class TestCrawlTargetQueryPlans:
+    """Query plans for CrawlTargetRepository."""
+
+    def test_list_active(self, db):
+        """Test list_active searches the is_active index."""
+        plans = query_plans(db, lambda s: CrawlTargetRepository(s).list_active())
+        assert_indexed(plans, "ix_crawl_targets_is_active")
+
+
+# jobs and insights as created by the first release, with their
+# single-column company indexes
+BASELINE_SCHEMA = """
+CREATE TABLE jobs (
+    id INTEGER NOT NULL,
+    company VARCHAR(100) NOT NULL,
+    title VARCHAR(200) NOT NULL,
+    job_id_external VARCHAR(100),
+    location VARCHAR(200),
+    job_type VARCHAR(50),
+    requirements TEXT,
+    salary_range VARCHAR(100),
+    apply_link VARCHAR(500),
+    source_url VARCHAR(500),
+    raw_content TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    PRIMARY KEY (id)
+);
+CREATE UNIQUE INDEX ix_jobs_job_id_external ON jobs (job_id_external);
+CREATE INDEX ix_jobs_company ON jobs (company);
+CREATE TABLE insights (
+    id INTEGER NOT NULL,
+    company VARCHAR(100) NOT NULL,
+    position_keyword VARCHAR(100) NOT NULL,
+    salary_estimate VARCHAR(100),
+    interview_difficulty VARCHAR(20),
+    overall_sentiment VARCHAR(20),
+    key_insights JSON,
+    recommendation TEXT,
+    posts_analyzed INTEGER NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    PRIMARY KEY (id)
+);
+CREATE INDEX ix_insights_company ON insights (company);
+"""
+
+
+class TestIndexMigration:
+    """Tests for adding indexes to databases created before they existed."""
+
+    @pytest.fixture
+    def baseline_db(self, tmp_path):
+        """Database created with the baseline schema, then migrated."""
+        db_path = tmp_path / "baseline.db"
+        conn = sqlite3.connect(db_path)
+        conn.executescript(BASELINE_SCHEMA)
+        conn.close()
+        db = DatabaseManager(db_path=str(db_path))
+        db.create_tables()
+        yield db
+        db.engine.dispose()
+
+    def test_drops_superseded_indexes(self, baseline_db):
+        """Test the single-column company indexes are dropped."""
+        with baseline_db.engine.connect() as conn:
+            names = {
+                row[0]
+                for row in conn.exec_driver_sql(
+                    "SELECT name FROM sqlite_master WHERE type = 'index'"
+                )
+            }
+        assert "ix_jobs_company" not in names
+        assert "ix_insights_company" not in names
+        assert "ix_jobs_job_id_external" in names
+
+    def test_migrated_query_plans(self, baseline_db):
+        """Test a migrated database uses the composite indexes."""
+        plans = query_plans(baseline_db, lambda s: JobRepository(s).list_by_company("腾讯"))
+        assert_indexed(plans, "ix_jobs_company_created_at")
+        plans = query_plans(
+            baseline_db, lambda s: JobRepository(s).count_by_company("腾讯")
+        )
+        assert_indexed(plans, "ix_jobs_company_created_at")
+        plans = query_plans(
+            baseline_db, lambda s: InsightRepository(s).list_by_company("腾讯")
+        )
+        assert_indexed(plans, "ix_insights_company_")
+
+    def test_create_tables_adds_missing_indexes(self, tmp_path):
+        """Test that create_tables creates indexes on existing tables."""
+        db_path = str(tmp_path / "old.db")
+        db = DatabaseManager(db_path=db_path)
+        db.create_tables()
+        with db.engine.begin() as conn:
+            conn.exec_driver_sql("DROP INDEX ix_jobs_company_created_at")
+        db.engine.dispose()
+
+        db = DatabaseManager(db_path=db_path)
+        db.create_tables()
+        plans = query_plans(db, lambda s: JobRepository(s).list_by_company("腾讯"))
+        assert_indexed(plans, "ix_jobs_company_created_at")
+        db.engine.dispose()
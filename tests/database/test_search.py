@@ -0,0 +1,97 @@
+"""Tests for the FTS5 job search helpers."""
+
+import sqlite3
+
+from offer_sherlock.database import DatabaseManager, JobRepository
+from offer_sherlock.database.search import has_search_index, split_keyword
+
+
+class TestSplitKeyword:
+    """Tests for query rewriting."""
+
+    def test_long_terms_become_phrases(self):
+        """Test that terms of three or more characters become phrases."""
+        assert split_keyword("后端开发 Python") == ('"后端开发" "Python"', [])
+
+    def test_short_terms_left_for_like(self):
+        """Test that terms the trigram index cannot match are returned."""
+        assert split_keyword("后端 Go 京") == (None, ["后端", "Go", "京"])
+        assert split_keyword('C++ "a"b') == ('"C++" """a""b"', [])
+
+    def test_no_terms(self):
+        """Test that blank keywords produce no query."""
+        assert split_keyword("  ") == (None, [])
+
+
+class TestSearchIndex:
+    """Tests for index lifecycle."""
+
+    def test_created_with_tables(self):
+        """Test that create_tables() builds the index."""
+        db = DatabaseManager(db_path=":memory:")
+        db.create_tables()
+        with db.engine.connect() as conn:
+            assert has_search_index(conn)
+
+    def test_backfills_existing_jobs(self, tmp_path):
+        """Test that an index added to an existing database is backfilled."""
+        from offer_sherlock.database.search import drop_search_index
+        from offer_sherlock.schemas.job import JobPosting
+
+        db = DatabaseManager(db_path=str(tmp_path / "offers.db"))
+        db.create_tables()
+        drop_search_index(db.engine)
+        with db.session() as session:
+            JobRepository(session).add(JobPosting(title="测试开发", company="网易"))
+
+        db.create_tables()
+
+        with db.session() as session:
+            assert len(JobRepository(session).search("测试")) == 1
+
+    def test_plain_sqlite_writers(self, tmp_path):
+        """Test that connections without app setup can write and are indexed."""
+        path = tmp_path / "offers.db"
+        db = DatabaseManager(db_path=str(path))
+        db.create_tables()
+
+        conn = sqlite3.connect(path)
+        conn.execute("INSERT INTO jobs (title, company) VALUES ('数据分析师', '京东')")
+        conn.execute("UPDATE jobs SET title = '数据工程师'")
+        conn.commit()
+        conn.close()
+
+        with db.session() as session:
+            repo = JobRepository(session)
+            assert repo.search("数据分析") == []
+            assert [job.title for job in repo.search("数据工程")] == ["数据工程师"]
+
+    def test_replaces_bigram_index(self, tmp_path):
+        """Test that an index needing a Python function is rebuilt in SQL."""
+        from offer_sherlock.database.search import drop_search_index
+        from offer_sherlock.schemas.job import JobPosting
+
+        path = tmp_path / "offers.db"
+        db = DatabaseManager(db_path=str(path))
+        db.create_tables()
+        drop_search_index(db.engine)
+        with db.session() as session:
+            JobRepository(session).add(JobPosting(title="测试开发工程师", company="网易"))
+        with db.engine.begin() as conn:
+            conn.exec_driver_sql(
+                "CREATE VIRTUAL TABLE jobs_fts USING fts5("
+                "title, company, requirements, location, content='', tokenize='unicode61')"
+            )
+            conn.exec_driver_sql(
+                "CREATE TRIGGER jobs_fts_ai AFTER INSERT ON jobs BEGIN "
+                "INSERT INTO jobs_fts(rowid, title) VALUES (new.id, cjk_bigrams(new.title)); END"
+            )
+
+        db.create_tables()
+
+        conn = sqlite3.connect(path)
+        conn.execute("INSERT INTO jobs (title, company) VALUES ('后端开发工程师', '网易')")
+        conn.commit()
+        conn.close()
+        with db.session() as session:
+            assert len(JobRepository(session).search("开发工程师")) == 2
@@ -0,0 +1,184 @@
+"""Tests for DatabaseManager connection settings."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.pool import StaticPool
+
+from offer_sherlock.database import (
+    DatabaseManager,
+    JobRepository,
+    PerformanceProfile,
+    PoolSettings,
+)
+from offer_sherlock.utils.config import Settings
+
+
+def _pragma(db: DatabaseManager, name: str):
+    with db.engine.connect() as conn:
+        return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+class TestPerformanceProfile:
+    """Tests for PerformanceProfile."""
+
+    def test_default_pragmas(self):
+        """Test the statements generated by the default profile."""
+        pragmas = PerformanceProfile().pragmas()
+        assert "PRAGMA foreign_keys=ON" in pragmas
+        assert "PRAGMA journal_mode=WAL" in pragmas
+        assert "PRAGMA synchronous=NORMAL" in pragmas
+        assert "PRAGMA cache_size=-65536" in pragmas
+
+    def test_legacy_profile(self):
+        """Test that the legacy profile only enables foreign keys."""
+        assert PerformanceProfile.legacy().pragmas() == ["PRAGMA foreign_keys=ON"]
+
+
+class TestDatabaseManagerProfile:
+    """Tests for applying the profile to connections."""
+
+    def test_default_profile_applied(self, tmp_path):
+        """Test that a file database runs in WAL mode with tuned settings."""
+        db = DatabaseManager(db_path=str(tmp_path / "offers.db"))
+        db.create_tables()
+
+        assert _pragma(db, "journal_mode") == "wal"
+        assert _pragma(db, "synchronous") == 1  # NORMAL
+        assert _pragma(db, "busy_timeout") == 5000
+        assert _pragma(db, "temp_store") == 2  # MEMORY
+        assert _pragma(db, "foreign_keys") == 1
+
+    def test_custom_profile(self, tmp_path):
+        """Test overriding individual settings."""
+        profile = PerformanceProfile(busy_timeout_ms=250, cache_size_kib=1024)
+        db = DatabaseManager(db_path=str(tmp_path / "offers.db"), profile=profile)
+
+        assert db.profile is profile
+        assert _pragma(db, "busy_timeout") == 250
+        assert _pragma(db, "cache_size") == -1024
+
+    def test_legacy_profile_keeps_rollback_journal(self, tmp_path):
+        """Test that the legacy profile leaves the journal mode alone."""
+        db = DatabaseManager(
+            db_path=str(tmp_path / "offers.db"),
+            profile=PerformanceProfile.legacy(),
+        )
+        assert _pragma(db, "journal_mode") == "delete"
+
+
+class TestSchemaMigration:
+    """Tests for upgrading databases created by older versions."""
+
+    def test_create_tables_adds_missing_columns(self, tmp_path):
+        """Test that new nullable columns are added to existing tables."""
+        db_path = str(tmp_path / "old.db")
+        db = DatabaseManager(db_path=db_path)
+        db.create_tables()
+        with db.engine.begin() as conn:
+            conn.execute(text("ALTER TABLE jobs DROP COLUMN content_hash"))
+        db.engine.dispose()
+
+        db = DatabaseManager(db_path=db_path)
+        db.create_tables()
+
+        with db.engine.connect() as conn:
+            columns = {row[1] for row in conn.execute(text("PRAGMA table_info(jobs)"))}
+        assert "content_hash" in columns
+        db.engine.dispose()
+
+    def test_create_tables_migrates_post_links(self, tmp_path):
+        """Test that legacy insight_id post links move to insight_posts."""
+        db_path = str(tmp_path / "old.db")
+        db = DatabaseManager(db_path=db_path)
+        db.create_tables()
+        with db.engine.begin() as conn:
+            conn.execute(text("ALTER TABLE social_posts ADD COLUMN insight_id INTEGER"))
+            conn.execute(
+                text(
+                    "INSERT INTO insights (id, company, position_keyword, posts_analyzed, "
+                    "created_at) VALUES (1, '腾讯', '后端', 1, CURRENT_TIMESTAMP)"
+                )
+            )
+            conn.execute(
+                text(
+                    "INSERT INTO social_posts (id, insight_id, title, likes, source, "
+                    "is_interview_experience, is_offer_info, created_at) "
+                    "VALUES (7, 1, '腾讯面经', 0, 'xiaohongshu', 0, 0, CURRENT_TIMESTAMP)"
+                )
+            )
+        db.engine.dispose()
+
+        db = DatabaseManager(db_path=db_path)
+        db.create_tables()
+        db.create_tables()
+
+        with db.engine.connect() as conn:
+            links = conn.execute(text("SELECT insight_id, post_id FROM insight_posts")).all()
+        assert links == [(1, 7)]
+        db.engine.dispose()
+
+
+class TestDatabaseUrl:
+    """Tests for URL-based engine configuration."""
+
+    def test_sqlite_url(self, tmp_path):
+        """Test that a SQLite URL behaves like db_path."""
+        db_path = str(tmp_path / "offers.db")
+        db = DatabaseManager(url=f"sqlite:///{db_path}")
+        db.create_tables()
+
+        assert db.dialect == "sqlite"
+        assert db.db_path == db_path
+        assert _pragma(db, "journal_mode") == "wal"
+        db.engine.dispose()
+
+    def test_sqlite_memory_url_shares_connection(self):
+        """Test that an in-memory URL uses a single shared connection."""
+        db = DatabaseManager(url="sqlite://")
+        assert isinstance(db.engine.pool, StaticPool)
+
+    def test_path_and_url_are_exclusive(self):
+        """Test that db_path and url cannot both be given."""
+        with pytest.raises(ValueError):
+            DatabaseManager(db_path="offers.db", url="sqlite:///offers.db")
+
+    def test_postgresql_url(self):
+        """Test server URLs: no file path, password hidden in repr."""
+        db = DatabaseManager(url="postgresql+psycopg://sherlock:secret@db:5432/offers")
+
+        assert db.dialect == "postgresql"
+        assert db.db_path is None
+        assert "secret" not in repr(db)
+
+    def test_pool_settings_applied(self):
+        """Test that pool settings reach the PostgreSQL engine."""
+        pytest.importorskip("psycopg")
+        pool = PoolSettings(pool_size=3, max_overflow=1, pool_recycle=60)
+        db = DatabaseManager(url="postgresql+psycopg://sherlock@db/offers", pool=pool)
+
+        assert db.engine.pool.size() == 3
+        assert db.engine.pool._max_overflow == 1
+        assert db.engine.pool._recycle == 60
+        assert db.engine.pool._pre_ping is True
+
+    def test_from_settings(self, tmp_path):
+        """Test that Settings.database_url and pool fields are honoured."""
+        db_path = str(tmp_path / "offers.db")
+        settings = Settings(database_url=f"sqlite:///{db_path}", db_pool_size=2)
+        db = DatabaseManager.from_settings(settings)
+
+        assert db.db_path == db_path
+        assert db._pool.pool_size == 2
+
+    def test_postgresql_upsert_statement(self):
+        """Test that repositories build PostgreSQL upserts on PostgreSQL."""
+        session = MagicMock()
+        session.get_bind.return_value.dialect.name = "postgresql"
+        stmt = JobRepository(session)._upsert_statement("fingerprint", None)
+        sql = str(stmt.compile(dialect=postgresql.dialect()))
+
+        assert "ON CONFLICT (fingerprint) WHERE job_id_external IS NULL" in sql
+        assert "IS DISTINCT FROM excluded.content_hash" in sql
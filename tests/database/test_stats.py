@@ -0,0 +1,189 @@
+"""Tests for the trigger-maintained summary tables."""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import func, select, text, update
+
+from offer_sherlock.database import (
+    DatabaseManager,
+    InsightRepository,
+    JobRepository,
+    StatsRepository,
+)
+from offer_sherlock.database.models import Insight, Job
+from offer_sherlock.database.stats import drop_stats_triggers, has_stats_triggers
+from offer_sherlock.schemas.insight import InsightSummary
+from offer_sherlock.schemas.job import JobPosting
+
+
+@pytest.fixture
+def session(db):
+    """Get a database session."""
+    with db.session() as sess:
+        yield sess
+
+
+def _jobs(n: int, **overrides) -> list[JobPosting]:
+    return [
+        JobPosting(
+            title=f"工程师 {i}",
+            company=f"公司{i % 3}",
+            job_id_external=f"E{i}",
+            job_type="社招" if i % 2 else None,
+            **overrides,
+        )
+        for i in range(n)
+    ]
+
+
+def _assert_consistent(session) -> None:
+    """Compare the summaries with GROUP BY queries over the base tables."""
+    stats = StatsRepository(session)
+    by_company = dict(
+        (company, count)
+        for company, count in session.execute(
+            select(Job.company, func.count()).group_by(Job.company)
+        )
+    )
+    assert dict(stats.top_companies(limit=100)) == by_company
+    by_type = dict(
+        (job_type or "", count)
+        for job_type, count in session.execute(
+            select(Job.job_type, func.count()).group_by(Job.job_type)
+        )
+    )
+    assert dict(stats.jobs_by_type()) == by_type
+    insights = dict(
+        (company, count)
+        for company, count in session.execute(
+            select(Insight.company, func.count()).group_by(Insight.company)
+        )
+    )
+    assert {row.company: row.insights for row in stats.insight_counts()} == insights
+
+
+class TestJobCounts:
+    """Tests for job summaries."""
+
+    def test_insert(self, session):
+        """Test that inserted jobs are counted per company, day and type."""
+        JobRepository(session).upsert_many(_jobs(10))
+        stats = StatsRepository(session)
+
+        assert stats.total_jobs() == 10
+        assert stats.jobs_by_company("公司0") == 4
+        assert stats.top_companies(1) == [("公司0", 4)]
+        assert dict(stats.jobs_by_type()) == {"社招": 5, "": 5}
+        [(day, count)] = stats.jobs_per_day()
+        assert count == 10
+        assert isinstance(day, date)
+        _assert_consistent(session)
+
+    def test_update_moves_counts(self, session):
+        """Test that changing company or job type moves the job between rows."""
+        repo = JobRepository(session)
+        repo.upsert_many(_jobs(4))
+        repo.upsert_many(_jobs(4, location="北京"))  # content change only
+        session.execute(update(Job).where(Job.job_id_external == "E0").values(company="新公司"))
+        session.execute(update(Job).values(job_type="校招"))
+
+        stats = StatsRepository(session)
+        assert stats.total_jobs() == 4
+        assert stats.jobs_by_company("新公司") == 1
+        assert dict(stats.jobs_by_type()) == {"校招": 4}
+        _assert_consistent(session)
+
+    def test_delete_removes_empty_rows(self, session):
+        """Test that deleting a company's last job removes its summary row."""
+        repo = JobRepository(session)
+        repo.upsert_many(_jobs(3))
+        job = repo.get_by_external_id("E2")
+        repo.delete(job.id)
+        session.flush()
+
+        stats = StatsRepository(session)
+        assert stats.jobs_by_company("公司2") == 0
+        assert "公司2" not in dict(stats.top_companies(10))
+        _assert_consistent(session)
+
+    def test_compact_duplicates(self, session):
+        """Test that merging duplicates keeps the counts consistent."""
+        for _ in range(3):
+            session.execute(
+                text("INSERT INTO jobs (company, title) VALUES ('公司A', '后端开发')")
+            )
+        JobRepository(session).compact_duplicates()
+
+        assert StatsRepository(session).jobs_by_company("公司A") == 1
+        _assert_consistent(session)
+
+    def test_jobs_per_day_since(self, session):
+        """Test filtering daily counts by date."""
+        session.execute(
+            text(
+                "INSERT INTO jobs (company, title, created_at) VALUES "
+                "('公司A', 'a', '2026-01-01 09:00:00'), "
+                "('公司A', 'b', '2026-01-01 18:00:00'), "
+                "('公司B', 'c', '2026-01-03 10:00:00')"
+            )
+        )
+        stats = StatsRepository(session)
+
+        assert stats.jobs_per_day() == [(date(2026, 1, 1), 2), (date(2026, 1, 3), 1)]
+        assert stats.jobs_per_day(since=date(2026, 1, 2)) == [(date(2026, 1, 3), 1)]
+        assert stats.jobs_per_day(company="公司A") == [(date(2026, 1, 1), 2)]
+
+
+class TestInsightCounts:
+    """Tests for insight summaries."""
+
+    def test_add_and_delete(self, session):
+        """Test insight counts and the latest insight time."""
+        repo = InsightRepository(session)
+        first = repo.add(InsightSummary(company="腾讯", position_keyword="后端"))
+        repo.add(InsightSummary(company="腾讯", position_keyword="前端"))
+        repo.add(InsightSummary(company="字节", position_keyword="算法"))
+        session.flush()
+
+        stats = StatsRepository(session)
+        assert stats.total_insights() == 3
+        [tencent, _] = stats.insight_counts()
+        assert (tencent.company, tencent.insights) == ("腾讯", 2)
+        assert tencent.last_created_at is not None
+
+        repo.delete(first.id)
+        session.flush()
+        assert StatsRepository(session).total_insights() == 2
+        _assert_consistent(session)
+
+
+class TestStatsLifecycle:
+    """Tests for installing and rebuilding the summaries."""
+
+    def test_backfills_existing_database(self, tmp_path):
+        """Test that summaries added to an existing database are backfilled."""
+        db = DatabaseManager(db_path=str(tmp_path / "offers.db"))
+        db.create_tables()
+        drop_stats_triggers(db.engine)
+        with db.session() as session:
+            JobRepository(session).upsert_many(_jobs(6))
+            assert StatsRepository(session).total_jobs() == 0
+
+        db.create_tables()
+        with db.engine.connect() as conn:
+            assert has_stats_triggers(conn)
+        with db.session() as session:
+            assert StatsRepository(session).total_jobs() == 6
+            _assert_consistent(session)
+        db.engine.dispose()
+
+    def test_refresh(self, session):
+        """Test that refresh() rebuilds drifted summaries."""
+        JobRepository(session).upsert_many(_jobs(5))
+        session.execute(text("DELETE FROM job_counts_by_company"))
+        stats = StatsRepository(session)
+        assert stats.top_companies() == []
+
+        stats.refresh()
+        _assert_consistent(session)
@@ -0,0 +1,130 @@
+"""Tests for page block segmentation."""
+
+from offer_sherlock.extractors.blocks import block_hash, plan_extraction, segment_markdown
+from offer_sherlock.schemas.job import JobPosting
+
+LIST_PAGE = """
+# 招聘
+
+## 热招职位
+
+- [后端开发工程师](https://jobs.example.com/1) 北京
+- [前端开发工程师](https://jobs.example.com/2) 上海
+
+### [算法工程师](https://jobs.example.com/3)
+- 工作地点: 深圳
+- 岗位类型: 校招
+
+页脚 © 2025
+"""
+
+
+class TestSegmentMarkdown:
+    """Tests for segment_markdown."""
+
+    def test_blocks(self):
+        """Test headings, job rows and cards become separate blocks."""
+        texts = [block.text for block in segment_markdown(LIST_PAGE)]
+
+        assert texts[0] == "# 招聘"
+        assert texts[1] == "## 热招职位"
+        assert texts[2] == "- [后端开发工程师](https://jobs.example.com/1) 北京"
+        assert texts[3] == "- [前端开发工程师](https://jobs.example.com/2) 上海"
+        # A card keeps its attribute list and body together
+        assert texts[4].startswith("### [算法工程师]")
+        assert "岗位类型: 校招" in texts[4]
+        assert "页脚" in texts[4]
+
+    def test_rows_keep_heading_context(self):
+        """Test rows carry their section heading for standalone extraction."""
+        row = segment_markdown(LIST_PAGE)[2]
+
+        assert row.heading == "## 热招职位"
+        assert row.prompt_text().startswith("## 热招职位\n- [后端")
+
+    def test_stable_under_insertion(self):
+        """Test adding a job row leaves the other blocks' hashes alone."""
+        changed = LIST_PAGE.replace(
+            "- [前端", "- [测试开发工程师](https://jobs.example.com/4) 杭州\n- [前端"
+        )
+        before = {block.hash for block in segment_markdown(LIST_PAGE)}
+        after = [block.hash for block in segment_markdown(changed)]
+
+        assert len([h for h in after if h not in before]) == 1
+
+    def test_long_blocks_are_split(self):
+        """Test oversized blocks are split at line boundaries."""
+        text = "\n".join(f"行 {i} " + "x" * 50 for i in range(100))
+        blocks = segment_markdown(text, max_chars=500)
+
+        assert len(blocks) > 1
+        assert all(len(block.text) <= 500 for block in blocks)
+
+    def test_hash_ignores_whitespace(self):
+        """Test block hashes ignore re-rendering noise."""
+        assert block_hash("- 后端  工程师") == block_hash("- 后端 工程师\n")
+
+
+class TestPlanExtraction:
+    """Tests for plan_extraction."""
+
+    def test_carries_known_blocks(self):
+        """Test only unknown blocks are selected."""
+        blocks = segment_markdown(LIST_PAGE)
+        job = JobPosting(title="后端开发工程师", company="A")
+        previous = {blocks[2].hash: [job], blocks[0].hash: []}
+
+        plan = plan_extraction(blocks, previous, max_chars=10_000)
+
+        assert plan.carried == {blocks[2].hash: [job], blocks[0].hash: []}
+        assert [b.hash for b in plan.selected] == [b.hash for b in blocks[1:2] + blocks[3:]]
+        assert "后端开发工程师" not in plan.prompt
+
+    def test_budget_defers_blocks(self):
+        """Test blocks beyond the prompt budget are deferred."""
+        blocks = segment_markdown(LIST_PAGE)
+
+        plan = plan_extraction(blocks, None, max_chars=60)
+
+        assert plan.selected
+        assert plan.deferred
+        assert len(plan.selected) + len(plan.deferred) == len(blocks)
+
+    def test_assign_by_title(self):
+        """Test extracted jobs are attributed to the block naming them."""
+        blocks = segment_markdown(LIST_PAGE)
+        plan = plan_extraction(blocks, None, max_chars=10_000)
+        jobs = [
+            JobPosting(title="前端开发工程师", company="A"),
+            JobPosting(title="Unnamed", company="A"),
+        ]
+
+        assigned = plan.assign(jobs)
+
+        # The unattributed job leaves every block without jobs to be retried
+        assert assigned == {blocks[3].hash: jobs[:1]}
+
+    def test_assign_prefers_specific_blocks(self):
+        """Test a job goes to its card, not a larger block sharing its title."""
+        page = "# 招聘\n职位类别: 工程师 产品 设计\n\n- [工程师](https://jobs.example.com/7) 北京\n"
+        blocks = segment_markdown(page)
+        plan = plan_extraction(blocks, None, max_chars=10_000)
+        engineer = JobPosting(title="工程师", company="A")
+        tagged = JobPosting(title="产品", company="A", job_id_external="jobs.example.com/7")
+
+        assigned = plan.assign([engineer, tagged])
+
+        assert assigned == {blocks[0].hash: [], blocks[1].hash: [engineer, tagged]}
+
+    def test_removed_card_is_not_carried(self):
+        """Test a job disappears with its card while the header stays."""
+        header = "# 招聘\n职位类别: 工程师 产品 设计\n"
+        card = "- [工程师](https://jobs.example.com/7) 北京\n"
+        blocks = segment_markdown(header + "\n" + card)
+        job = JobPosting(title="工程师", company="A")
+        previous = plan_extraction(blocks, None, max_chars=10_000).assign([job])
+
+        plan = plan_extraction(segment_markdown(header), previous, max_chars=10_000)
+
+        assert plan.carried == {blocks[0].hash: []}
+        assert not plan.selected
@@ -174,6 +174,58 @@ class TestJobExtractor:
         assert "提取失败" in result.extraction_notes
         assert "LLM API Error" in result.extraction_notes
 
+    @pytest.mark.asyncio
+    async def test_extract_incremental(self, extractor, mock_llm_client):
+        """Test a re-crawl only sends new job cards to the LLM."""
+        backend = JobPosting(title="后端开发工程师", company="字节跳动", job_id_external="123456")
+        mock_llm_client.achat_structured.return_value = JobListExtraction(
+            jobs=[backend], source_url=""
+        )
+        first = await extractor.extract_incremental(
+            content=SAMPLE_JOB_LIST_CONTENT, company="字节跳动", source_url="https://x.com"
+        )
+
+        new_card = (
+            "### [测试开发工程师](https://jobs.bytedance.com/job/123459)\n"
+            "- 工作地点: 杭州\n"
+        )
+        changed = SAMPLE_JOB_LIST_CONTENT + "\n" + new_card
+        tester = JobPosting(title="测试开发工程师", company="字节跳动", job_id_external="123459")
+        mock_llm_client.achat_structured.return_value = JobListExtraction(
+            jobs=[tester], source_url=""
+        )
+        second = await extractor.extract_incremental(
+            content=changed,
+            company="字节跳动",
+            source_url="https://x.com",
+            previous=first.block_jobs,
+        )
+
+        prompt = mock_llm_client.achat_structured.call_args.kwargs["message"]
+        assert "测试开发工程师" in prompt
+        assert "前端开发工程师" not in prompt
+        assert second.changed_blocks == 1
+        assert second.carried_jobs == 1
+        assert second.complete
+        assert [job.title for job in second.jobs] == ["后端开发工程师", "测试开发工程师"]
+        assert len(second.block_jobs) == second.blocks
+
+    @pytest.mark.asyncio
+    async def test_extract_incremental_failure_defers_blocks(
+        self, extractor, mock_llm_client
+    ):
+        """Test blocks whose extraction failed are retried next time."""
+        mock_llm_client.achat_structured.side_effect = Exception("LLM API Error")
+
+        result = await extractor.extract_incremental(
+            content=SAMPLE_JOB_LIST_CONTENT, company="字节跳动", source_url="https://x.com"
+        )
+
+        assert result.count == 0
+        assert not result.complete
+        assert result.block_jobs == {}
+        assert "LLM API Error" in result.extraction_notes
+
     @pytest.mark.asyncio
     async def test_extract_fills_missing_company(self, extractor, mock_llm_client):
         """Test that missing company names are filled in."""
@@ -1,11 +1,14 @@
 """Tests for IntelScheduler."""
 
+import asyncio
+
 import pytest
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
 from offer_sherlock.scheduler import IntelScheduler, ScheduleConfig
 from offer_sherlock.agents import AgentResult
+from offer_sherlock.crawlers import RecyclePolicy
 
 
 class TestScheduleConfig:
@@ -14,7 +17,8 @@ class TestScheduleConfig:
     def test_default_values(self):
         """Test default configuration values."""
         config = ScheduleConfig()
-        assert config.db_path == "data/offers.db"
+        assert config.db_path is None
+        assert config.database_url is None
         assert config.cron_hour == "9,21"
         assert config.cron_minute == "0"
         assert config.cron_day_of_week == "mon-fri"
@@ -37,6 +41,17 @@ class TestScheduleConfig:
         assert config.skip_social is True
         assert config.max_companies_per_run == 5
 
+    def test_open_database(self, tmp_path, monkeypatch):
+        """Test paths, URLs and the DATABASE_URL/DB_POOL_* settings."""
+        monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'env.db'}")
+        monkeypatch.setenv("DB_POOL_SIZE", "3")
+
+        assert ScheduleConfig().open_database().db_path == str(tmp_path / "env.db")
+        assert ScheduleConfig(db_path="custom.db").open_database().db_path == "custom.db"
+        db = ScheduleConfig(database_url="postgresql+psycopg://u@db/offers").open_database()
+        assert db.dialect == "postgresql"
+        assert db._pool.pool_size == 3
+
 
 class TestIntelScheduler:
     """Tests for IntelScheduler."""
@@ -97,7 +112,7 @@ class TestIntelScheduler:
     @pytest.mark.asyncio
     async def test_run_once(self):
         """Test run_once executes collection."""
-        config = ScheduleConfig(db_path=":memory:")
+        config = ScheduleConfig(db_path=":memory:", skip_social=True)
         scheduler = IntelScheduler(config)
 
         # Mock the agent
@@ -119,6 +134,7 @@ class TestIntelScheduler:
         assert results[0].company == "TestCorp"
         assert scheduler.run_count == 1
         assert scheduler.last_run is not None
+        assert mock_agent.run_all.call_args.kwargs["skip_social"] is True
 
     @pytest.mark.asyncio
     async def test_run_once_calls_callback(self):
@@ -265,3 +281,128 @@ class TestIntelScheduler:
 
         assert len(scheduler.last_results) == 1
         assert scheduler.last_results[0].company == "Test"
+
+    @pytest.mark.asyncio
+    async def test_runs_share_one_browser(self):
+        """Test one started, recycled crawler per site kind goes to the agent."""
+        recycle = RecyclePolicy(max_pages=10, max_rss_mb=512)
+        scheduler = IntelScheduler(ScheduleConfig(db_path=":memory:", browser_recycle=recycle))
+
+        with patch(
+            "offer_sherlock.scheduler.intel_scheduler.OfficialCrawler"
+        ) as mock_crawler, patch(
+            "offer_sherlock.scheduler.intel_scheduler.XhsCrawler"
+        ) as mock_social:
+            crawler = mock_crawler.return_value
+            crawler.start = AsyncMock()
+            await scheduler._init_components()
+            await scheduler._init_components()
+
+        mock_crawler.assert_called_once_with(use_cache=False, recycle=recycle)
+        crawler.start.assert_awaited_once()
+        mock_social.assert_called_once_with(headless=True, recycle=recycle)
+        assert scheduler._agent.crawler is crawler
+        assert scheduler._agent.social_crawler is mock_social.return_value
+
+    @pytest.mark.asyncio
+    async def test_close_releases_agent(self):
+        """Test close() stops the agent's database thread and the browser."""
+        scheduler = IntelScheduler(ScheduleConfig(db_path=":memory:"))
+        with patch(
+            "offer_sherlock.scheduler.intel_scheduler.OfficialCrawler"
+        ) as mock_crawler, patch(
+            "offer_sherlock.scheduler.intel_scheduler.XhsCrawler"
+        ) as mock_social:
+            crawler = mock_crawler.return_value
+            crawler.start = AsyncMock()
+            crawler.close = AsyncMock()
+            social = mock_social.return_value
+            social.close = AsyncMock()
+            await scheduler._init_components()
+        agent = scheduler._agent
+        await agent.adb.run(lambda session: None)
+        assert agent.adb._executor is not None
+
+        await scheduler.close()
+
+        assert agent.adb._executor is None
+        assert scheduler._agent is None
+        crawler.close.assert_awaited_once()
+        social.close.assert_awaited_once()
+
+
+class TestWatchdog:
+    """Tests for the run timeout and memory watchdog."""
+
+    @pytest.mark.asyncio
+    async def test_hung_run_is_cancelled(self):
+        """Test a run over run_timeout_minutes is cancelled and reported."""
+        errors = []
+        config = ScheduleConfig(
+            db_path=":memory:", run_timeout_minutes=0.001, on_error=errors.append
+        )
+        scheduler = IntelScheduler(config)
+        cancelled = asyncio.Event()
+
+        async def hang(**kwargs):
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with patch.object(scheduler, '_init_components'):
+            scheduler._agent = MagicMock()
+            scheduler._agent.run_all = hang
+
+            with pytest.raises(TimeoutError):
+                await scheduler.run_once()
+
+        assert cancelled.is_set()
+        assert "exceeded" in str(errors[0])
+        assert scheduler.get_status()["run_in_progress"] is False
+
+    @pytest.mark.asyncio
+    async def test_memory_limit_stops_scheduler(self):
+        """Test the watchdog stops an idle scheduler over max_rss_mb."""
+        errors = []
+        config = ScheduleConfig(
+            db_path=":memory:", interval_hours=1.0, max_rss_mb=100, on_error=errors.append
+        )
+        scheduler = IntelScheduler(config)
+        scheduler.start()
+        assert scheduler._scheduler.get_job("watchdog") is not None
+
+        rss = "offer_sherlock.scheduler.intel_scheduler.process_tree_rss"
+        with patch(rss, return_value=50 * 1024 * 1024):
+            await scheduler._watchdog()
+        assert scheduler.is_running is True
+        assert scheduler.get_status()["rss_mb"] == 50
+
+        # Over the limit during a run: wait for the run to end
+        scheduler._run_started = datetime.now()
+        with patch(rss, return_value=500 * 1024 * 1024):
+            await scheduler._watchdog()
+            assert scheduler.is_running is True
+
+            scheduler._run_started = None
+            await scheduler._watchdog()
+
+        assert scheduler.is_running is False
+        assert scheduler.memory_exceeded is True
+        assert isinstance(errors[0], MemoryError)
+
+    def test_watchdog_disabled(self):
+        """Test no watchdog job is scheduled when disabled."""
+        config = ScheduleConfig(
+            db_path=":memory:", interval_hours=1.0, watchdog_interval_minutes=None
+        )
+        scheduler = IntelScheduler(config)
+
+        async def start():
+            scheduler.start()
+            jobs = [job.id for job in scheduler._scheduler.get_jobs()]
+            scheduler.shutdown()
+            return jobs
+
+        assert asyncio.run(start()) == ["intel_collection"]